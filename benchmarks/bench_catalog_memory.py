@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the shared Requirement model.
+
+Parses ASVS-5.0-en.json into the slotted, interned ``tools.catalog``
+Requirement and into a plain dataclass with the same fields, as the
+drift and export tools used before, and compares the memory each list
+holds under tracemalloc. Run from the repository root:
+
+    python -m benchmarks.bench_catalog_memory [--source PATH]
+"""
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from tools.catalog import Requirement, RequirementParser
+from tools.drift_detector import DEFAULT_LOCAL_PATH
+
+
+@dataclass
+class PlainRequirement:
+    """The per-tool requirement dataclass before the shared model."""
+    req_id: str
+    description: str
+    level: str
+    chapter_id: str = ""
+    chapter_name: str = ""
+    section_id: str = ""
+    section_name: str = ""
+
+
+def _plain(requirements: list[Requirement]) -> list[PlainRequirement]:
+    # Copy every string so rows do not share chapter and section names,
+    # as with json.loads output fed straight into a plain dataclass
+    return [
+        PlainRequirement(**{name: "".join(value) for name, value in _fields(req).items()})
+        for req in requirements
+    ]
+
+
+def _fields(req: Requirement) -> dict[str, str]:
+    return {
+        "req_id": req.req_id,
+        "description": req.description,
+        "level": req.level,
+        "chapter_id": req.chapter_id,
+        "chapter_name": req.chapter_name,
+        "section_id": req.section_id,
+        "section_name": req.section_name,
+    }
+
+
+def measure(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Build a value under tracemalloc; return it and the bytes it retains."""
+    tracemalloc.start()
+    try:
+        value = build()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return value, retained
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Requirement memory use")
+    parser.add_argument("--source", type=Path, default=Path(DEFAULT_LOCAL_PATH))
+    parsed = parser.parse_args()
+
+    content = parsed.source.read_text(encoding="utf-8")
+    req_parser = RequirementParser()
+
+    # Both runs decode the source; only the resulting lists stay alive
+    compact, compact_bytes = measure(lambda: req_parser.parse(content))
+    plain, plain_bytes = measure(lambda: _plain(req_parser.parse(content)))
+
+    print(f"Source: {parsed.source} ({len(compact)} requirements)")
+    print(f"  plain dataclass      {plain_bytes / 1024:8.1f} KiB  ({plain_bytes // len(plain)} B/req)")
+    print(f"  slotted + interned   {compact_bytes / 1024:8.1f} KiB  ({compact_bytes // len(compact)} B/req)")
+    print(f"  saving               {(1 - compact_bytes / plain_bytes) * 100:8.1f} %")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
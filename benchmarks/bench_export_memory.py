@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Peak-memory benchmark for streaming exports.
+
+Builds a large merged catalog by repeating ASVS-5.0-en.json with
+renumbered IDs, then exports it as Jira JSON to a file three ways under
+tracemalloc: the old path (load the catalog, build the output string,
+write it), the streaming exporters over the loaded catalog, and the
+streaming exporters over ``iter_load(stream=True)``. Run from the
+repository root:
+
+    python -m benchmarks.bench_export_memory [--copies N]
+"""
+
+import argparse
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from tools.drift_detector import DEFAULT_LOCAL_PATH
+from tools.export_requirements import (
+    DefaultFileReader,
+    FileWriter,
+    IntegrityVerifier,
+    JiraJsonExporter,
+    RequirementsLoader,
+)
+
+
+def merged_catalog(source: Path, copies: int, target: Path) -> int:
+    """Write ``copies`` renumbered copies of a catalog as one flat file."""
+    records = json.loads(source.read_text(encoding="utf-8"))["requirements"]
+    with target.open("w", encoding="utf-8") as handle:
+        handle.write("[\n")
+        for copy in range(copies):
+            for i, record in enumerate(records):
+                item = dict(record, req_id=f"X{copy}.{record['req_id']}")
+                separator = "" if copy == 0 and i == 0 else ",\n"
+                handle.write(separator + json.dumps(item))
+        handle.write("\n]\n")
+    return copies * len(records)
+
+
+def peak(run: Callable[[], None]) -> int:
+    """Peak bytes allocated while running."""
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_bytes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark export peak memory")
+    parser.add_argument("--source", type=Path, default=Path(DEFAULT_LOCAL_PATH))
+    parser.add_argument("--copies", type=int, default=20)
+    parsed = parser.parse_args()
+
+    reader = DefaultFileReader()
+    loader = RequirementsLoader(reader, IntegrityVerifier(reader))
+    exporter = JiraJsonExporter()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = Path(tmp) / "merged.json"
+        count = merged_catalog(parsed.source, parsed.copies, catalog)
+        output = FileWriter(Path(tmp) / "out.json")
+
+        def string_export() -> None:
+            output.write(exporter.export(loader.load(catalog)))
+
+        def sink_export() -> None:
+            with output.open() as sink:
+                exporter.write(loader.iter_load(catalog), sink)
+
+        def streamed_export() -> None:
+            with output.open() as sink:
+                exporter.write(loader.iter_by_level(loader.iter_load(catalog, stream=True)), sink)
+
+        results = [
+            ("load + string output", peak(string_export)),
+            ("load + sink output", peak(sink_export)),
+            ("stream + sink output", peak(streamed_export)),
+        ]
+
+    print(f"Catalog: {parsed.copies} copies of {parsed.source} ({count} requirements)")
+    for label, peak_bytes in results:
+        print(f"  {label:<22} {peak_bytes / 1024 / 1024:8.1f} MiB peak")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
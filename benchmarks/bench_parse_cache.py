@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmark for the parsed-catalog cache.
+
+Times RequirementParser.parse on ASVS-5.0-en.json against a warm ParseCache
+hit for the same content. Run from the repository root:
+
+    python -m benchmarks.bench_parse_cache [--repeat N] [--source PATH]
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from tools.catalog import Requirement, RequirementParser
+from tools.drift_detector import DEFAULT_LOCAL_PATH
+from tools.parse_cache import ParseCache, content_digest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the parsed-catalog cache")
+    parser.add_argument("--source", type=Path, default=Path(DEFAULT_LOCAL_PATH))
+    parser.add_argument("--repeat", type=int, default=50)
+    parsed = parser.parse_args()
+
+    content = parsed.source.read_text(encoding="utf-8")
+    req_parser = RequirementParser()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ParseCache(Path(cache_dir))
+        count = len(cache.get_or_parse("drift", content, req_parser.parse, Requirement))
+
+        cold = timeit.timeit(lambda: req_parser.parse(content), number=parsed.repeat)
+        hashed = timeit.timeit(lambda: content_digest(content), number=parsed.repeat)
+        warm = timeit.timeit(
+            lambda: cache.get_or_parse("drift", content, req_parser.parse, Requirement),
+            number=parsed.repeat,
+        )
+
+    def per_run(total: float) -> float:
+        return total / parsed.repeat * 1000
+
+    print(f"Source: {parsed.source} ({len(content):,} chars, {count} requirements)")
+    print(f"  json.loads + parse   {per_run(cold):8.2f} ms")
+    print(f"  cache hit (total)    {per_run(warm):8.2f} ms")
+    print(f"    of which SHA-256   {per_run(hashed):8.2f} ms")
+    print(f"  speedup              {cold / warm:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,14 @@ from pathlib import Path
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep index and download caches out of the real home directory."""
+    cache_dir = tmp_path_factory.mktemp("asvs-cache")
+    monkeypatch.setenv("ASVS_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def sample_requirements_data():
     """Sample ASVS requirements data for testing."""
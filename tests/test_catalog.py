@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared requirement model.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.catalog import Requirement, RequirementIndex, RequirementParser
+from tools.drift_detector import DEFAULT_LOCAL_PATH
+from tools.parse_cache import ParseCache
+
+
+CATALOG_PATH = Path(__file__).parent.parent / DEFAULT_LOCAL_PATH
+
+
+def _flat(req_id, **overrides):
+    record = {
+        "chapter_id": "V1",
+        "chapter_name": "Encoding and Sanitization",
+        "section_id": "V1.1",
+        "section_name": "Architecture",
+        "req_id": req_id,
+        "req_description": f"Verify {req_id}.",
+        "L": "1",
+    }
+    record.update(overrides)
+    return record
+
+
+class TestRequirement:
+    """Tests for the Requirement record."""
+
+    def test_has_no_instance_dict(self):
+        req = Requirement(req_id="V1.1.1", description="d", level="1")
+        assert not hasattr(req, "__dict__")
+        with pytest.raises(AttributeError):
+            req.extra = "x"
+
+    def test_shares_chapter_and_section_strings(self):
+        # Build equal but distinct strings, as json.loads would
+        a = Requirement.from_dict(json.loads(json.dumps(_flat("V1.1.1"))))
+        b = Requirement.from_dict(json.loads(json.dumps(_flat("V1.1.2"))))
+        assert a.chapter_name is b.chapter_name
+        assert a.section_name is b.section_name
+        assert a.level is b.level
+
+    def test_equality_and_hash_use_req_id(self):
+        a = Requirement(req_id="V1.1.1", description="old", level="1")
+        b = Requirement(req_id="V1.1.1", description="new", level="2")
+        assert a == b
+        assert len({a, b}) == 1
+
+    def test_req_description_alias(self):
+        req = Requirement(req_id="V1.1.1", description="Verify.", level="1")
+        assert req.req_description == "Verify."
+
+    def test_dict_round_trip(self):
+        record = _flat("V1.1.1")
+        assert Requirement.from_dict(record).to_dict() == record
+
+    def test_from_dict_rejects_non_object(self):
+        with pytest.raises(ValueError, match="Expected an object"):
+            Requirement.from_dict(["V1.1.1"])
+
+
+class TestRequirementIndex:
+    """Tests for RequirementIndex."""
+
+    @pytest.fixture
+    def index(self):
+        return RequirementIndex([
+            Requirement.from_dict(_flat("V1.1.1", L="2")),
+            Requirement.from_dict(_flat("V1.1.2", L="1")),
+            Requirement.from_dict(_flat("V1.2.1", section_id="V1.2", L="3")),
+            Requirement.from_dict(_flat("V2.1.1", chapter_id="V2", section_id="V2.1", L="1")),
+            Requirement.from_dict(_flat("V2.1.2", chapter_id="V2", section_id="V2.1", L="")),
+            Requirement.from_dict(_flat("V1.1.1", req_description="Duplicate.")),
+        ])
+
+    def test_lookup_by_id(self, index):
+        assert index.get("V1.2.1").level == "3"
+        assert "V2.1.1" in index
+        assert "V9.9.9" not in index
+        assert index.get("V9.9.9") is None
+
+    def test_first_duplicate_wins(self, index):
+        assert len(index) == 5
+        assert index.get("V1.1.1").description == "Verify V1.1.1."
+        assert [r.description for r in index.duplicates] == ["Duplicate."]
+
+    def test_chapter_and_section_views(self, index):
+        assert index.chapters == ["V1", "V2"]
+        assert [r.req_id for r in index.chapter("V1")] == ["V1.1.1", "V1.1.2", "V1.2.1"]
+        assert [r.req_id for r in index.section("V2.1")] == ["V2.1.1", "V2.1.2"]
+        assert index.section("V9.9") == []
+
+    def test_levels_are_cumulative(self, index):
+        assert [r.req_id for r in index.at_level("1")] == ["V1.1.2", "V2.1.1"]
+        assert [r.req_id for r in index.at_level(2)] == ["V1.1.1", "V1.1.2", "V2.1.1"]
+        assert [r.req_id for r in index.at_level("3")] == ["V1.1.1", "V1.1.2", "V1.2.1", "V2.1.1"]
+
+    def test_invalid_level(self, index):
+        with pytest.raises(ValueError, match="Invalid level"):
+            index.at_level("4")
+
+    def test_of_reuses_index(self, index):
+        assert RequirementIndex.of(index) is index
+        assert len(RequirementIndex.of(list(index))) == 5
+
+    def test_full_catalog(self):
+        requirements = RequirementParser().parse(CATALOG_PATH.read_text(encoding="utf-8"))
+        index = RequirementIndex(requirements)
+        assert len(index.at_level(3)) == len(requirements)
+        assert set(index.at_level(1)) <= set(index.at_level(2))
+        assert sum(len(index.chapter(c)) for c in index.chapters) == len(requirements)
+
+
+class TestStrictParser:
+    """Tests for RequirementParser(strict=True)."""
+
+    def test_flat_records_must_be_complete(self):
+        data = [_flat("V1.1.1"), {"req_id": "V1.1.2", "L": "1"}]
+        with pytest.raises(ValueError, match="Invalid requirement at index 1: Missing required field"):
+            RequirementParser(strict=True).parse_data(data)
+
+    def test_streamed_flat_records_must_be_complete(self):
+        data = [_flat("V1.1.1"), {"req_id": "V1.1.2", "L": "1"}]
+        stream = io.BytesIO(json.dumps(data).encode("utf-8"))
+        with pytest.raises(ValueError, match="Invalid requirement at index 1: Missing required field"):
+            list(RequirementParser(strict=True).iter_parse(stream))
+
+    def test_lenient_parser_skips_incomplete_records(self):
+        data = [_flat("V1.1.1"), "not a record", {"L": "1"}]
+        assert [r.req_id for r in RequirementParser().parse_data(data)] == ["V1.1.1"]
+
+    def test_nested_catalog(self):
+        requirements = RequirementParser(strict=True).parse(CATALOG_PATH.read_text(encoding="utf-8"))
+        assert len(requirements) > 300
+        assert all(r.level in ("1", "2", "3") for r in requirements)
+
+
+class TestParseCache:
+    """Slotted requirements survive the parse cache."""
+
+    def test_round_trip(self, tmp_path):
+        content = CATALOG_PATH.read_text(encoding="utf-8")
+        parser = RequirementParser()
+        cache = ParseCache(tmp_path)
+
+        first = cache.get_or_parse("drift", content, parser.parse, Requirement)
+        second = cache.get_or_parse("drift", content, parser.parse, Requirement)
+
+        assert [r.to_dict() for r in second] == [r.to_dict() for r in first]
+        assert second[0].chapter_name is second[1].chapter_name
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the packaged reference catalog bundle.
+"""
+
+import io
+import tarfile
+from pathlib import Path
+
+from tools.catalog_bundle import (
+    DEFAULT_BUNDLE_PATH,
+    build_bundle,
+    bundle_dir,
+    bundle_files,
+    bundled_file,
+    main,
+    read_bundle,
+)
+
+
+REFERENCE_DIR = Path(__file__).parent.parent / "01-ASVS-Core-Reference"
+
+
+class TestBuild:
+    """Tests for writing the bundle."""
+
+    def test_deterministic(self):
+        assert build_bundle(REFERENCE_DIR) == build_bundle(REFERENCE_DIR)
+
+    def test_members(self):
+        with tarfile.open(fileobj=io.BytesIO(build_bundle(REFERENCE_DIR)), mode="r:xz") as tar:
+            members = tar.getmembers()
+        assert [m.name for m in members] == sorted(bundle_files())
+        assert {m.mtime for m in members} == {0}
+
+    def test_shipped_bundle_is_current(self):
+        assert DEFAULT_BUNDLE_PATH.read_bytes() == build_bundle(REFERENCE_DIR)
+        assert read_bundle() == DEFAULT_BUNDLE_PATH.read_bytes()
+
+
+class TestUnpack:
+    """Tests for unpacking on first use."""
+
+    def test_files_match_reference(self, tmp_path):
+        for name in bundle_files():
+            path = bundled_file(name, tmp_path)
+            assert path.read_bytes() == (REFERENCE_DIR / name).read_bytes()
+
+    def test_unpacked_once(self, tmp_path):
+        first = bundle_dir(tmp_path)
+        marker = first / "marker"
+        marker.write_text("x")
+        assert bundle_dir(tmp_path) == first
+        assert marker.exists()
+
+    def test_unsafe_members_skipped(self, tmp_path):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:xz") as tar:
+            for name in ("../escape.json", "nested/../../up.json", "/abs.json", "nested/file.json", "ok.json"):
+                info = tarfile.TarInfo(name)
+                info.size = 2
+                tar.addfile(info, io.BytesIO(b"{}"))
+
+        directory = bundle_dir(tmp_path / "cache", buffer.getvalue())
+        files = sorted(p.relative_to(directory).as_posix() for p in directory.rglob("*") if p.is_file())
+        assert files == ["nested/file.json", "ok.json"]
+        assert not (tmp_path / "cache" / "escape.json").exists()
+        assert not (tmp_path / "up.json").exists()
+
+    def test_corrupt_bundle(self, tmp_path):
+        assert bundle_dir(tmp_path, b"not an archive") is None
+
+    def test_unknown_file(self, tmp_path):
+        assert bundled_file("missing.json", tmp_path) is None
+        assert bundled_file("../ASVS-5.0-en.json", tmp_path) is None
+
+    def test_functional_requirements_bundled(self, tmp_path):
+        name = "Functional-Requirements/ASVS-Functional-Requirements-L1.json"
+        assert name in bundle_files()
+        assert bundled_file(name, tmp_path).read_bytes() == (REFERENCE_DIR / name).read_bytes()
+
+
+class TestMain:
+    """Tests for the CLI."""
+
+    def test_write_then_check(self, tmp_path, capsys):
+        output = tmp_path / "bundle.tar.xz"
+        assert main(["--path", str(REFERENCE_DIR), "--output", str(output), "--check"]) == 1
+        assert main(["--path", str(REFERENCE_DIR), "--output", str(output)]) == 0
+        assert main(["--path", str(REFERENCE_DIR), "--output", str(output), "--check"]) == 0
+        assert "up to date" in capsys.readouterr().out
+
+    def test_missing_reference_dir(self, tmp_path, capsys):
+        assert main(["--path", str(tmp_path), "--output", str(tmp_path / "b.tar.xz")]) == 1
+        assert "Error" in capsys.readouterr().err
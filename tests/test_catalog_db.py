@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite catalog database.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from tools import catalog_db
+from tools.catalog import Requirement
+from tools.catalog_db import (
+    CatalogDatabase,
+    CatalogDatabaseError,
+    _match_expression,
+    load_sources,
+    main,
+)
+
+
+REFERENCE_DIR = Path(__file__).parent.parent / "01-ASVS-Core-Reference"
+
+
+def _req(req_id, description, level="1"):
+    return Requirement(
+        req_id=req_id,
+        description=description,
+        level=level,
+        chapter_id=req_id.split(".")[0],
+        chapter_name="Tokens",
+        section_id=".".join(req_id.split(".")[:2]),
+        section_name="Token content",
+    )
+
+
+SOURCES = [
+    ("core.json", "a" * 64, [
+        _req("V9.1.1", "Verify that JWT signatures are validated.", "1"),
+        _req("V9.1.2", "Verify that token lifetimes are enforced.", "2"),
+        _req("V9.1.3", "Verify that JWT keys come from trusted sources.", "3"),
+    ]),
+    ("functional.json", "b" * 64, [
+        _req("V9.1.1", "The system shall validate JWT signatures.", "1"),
+    ]),
+    ("subset.csv", "c" * 64, [
+        _req("V9.1.2", "Verify that token lifetimes are enforced.", ""),
+    ]),
+]
+
+
+@pytest.fixture(params=[True, False], ids=["fts5", "like"])
+def database(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_db, "fts5_available", lambda: request.param)
+    db = CatalogDatabase(tmp_path / "catalog.db")
+    db.build(SOURCES)
+    return db
+
+
+class TestBuild:
+    """Tests for building the database."""
+
+    def test_rows_and_indexes(self, tmp_path):
+        report = CatalogDatabase(tmp_path / "catalog.db").build(SOURCES)
+        assert report.count == 5
+        assert report.sources == {"core.json": 3, "functional.json": 1, "subset.csv": 1}
+
+        conn = sqlite3.connect(tmp_path / "catalog.db")
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"requirements_req_id", "requirements_chapter", "requirements_section",
+                "requirements_level"} <= indexes
+        conn.close()
+
+    def test_missing_level_taken_from_earlier_source(self, database):
+        hits = database.search("lifetimes")
+        assert hits[0].level == 2
+        assert hits[0].sources == ["core.json", "subset.csv"]
+
+    def test_rebuild_replaces_content(self, tmp_path):
+        db = CatalogDatabase(tmp_path / "catalog.db")
+        db.build(SOURCES)
+        db.build([("other.json", "d" * 64, [_req("V1.1.1", "Verify encoding.")])])
+        assert db.search("jwt") == []
+        assert [h.req_id for h in db.search("encoding")] == ["V1.1.1"]
+
+    def test_shipped_reference_files(self):
+        sources = load_sources(REFERENCE_DIR)
+        names = [name for name, _, _ in sources]
+        assert names[0] == "ASVS-5.0-en.json"
+        assert "ASVS-L1-Baseline.csv" in names
+        assert "Functional-Requirements/ASVS-Functional-Requirements-L3.json" in names
+        assert all(len(digest) == 64 for _, digest, _ in sources)
+
+
+class TestSearch:
+    """Tests for searching the database."""
+
+    def test_one_hit_per_requirement(self, database):
+        hits = database.search("jwt")
+        assert sorted(h.req_id for h in hits) == ["V9.1.1", "V9.1.3"]
+        v911 = next(h for h in hits if h.req_id == "V9.1.1")
+        assert v911.sources == ["core.json", "functional.json"]
+        assert v911.description == "Verify that JWT signatures are validated."
+
+    def test_all_words_required(self, database):
+        assert [h.req_id for h in database.search("jwt trusted")] == ["V9.1.3"]
+
+    def test_level_is_cumulative(self, database):
+        assert [h.req_id for h in database.search("jwt", level=1)] == ["V9.1.1"]
+        assert len(database.search("verify", level=2)) == 2
+
+    def test_limit(self, database):
+        assert len(database.search("verify", limit=1)) == 1
+
+    def test_prefix(self, database):
+        assert [h.req_id for h in database.search("lifetim*")] == ["V9.1.2"]
+
+    def test_query_syntax_is_literal(self, database):
+        assert database.search('V9.1 "OR') == []
+
+    def test_empty_query(self, database):
+        with pytest.raises(CatalogDatabaseError, match="Empty"):
+            database.search("   ")
+
+    def test_missing_database(self, tmp_path):
+        with pytest.raises(CatalogDatabaseError, match="asvs catalog build"):
+            CatalogDatabase(tmp_path / "none.db").search("jwt")
+
+
+class TestMatchExpression:
+    """Tests for FTS5 query quoting."""
+
+    def test_words_are_quoted(self):
+        assert _match_expression('single-sign-on "x') == '"single-sign-on" """x"'
+
+    def test_prefix(self):
+        assert _match_expression("pass*") == '"pass"*'
+
+
+class TestMain:
+    """Tests for the CLI."""
+
+    def test_build_then_search(self, tmp_path, capsys):
+        db = str(tmp_path / "catalog.db")
+        assert main(["--db", db, "build", "--path", str(REFERENCE_DIR)]) == 0
+        assert "8 files" in capsys.readouterr().out
+
+        assert main(["--db", db, "search", "jwt", "--format", "json"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["count"] == len(data["results"]) > 0
+        assert data["results"][0]["sources"][0] == "ASVS-5.0-en.json"
+
+    def test_build_with_internal_catalog(self, tmp_path, capsys):
+        internal = tmp_path / "internal.json"
+        internal.write_text(json.dumps([{"req_id": "ACME.1.1", "req_description": "Rotate the widget key.",
+                                         "L": "1"}]))
+        db = str(tmp_path / "catalog.db")
+        assert main(["--db", db, "build", "--path", str(REFERENCE_DIR), "--add", str(internal)]) == 0
+        capsys.readouterr()
+
+        assert main(["--db", db, "search", "widget"]) == 0
+        assert "ACME.1.1" in capsys.readouterr().out
+
+    def test_invalid_limit(self, tmp_path, capsys):
+        assert main(["--db", str(tmp_path / "catalog.db"), "search", "jwt", "--limit", "0"]) == 1
+        assert "--limit" in capsys.readouterr().err
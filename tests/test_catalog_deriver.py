@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the derived catalog builder.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tools.catalog_deriver import (
+    DERIVED_OUTPUTS,
+    MANIFEST_NAME,
+    CatalogDeriver,
+    JsonArrayWriter,
+    main,
+)
+from tools.catalog import Requirement
+
+
+REFERENCE_DIR = Path(__file__).parent.parent / "01-ASVS-Core-Reference"
+
+
+def _catalog(*requirements):
+    """A catalog in the format of ASVS-5.0-en.json."""
+    return {
+        "requirements": [
+            {
+                "chapter_id": "V1",
+                "chapter_name": "Encoding",
+                "section_id": "V1.1",
+                "section_name": "Architecture",
+                "req_id": req_id,
+                "req_description": f"Verify {req_id}.",
+                "L": level,
+            }
+            for req_id, level in requirements
+        ],
+    }
+
+
+@pytest.fixture
+def reference(tmp_path):
+    (tmp_path / "ASVS-5.0-en.json").write_text(
+        json.dumps(_catalog(("V1.1.1", "1"), ("V1.1.2", "2"), ("V1.1.3", "3"))), encoding="utf-8"
+    )
+    return tmp_path
+
+
+class TestDerive:
+    """Tests for CatalogDeriver."""
+
+    def test_writes_level_subsets(self, reference):
+        report = CatalogDeriver(reference).derive()
+        assert {o.status for o in report.outputs} == {"written"}
+
+        l1 = json.loads((reference / "ASVS-L1-Baseline.json").read_text())
+        assert [r["req_id"] for r in l1] == ["V1.1.1"]
+        assert (reference / "ASVS-L2-Standard.csv").read_text() == (
+            '"V1.1.1","Verify V1.1.1."\n"V1.1.2","Verify V1.1.2."\n'
+        )
+        manifest = json.loads((reference / MANIFEST_NAME).read_text())
+        assert manifest["outputs"]["ASVS-L2-Standard.json"]["count"] == 2
+
+    def test_second_run_skips_parse(self, reference):
+        CatalogDeriver(reference).derive()
+        report = CatalogDeriver(reference).derive()
+        assert report.parsed is False
+        assert {o.status for o in report.outputs} == {"up-to-date"}
+
+    def test_source_change_regenerates_affected_outputs(self, reference):
+        CatalogDeriver(reference).derive()
+        source = reference / "ASVS-5.0-en.json"
+        source.write_text(json.dumps(_catalog(("V1.1.1", "1"), ("V1.1.2", "2"), ("V1.1.3", "2"))))
+
+        report = CatalogDeriver(reference).derive()
+        statuses = {o.path: o.status for o in report.outputs}
+        assert statuses["ASVS-L1-Baseline.json"] == "unchanged"
+        assert statuses["ASVS-L2-Standard.json"] == "written"
+        assert "V1.1.3" in (reference / "ASVS-L2-Standard.csv").read_text()
+
+    def test_edited_output_is_regenerated(self, reference):
+        CatalogDeriver(reference).derive()
+        (reference / "ASVS-L1-Baseline.csv").write_text("edited\n")
+        (reference / "ASVS-L2-Standard.json").unlink()
+
+        report = CatalogDeriver(reference).derive()
+        statuses = {o.path: o.status for o in report.outputs}
+        assert statuses == {
+            "ASVS-L1-Baseline.json": "up-to-date",
+            "ASVS-L2-Standard.json": "written",
+            "ASVS-L1-Baseline.csv": "written",
+            "ASVS-L2-Standard.csv": "up-to-date",
+        }
+
+    def test_check_does_not_write(self, reference):
+        report = CatalogDeriver(reference).derive(check=True)
+        assert {o.status for o in report.outputs} == {"stale"}
+        assert sorted(p.name for p in reference.iterdir()) == ["ASVS-5.0-en.json"]
+
+    def test_force(self, reference):
+        CatalogDeriver(reference).derive()
+        report = CatalogDeriver(reference).derive(force=True)
+        assert report.parsed is True
+        assert {o.status for o in report.outputs} == {"unchanged"}
+
+    def test_missing_source(self, tmp_path):
+        with pytest.raises(OSError, match="Cannot read"):
+            CatalogDeriver(tmp_path).derive()
+
+
+class TestShippedCatalogs:
+    """The shipped subsets are exactly what derive produces."""
+
+    def test_byte_identical(self, tmp_path):
+        shutil.copy(REFERENCE_DIR / "ASVS-5.0-en.json", tmp_path)
+        CatalogDeriver(tmp_path).derive()
+        for output in DERIVED_OUTPUTS:
+            assert (tmp_path / output.path).read_bytes() == (REFERENCE_DIR / output.path).read_bytes()
+        assert (tmp_path / MANIFEST_NAME).read_bytes() == (REFERENCE_DIR / MANIFEST_NAME).read_bytes()
+
+
+class TestJsonArrayWriter:
+    """The writer matches json.dumps(indent=2)."""
+
+    def test_matches_json_dumps(self):
+        reqs = [Requirement(req_id="V1.1.1", description='Quote " and café', level="1"),
+                Requirement(req_id="V1.1.2", description="Second", level="1")]
+        writer = JsonArrayWriter()
+        for req in reqs:
+            writer.add(req)
+        assert writer.getvalue() == json.dumps([r.to_dict() for r in reqs], indent=2) + "\n"
+
+    def test_empty(self):
+        assert JsonArrayWriter().getvalue() == json.dumps([], indent=2) + "\n"
+
+
+class TestMain:
+    """Tests for the CLI."""
+
+    def test_check_exit_status(self, reference, capsys):
+        assert main(["--path", str(reference), "--check"]) == 1
+        assert "out of date" in capsys.readouterr().out
+        assert main(["--path", str(reference)]) == 0
+        assert main(["--path", str(reference), "--check"]) == 0
+        assert "up to date" in capsys.readouterr().out
+
+    def test_invalid_source(self, tmp_path, capsys):
+        (tmp_path / "ASVS-5.0-en.json").write_text("{not json")
+        assert main(["--path", str(tmp_path)]) == 1
+        assert "Error" in capsys.readouterr().err
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit tests for catalog Merkle trees.
+"""
+
+import json
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from tools.catalog_merkle import build_tree, diff_trees, tree_from_rows, tree_to_rows
+from tools.drift_detector import (
+    DEFAULT_LOCAL_PATH,
+    DefaultFileReader,
+    DriftDetector,
+    RequirementParser,
+    main,
+)
+from tools.parse_cache import ParseCache
+
+
+CATALOG_PATH = Path(__file__).parent.parent / DEFAULT_LOCAL_PATH
+
+
+@pytest.fixture(scope="module")
+def catalog_text():
+    return CATALOG_PATH.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def requirements(catalog_text):
+    return RequirementParser().parse(catalog_text)
+
+
+def _count_nodes(node):
+    return 1 + sum(_count_nodes(child) for child in node.children.values())
+
+
+class TestBuildTree:
+
+    def test_independent_of_key_order_and_whitespace(self, catalog_text):
+        data = json.loads(catalog_text)
+        reordered = json.dumps(
+            {"requirements": [dict(sorted(item.items(), reverse=True)) for item in data["requirements"]]},
+            separators=(",", ":"),
+        )
+        parser = RequirementParser()
+        assert build_tree(parser.parse(reordered)).digest == build_tree(parser.parse(catalog_text)).digest
+
+    def test_independent_of_requirement_order(self, requirements):
+        assert build_tree(reversed(requirements)).digest == build_tree(requirements).digest
+
+    def test_rows_round_trip(self, requirements):
+        tree = build_tree(requirements)
+        restored = tree_from_rows(tree_to_rows(tree))
+        assert tree_to_rows(restored) == tree_to_rows(tree)
+        assert restored.children["V1"].children["V1.1"].children["V1.1.1"].digest == \
+            tree.children["V1"].children["V1.1"].children["V1.1.1"].digest
+
+
+class TestDiffTrees:
+
+    def test_identical_trees_visit_root_only(self, requirements):
+        diff = diff_trees(build_tree(requirements), build_tree(requirements))
+        assert not diff.has_changes
+        assert diff.visited == 1
+
+    def test_single_change_descends_one_path(self, requirements):
+        changed = [
+            replace(r, description=r.description + " Updated.") if r.req_id == "V1.1.1" else r
+            for r in requirements
+        ]
+        local, upstream = build_tree(requirements), build_tree(changed)
+        diff = diff_trees(local, upstream)
+
+        assert diff.changed == ["V1.1.1"]
+        assert diff.chapters == ["V1"]
+        assert diff.visited < _count_nodes(local) / 5
+
+    def test_added_removed_and_moved(self, requirements):
+        upstream = [r for r in requirements if r.req_id != "V1.1.2"]
+        upstream.append(replace(requirements[0], req_id="V99.1.1", chapter_id="V99", section_id="V99.1"))
+        upstream = [replace(r, section_id="V2.9") if r.req_id == "V2.1.1" else r for r in upstream]
+
+        diff = diff_trees(build_tree(requirements), build_tree(upstream))
+
+        assert diff.added == ["V99.1.1"]
+        assert diff.removed == ["V1.1.2"]
+        assert diff.changed == ["V2.1.1"]
+
+    def test_chapters_only(self, requirements):
+        upstream = [replace(r, level="3") if r.chapter_id == "V5" else r for r in requirements]
+        diff = diff_trees(build_tree(requirements), build_tree(upstream), leaves=False)
+        assert diff.chapters == ["V5"]
+        assert diff.changed == []
+        assert diff.visited == 1 + len(build_tree(requirements).children)
+
+
+class TestDetectorIntegration:
+
+    def test_compare_trees_matches_compare(self, requirements):
+        detector = DriftDetector(Mock(), Mock(), RequirementParser())
+        upstream = [r for r in requirements if r.req_id != "V3.1.1"]
+        upstream = [replace(r, description="Rewritten.") if r.req_id == "V4.1.1" else r for r in upstream]
+        upstream = [replace(r, level="") if r.req_id == "V5.1.1" else r for r in upstream]
+
+        expected = detector.compare(requirements, upstream)
+        result = detector.compare_trees(requirements, upstream, build_tree(requirements), build_tree(upstream))
+
+        assert result.removed == expected.removed
+        assert result.modified == expected.modified
+        assert result.added == expected.added
+        assert (result.local_count, result.upstream_count) == (expected.local_count, expected.upstream_count)
+
+    def test_cached_tree_skips_parsing(self, catalog_text, tmp_path):
+        cache = ParseCache(tmp_path)
+        parser = Mock(wraps=RequirementParser())
+        detector = DriftDetector(DefaultFileReader(), Mock(), parser, cache)
+
+        first = detector.load_tree(catalog_text)
+        second = detector.load_tree(catalog_text)
+
+        assert parser.parse.call_count == 1
+        assert second.digest == first.digest
+
+    def test_main_summary_only(self, catalog_text, tmp_path, capsys):
+        local = tmp_path / "local.json"
+        local.write_text(catalog_text, encoding="utf-8")
+        data = json.loads(catalog_text)
+        data["requirements"][0]["req_description"] = "Changed."
+        upstream = tmp_path / "upstream.json"
+        upstream.write_text(json.dumps(data), encoding="utf-8")
+
+        exit_code = main(["--local", str(local), "--upstream-file", str(upstream),
+                          "--summary-only", "--format", "json"])
+        output = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 1
+        assert output["changed_chapters"] == ["V1"]
+
+        assert main(["--local", str(local), "--upstream-file", str(local), "--summary-only"]) == 0
+        assert "IN SYNC" in capsys.readouterr().out
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the reference catalog verifier.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.catalog_verifier import (
+    DEFAULT_REFERENCE_DIR,
+    CatalogSpec,
+    CatalogVerifier,
+    main,
+    parse_csv,
+)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+SPECS = (
+    CatalogSpec("L1.json", 1),
+    CatalogSpec("L1.csv", 1, has_levels=False, has_structure=False),
+    CatalogSpec("Functional-L2.json", 2, compare_descriptions=False),
+)
+
+
+def _req(req_id, level, description=None, section_name="Section"):
+    chapter = req_id.split(".")[0]
+    return {
+        "chapter_id": chapter,
+        "chapter_name": "Chapter",
+        "section_id": ".".join(req_id.split(".")[:2]),
+        "section_name": section_name,
+        "req_id": req_id,
+        "req_description": description or f"Verify {req_id}.",
+        "L": level,
+    }
+
+
+MASTER = [_req("V1.1.1", "1"), _req("V1.1.2", "2"), _req("V1.2.1", "1"), _req("V2.1.1", "3")]
+
+
+def _write(reference_dir, l1, csv_rows, functional):
+    reference_dir.mkdir(exist_ok=True)
+    (reference_dir / "ASVS-5.0-en.json").write_text(json.dumps({"requirements": MASTER}), encoding="utf-8")
+    (reference_dir / "L1.json").write_text(json.dumps(l1), encoding="utf-8")
+    (reference_dir / "L1.csv").write_text(
+        "".join(f'"{rid}","{text}"\n' for rid, text in csv_rows), encoding="utf-8"
+    )
+    (reference_dir / "Functional-L2.json").write_text(json.dumps(functional), encoding="utf-8")
+
+
+@pytest.fixture
+def consistent_dir(tmp_path):
+    l1 = [r for r in MASTER if r["L"] == "1"]
+    functional = [dict(r, req_description="Reworded.") for r in MASTER if r["L"] in ("1", "2")]
+    _write(tmp_path, l1, [(r["req_id"], r["req_description"]) for r in l1], functional)
+    return tmp_path
+
+
+class TestCatalogVerifier:
+
+    def test_consistent_catalogs_pass(self, consistent_dir):
+        report = CatalogVerifier(consistent_dir, SPECS).verify()
+        assert report.passed
+        assert [r.count for r in report.reports] == [4, 2, 2, 3]
+
+    def test_reports_each_kind(self, tmp_path):
+        l1 = [
+            _req("V1.1.1", "1", "Verify something else."),
+            _req("V1.1.2", "1"),
+            _req("V9.9.9", "1"),
+            _req("V9.9.9", "1"),
+        ]
+        csv_rows = [("V1.1.1", "Verify V1.1.1."), ("V1.2.1", "Verify V1.2.1 differently.")]
+        functional = [
+            dict(_req("V1.1.1", "2"), req_description="Reworded."),
+            _req("V1.1.2", "2", section_name="Renamed"),
+        ]
+        _write(tmp_path, l1, csv_rows, functional)
+
+        report = CatalogVerifier(tmp_path, SPECS).verify()
+        found = {(f.path, f.req_id, f.kind) for f in report.findings}
+
+        assert found == {
+            ("L1.json", "V1.1.1", "description"),
+            ("L1.json", "V1.1.2", "above-level"),
+            ("L1.json", "V1.2.1", "missing"),
+            ("L1.json", "V9.9.9", "unknown"),
+            ("L1.json", "V9.9.9", "duplicate"),
+            ("L1.csv", "V1.2.1", "description"),
+            ("Functional-L2.json", "V1.1.1", "level"),
+            ("Functional-L2.json", "V1.1.2", "structure"),
+            ("Functional-L2.json", "V1.2.1", "missing"),
+        }
+
+    def test_one_finding_per_level_defect(self, consistent_dir):
+        l1 = [r for r in MASTER if r["L"] == "1"] + [_req("V1.1.2", "1")]
+        (consistent_dir / "L1.json").write_text(json.dumps(l1), encoding="utf-8")
+        report = CatalogVerifier(consistent_dir, SPECS).verify()
+        assert [(f.req_id, f.kind, f.detail) for f in report.findings] == [
+            ("V1.1.2", "above-level", "L2 in reference, L1 here"),
+        ]
+
+    def test_unreadable_file(self, consistent_dir):
+        (consistent_dir / "L1.json").write_text("{not json", encoding="utf-8")
+        report = CatalogVerifier(consistent_dir, SPECS).verify()
+        assert [(f.path, f.kind) for f in report.findings] == [("L1.json", "unreadable")]
+
+    def test_parse_csv(self):
+        rows = parse_csv('"V1.1.1","Text, with comma"\n\n"V1.1.2","Other"\n')
+        assert [(r.req_id, r.description) for r in rows] == [("V1.1.1", "Text, with comma"), ("V1.1.2", "Other")]
+
+    def test_shipped_catalogs_verify_clean(self):
+        report = CatalogVerifier(PROJECT_ROOT / DEFAULT_REFERENCE_DIR).verify()
+        assert [(f.path, f.req_id, f.kind) for f in report.findings] == []
+
+
+class TestMain:
+
+    def test_main_pass(self, consistent_dir, monkeypatch, capsys):
+        monkeypatch.setattr("tools.catalog_verifier.DERIVED_CATALOGS", SPECS)
+        assert main(["--path", str(consistent_dir)]) == 0
+        assert "Status: PASS" in capsys.readouterr().out
+
+    def test_main_fail_json(self, consistent_dir, monkeypatch, capsys):
+        monkeypatch.setattr("tools.catalog_verifier.DERIVED_CATALOGS", SPECS)
+        (consistent_dir / "L1.csv").write_text('"V1.1.1","Verify V1.1.1."\n', encoding="utf-8")
+        assert main(["--path", str(consistent_dir), "--format", "json"]) == 1
+        output = json.loads(capsys.readouterr().out)
+        assert output["status"] == "fail"
+        assert output["files"][1]["findings"] == [{"id": "V1.2.1", "kind": "missing", "detail": "L1"}]
+
+    def test_main_falls_back_to_bundle(self, tmp_path, capsys):
+        main(["--base-path", str(tmp_path), "--format", "json"])
+        output = json.loads(capsys.readouterr().out)
+        paths = [f["path"] for f in output["files"]]
+        assert "Functional-Requirements/ASVS-Functional-Requirements-L3.json" in paths
+        assert not any(f["findings"] and f["findings"][0]["kind"] == "unreadable" for f in output["files"])
+
+    def test_main_shipped_tree_passes(self, capsys):
+        assert main(["--base-path", str(PROJECT_ROOT)]) == 0
+        assert "Status: PASS" in capsys.readouterr().out
+
+    def test_main_missing_directory(self, tmp_path, capsys):
+        assert main(["--path", str(tmp_path)]) == 1
+        assert "not found" in capsys.readouterr().err
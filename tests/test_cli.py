@@ -1,5 +1,7 @@
 """Unit tests for the unified ASVS CLI."""
 
+import json
+
 import pytest
 from pathlib import Path
 
@@ -67,6 +69,12 @@ class TestVerifyCommand:
         args = parser.parse_args(["verify", "--json"])
         assert args.json is True
 
+    def test_verify_with_ndjson_flag(self):
+        """Test verify command with --ndjson flag."""
+        parser = create_parser()
+        args = parser.parse_args(["verify", "--ndjson"])
+        assert args.ndjson is True
+
     def test_verify_with_strict_flag(self):
         """Test verify command with --strict flag."""
         parser = create_parser()
@@ -80,6 +88,20 @@ class TestVerifyCommand:
         assert args.level == 1
         assert args.docs_path == Path("/tmp/docs")
 
+    def test_verify_max_scan_bytes(self):
+        """Test --max-scan-bytes takes a positive integer."""
+        parser = create_parser()
+        assert parser.parse_args(["verify", "--max-scan-bytes", "100"]).max_scan_bytes == 100
+        assert parser.parse_args(["verify"]).max_scan_bytes is None
+
+    @pytest.mark.parametrize("value", ["0", "-1", "ten"])
+    def test_verify_max_scan_bytes_rejects_invalid(self, value):
+        """Test --max-scan-bytes rejects zero, negative and non-integer values."""
+        parser = create_parser()
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(["verify", "--max-scan-bytes", value])
+        assert exc_info.value.code == 2
+
 
 class TestScanCommand:
     """Tests for 'asvs scan' command."""
@@ -159,6 +181,32 @@ class TestExportCommand:
         assert args.format == "csv"
         assert args.output == Path("out.csv")
 
+    def test_export_with_functional(self):
+        """Test export command with --with-functional."""
+        parser = create_parser()
+        assert parser.parse_args(["export", "--with-functional"]).with_functional is True
+        assert parser.parse_args(["export"]).with_functional is False
+
+    def test_export_stream(self):
+        """Test export command with --stream."""
+        parser = create_parser()
+        assert parser.parse_args(["export", "--stream"]).stream is True
+        assert parser.parse_args(["export"]).stream is False
+
+    def test_export_with_framework(self):
+        """Test export command with --framework."""
+        parser = create_parser()
+        args = parser.parse_args(["export", "--framework", "soc2", "--format", "json"])
+        assert args.framework == "soc2"
+        assert args.format == "json"
+
+    def test_export_framework_rejects_jira_json(self, project_root, capsys):
+        """Test control coverage is never emitted under the jira-json name."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(["export", "--framework", "soc2", "--format", "jira-json"])
+        assert exc_info.value.code == 2
+        assert "use --format json" in capsys.readouterr().err
+
 
 class TestDriftCommand:
     """Tests for 'asvs drift' command."""
@@ -184,6 +232,39 @@ class TestDriftCommand:
         args = parser.parse_args(["drift", "--offline"])
         assert args.offline is True
 
+    def test_drift_json_and_json_patch_exclusive(self, capsys):
+        """Test --json and --json-patch cannot both pick the format."""
+        parser = create_parser()
+        assert parser.parse_args(["drift", "--json-patch"]).json_patch is True
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(["drift", "--json", "--json-patch"])
+        assert exc_info.value.code == 2
+        assert "not allowed with argument" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("extra, forwarded", [([], None), (["--max-age", "0"], "0"), (["--max-age", "60"], "60")])
+    def test_drift_forwards_max_age(self, monkeypatch, extra, forwarded):
+        """Test --max-age is forwarded whenever given, including 0."""
+        calls = []
+        monkeypatch.setattr("tools.drift_detector.main", lambda args: calls.append(args) or 0)
+        assert main(["drift", "--offline"] + extra) == 0
+        args = calls[0]
+        assert (args[args.index("--max-age") + 1] if "--max-age" in args else None) == forwarded
+
+    def test_drift_move_threshold(self):
+        """Test --move-threshold takes a similarity between 0 and 1."""
+        parser = create_parser()
+        assert parser.parse_args(["drift", "--move-threshold", "0"]).move_threshold == 0.0
+        assert parser.parse_args(["drift", "--move-threshold", "1"]).move_threshold == 1.0
+
+    @pytest.mark.parametrize("value", ["-0.1", "1.5", "high"])
+    def test_drift_move_threshold_rejects_invalid(self, value, capsys):
+        """Test --move-threshold rejects values outside [0, 1]."""
+        parser = create_parser()
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(["drift", "--move-threshold", value])
+        assert exc_info.value.code == 2
+        assert "--move-threshold" in capsys.readouterr().err
+
 
 class TestInitCommand:
     """Tests for 'asvs init' command."""
@@ -305,3 +386,70 @@ class TestDriftIntegration:
         assert result == 0
         captured = capsys.readouterr()
         assert "ASVS Drift Detection Report" in captured.out
+
+
+class TestCatalogCommand:
+    """Tests for 'asvs catalog' command."""
+
+    def test_catalog_verify_defaults(self):
+        """Test catalog verify default values."""
+        parser = create_parser()
+        args = parser.parse_args(["catalog", "verify"])
+        assert args.command == "catalog"
+        assert args.catalog_command == "verify"
+        assert args.path is None
+        assert args.json is False
+
+    def test_catalog_without_subcommand_shows_help(self, capsys):
+        """Test 'asvs catalog' prints its subcommands."""
+        assert main(["catalog"]) == 0
+        assert "verify" in capsys.readouterr().out
+
+    def test_catalog_verify_json(self, project_root, capsys):
+        """Test catalog verify against the shipped reference directory."""
+        main(["catalog", "verify", "--path", str(project_root / "01-ASVS-Core-Reference"), "--json"])
+        captured = capsys.readouterr()
+        assert '"count": 345' in captured.out
+
+    def test_catalog_build_and_search(self, project_root, tmp_path, capsys):
+        """Test building the catalog database and searching it."""
+        db = tmp_path / "catalog.db"
+        reference = project_root / "01-ASVS-Core-Reference"
+        assert main(["catalog", "build", "--path", str(reference), "--db", str(db)]) == 0
+        capsys.readouterr()
+
+        assert main(["search", "jwt", "--level", "1", "--json", "--db", str(db)]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["count"] > 0
+        assert all(hit["level"] == 1 for hit in data["results"])
+
+    def test_catalog_derive_check(self, project_root, capsys):
+        """Test the shipped derived catalogs are up to date."""
+        reference = project_root / "01-ASVS-Core-Reference"
+        assert main(["catalog", "derive", "--path", str(reference), "--check", "--json"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["parsed"] is False
+        assert {o["status"] for o in data["outputs"]} == {"up-to-date"}
+
+    def test_catalog_bundle_check(self, project_root, capsys):
+        """Test the packaged catalog bundle matches the reference files."""
+        reference = project_root / "01-ASVS-Core-Reference"
+        assert main(["catalog", "bundle", "--path", str(reference), "--check"]) == 0
+        assert "up to date" in capsys.readouterr().out
+
+    def test_search_without_database(self, tmp_path, capsys):
+        """Test search explains how to build a missing database."""
+        assert main(["search", "jwt", "--db", str(tmp_path / "missing.db")]) == 1
+        assert "asvs catalog build" in capsys.readouterr().err
+
+
+class TestExplainCommand:
+    """Tests for 'asvs explain' command."""
+
+    def test_explain_json(self, project_root, monkeypatch, capsys):
+        """Test explain finds the CSRF guidance for V3.5.1."""
+        monkeypatch.chdir(project_root)
+        assert main(["explain", "v3.5.1", "--json"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["id"] == "V3.5.1"
+        assert any(s["path"].endswith("Anti-CSRF-Implementation.md") for s in data["guidance"])
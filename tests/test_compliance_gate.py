@@ -1,5 +1,6 @@
 """Unit tests for ASVS Compliance Gate."""
 
+import io
 import json
 from pathlib import Path
 
@@ -11,7 +12,9 @@ from tools.compliance_gate import (
     GateResult,
     DEFAULT_PLACEHOLDER_PATTERNS,
     REQUIRED_DOCUMENTS_BY_LEVEL,
+    main,
     resolve_docs_path,
+    stream_ndjson,
 )
 
 
@@ -447,6 +450,17 @@ We need more content here to pass the length check.
         assert result.passed is False
 
 
+class TestMaxScanBytes:
+    """Tests for --max-scan-bytes validation."""
+
+    @pytest.mark.parametrize("value", ["0", "-5"])
+    def test_rejects_non_positive(self, value, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--max-scan-bytes", value])
+        assert exc_info.value.code == 2
+        assert "must be greater than 0" in capsys.readouterr().err
+
+
 class TestResolveDocsPath:
     """Tests for resolve_docs_path function."""
 
@@ -494,3 +508,84 @@ class TestResolveDocsPath:
         monkeypatch.chdir(tmp_path)
         result = resolve_docs_path(None)
         assert result == Path(".")
+
+
+
+class TestNdjsonOutput:
+    """Tests for streaming NDJSON output."""
+
+    @pytest.fixture
+    def good_repo(self, tmp_path):
+        """Create a valid repo structure."""
+        docs_path = tmp_path / "Decision-Templates"
+        docs_path.mkdir()
+        (docs_path / "V11-Cryptography-Strategy.md").write_text(
+            "# Cryptography Strategy\n\n" + "Argon2id for passwords, AES-256-GCM at rest.\n" * 5,
+            encoding="utf-8",
+        )
+        return docs_path
+
+    @pytest.fixture
+    def manifest(self, tmp_path, monkeypatch):
+        """Evidence manifest with one passing and one failing check."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "SECURITY.md").write_text("# Security", encoding="utf-8")
+        manifest = tmp_path / "evidence.yml"
+        manifest.write_text(
+            "requirements:\n"
+            "  V1.1.1:\n"
+            "    checks:\n"
+            "      - type: file_exists\n"
+            "        path: SECURITY.md\n"
+            "      - type: file_exists\n"
+            "        path: missing.md\n",
+            encoding="utf-8",
+        )
+        return manifest
+
+    def test_stream_ndjson_lines(self, good_repo, manifest):
+        """One line per document and evidence result, then a summary."""
+        out = io.StringIO()
+        gate = ComplianceGate(docs_path=good_repo, level=2)
+        result = stream_ndjson(gate, out, manifest)
+
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [line["record"] for line in lines] == ["document", "evidence", "evidence", "summary"]
+        assert lines[0]["document"] == "V11-Cryptography-Strategy.md"
+        assert lines[0]["is_valid"] is True
+        assert lines[1]["type"] == "file_exists"
+        assert lines[1]["target"] == "SECURITY.md"
+        assert lines[1]["passed"] is True
+        assert lines[2]["passed"] is False
+        assert lines[3]["evidence"] == {"checked": 2, "passed": 1}
+        assert lines[3]["passed"] is False
+        assert result.evidence_results == []
+
+    def test_ndjson_matches_json_results(self, good_repo, manifest, capsys):
+        """NDJSON records carry the same fields as the --format json results."""
+        main(["--docs-path", str(good_repo), "--evidence-manifest", str(manifest),
+              "--format", "json"])
+        full = json.loads(capsys.readouterr().out)
+
+        exit_code = main(["--docs-path", str(good_repo), "--evidence-manifest", str(manifest),
+                          "--format", "ndjson"])
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+        assert exit_code == 1
+
+        def strip(record):
+            return {k: v for k, v in record.items() if k != "record"}
+
+        assert [strip(r) for r in lines if r["record"] == "document"] == full["documents"]["results"]
+        assert [strip(r) for r in lines if r["record"] == "evidence"] == full["evidence"]["results"]
+        assert lines[-1]["passed"] == full["passed"]
+
+    def test_ndjson_missing_docs_path(self, tmp_path):
+        """A missing docs path still produces a summary line."""
+        out = io.StringIO()
+        gate = ComplianceGate(docs_path=tmp_path / "nope", level=2)
+        result = stream_ndjson(gate, out)
+        summary = json.loads(out.getvalue())
+        assert summary["record"] == "summary"
+        assert result.passed is False
+        assert "Documents path not found" in summary["errors"][0]
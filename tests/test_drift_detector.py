@@ -3,11 +3,18 @@
 Unit tests for the ASVS Drift Detector tool.
 """
 
+import io
 import json
-import pytest
+import threading
+import tracemalloc
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
+
+from tools import drift_detector
 from tools.drift_detector import (
     Requirement,
     DriftResult,
@@ -15,9 +22,12 @@ from tools.drift_detector import (
     DriftDetector,
     DefaultFileReader,
     DefaultUrlFetcher,
+    CachingUrlFetcher,
     TextFormatter,
     JsonFormatter,
+    MatrixTextFormatter,
     create_parser,
+    page_result,
     main,
     UPSTREAM_ASVS_URL,
     DEFAULT_LOCAL_PATH,
@@ -252,6 +262,137 @@ class TestRequirementParser:
         assert requirements[0].description == "Test desc"
 
 
+@pytest.fixture
+def nested_upstream_json():
+    """Nested OWASP format, with one chapter listing items before its name."""
+    return json.dumps({
+        "Name": "Application Security Verification Standard",
+        "Version": "5.0.0",
+        "Requirements": "ignored",
+        "requirements": [
+            {
+                "Shortcode": "V1",
+                "Ordinal": 1,
+                "Name": "Encoding",
+                "Items": [
+                    {
+                        "Shortcode": "V1.2",
+                        "Name": "Injection",
+                        "Items": [
+                            {"Shortcode": "V1.2.1", "Description": "Encode output.",
+                             "L1": {"Required": "1"}},
+                            {"Shortcode": "V1.2.2", "Description": "Encode URLs.", "L": "2"},
+                            "not-a-requirement",
+                        ],
+                    },
+                ],
+            },
+            {
+                "Items": [
+                    {
+                        "Items": [{"Shortcode": "V2.1.1", "Description": "Validate input.", "L": "1"}],
+                        "Shortcode": "V2.1",
+                        "Name": "Input",
+                    },
+                ],
+                "Shortcode": "V2",
+                "Name": "Validation",
+            },
+        ],
+    })
+
+
+class TestRequirementParserStreaming:
+    """Tests for RequirementParser.iter_parse."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 16, 65536])
+    def test_flat_matches_parse(self, parser, sample_local_json, chunk_size):
+        expected = [asdict(r) for r in parser.parse(sample_local_json)]
+        streamed = [asdict(r) for r in parser.iter_parse(io.StringIO(sample_local_json), chunk_size)]
+        assert streamed == expected
+
+    @pytest.mark.parametrize("chunk_size", [1, 16, 65536])
+    def test_nested_matches_parse(self, parser, nested_upstream_json, chunk_size):
+        expected = [asdict(r) for r in parser.parse(nested_upstream_json)]
+        streamed = [asdict(r) for r in parser.iter_parse(io.StringIO(nested_upstream_json), chunk_size)]
+        assert streamed == expected
+        assert [r["req_id"] for r in streamed] == ["V1.2.1", "V1.2.2", "V2.1.1"]
+        assert streamed[2]["chapter_name"] == "Validation"
+        assert streamed[2]["section_id"] == "V2.1"
+
+    def test_wrapped_flat_matches_parse(self, parser, sample_local_json):
+        content = json.dumps({"requirements": json.loads(sample_local_json)})
+        expected = [asdict(r) for r in parser.parse(content)]
+        assert [asdict(r) for r in parser.iter_parse(io.StringIO(content))] == expected
+
+    def test_bundled_catalog_matches_parse(self, parser):
+        path = Path(__file__).parent.parent / DEFAULT_LOCAL_PATH
+        content = path.read_text(encoding="utf-8")
+        expected = [asdict(r) for r in parser.parse(content)]
+        with path.open("rb") as handle:
+            assert [asdict(r) for r in parser.iter_parse(handle, 4096)] == expected
+
+    @pytest.mark.parametrize("chunk_size", [1, 65536])
+    def test_single_chapter_section_without_items_matches_parse(self, parser, chunk_size):
+        content = json.dumps({
+            "Shortcode": "V1", "Name": "Encoding",
+            "Items": [
+                {"Shortcode": "V1.1", "Name": "Architecture"},
+                {"Shortcode": "V1.2", "Name": "Injection",
+                 "Items": [{"Shortcode": "V1.2.1", "Description": "Verify.", "L": "1"}]},
+            ],
+        })
+        expected = [asdict(r) for r in parser.parse(content)]
+        streamed = [asdict(r) for r in parser.iter_parse(io.StringIO(content), chunk_size)]
+        assert streamed == expected
+        assert [r["req_id"] for r in streamed] == ["V1.2.1"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 65536])
+    def test_chapter_with_empty_items_matches_parse(self, parser, chunk_size):
+        content = json.dumps({"requirements": [{"Shortcode": "V1", "Name": "Encoding", "Items": []}]})
+        expected = [asdict(r) for r in parser.parse(content)]
+        streamed = [asdict(r) for r in parser.iter_parse(io.StringIO(content), chunk_size)]
+        assert streamed == expected
+        assert [r["req_id"] for r in streamed] == ["V1"]
+
+    def test_chapter_fallback_dropped_once_nested_requirements_appear(self, parser, nested_upstream_json):
+        document = json.loads(nested_upstream_json)
+        document["requirements"].insert(0, {"Shortcode": "V0", "Name": "Empty", "Items": []})
+        content = json.dumps(document)
+        expected = [asdict(r) for r in parser.parse(content)]
+        assert [asdict(r) for r in parser.iter_parse(io.StringIO(content))] == expected
+        assert "V0" not in [r["req_id"] for r in expected]
+
+    def test_unexpected_type(self, parser):
+        with pytest.raises(ValueError, match="Unexpected JSON structure"):
+            list(parser.iter_parse(io.StringIO('"just a string"')))
+
+    def test_large_catalog_bounded_memory(self, parser, tmp_path):
+        """Peak memory stays far below the size of the document."""
+        path = tmp_path / "merged.json"
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write("[")
+            for i in range(30000):
+                if i:
+                    handle.write(",")
+                handle.write(json.dumps({
+                    "chapter_id": f"V{i % 17}", "chapter_name": "Chapter",
+                    "section_id": f"V{i % 17}.1", "section_name": "Section",
+                    "req_id": f"X{i}", "req_description": "Verify that " + "x" * 200, "L": "2",
+                }))
+            handle.write("]")
+        size = path.stat().st_size
+
+        tracemalloc.start()
+        with path.open("rb") as handle:
+            count = sum(1 for _ in parser.iter_parse(handle))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 30000
+        assert peak < size / 10
+
+
 # --- DriftDetector Tests ---
 
 class TestDriftDetector:
@@ -367,6 +508,43 @@ class TestDriftDetector:
         assert result.has_drift
         assert len(result.modified) == 1
 
+    def test_compare_detects_moves(self, mock_file_reader, mock_url_fetcher, parser):
+        """Renumbered requirements are reported as moves, not added/removed."""
+        detector = DriftDetector(mock_file_reader, mock_url_fetcher, parser)
+
+        local = [
+            Requirement(req_id="V2.1.1", description="Verify that passwords are at least 12 characters.", level="1"),
+            Requirement(req_id="V3.4.1", description="Verify that session cookies have the Secure attribute set.", level="1"),
+            Requirement(req_id="V9.9.9", description="Verify something that was dropped entirely.", level="1"),
+        ]
+        upstream = [
+            Requirement(req_id="V6.2.1", description="Verify that passwords are at least 12 characters", level="1"),
+            Requirement(req_id="V3.3.1", description="Verify that session cookies have the 'Secure' attribute set and are rotated.", level="1"),
+            Requirement(req_id="V1.1.1", description="Verify a brand new control.", level="1"),
+        ]
+
+        result = detector.compare(local, upstream)
+
+        assert [(a.req_id, b.req_id) for a, b, _ in result.moved] == [
+            ("V2.1.1", "V6.2.1"),
+            ("V3.4.1", "V3.3.1"),
+        ]
+        assert result.moved[0][2] == 1.0
+        assert [r.req_id for r in result.added] == ["V1.1.1"]
+        assert [r.req_id for r in result.removed] == ["V9.9.9"]
+        assert result.summary == "1 added, 1 removed, 2 moved"
+
+    def test_compare_move_detection_disabled(self, mock_file_reader, mock_url_fetcher, parser):
+        detector = DriftDetector(mock_file_reader, mock_url_fetcher, parser, move_threshold=None)
+
+        result = detector.compare(
+            [Requirement(req_id="V2.1.1", description="Same text.", level="1")],
+            [Requirement(req_id="V6.2.1", description="Same text.", level="1")],
+        )
+
+        assert result.moved == []
+        assert len(result.added) == 1 and len(result.removed) == 1
+
     def test_detect_with_upstream_content(
         self, mock_file_reader, mock_url_fetcher, parser, sample_local_json, sample_upstream_json
     ):
@@ -388,6 +566,131 @@ class TestDriftDetector:
 
 # --- Formatter Tests ---
 
+class TestStreamingDrift:
+    """Tests for DriftDetector.detect_streaming."""
+
+    @pytest.fixture
+    def files(self, tmp_path, sample_local_json, sample_upstream_json):
+        local = tmp_path / "local.json"
+        local.write_text(sample_local_json, encoding="utf-8")
+        upstream = tmp_path / "upstream.json"
+        upstream.write_text(sample_upstream_json, encoding="utf-8")
+        return local, upstream
+
+    def test_matches_detect(self, files, parser, mock_url_fetcher):
+        local, upstream = files
+        detector = DriftDetector(DefaultFileReader(), mock_url_fetcher, parser)
+
+        expected = detector.detect(local, upstream_content=upstream.read_text(encoding="utf-8"))
+        result = detector.detect_streaming(local, upstream_path=upstream)
+
+        assert [r.req_id for r in result.added] == ["V1.2.3"]
+        assert [r.req_id for r in result.removed] == ["V1.2.2"]
+        assert [(a.description, b.description) for a, b in result.modified] == [
+            (a.description, b.description) for a, b in expected.modified
+        ]
+        assert result.added == expected.added
+        assert result.removed == expected.removed
+        assert (result.local_count, result.upstream_count) == (3, 3)
+        assert (result.local_hash, result.upstream_hash) == (expected.local_hash, expected.upstream_hash)
+
+    def test_upstream_from_url(self, files, parser, mock_url_fetcher, sample_upstream_json):
+        local, _ = files
+        mock_url_fetcher.fetch.return_value = sample_upstream_json
+        detector = DriftDetector(DefaultFileReader(), mock_url_fetcher, parser)
+
+        result = detector.detect_streaming(local, upstream_url="http://test.url")
+
+        mock_url_fetcher.fetch.assert_called_once_with("http://test.url")
+        assert result.summary == "1 added, 1 removed, 1 modified"
+
+    def test_level_only_change(self, tmp_path, parser, mock_url_fetcher):
+        local = tmp_path / "local.json"
+        local.write_text(json.dumps([{"req_id": "V1", "req_description": "d", "L": "1"}]))
+        upstream = tmp_path / "upstream.json"
+        upstream.write_text(json.dumps([{"req_id": "V1", "req_description": "d ", "L": "2"}]))
+        detector = DriftDetector(DefaultFileReader(), mock_url_fetcher, parser)
+
+        result = detector.detect_streaming(local, upstream_path=upstream)
+        assert [(a.level, b.level) for a, b in result.modified] == [("1", "2")]
+
+    def test_main_stream(self, files, capsys):
+        local, upstream = files
+        exit_code = main(["--local", str(local), "--upstream-file", str(upstream),
+                          "--stream", "--format", "json"])
+        output = json.loads(capsys.readouterr().out)
+        assert exit_code == 1
+        assert [r["id"] for r in output["added"]] == ["V1.2.3"]
+
+    def test_main_stream_offline(self, files):
+        local, _ = files
+        assert main(["--local", str(local), "--offline", "--stream"]) == 0
+
+
+class TestDriftMatrix:
+    """Tests for DriftDetector.matrix and --matrix."""
+
+    @pytest.fixture
+    def catalogs(self, tmp_path, sample_local_json, sample_upstream_json):
+        base = tmp_path / "base.json"
+        base.write_text(sample_local_json, encoding="utf-8")
+        fork = tmp_path / "fork.json"
+        fork.write_text(sample_upstream_json, encoding="utf-8")
+        subset = tmp_path / "subset.json"
+        subset.write_text(json.dumps(json.loads(sample_local_json)[:1]), encoding="utf-8")
+        return [base, fork, subset]
+
+    def test_cells_match_compare(self, catalogs, parser, mock_url_fetcher):
+        detector = DriftDetector(DefaultFileReader(), mock_url_fetcher, parser, move_threshold=None)
+        matrix = detector.matrix(catalogs)
+
+        assert [c.label for c in matrix.catalogs] == ["base", "fork", "subset"]
+        assert len(matrix.cells) == 6
+        for (i, j), cell in matrix.cells.items():
+            local, _ = detector.load_local(catalogs[i])
+            upstream, _ = detector.load_local(catalogs[j])
+            expected = detector.compare(local, upstream)
+            assert (cell.added, cell.removed, cell.modified) == (
+                len(expected.added), len(expected.removed), len(expected.modified)
+            )
+
+    def test_each_catalog_parsed_once(self, catalogs, parser, mock_url_fetcher):
+        reader = Mock(wraps=DefaultFileReader())
+        DriftDetector(reader, mock_url_fetcher, parser).matrix(catalogs)
+        assert reader.read.call_count == 3
+
+    def test_duplicate_stems_use_paths(self, tmp_path, sample_local_json, parser, mock_url_fetcher):
+        paths = []
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+            paths.append(tmp_path / name / "asvs.json")
+            paths[-1].write_text(sample_local_json, encoding="utf-8")
+        matrix = DriftDetector(DefaultFileReader(), mock_url_fetcher, parser).matrix(paths)
+        assert [c.label for c in matrix.catalogs] == [str(p) for p in paths]
+        assert not matrix.cells[(0, 1)].has_drift
+
+    def test_text_format(self, catalogs, parser, mock_url_fetcher):
+        matrix = DriftDetector(DefaultFileReader(), mock_url_fetcher, parser).matrix(catalogs)
+        text = MatrixTextFormatter().format(matrix)
+        assert "[1] base: 3 requirements" in text
+        assert "+1 -1 ~1" in text
+        assert "+0 -2 ~0" in text
+
+    def test_main_matrix_json(self, catalogs, capsys):
+        exit_code = main(["--matrix", *map(str, catalogs), "--format", "json"])
+        data = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 0
+        assert [c["label"] for c in data["catalogs"]] == ["base", "fork", "subset"]
+        pair = next(p for p in data["pairs"] if p["from"] == "base" and p["to"] == "subset")
+        assert pair == {"from": "base", "to": "subset", "added": 0, "removed": 2,
+                        "modified": 0, "unchanged": 1}
+
+    def test_main_matrix_needs_two(self, catalogs, capsys):
+        assert main(["--matrix", str(catalogs[0])]) == 1
+        assert "at least two" in capsys.readouterr().err
+
+
 class TestTextFormatter:
     """Tests for the TextFormatter class."""
 
@@ -428,6 +731,51 @@ class TestTextFormatter:
         assert "V1.2.2" in output
         assert "V1.2.3" in output
 
+    def test_format_modified_word_diff(self):
+        """Modified requirements show a word diff of the full text and level changes."""
+        result = DriftResult(modified=[(
+            Requirement(req_id="V1.2.3", description="Use TLS 1.2 for " + "all traffic " * 20, level="1"),
+            Requirement(req_id="V1.2.3", description="Use TLS 1.3 for " + "all traffic " * 20, level="2"),
+        )])
+
+        output = TextFormatter().format(result)
+
+        assert "Use TLS [-1.2-]{+1.3+} for all traffic" in output
+        assert output.count("all traffic") == 20
+        assert "Level: L1 -> L2" in output
+
+    def test_format_paging(self, monkeypatch):
+        """Only the requested page is rendered, and diffs only for it."""
+        result = DriftResult(
+            added=[Requirement(req_id=f"V9.1.{i}", description="Added", level="1") for i in range(3)],
+            modified=[
+                (
+                    Requirement(req_id=f"V1.1.{i}", description="Old text", level="1"),
+                    Requirement(req_id=f"V1.1.{i}", description="New text", level="1"),
+                )
+                for i in range(50)
+            ],
+        )
+        calls = []
+        original = drift_detector.word_diff
+        monkeypatch.setattr(drift_detector, "word_diff", lambda a, b: calls.append(a) or original(a, b))
+
+        output = TextFormatter().format(result, offset=2, limit=3)
+
+        assert "V9.1.2" in output and "V9.1.1" not in output
+        assert "V1.1.0:" in output and "V1.1.1:" in output and "V1.1.2:" not in output
+        assert "MODIFIED (50 requirements changed)" in output
+        assert "Showing changes 3-5 of 53." in output
+        assert "Use --offset 5 to see more." in output
+        assert len(calls) == 2
+
+    def test_page_result_past_end(self):
+        """An offset past the last change yields an empty page."""
+        result = DriftResult(added=[Requirement(req_id="V1.1.1", description="x", level="1")])
+        page = page_result(result, offset=5, limit=10)
+        assert page.added == [] and page.modified == []
+        assert "No changes at offset 5" in TextFormatter().format(result, offset=5)
+
 
 class TestJsonFormatter:
     """Tests for the JsonFormatter class."""
@@ -460,6 +808,43 @@ class TestJsonFormatter:
         assert len(data["added"]) == 1
         assert data["added"][0]["id"] == "V1.2.1"
 
+    def test_format_moved(self):
+        """Moves carry both IDs and the similarity score."""
+        result = DriftResult(moved=[(
+            Requirement(req_id="V2.1.1", description="Old", level="1"),
+            Requirement(req_id="V6.2.1", description="New", level="1"),
+            0.85,
+        )])
+
+        data = json.loads(JsonFormatter().format(result))
+        text = TextFormatter().format(result)
+
+        assert data["status"] == "drift"
+        assert data["moved"] == [{
+            "local_id": "V2.1.1",
+            "upstream_id": "V6.2.1",
+            "similarity": 0.85,
+            "local_description": "Old",
+            "upstream_description": "New",
+        }]
+        assert "V2.1.1 -> V6.2.1 (similarity: 0.85)" in text
+
+    def test_format_page_and_diff(self):
+        """Paged JSON output carries page metadata and word diffs."""
+        result = DriftResult(modified=[
+            (
+                Requirement(req_id=f"V1.1.{i}", description="Old text", level="1"),
+                Requirement(req_id=f"V1.1.{i}", description="New text", level="1"),
+            )
+            for i in range(4)
+        ])
+
+        data = json.loads(JsonFormatter().format(result, offset=1, limit=2))
+
+        assert [m["id"] for m in data["modified"]] == ["V1.1.1", "V1.1.2"]
+        assert data["modified"][0]["diff"] == "[-Old-]{+New+} text"
+        assert data["page"] == {"offset": 1, "limit": 2, "total": 4}
+
 
 # --- CLI Tests ---
 
@@ -494,6 +879,13 @@ class TestCLI:
         assert args.format == "json"
         assert args.offline is True
 
+    @pytest.mark.parametrize("value", ["-1", "1.01", "nan"])
+    def test_move_threshold_out_of_range(self, value):
+        """Test --move-threshold is rejected outside [0, 1]."""
+        with pytest.raises(SystemExit) as exc_info:
+            create_parser().parse_args(["--move-threshold", value])
+        assert exc_info.value.code == 2
+
     def test_main_file_not_found(self, tmp_path):
         """Test main with non-existent file."""
         result = main(["--local", str(tmp_path / "nonexistent.json")])
@@ -552,6 +944,86 @@ class TestDefaultUrlFetcher:
             fetcher.fetch("http://invalid.nonexistent.url.test/asvs.json")
 
 
+# --- CachingUrlFetcher Tests ---
+
+@pytest.fixture
+def upstream_server():
+    """Local HTTP server honouring If-None-Match, recording each request."""
+    state = {"body": b'[{"req_id": "V1.1.1"}]', "etag": '"v1"', "requests": []}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"].append(dict(self.headers))
+            if self.headers.get("If-None-Match") == state["etag"]:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", state["etag"])
+            self.send_header("Last-Modified", "Wed, 21 Oct 2025 07:28:00 GMT")
+            self.send_header("Content-Length", str(len(state["body"])))
+            self.end_headers()
+            self.wfile.write(state["body"])
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/asvs.json"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+class TestCachingUrlFetcher:
+    """Tests for the CachingUrlFetcher class."""
+
+    def test_revalidates_with_etag(self, upstream_server, tmp_path):
+        """Second fetch sends validators and reuses the body on 304."""
+        fetcher = CachingUrlFetcher(cache_dir=tmp_path)
+        first = fetcher.fetch(upstream_server["url"])
+        assert fetcher.last_status == "downloaded"
+
+        second = CachingUrlFetcher(cache_dir=tmp_path).fetch(upstream_server["url"])
+        assert second == first
+        sent = upstream_server["requests"][1]
+        assert sent["If-None-Match"] == '"v1"'
+        assert sent["If-Modified-Since"] == "Wed, 21 Oct 2025 07:28:00 GMT"
+
+    def test_not_modified_status(self, upstream_server, tmp_path):
+        fetcher = CachingUrlFetcher(cache_dir=tmp_path)
+        fetcher.fetch(upstream_server["url"])
+        fetcher.fetch(upstream_server["url"])
+        assert fetcher.last_status == "not-modified"
+
+    def test_changed_upstream_is_downloaded(self, upstream_server, tmp_path):
+        fetcher = CachingUrlFetcher(cache_dir=tmp_path)
+        fetcher.fetch(upstream_server["url"])
+        upstream_server["body"] = b'[{"req_id": "V2.1.1"}]'
+        upstream_server["etag"] = '"v2"'
+
+        assert "V2.1.1" in fetcher.fetch(upstream_server["url"])
+        assert fetcher.last_status == "downloaded"
+
+    def test_max_age_skips_network(self, upstream_server, tmp_path):
+        fetcher = CachingUrlFetcher(cache_dir=tmp_path, max_age=3600)
+        fetcher.fetch(upstream_server["url"])
+        fetcher.fetch(upstream_server["url"])
+        assert fetcher.last_status == "fresh"
+        assert len(upstream_server["requests"]) == 1
+
+    def test_connection_error(self, tmp_path):
+        fetcher = CachingUrlFetcher(cache_dir=tmp_path, timeout=1)
+        with pytest.raises(ConnectionError):
+            fetcher.fetch("http://invalid.nonexistent.url.test/asvs.json")
+
+    def test_default_cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ASVS_CACHE_DIR", str(tmp_path))
+        assert CachingUrlFetcher().cache_dir == tmp_path / "http-cache"
+
+
 # --- DefaultFileReader Tests ---
 
 class TestDefaultFileReader:
@@ -1,8 +1,13 @@
 # File: tests/test_evidence_verifier.py
 
+import threading
+import time
+
 import pytest
 from pathlib import Path
-from tools.compliance_gate import EvidenceVerifier
+from tools import compliance_gate
+from tools.compliance_gate import ContentScanner, EvidenceVerifier
+from tools.tree_walker import IgnoreRules
 
 class TestEvidenceVerifier:
     
@@ -59,4 +64,338 @@ class TestEvidenceVerifier:
         
         assert len(results) == 2
         assert all(r.passed for r in results)
-        assert results[0].requirement_id == "V1.2.3"
\ No newline at end of file
+        assert results[0].requirement_id == "V1.2.3"
+
+    def test_check_content_match_skips_binary(self, workspace):
+        """Binary files are detected from their first block and skipped."""
+        (workspace / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00helmet")
+        verifier = EvidenceVerifier(workspace)
+        passed, msg = verifier.check_file_contains("logo.png", "helmet")
+        assert passed is False
+        assert "Skipped binary file" in msg
+
+    def test_check_content_match_reports_truncation(self, workspace):
+        """Only max_scan_bytes are scanned and the details say so."""
+        (workspace / "bundle.js").write_text("a" * 500 + "helmet()", encoding="utf-8")
+        verifier = EvidenceVerifier(workspace, max_scan_bytes=100)
+        passed, msg = verifier.check_file_contains("bundle.js", r"helmet\(\)")
+        assert passed is False
+        assert "truncated: scanned first 100 of 508 bytes" in msg
+
+    def test_check_content_match_large_file_uses_mmap(self, workspace, monkeypatch):
+        """Files above the mmap threshold are searched window by window."""
+        monkeypatch.setattr(compliance_gate, "MMAP_THRESHOLD_BYTES", 64)
+        (workspace / "vendor.js").write_text(
+            "// header\n" + "x = 1;\n" * 100 + "app.use(helmet());\n", encoding="utf-8"
+        )
+        verifier = EvidenceVerifier(workspace)
+        passed, msg = verifier.check_file_contains("vendor.js", r"^app\.use\(helmet\(\)\);$")
+        assert passed is True
+        assert "truncated" not in msg
+
+    def test_check_content_match_invalid_utf8(self, workspace):
+        """Undecodable text is reported as a read error, not raised."""
+        (workspace / "latin1.txt").write_bytes("caf\xe9".encode("latin-1"))
+        verifier = EvidenceVerifier(workspace)
+        passed, msg = verifier.check_file_contains("latin1.txt", "caf")
+        assert passed is False
+        assert "Error reading latin1.txt" in msg
+
+
+class TestContentScanner:
+
+    def test_scan_empty_file(self, tmp_path):
+        target = tmp_path / "empty.txt"
+        target.write_bytes(b"")
+        scan = ContentScanner("anything").scan(target)
+        assert scan.matched is False
+        assert scan.truncated is False
+
+    def test_scan_truncated_multibyte_boundary(self, tmp_path):
+        """A limit that splits a UTF-8 sequence does not cause a decode error."""
+        target = tmp_path / "utf8.txt"
+        target.write_text("bcrypt é argon2", encoding="utf-8")
+        scan = ContentScanner("bcrypt", max_scan_bytes=8).scan(target)
+        assert scan.matched is True
+        assert scan.truncated is True
+
+
+    @pytest.mark.parametrize("pattern", [r"^app\.use\(helmet\(\)\)$", "(?i)CAFÉ"])
+    def test_scan_large_file_same_semantics_as_small(self, tmp_path, pattern):
+        """Mapped files get the same newline and Unicode handling as small ones."""
+        body = "x = 1;\r\n" * 10 + "app.use(helmet())\r\nconst name = 'café';\r\n"
+        small = tmp_path / "small.js"
+        small.write_bytes(body.encode("utf-8"))
+        large = tmp_path / "large.js"
+        filler = "// padding\r\n" * (compliance_gate.MMAP_THRESHOLD_BYTES // 12 + 1)
+        large.write_bytes((filler + body).encode("utf-8"))
+        assert large.stat().st_size > compliance_gate.MMAP_THRESHOLD_BYTES
+
+        assert ContentScanner(pattern).scan(small).matched is True
+        assert ContentScanner(pattern).scan(large).matched is True
+
+    @pytest.mark.parametrize("overlap", [64 * 1024, 10])
+    def test_scan_windows_match_across_boundaries(self, tmp_path, monkeypatch, overlap):
+        """Matches, CRLF pairs and anchors are handled across window edges."""
+        monkeypatch.setattr(compliance_gate, "MMAP_THRESHOLD_BYTES", 16)
+        monkeypatch.setattr(compliance_gate, "SCAN_OVERLAP_CHARS", overlap)
+        monkeypatch.setattr(compliance_gate, "SCAN_WINDOW_BYTES", 7)
+        target = tmp_path / "split.txt"
+        target.write_bytes("header\r\nabcdef\r\nbcrypt é\r\n".encode("utf-8"))
+
+        assert ContentScanner(r"^bcrypt é$").scan(target).matched is True
+        assert ContentScanner(r"^abcdef$").scan(target).matched is True
+        assert ContentScanner(r"^abc$").scan(target).matched is False
+        assert ContentScanner(r"^cdef").scan(target).matched is False
+        assert ContentScanner(r"\n\n").scan(target).matched is False
+
+
+class TestTreeContentMatch:
+
+    @pytest.fixture
+    def tree(self, tmp_path):
+        """A small source tree with vendored, ignored and binary files."""
+        (tmp_path / "src" / "auth").mkdir(parents=True)
+        (tmp_path / "src" / "app.py").write_text("import flask\n", encoding="utf-8")
+        (tmp_path / "src" / "auth" / "hasher.py").write_text(
+            "from argon2 import PasswordHasher\n", encoding="utf-8"
+        )
+        (tmp_path / "src" / "node_modules" / "bcrypt").mkdir(parents=True)
+        (tmp_path / "src" / "node_modules" / "bcrypt" / "index.js").write_text(
+            "module.exports = 'bcrypt'", encoding="utf-8"
+        )
+        (tmp_path / "src" / "generated").mkdir()
+        (tmp_path / "src" / "generated" / "schema.py").write_text("bcrypt", encoding="utf-8")
+        (tmp_path / "src" / "blob.bin").write_bytes(b"\x00bcrypt")
+        (tmp_path / ".gitignore").write_text("# build output\nsrc/generated/\n", encoding="utf-8")
+        return tmp_path
+
+    def test_tree_match_found(self, tree):
+        verifier = EvidenceVerifier(tree)
+        passed, msg = verifier.check_tree_contains("src", "argon2|bcrypt")
+        assert passed is True
+        assert "src/auth/hasher.py" in msg
+
+    def test_tree_match_skips_vendored_ignored_and_binary(self, tree):
+        verifier = EvidenceVerifier(tree)
+        passed, msg = verifier.check_tree_contains("src", "bcrypt")
+        assert passed is False
+        assert "2 files scanned, 1 skipped" in msg
+
+    def test_tree_match_exclude(self, tree):
+        verifier = EvidenceVerifier(tree)
+        passed, _ = verifier.check_tree_contains("src", "argon2", exclude=["auth/"])
+        assert passed is False
+
+    def test_tree_match_exclude_as_string(self, tree):
+        """A single exclude pattern given as a str is one pattern."""
+        verifier = EvidenceVerifier(tree)
+        passed, _ = verifier.check_tree_contains("src", "argon2", exclude="auth/")
+        assert passed is False
+
+    def test_tree_match_anchored_glob_stays_in_one_directory(self, tree):
+        """'src/*' ignores entries directly under src/, not nested ones."""
+        verifier = EvidenceVerifier(tree)
+        passed, msg = verifier.check_tree_contains("src", "argon2", exclude=["src/*.py"])
+        assert passed is True
+        assert "src/auth/hasher.py" in msg
+
+    def test_tree_match_missing_directory(self, tree):
+        verifier = EvidenceVerifier(tree)
+        passed, msg = verifier.check_tree_contains("lib", "argon2")
+        assert passed is False
+        assert "Directory not found" in msg
+
+    def test_tree_match_invalid_pattern(self, tree):
+        verifier = EvidenceVerifier(tree)
+        passed, msg = verifier.check_tree_contains("src", "(")
+        assert passed is False
+        assert "Invalid pattern" in msg
+
+    def test_tree_match_stops_at_first_hit(self, tmp_path, monkeypatch):
+        """Workers stop scanning once any file matches."""
+        for i in range(50):
+            (tmp_path / f"f{i:02d}.txt").write_text("bcrypt", encoding="utf-8")
+        monkeypatch.setattr(compliance_gate, "TREE_SCAN_BATCH_SIZE", 1)
+        calls = []
+        original = ContentScanner.scan
+
+        def counting_scan(self, path):
+            calls.append(path)
+            return original(self, path)
+
+        monkeypatch.setattr(ContentScanner, "scan", counting_scan)
+        verifier = EvidenceVerifier(tmp_path, workers=1)
+        passed, msg = verifier.check_tree_contains(".", "bcrypt")
+        assert passed is True
+        assert len(calls) == 1
+
+    def test_tree_match_reports_worker_errors(self, tree, monkeypatch):
+        """A failing worker fails the check instead of reporting NOT found."""
+        def broken_scan(self, path):
+            raise RuntimeError("scanner crashed")
+
+        monkeypatch.setattr(ContentScanner, "scan", broken_scan)
+        verifier = EvidenceVerifier(tree)
+        passed, msg = verifier.check_tree_contains("src", "argon2")
+        assert passed is False
+        assert "Error scanning src: scanner crashed" in msg
+        assert "NOT found" not in msg
+
+    def test_tree_match_bounds_batches_in_flight(self, tmp_path, monkeypatch):
+        """The walk waits for workers instead of queueing every batch."""
+        for i in range(40):
+            (tmp_path / f"f{i:02d}.txt").write_text("nothing", encoding="utf-8")
+        monkeypatch.setattr(compliance_gate, "TREE_SCAN_BATCH_SIZE", 1)
+        pending = {"now": 0, "max": 0}
+        lock = threading.Lock()
+        original = compliance_gate.ThreadPoolExecutor
+
+        class TrackingPool(original):
+            def submit(self, fn, *args):
+                with lock:
+                    pending["now"] += 1
+                    pending["max"] = max(pending["max"], pending["now"])
+                future = super().submit(fn, *args)
+                future.add_done_callback(lambda _: self._done())
+                return future
+
+            def _done(self):
+                with lock:
+                    pending["now"] -= 1
+
+        def slow_scan(self, path):
+            time.sleep(0.002)
+            return compliance_gate.FileScan(size=1, scanned=1)
+
+        monkeypatch.setattr(compliance_gate, "ThreadPoolExecutor", TrackingPool)
+        monkeypatch.setattr(ContentScanner, "scan", slow_scan)
+        verifier = EvidenceVerifier(tmp_path, workers=2)
+        passed, msg = verifier.check_tree_contains(".", "bcrypt")
+        assert passed is False
+        assert "40 files scanned" in msg
+        assert pending["max"] <= 4
+
+    def test_verify_requirement_tree_content_match(self, tree):
+        verifier = EvidenceVerifier(tree)
+        results = verifier.verify_requirement("V11.4.2", [
+            {"type": "tree_content_match", "path": "src", "pattern": "argon2"},
+        ])
+        assert results[0].passed is True
+        assert results[0].check_type == "tree_content_match"
+
+
+class TestSymbolChecks:
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "security.py").write_text(
+            "from flask_talisman import Talisman\n\nclass CSPMiddleware:\n    pass\n",
+            encoding="utf-8",
+        )
+        (tmp_path / "src" / "app.js").write_text(
+            "const helmet = require('helmet');\n", encoding="utf-8"
+        )
+        return tmp_path
+
+    def test_symbol_exists(self, project):
+        verifier = EvidenceVerifier(project)
+        passed, msg = verifier.check_symbol_exists("CSPMiddleware", kind="class")
+        assert passed is True
+        assert "src/security.py:3" in msg
+
+    def test_symbol_missing(self, project):
+        verifier = EvidenceVerifier(project)
+        passed, msg = verifier.check_symbol_exists("CSPMiddleware", kind="function")
+        assert passed is False
+        assert "NOT defined" in msg
+
+    def test_import_exists(self, project):
+        verifier = EvidenceVerifier(project)
+        assert verifier.check_import_exists("helmet")[0] is True
+        assert verifier.check_import_exists("flask_talisman", "src")[0] is True
+        assert verifier.check_import_exists("csurf")[0] is False
+
+    def test_verify_requirement_symbol_checks(self, project):
+        verifier = EvidenceVerifier(project)
+        results = verifier.verify_requirement("V3.4.3", [
+            {"type": "symbol_exists", "symbol": "*Middleware"},
+            {"type": "import_exists", "module": "helmet", "path": "src"},
+        ])
+        assert [r.passed for r in results] == [True, True]
+        assert [r.target for r in results] == ["*Middleware", "helmet"]
+
+
+class TestDependencyPresent:
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "package-lock.json").write_text(
+            '{"lockfileVersion": 3, "packages": {"node_modules/helmet": {"version": "7.1.0"}}}',
+            encoding="utf-8",
+        )
+        (tmp_path / "requirements.txt").write_text(
+            "argon2-cffi==21.3.0\nbcrypt\n", encoding="utf-8"
+        )
+        return tmp_path
+
+    def test_dependency_present(self, project):
+        verifier = EvidenceVerifier(project)
+        passed, msg = verifier.check_dependency_present("helmet")
+        assert passed is True
+        assert "7.1.0" in msg
+
+    def test_dependency_min_version(self, project):
+        verifier = EvidenceVerifier(project)
+        assert verifier.check_dependency_present("argon2_cffi", "21.0")[0] is True
+        passed, msg = verifier.check_dependency_present("helmet", "8.0.0")
+        assert passed is False
+        assert "below minimum 8.0.0" in msg
+
+    def test_dependency_unpinned_fails_min_version(self, project):
+        verifier = EvidenceVerifier(project)
+        assert verifier.check_dependency_present("bcrypt")[0] is True
+        passed, msg = verifier.check_dependency_present("bcrypt", "4.0")
+        assert passed is False
+        assert "unpinned" in msg
+
+    def test_dependency_missing(self, project):
+        verifier = EvidenceVerifier(project)
+        passed, msg = verifier.check_dependency_present("django-csp")
+        assert passed is False
+        assert "NOT found in 2 lockfile(s)" in msg
+
+    def test_verify_requirement_dependency_present(self, project):
+        verifier = EvidenceVerifier(project)
+        results = verifier.verify_requirement("V11.4.2", [
+            {"type": "dependency_present", "package": "argon2-cffi", "min_version": 21},
+            {"type": "dependency_present", "package": "helmet", "ecosystem": "npm"},
+        ])
+        assert [r.passed for r in results] == [True, True]
+        assert results[0].target == "argon2-cffi"
+
+
+class TestIgnoreRules:
+
+    @pytest.mark.parametrize("rel_path, is_dir, ignored", [
+        ("build/app.js", False, True),
+        ("build/js/app.js", False, False),
+        ("build/js", True, True),
+        ("docs/tmp", True, True),
+        ("docs/api/v1/tmp", True, True),
+        ("lib/app.min.js", False, True),
+        ("out", True, True),
+        ("src/out", True, False),
+        ("out", False, False),
+    ])
+    def test_matches(self, rel_path, is_dir, ignored):
+        rules = IgnoreRules(["# comment", "", "build/*", "docs/**/tmp", "*.min.js", "/out/", "!keep"])
+        assert rules.matches(rel_path, is_dir) is ignored
+
+    def test_from_root_accepts_single_pattern(self, tmp_path):
+        (tmp_path / ".gitignore").write_text("*.log\n", encoding="utf-8")
+        rules = IgnoreRules.from_root(tmp_path, "auth/")
+        assert rules.matches("src/auth", True)
+        assert rules.matches("debug.log", False)
+        assert not rules.matches("a", True)
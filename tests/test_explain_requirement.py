@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit tests for 'asvs explain'.
+"""
+
+import json
+
+import pytest
+
+from tools.catalog import Requirement, RequirementIndex
+from tools.explain_requirement import (
+    RequirementExplainer,
+    TextFormatter,
+    main,
+    normalize_id,
+)
+from tools.reference_index import ReferenceIndex
+
+
+@pytest.fixture
+def docs(tmp_path):
+    guidance = tmp_path / "02-Implementation-Guidance" / "Patterns"
+    guidance.mkdir(parents=True)
+    (guidance / "Sessions.md").write_text(
+        "# Sessions\n\nCovers V7.2.1.\n\n## Rotation\n\n```js\n// V7.2.1 rotate ids\n```\nAlso V7.2.1.\n",
+        encoding="utf-8",
+    )
+    templates = tmp_path / "00-Documentation-Standards" / "Decision-Templates"
+    templates.mkdir(parents=True)
+    (templates / "V7-Session-Management.md").write_text("# Session Management\n", encoding="utf-8")
+    (templates / "V6-Authentication-Strategy.md").write_text("## Passwords\n- V7.2.1 applies too\n",
+                                                              encoding="utf-8")
+    artifacts = tmp_path / "04-Documentation-Artifacts"
+    artifacts.mkdir()
+    (artifacts / "Sprint.md").write_text("| V7.2.1 | sessions |\n", encoding="utf-8")
+    (tmp_path / "notes.md").write_text("V7.2.1 outside the documentation directories\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def catalog():
+    return RequirementIndex([
+        Requirement("V7.2.1", "Verify that session tokens are rotated.", "1", "V7", "Session Management",
+                    "V7.2", "Fundamental Session Management Security"),
+    ])
+
+
+def _explain(docs, catalog, req_id):
+    index = ReferenceIndex.build(docs, paths=("00-Documentation-Standards", "02-Implementation-Guidance",
+                                              "04-Documentation-Artifacts"))
+    return RequirementExplainer(catalog, index).explain(req_id)
+
+
+class TestNormalizeId:
+
+    def test_forms(self):
+        assert normalize_id("V3.5.1") == "V3.5.1"
+        assert normalize_id(" v3.5.1") == "V3.5.1"
+        assert normalize_id("3.5.1") == "V3.5.1"
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Not a requirement ID"):
+            normalize_id("V3.5")
+
+
+class TestExplainer:
+
+    def test_sections_by_heading(self, docs, catalog):
+        result = _explain(docs, catalog, "V7.2.1")
+
+        assert result.found
+        assert [(s.path, s.heading, s.lines) for s in result.guidance] == [
+            ("02-Implementation-Guidance/Patterns/Sessions.md", "Sessions", [3]),
+            ("02-Implementation-Guidance/Patterns/Sessions.md", "Rotation", [8, 10]),
+        ]
+        assert [(s.path, s.heading) for s in result.decisions] == [
+            ("00-Documentation-Standards/Decision-Templates/V6-Authentication-Strategy.md", "Passwords"),
+        ]
+        assert result.chapter_templates == ["00-Documentation-Standards/Decision-Templates/V7-Session-Management.md"]
+        assert [s.path for s in result.other] == ["04-Documentation-Artifacts/Sprint.md"]
+
+    def test_unknown_requirement(self, docs, catalog):
+        result = _explain(docs, catalog, "V7.9.9")
+        assert not result.found
+        assert result.guidance == []
+        assert "not in the ASVS catalog" in TextFormatter().format(result)
+
+    def test_text_output(self, docs, catalog):
+        text = TextFormatter().format(_explain(docs, catalog, "V7.2.1"))
+        assert text.startswith("V7.2.1 (L1) Session Management > Fundamental Session Management Security")
+        assert "Sessions.md > Rotation  (lines 8, 10)" in text
+        assert "V7-Session-Management.md  (covers chapter V7)" in text
+
+
+class TestMain:
+
+    def test_json(self, project_root, capsys):
+        assert main(["V3.5.1", "--base-path", str(project_root), "--format", "json"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["requirement"]["level"] == "1"
+        assert {s["path"] for s in data["guidance"]} >= {
+            "02-Implementation-Guidance/Verification-Tests/V3.5.1-CSRF-Test-Examples.md",
+        }
+
+    def test_unknown_id(self, project_root, capsys):
+        assert main(["V99.1.1", "--base-path", str(project_root)]) == 1
+        assert "not in ASVS-5.0-en.json" in capsys.readouterr().err
+
+    def test_invalid_id(self, project_root, capsys):
+        assert main(["password", "--base-path", str(project_root)]) == 1
+        assert "Not a requirement ID" in capsys.readouterr().err
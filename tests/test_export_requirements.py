@@ -4,23 +4,34 @@ import csv
 import hashlib
 import io
 import json
+import mmap
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
+from tools import export_requirements
 from tools.export_requirements import (
+    ControlCsvExporter,
+    ControlJsonExporter,
     CsvExporter,
     DefaultFileReader,
+    Exporter,
+    FileWriter,
     IntegrityVerifier,
     JiraJsonExporter,
     Requirement,
     RequirementsLoader,
+    StdoutWriter,
     create_parser,
+    find_functional_file,
     find_source_file,
+    get_control_exporter,
     get_exporter,
+    load_functional_text,
     main,
 )
+from tools.framework_mapping import Control, ControlCoverage
 
 
 class TestRequirement:
@@ -100,6 +111,14 @@ class TestIntegrityVerifier:
         is_valid, computed = verifier.verify(sample_json_file, "invalid_hash")
         assert is_valid is False
 
+    def test_compute_hash_of_raw_bytes(self, tmp_path):
+        """Test the hash covers the bytes on disk, not newline-translated text."""
+        path = tmp_path / "crlf.json"
+        path.write_bytes(b'[\r\n]\r\n')
+        verifier = IntegrityVerifier(DefaultFileReader())
+
+        assert verifier.compute_hash(path) == hashlib.sha256(b'[\r\n]\r\n').hexdigest()
+
 
 class TestRequirementsLoader:
     """Tests for the RequirementsLoader class."""
@@ -138,6 +157,55 @@ class TestRequirementsLoader:
         with pytest.raises(ValueError, match="Integrity check failed"):
             loader.load(sample_json_file, "bad_hash")
 
+    def test_load_reads_file_once(self, sample_json_file):
+        """Test one read feeds both the integrity check and the parser."""
+        class CountingReader(DefaultFileReader):
+            opened = 0
+
+            def read(self, path):
+                raise AssertionError("load must not re-read the file as text")
+
+            def open_bytes(self, path):
+                self.opened += 1
+                return super().open_bytes(path)
+
+        reader = CountingReader()
+        loader = RequirementsLoader(reader, IntegrityVerifier(reader))
+        expected_hash = hashlib.sha256(sample_json_file.read_bytes()).hexdigest()
+
+        assert len(loader.load(sample_json_file, expected_hash)) == 3
+        assert reader.opened == 1
+
+    def test_load_mapped_file(self, sample_json_file, monkeypatch):
+        """Test files above the threshold are hashed and parsed from a memory map."""
+        reader = DefaultFileReader()
+        loader = RequirementsLoader(reader, IntegrityVerifier(reader))
+        expected_hash = hashlib.sha256(sample_json_file.read_bytes()).hexdigest()
+        monkeypatch.setattr(export_requirements, "MMAP_THRESHOLD_BYTES", 0)
+
+        with reader.open_bytes(sample_json_file) as data:
+            assert isinstance(data, mmap.mmap)
+        requirements = loader.load(sample_json_file, expected_hash)
+        assert [r.req_id for r in requirements] == ["V1.1.1", "V1.2.1", "V2.1.1"]
+
+    def test_load_checks_hash_before_parsing(self, invalid_json_file):
+        """Test a tampered file is rejected before its JSON is decoded."""
+        reader = DefaultFileReader()
+        loader = RequirementsLoader(reader, IntegrityVerifier(reader))
+
+        with pytest.raises(ValueError, match="Integrity check failed"):
+            loader.load(invalid_json_file, "bad_hash")
+
+    def test_load_invalid_utf8(self, tmp_path):
+        """Test undecodable bytes are reported as a ValueError."""
+        path = tmp_path / "latin1.json"
+        path.write_bytes(b'["caf\xe9"]')
+        reader = DefaultFileReader()
+        loader = RequirementsLoader(reader, IntegrityVerifier(reader))
+
+        with pytest.raises(ValueError, match="Invalid UTF-8"):
+            loader.load(path)
+
     def test_load_invalid_json(self, invalid_json_file):
         """Test loading invalid JSON raises error."""
         reader = DefaultFileReader()
@@ -184,6 +252,18 @@ class TestRequirementsLoader:
         
         assert len(filtered) == 3
 
+    def test_filter_by_level_from_index(self, sample_json_file):
+        """Test filtering reads the level views of a loaded index."""
+        reader = DefaultFileReader()
+        verifier = IntegrityVerifier(reader)
+        loader = RequirementsLoader(reader, verifier)
+
+        index = loader.load_index(sample_json_file)
+
+        assert index.get("V2.1.1").req_id == "V2.1.1"
+        assert loader.filter_by_level(index, "2") is index.at_level("2")
+        assert [r.req_id for r in loader.filter_by_level(index, "1")] == ["V1.1.1"]
+
     def test_filter_invalid_level(self, sample_json_file):
         """Test filtering with invalid level raises error."""
         reader = DefaultFileReader()
@@ -196,6 +276,118 @@ class TestRequirementsLoader:
             loader.filter_by_level(requirements, "4")
 
 
+class TestStreamingPipeline:
+    """Tests for the generator pipeline from loader to exporter."""
+
+    @pytest.fixture
+    def loader(self):
+        reader = DefaultFileReader()
+        return RequirementsLoader(reader, IntegrityVerifier(reader))
+
+    @pytest.mark.parametrize("stream", [False, True], ids=["cached", "stream"])
+    def test_iter_load_matches_load(self, loader, sample_json_file, stream):
+        requirements = loader.iter_load(sample_json_file, stream=stream)
+        assert [r.req_id for r in requirements] == [r.req_id for r in loader.load(sample_json_file)]
+
+    def test_iter_load_stream_hashes_while_parsing(self, loader, sample_json_file, monkeypatch):
+        """The file is opened once and the parsed bytes are the hashed bytes."""
+        expected = loader.verifier.compute_hash(sample_json_file)
+        opened = []
+        real_open = Path.open
+        monkeypatch.setattr(Path, "open", lambda self, *a, **k: opened.append(self) or real_open(self, *a, **k))
+        monkeypatch.setattr(loader.verifier, "compute_hash", None)
+
+        requirements = list(loader.iter_load(sample_json_file, expected, stream=True))
+        assert [r.req_id for r in requirements] == ["V1.1.1", "V1.2.1", "V2.1.1"]
+        assert opened == [sample_json_file]
+
+    def test_iter_load_stream_checks_hash_when_iteration_ends(self, loader, sample_json_file):
+        with pytest.raises(ValueError, match="Integrity check failed"):
+            list(loader.iter_load(sample_json_file, "bad_hash", stream=True))
+
+    def test_iter_load_stream_reports_tampering_over_malformed(self, loader, tmp_path, sample_requirements_data):
+        path = tmp_path / "partial.json"
+        path.write_text(json.dumps(sample_requirements_data[:1] + [{"req_id": "V9.9.9"}]))
+        with pytest.raises(ValueError, match="Integrity check failed"):
+            list(loader.iter_load(path, "bad_hash", stream=True))
+
+    def test_iter_load_stream_is_strict(self, loader, tmp_path, sample_requirements_data):
+        path = tmp_path / "partial.json"
+        path.write_text(json.dumps(sample_requirements_data[:1] + [{"req_id": "V9.9.9"}]))
+        requirements = loader.iter_load(path, stream=True)
+        assert next(requirements).req_id == "V1.1.1"
+        with pytest.raises(ValueError, match="index 1: Missing required field.*partial.json"):
+            next(requirements)
+
+    def test_iter_by_level_matches_index(self, loader, project_root):
+        path = project_root / "01-ASVS-Core-Reference" / "ASVS-5.0-en.json"
+        index = loader.load_index(path)
+        for level in ("1", "2", "3"):
+            streamed = loader.iter_by_level(loader.iter_load(path, stream=True), level)
+            assert list(streamed) == loader.filter_by_level(index, level)
+
+    def test_iter_by_level_keeps_repeated_ids(self, loader, sample_requirements_data):
+        """Merged catalogs keep every row of a repeated ID."""
+        records = sample_requirements_data + [dict(sample_requirements_data[2], L="1")]
+        requirements = [Requirement.from_dict(r) for r in records]
+        assert [r.req_id for r in loader.iter_by_level(iter(requirements), "1")] == ["V1.1.1", "V2.1.1"]
+        assert len(list(loader.iter_by_level(iter(requirements)))) == 4
+        assert loader.filter_by_level(requirements, "1") == list(loader.iter_by_level(requirements, "1"))
+
+    def test_iter_by_level_invalid_level(self, loader):
+        with pytest.raises(ValueError, match="Invalid level"):
+            loader.iter_by_level([], "4")
+
+    def test_stdout_writer_prints_only_on_success(self, capsys):
+        writer = StdoutWriter()
+
+        with pytest.raises(RuntimeError):
+            with writer.open() as sink:
+                sink.write("partial")
+                raise RuntimeError("export failed")
+        assert capsys.readouterr().out == ""
+
+        with writer.open() as sink:
+            sink.write("complete\n")
+        assert capsys.readouterr().out == "complete\n"
+
+    def test_main_stream_malformed_prints_nothing(self, tmp_path, sample_requirements_data, capsys):
+        """A record failing validation mid-stream leaves stdout empty."""
+        source = tmp_path / "merged.json"
+        source.write_text(json.dumps(sample_requirements_data + [{"req_id": "V9.9.9"}]))
+        assert main(["--source", str(source), "--stream", "--format", "jira-json"]) == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Missing required field" in captured.err
+
+    def test_main_stream_hash_mismatch_writes_nothing(self, tmp_path, sample_json_file, capsys):
+        """A streamed export from a file failing --verify-hash is never committed."""
+        output = tmp_path / "out.csv"
+        args = ["--source", str(sample_json_file), "--stream", "--verify-hash", "0" * 64]
+        assert main(args + ["--output", str(output)]) == 1
+        assert not output.exists()
+        assert main(args) == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Integrity check failed" in captured.err
+
+    def test_file_writer_replaces_only_on_success(self, tmp_path):
+        path = tmp_path / "out.csv"
+        path.write_text("previous")
+        writer = FileWriter(path)
+
+        with pytest.raises(RuntimeError):
+            with writer.open() as sink:
+                sink.write("partial")
+                raise RuntimeError("export failed")
+        assert path.read_text() == "previous"
+        assert list(tmp_path.iterdir()) == [path]
+
+        with writer.open() as sink:
+            sink.write("complete")
+        assert path.read_text() == "complete"
+
+
 class TestCsvExporter:
     """Tests for the CsvExporter class."""
 
@@ -238,6 +430,16 @@ class TestCsvExporter:
         assert "asvs,security,L2,V1" == rows[2][3]
         assert "asvs,security,L3,V2" == rows[3][3]
 
+    def test_export_csv_functional_column(self, sample_requirements_data):
+        """Test that functional text is joined on req_id."""
+        requirements = [Requirement.from_dict(d) for d in sample_requirements_data]
+        exporter = CsvExporter({"V1.2.1": "The system shall encode output."})
+
+        rows = list(csv.reader(io.StringIO(exporter.export(requirements))))
+
+        assert rows[0][-1] == "Functional Requirement"
+        assert [row[-1] for row in rows[1:]] == ["", "The system shall encode output.", ""]
+
 
 class TestJiraJsonExporter:
     """Tests for the JiraJsonExporter class."""
@@ -281,6 +483,63 @@ class TestJiraJsonExporter:
         expected_labels = ["asvs", "security", "L1", "v1"]
         assert issue["labels"] == expected_labels
 
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_write_matches_json_dumps(self, sample_requirements_data, count):
+        """Test that incremental output is byte-identical to json.dumps."""
+        requirements = [Requirement.from_dict(d) for d in sample_requirements_data[:count]]
+        exporter = JiraJsonExporter()
+        sink = io.StringIO()
+
+        exporter.write(iter(requirements), sink)
+
+        expected = json.dumps({"issues": [exporter._issue(r) for r in requirements]}, indent=2)
+        assert sink.getvalue() == expected
+
+    def test_export_jira_json_functional(self, sample_requirements_data):
+        """Test that functional text goes into a custom field."""
+        requirements = [Requirement.from_dict(d) for d in sample_requirements_data]
+        exporter = JiraJsonExporter({"V1.1.1": "The system shall decode once."})
+
+        issues = json.loads(exporter.export(requirements))["issues"]
+
+        assert issues[0]["customFields"]["asvsFunctionalRequirement"] == "The system shall decode once."
+        assert issues[1]["customFields"]["asvsFunctionalRequirement"] is None
+        assert "asvsFunctionalRequirement" not in json.loads(JiraJsonExporter().export(requirements))[
+            "issues"][0]["customFields"]
+
+
+class TestFunctionalText:
+    """Tests for loading Functional-Requirements files."""
+
+    def test_first_entry_wins(self, tmp_path, sample_requirements_data):
+        records = sample_requirements_data + [dict(sample_requirements_data[0], req_description="Later")]
+        path = tmp_path / "functional.json"
+        path.write_text(json.dumps(records))
+
+        functional = load_functional_text(path)
+
+        assert len(functional) == 3
+        assert functional["V1.1.1"] == "Test requirement for L1"
+
+    def test_shipped_files_cover_their_level(self, project_root):
+        for level in ("1", "2", "3"):
+            functional = load_functional_text(find_functional_file(level, project_root))
+            exported = RequirementsLoader(DefaultFileReader(), IntegrityVerifier(DefaultFileReader())).load(
+                find_source_file(level, project_root))
+            assert sum(req.req_id in functional for req in exported) >= 0.95 * len(exported)
+
+    def test_bundled_file(self, tmp_path, monkeypatch, isolated_cache_dir):
+        monkeypatch.setattr("tools.resource_manager.get_resource_path", lambda resource_type: None)
+        path = find_functional_file("2", tmp_path)
+        assert path.name == "ASVS-Functional-Requirements-L2.json"
+        assert isolated_cache_dir in path.parents
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("tools.resource_manager.get_resource_path", lambda resource_type: None)
+        monkeypatch.setattr("tools.export_requirements.bundled_file", lambda filename: None)
+        with pytest.raises(FileNotFoundError, match="asvs resources --download"):
+            find_functional_file("1", tmp_path)
+
 
 class TestGetExporter:
     """Tests for the get_exporter factory function."""
@@ -300,6 +559,18 @@ class TestGetExporter:
         with pytest.raises(ValueError, match="Unknown format"):
             get_exporter("xml")
 
+    @pytest.mark.parametrize("format_type, cls", [("csv", ControlCsvExporter), ("json", ControlJsonExporter)])
+    def test_control_exporters_share_exporter_contract(self, format_type, cls):
+        """Control exporters write a generator through the common Exporter.export."""
+        exporter = get_control_exporter(format_type, "soc2")
+        assert isinstance(exporter, cls)
+        assert isinstance(exporter, Exporter)
+
+        req = Requirement("V1.1.1", "Verify encoding.", "1", "V1", "Encoding", "V1.1", "Architecture")
+        coverage = ControlCoverage(Control("soc2", "CC6.1", "Logical Access"), [req])
+        output = exporter.export(item for item in [coverage])
+        assert "CC6.1" in output and "V1.1.1" in output
+
 
 class TestFindSourceFile:
     """Tests for the find_source_file function."""
@@ -322,6 +593,13 @@ class TestFindSourceFile:
         assert path.name == "ASVS-5.0-en.json"
         assert path.exists()
 
+    def test_find_bundled_source(self, tmp_path, monkeypatch, isolated_cache_dir):
+        """Test falling back to the packaged bundle without a checkout or download."""
+        monkeypatch.setattr("tools.resource_manager.get_resource_path", lambda resource_type: None)
+        path = find_source_file("3", tmp_path)
+        assert path.name == "ASVS-5.0-en.json"
+        assert isolated_cache_dir in path.parents
+
     def test_find_invalid_level(self, project_root):
         """Test finding source for invalid level."""
         with pytest.raises(ValueError, match="Invalid level"):
@@ -403,6 +681,90 @@ class TestMain:
         data = json.loads(captured.out)
         assert "issues" in data
 
+    def test_main_level_3_reads_nested_catalog(self, project_root, capsys):
+        """Test that level 3 exports the nested full catalog."""
+        result = main([
+            "--level", "3",
+            "--format", "jira-json",
+            "--base-path", str(project_root),
+        ])
+
+        assert result == 0
+        issues = json.loads(capsys.readouterr().out)["issues"]
+        levels = {issue["customFields"]["asvsLevel"] for issue in issues}
+        assert levels == {"1", "2", "3"}
+
+    def test_main_framework_json_groups_by_control(self, project_root, capsys):
+        """Test that --framework groups the export by control."""
+        result = main([
+            "--level", "1",
+            "--format", "json",
+            "--framework", "iso27001",
+            "--base-path", str(project_root),
+        ])
+
+        assert result == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["framework"] == "iso27001"
+        controls = {c["id"]: c for c in data["controls"]}
+        assert [r["id"] for r in controls["A.8.24"]["requirements"]] == ["V5.2.1", "V5.3.1"]
+        assert controls["A.8.24"]["unmatched"] == ["V5.1.1"]
+
+    @pytest.mark.parametrize("args", [
+        ["--format", "jira-json", "--framework", "soc2"],
+        ["--format", "json"],
+    ], ids=["jira-json-with-framework", "json-without-framework"])
+    def test_main_rejects_mismatched_format(self, project_root, capsys, args):
+        """Test Jira JSON and control-coverage JSON are not confused."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(args + ["--base-path", str(project_root)])
+        assert exc_info.value.code == 2
+        assert "--format" in capsys.readouterr().err
+
+    def test_main_framework_csv(self, project_root, capsys):
+        """Test the --framework CSV has one row per control and requirement."""
+        result = main([
+            "--level", "3",
+            "--framework", "soc2",
+            "--base-path", str(project_root),
+        ])
+
+        assert result == 0
+        rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+        assert rows[0][:3] == ["Control", "Control Name", "Issue Key"]
+        assert ["CC6.1", "V4.1.2"] in [[r[0], r[2]] for r in rows]
+
+    def test_main_with_functional(self, project_root, capsys):
+        """Test --with-functional adds the functional text of each requirement."""
+        result = main([
+            "--level", "2",
+            "--with-functional",
+            "--base-path", str(project_root),
+        ])
+
+        assert result == 0
+        rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+        assert rows[0][-1] == "Functional Requirement"
+        assert all(len(row) == 7 for row in rows)
+        assert sum(" shall " in row[-1] for row in rows[1:]) > len(rows) // 2
+
+    @pytest.mark.parametrize("extra", [[], ["--stream"]], ids=["cached", "stream"])
+    def test_main_keeps_repeated_ids(self, tmp_path, sample_requirements_data, capsys, extra):
+        """Test a merged catalog exports every row of a repeated ID."""
+        source = tmp_path / "merged.json"
+        source.write_text(json.dumps(sample_requirements_data + sample_requirements_data[:1]))
+        assert main(["--source", str(source)] + extra) == 0
+        rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+        assert [row[0] for row in rows[1:]] == ["V1.1.1", "V1.2.1", "V2.1.1", "V1.1.1"]
+
+    def test_main_stream_matches_default(self, project_root, capsys):
+        """Test --stream produces the same export."""
+        args = ["--level", "2", "--format", "jira-json", "--base-path", str(project_root)]
+        assert main(args) == 0
+        default = capsys.readouterr().out
+        assert main(args + ["--stream"]) == 0
+        assert capsys.readouterr().out == default
+
     def test_main_with_output_file(self, project_root, tmp_path):
         """Test main with output file."""
         output_file = tmp_path / "output.csv"
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SOC2 / ISO 27001 mapping index.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.catalog import Requirement
+from tools.framework_mapping import (
+    MAPPING_DOC,
+    MappingIndex,
+    expand_controls,
+    find_mapping_file,
+)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DOC = """\
+# Mapping
+
+### CC6: Access
+
+| SOC2 Criterion | ASVS Chapter | Key ASVS Requirements |
+|----------------|--------------|----------------------|
+| CC6.1 - Logical access security | V4 (Access Control) | V4.1.1, V4.1.2 |
+| CC6.2 - Access removal | V4 (Access Control) | V4.1.3 |
+| CC3.2 - Risk analysis | Decision Templates | V11, V15 templates |
+
+### A.8
+
+| ISO Control | ASVS Chapter | Key ASVS Requirements |
+|-------------|--------------|----------------------|
+| A.8.24 - Cryptography | V5 (Cryptography) | V5.1.1, V4.1.1 |
+
+| Evidence Type | SOC2 Criterion | ISO 27001 Control |
+|--------------|----------------|-------------------|
+| Report | CC9.9 | A.9.9 |
+
+| ASVS Chapter | Primary SOC2 | Primary ISO 27001 |
+|-------------|--------------|-------------------|
+| V1 - Encoding | CC6.1-CC6.3 | A.8.24 |
+"""
+
+
+def _req(req_id, level="1"):
+    return Requirement(req_id=req_id, description=f"Verify {req_id}.", level=level,
+                       chapter_id=req_id.split(".")[0], section_name="Section")
+
+
+class TestParse:
+    """Tests for parsing the mapping tables."""
+
+    def test_controls_and_requirements(self):
+        mapping = MappingIndex.parse(DOC)
+        soc2 = {c.control_id: c for c in mapping.framework("soc2")}
+        assert list(soc2) == ["CC3.2", "CC6.1", "CC6.2", "CC6.3"]
+        assert soc2["CC6.1"].name == "Logical access security"
+        assert soc2["CC6.1"].requirements == ["V4.1.1", "V4.1.2"]
+        assert soc2["CC3.2"].notes == ["V11, V15 templates"]
+        assert soc2["CC3.2"].chapters == []
+
+    def test_quick_reference_adds_chapters(self):
+        soc2 = {c.control_id: c for c in MappingIndex.parse(DOC).framework("soc2")}
+        assert soc2["CC6.1"].chapters == ["V4", "V1"]
+        assert soc2["CC6.3"].chapters == ["V1"]
+
+    def test_other_tables_ignored(self):
+        mapping = MappingIndex.parse(DOC)
+        assert [c.control_id for c in mapping.framework("iso27001")] == ["A.8.24"]
+
+    def test_reverse_lookups(self):
+        mapping = MappingIndex.parse(DOC)
+        assert [c.control_id for c in mapping.for_requirement("V4.1.1")] == ["CC6.1", "A.8.24"]
+        assert [c.control_id for c in mapping.for_chapter("V1")] == ["CC6.1", "CC6.2", "CC6.3", "A.8.24"]
+        assert mapping.for_requirement("V9.9.9") == []
+
+    def test_unknown_framework(self):
+        with pytest.raises(ValueError, match="Unknown framework"):
+            MappingIndex.parse(DOC).framework("pci")
+
+    def test_shipped_document(self):
+        mapping = MappingIndex.parse((PROJECT_ROOT / MAPPING_DOC).read_text(encoding="utf-8"))
+        assert len(mapping.framework("soc2")) > 10
+        assert len(mapping.framework("iso27001")) > 20
+        assert "V4" in {c.control_id: c for c in mapping.framework("iso27001")}["A.8.2"].chapters
+
+
+class TestExpandControls:
+    """Tests for control ranges."""
+
+    def test_ranges(self):
+        assert expand_controls("A.8.25-A.8.27") == ["A.8.25", "A.8.26", "A.8.27"]
+        assert expand_controls("CC6.1, CC6.3") == ["CC6.1", "CC6.3"]
+
+
+class TestJoin:
+    """Tests for grouping a catalog by control."""
+
+    def test_join_groups_by_control(self):
+        mapping = MappingIndex.parse(DOC)
+        coverage = {c.control.control_id: c for c in mapping.join("soc2", [_req("V4.1.1"), _req("V4.1.3")])}
+        assert [r.req_id for r in coverage["CC6.1"].requirements] == ["V4.1.1"]
+        assert coverage["CC6.1"].unmatched == ["V4.1.2"]
+        assert coverage["CC3.2"].requirements == []
+
+    def test_join_keeps_repeated_ids(self):
+        mapping = MappingIndex.parse(DOC)
+        first, second = _req("V4.1.1"), _req("V4.1.1", level="2")
+        coverage = {c.control.control_id: c for c in mapping.join("soc2", [first, second])}
+        assert coverage["CC6.1"].requirements == [first, second]
+
+
+class TestLoad:
+    """Tests for the cached index."""
+
+    def test_parses_once(self, tmp_path, monkeypatch):
+        doc = tmp_path / "mapping.md"
+        doc.write_text(DOC, encoding="utf-8")
+        cache = tmp_path / "cache.json"
+        first = MappingIndex.load(doc, cache)
+
+        def fail(text):
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(MappingIndex, "parse", classmethod(lambda cls, text: fail(text)))
+        second = MappingIndex.load(doc, cache)
+        assert second.to_dict() == first.to_dict()
+
+        # Touched but unchanged: matched by hash
+        doc.write_text(DOC, encoding="utf-8")
+        assert MappingIndex.load(doc, cache).to_dict() == first.to_dict()
+
+    def test_change_reparses(self, tmp_path):
+        doc = tmp_path / "mapping.md"
+        doc.write_text(DOC, encoding="utf-8")
+        cache = tmp_path / "cache.json"
+        MappingIndex.load(doc, cache)
+
+        doc.write_text(DOC.replace("CC6.2 - Access removal", "CC6.5 - Access removal"), encoding="utf-8")
+        mapping = MappingIndex.load(doc, cache)
+        assert "CC6.5" in [c.control_id for c in mapping.framework("soc2")]
+        assert json.loads(cache.read_text())["controls"]
+
+    def test_default_cache_location(self, tmp_path):
+        doc = tmp_path / "mapping.md"
+        doc.write_text(DOC, encoding="utf-8")
+        MappingIndex.load(doc)
+        from tools.resource_manager import get_cache_dir
+        assert (get_cache_dir() / "framework-mapping.json").exists()
+
+
+class TestFindMappingFile:
+    """Tests for locating the mapping document."""
+
+    def test_checkout(self):
+        assert find_mapping_file(PROJECT_ROOT) == PROJECT_ROOT / MAPPING_DOC
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for JSON Patch output of drift results.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.drift_detector import DEFAULT_LOCAL_PATH, DriftDetector, RequirementParser, main
+from tools.json_patch import JsonPatchError, apply_patch, build_patch, catalog_items, format_patch
+
+
+CATALOG_PATH = Path(__file__).parent.parent / DEFAULT_LOCAL_PATH
+
+
+@pytest.fixture(scope="module")
+def local_document():
+    return json.loads(CATALOG_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def upstream_document(local_document):
+    document = json.loads(json.dumps(local_document))
+    items = document["requirements"]
+    items[0]["req_description"] = items[0]["req_description"].replace("only once", "exactly once")
+    items[5]["L"] = "3"
+    items[20]["req_id"] = "V98.1.1"
+    items[20]["section_name"] = "Renumbered"
+    del items[10]
+    del items[40]
+    items.append(dict(items[3], req_id="V99.1.1", req_description="A brand new requirement."))
+    return document
+
+
+def _drift(local_document, upstream_document, move_threshold=0.7):
+    detector = DriftDetector(None, None, RequirementParser(), move_threshold=move_threshold)
+    parser = RequirementParser()
+    return detector.compare(
+        parser.parse(json.dumps(local_document)),
+        parser.parse(json.dumps(upstream_document)),
+    )
+
+
+class TestBuildPatch:
+
+    @pytest.mark.parametrize("move_threshold", [0.7, None])
+    def test_patch_turns_local_into_upstream(self, local_document, upstream_document, move_threshold):
+        result = _drift(local_document, upstream_document, move_threshold)
+        patched = apply_patch(local_document, build_patch(local_document, upstream_document, result))
+
+        assert patched == upstream_document
+
+    def test_patch_covers_fields_drift_ignores(self, local_document):
+        """Names and positions are patched even when drift reports no change."""
+        upstream = json.loads(json.dumps(local_document))
+        items = upstream["requirements"]
+        for item in items:
+            if item["chapter_id"] == "V2":
+                item["chapter_name"] = "Validation (renamed)"
+        items.insert(7, dict(items[3], req_id="V99.1.1", req_description="Inserted upstream."))
+        items[30], items[31] = items[31], items[30]
+        upstream["version"] = "5.0.1"
+
+        ops = build_patch(local_document, upstream, _drift(local_document, upstream))
+
+        assert apply_patch(local_document, ops) == upstream
+        assert {"op": "add", "path": "/requirements/7", "value": items[7]} in ops
+
+    def test_nested_upstream(self, local_document):
+        """A nested upstream document is reproduced as its flat records."""
+        nested = {"requirements": [{
+            "Shortcode": "V1", "Name": "Encoding", "Items": [{
+                "Shortcode": "V1.1", "Name": "Architecture", "Items": [
+                    {"Shortcode": "V1.1.1", "Description": "Verify one.", "L": "1"},
+                ],
+            }],
+        }]}
+        local = [{"req_id": "V1.1.1", "req_description": "Old.", "L": "2"},
+                 {"req_id": "V1.1.2", "req_description": "Gone.", "L": "1"}]
+        patched = apply_patch(local, build_patch(local, nested))
+        assert [(r["req_id"], r["req_description"], r["L"], r["section_name"]) for r in patched] == [
+            ("V1.1.1", "Verify one.", "1", "Architecture")]
+
+    def test_patch_is_small(self, local_document, upstream_document):
+        ops = build_patch(local_document, upstream_document, _drift(local_document, upstream_document))
+        assert [op["op"] for op in ops].count("remove") == 2
+        assert [op["op"] for op in ops].count("add") == 1
+        assert len(ops) < 20
+
+    def test_no_drift_is_empty_patch(self, local_document):
+        ops = build_patch(local_document, local_document, _drift(local_document, local_document))
+        assert ops == []
+        assert format_patch(ops) == "[]"
+
+    def test_patch_guards_against_other_versions(self, local_document, upstream_document):
+        ops = build_patch(local_document, upstream_document, _drift(local_document, upstream_document))
+        with pytest.raises(JsonPatchError, match="Test failed"):
+            apply_patch(upstream_document, ops)
+
+    def test_flat_list_document(self):
+        local = [{"req_id": "V1.1.1", "req_description": "Old.", "L": "1"}]
+        upstream = [{"req_id": "V1.1.1", "req_description": "New.", "L": "1"}]
+        ops = build_patch(local, upstream, _drift(local, upstream))
+        assert ops[-1] == {"op": "replace", "path": "/0/req_description", "value": "New."}
+        assert apply_patch(local, ops) == upstream
+
+    def test_nested_document_rejected(self):
+        with pytest.raises(JsonPatchError):
+            catalog_items({"requirements": [{"Shortcode": "V1", "Items": []}]})
+
+    def test_format_is_one_operation_per_line(self):
+        ops = [{"op": "remove", "path": "/0"}, {"op": "remove", "path": "/1"}]
+        assert json.loads(format_patch(ops)) == ops
+        assert len(format_patch(ops).splitlines()) == 4
+
+
+class TestMainJsonPatch:
+
+    def test_main_json_patch(self, local_document, upstream_document, tmp_path, capsys):
+        upstream = tmp_path / "upstream.json"
+        upstream.write_text(json.dumps(upstream_document), encoding="utf-8")
+
+        exit_code = main(["--local", str(CATALOG_PATH), "--upstream-file", str(upstream),
+                          "--format", "json-patch"])
+        ops = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 1
+        assert apply_patch(local_document, ops) == upstream_document
+
+    def test_json_patch_rejects_matrix(self, capsys):
+        assert main(["--format", "json-patch", "--matrix", "a.json", "b.json"]) == 1
+        assert "json-patch" in capsys.readouterr().err
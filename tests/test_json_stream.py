@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental JSON reader.
+"""
+
+import io
+import json
+
+import pytest
+
+from tools.json_stream import JsonStreamReader, iter_items
+
+
+@pytest.fixture
+def document():
+    return {
+        "name": "demo",
+        "skip": {"deep": [[1, 2, {"s": "tricky \" ] } string"}], {"k": "\\"}]},
+        "packages": {
+            "": {"version": "1.0.0"},
+            "node_modules/helmet": {"version": "7.1.0"},
+        },
+        "numbers": [12345678901234567890, -1.5e-3, True, None],
+    }
+
+
+class TestIterItems:
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 16, 65536])
+    def test_object_wildcard(self, document, chunk_size):
+        text = json.dumps(document)
+        items = list(iter_items(io.StringIO(text), ["packages", "*"], chunk_size))
+        assert items == [
+            (["packages", ""], {"version": "1.0.0"}),
+            (["packages", "node_modules/helmet"], {"version": "7.1.0"}),
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 65536])
+    def test_array_items_from_bytes(self, document, chunk_size):
+        data = json.dumps(document).encode("utf-8")
+        items = [v for _, v in iter_items(io.BytesIO(data), ["numbers", "item"], chunk_size)]
+        assert items == document["numbers"]
+
+    def test_utf8_split_across_chunks(self):
+        data = json.dumps({"d": ["héllo wörld ✓"]}, ensure_ascii=False).encode("utf-8")
+        items = [v for _, v in iter_items(io.BytesIO(data), ["d", "item"], 1)]
+        assert items == ["héllo wörld ✓"]
+
+    def test_byte_order_mark(self):
+        data = "﻿[1, 2]".encode("utf-8")
+        assert [v for _, v in iter_items(io.BytesIO(data), ["item"])] == [1, 2]
+
+    def test_missing_path_yields_nothing(self, document):
+        assert list(iter_items(io.StringIO(json.dumps(document)), ["absent", "item"])) == []
+
+    def test_truncated_document(self):
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            list(iter_items(io.StringIO('{"packages": {"a": {"version": '), ["packages", "*"]))
+
+
+class TestJsonStreamReader:
+
+    def test_untouched_values_are_skipped(self, document):
+        reader = JsonStreamReader(io.StringIO(json.dumps(document)), chunk_size=7)
+        assert list(reader.iter_object()) == ["name", "skip", "packages", "numbers"]
+        assert reader.peek() == ""
+
+    def test_read_string_requires_string(self):
+        reader = JsonStreamReader(io.StringIO("[1]"))
+        with pytest.raises(ValueError):
+            reader.read_string()
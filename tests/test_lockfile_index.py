@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ASVS lockfile index.
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from tools.lockfile_index import (
+    LockfileIndex,
+    normalize_name,
+    parse_go_sum,
+    parse_package_lock,
+    parse_poetry_lock,
+    parse_requirements_txt,
+    version_at_least,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A monorepo with one lockfile of each supported kind."""
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "package-lock.json").write_text(json.dumps({
+        "name": "web",
+        "lockfileVersion": 3,
+        "packages": {
+            "": {"name": "web", "dependencies": {"helmet": "^7.0.0"}},
+            "node_modules/helmet": {"version": "7.1.0"},
+            "node_modules/express/node_modules/cookie": {"version": "0.5.0"},
+            "node_modules/linked": {"link": True},
+        },
+        "dependencies": {"helmet": {"version": "0.0.1"}},
+    }), encoding="utf-8")
+    (tmp_path / "api").mkdir()
+    (tmp_path / "api" / "requirements-prod.txt").write_text(
+        "# security\nargon2-cffi==21.3.0\nDjango_CSP>=3.7  # CSP\n-r base.txt\nrequests\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "api" / "poetry.lock").write_text(
+        '[[package]]\nname = "cryptography"\nversion = "41.0.3"\n\n'
+        '[package.dependencies]\ncffi = ">=1.12"\n\n'
+        '[metadata]\nname = "not-a-package"\n',
+        encoding="utf-8",
+    )
+    (tmp_path / "svc").mkdir()
+    (tmp_path / "svc" / "go.sum").write_text(
+        "golang.org/x/crypto v0.14.0 h1:abc=\n"
+        "golang.org/x/crypto v0.14.0/go.mod h1:def=\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "package-lock.json").write_text("{}", encoding="utf-8")
+    return tmp_path
+
+
+class TestVersions:
+
+    def test_version_at_least(self):
+        assert version_at_least("7.1.0", "7")
+        assert version_at_least("v0.14.0", "0.13.2")
+        assert version_at_least("1.10.0", "1.9.9")
+        assert not version_at_least("1.0.0-beta.1", "1.0.0")
+        assert not version_at_least("3.9", "4.0")
+
+    def test_normalize_name(self):
+        assert normalize_name("Django_CSP", "pypi") == "django-csp"
+        assert normalize_name("lodash.merge", "npm") == "lodash.merge"
+
+
+class TestParsers:
+
+    def test_package_lock_v3(self, repo):
+        pairs = list(parse_package_lock(repo / "web" / "package-lock.json"))
+        assert pairs == [("helmet", "7.1.0"), ("cookie", "0.5.0")]
+
+    def test_package_lock_v1(self, tmp_path):
+        lock = tmp_path / "package-lock.json"
+        lock.write_text(json.dumps({
+            "lockfileVersion": 1,
+            "dependencies": {
+                "express": {"version": "4.18.2", "dependencies": {"cookie": {"version": "0.5.0"}}},
+            },
+        }), encoding="utf-8")
+        assert list(parse_package_lock(lock)) == [("express", "4.18.2"), ("cookie", "0.5.0")]
+
+    def test_requirements_txt(self, repo):
+        pairs = list(parse_requirements_txt(repo / "api" / "requirements-prod.txt"))
+        assert pairs == [("argon2-cffi", "21.3.0"), ("Django_CSP", "3.7"), ("requests", "")]
+
+    def test_poetry_lock(self, repo):
+        assert list(parse_poetry_lock(repo / "api" / "poetry.lock")) == [("cryptography", "41.0.3")]
+
+    def test_go_sum(self, repo):
+        pairs = list(parse_go_sum(repo / "svc" / "go.sum"))
+        assert pairs == [("golang.org/x/crypto", "v0.14.0")] * 2
+
+    def test_large_package_lock_is_streamed(self, tmp_path):
+        """Parsing a multi-megabyte lockfile keeps peak memory far below its size."""
+        lock = tmp_path / "package-lock.json"
+        with lock.open("w", encoding="utf-8") as handle:
+            handle.write('{"lockfileVersion": 3, "packages": {"": {}')
+            for i in range(40000):
+                handle.write(f', "node_modules/pkg-{i}": {{"version": "1.0.{i}", '
+                             f'"resolved": "https://registry.npmjs.org/pkg-{i}/-/pkg-{i}-1.0.{i}.tgz", '
+                             f'"integrity": "sha512-{"x" * 64}"}}')
+            handle.write("}}")
+        size = lock.stat().st_size
+        assert size > 5 * 1024 * 1024
+
+        tracemalloc.start()
+        count = sum(1 for _ in parse_package_lock(lock))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 40000
+        assert peak < size / 10
+
+
+class TestLockfileIndex:
+
+    def test_build_and_find(self, repo):
+        index = LockfileIndex.build(repo)
+        assert sorted(index.lockfiles) == [
+            "api/poetry.lock",
+            "api/requirements-prod.txt",
+            "svc/go.sum",
+            "web/package-lock.json",
+        ]
+        assert [d.version for d in index.find("helmet")] == ["7.1.0"]
+        assert index.find("django-csp")[0].source == "api/requirements-prod.txt"
+        assert index.find("golang.org/x/crypto", ecosystem="go")
+        assert index.find("helmet", ecosystem="pypi") == []
+
+    def test_parse_errors_are_recorded(self, tmp_path):
+        (tmp_path / "package-lock.json").write_text('{"packages": [', encoding="utf-8")
+        index = LockfileIndex.build(tmp_path)
+        assert index.lockfiles == []
+        assert "package-lock.json" in index.errors[0]
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ASVS move detection.
+"""
+
+import random
+
+from tools import move_detection
+from tools.move_detection import (
+    MinHasher,
+    find_moves,
+    jaccard,
+    normalize_description,
+    shingles,
+)
+
+
+class TestNormalization:
+
+    def test_normalize_description(self):
+        assert normalize_description("  Verify that TLS 1.2+ is used.\n") == "verify that tls 1 2 is used"
+
+    def test_shingles(self):
+        assert shingles("Verify TLS usage") == frozenset({"verify tls", "tls usage"})
+        assert shingles("Verify") == frozenset({"verify"})
+
+    def test_jaccard(self):
+        assert jaccard(frozenset({"a", "b"}), frozenset({"b", "c"})) == 1 / 3
+        assert jaccard(frozenset(), frozenset()) == 1.0
+
+    def test_minhash_estimates_similarity(self):
+        hasher = MinHasher(num_perm=256)
+        a = shingles(" ".join(f"w{i}" for i in range(100)))
+        b = shingles(" ".join(f"w{i}" for i in range(20, 120)))
+        sig_a, sig_b = hasher.signature(a), hasher.signature(b)
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+        assert abs(estimate - jaccard(a, b)) < 0.1
+
+
+class TestFindMoves:
+
+    def test_exact_move_ignores_case_and_punctuation(self):
+        moves = find_moves(
+            [("V2.1.1", "Verify that passwords are at least 12 characters.")],
+            [("V6.2.1", "verify that passwords are at least 12 characters")],
+        )
+        assert moves == [("V2.1.1", "V6.2.1", 1.0)]
+
+    def test_near_move_scores_similarity(self):
+        moves = find_moves(
+            [("V3.4.1", "Verify that cookie-based session tokens have the Secure attribute set.")],
+            [("V3.3.1", "Verify that cookie-based session tokens have the 'Secure' attribute set "
+                        "and the __Host- prefix.")],
+        )
+        assert [(r, a) for r, a, _ in moves] == [("V3.4.1", "V3.3.1")]
+        assert 0.7 <= moves[0][2] < 1.0
+
+    def test_unrelated_pairs_are_not_moves(self):
+        moves = find_moves(
+            [("V1.1.1", "Verify that input is decoded into a canonical form only once.")],
+            [("V9.9.9", "Verify that all TLS certificates are issued by a trusted authority.")],
+        )
+        assert moves == []
+
+    def test_assignment_is_one_to_one_best_first(self):
+        moves = find_moves(
+            [("A", "verify that the application logs every failed login attempt with a timestamp")],
+            [
+                ("B", "verify that the application logs every failed login attempt"),
+                ("C", "verify that the application logs every failed login attempt with a timestamp and user"),
+            ],
+        )
+        assert [(r, a) for r, a, _ in moves] == [("A", "C")]
+
+    def test_blank_descriptions_are_not_moves(self):
+        moves = find_moves(
+            [("A", ""), ("B", "  -- "), ("C", "verify that sessions expire")],
+            [("D", ""), ("E", "..."), ("F", "Verify that sessions expire.")],
+        )
+        assert moves == [("C", "F", 1.0)]
+
+    def test_threshold_above_one_disables_near_moves(self):
+        moves = find_moves([("A", "alpha beta gamma delta")], [("B", "alpha beta gamma delta epsilon")], 1.01)
+        assert moves == []
+
+    def test_candidates_come_from_lsh_buckets(self, monkeypatch):
+        """Near-move scoring does not compare every removed/added pair."""
+        rng = random.Random(7)
+        vocabulary = [f"word{i}" for i in range(5000)]
+        texts = [" ".join(rng.choice(vocabulary) for _ in range(25)) for _ in range(400)]
+        removed = [(f"R{i}", text) for i, text in enumerate(texts)]
+        added = [(f"A{i}", text.replace("word", "term", 2)) for i, text in enumerate(texts)]
+
+        calls = []
+        real_jaccard = move_detection.jaccard
+        monkeypatch.setattr(move_detection, "jaccard", lambda a, b: calls.append(1) or real_jaccard(a, b))
+
+        moves = find_moves(removed, added)
+
+        assert sorted((r[1:], a[1:]) for r, a, _ in moves) == sorted((str(i), str(i)) for i in range(400))
+        assert len(calls) < 400 * 400 / 50
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ASVS parse cache.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from tools.drift_detector import DriftDetector, Requirement, RequirementParser
+from tools.export_requirements import (
+    DefaultFileReader,
+    IntegrityVerifier,
+    RequirementsLoader,
+)
+from tools.parse_cache import ParseCache, content_digest
+
+
+@pytest.fixture
+def catalog_text():
+    return json.dumps([
+        {
+            "chapter_id": "V1", "chapter_name": "Encoding", "section_id": "V1.1",
+            "section_name": "Architecture", "req_id": "V1.1.1",
+            "req_description": "Decode input once.", "L": "2",
+        },
+    ])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "parse-cache")
+
+
+class TestParseCache:
+
+    def test_miss_then_hit(self, cache, catalog_text):
+        parse = Mock(side_effect=RequirementParser().parse)
+        first = cache.get_or_parse("drift", catalog_text, parse, Requirement)
+        second = cache.get_or_parse("drift", catalog_text, parse, Requirement)
+
+        assert parse.call_count == 1
+        assert second == first
+        assert second[0].description == "Decode input once."
+        assert second[0].section_name == "Architecture"
+
+    def test_changed_content_is_reparsed(self, cache, catalog_text):
+        parse = Mock(side_effect=RequirementParser().parse)
+        cache.get_or_parse("drift", catalog_text, parse, Requirement)
+        cache.get_or_parse("drift", catalog_text.replace("once", "twice"), parse, Requirement)
+        assert parse.call_count == 2
+
+    def test_corrupt_entry_is_ignored(self, cache, catalog_text):
+        path = cache.path_for("drift", content_digest(catalog_text))
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not marshal data")
+        result = cache.get_or_parse("drift", catalog_text, RequirementParser().parse, Requirement)
+        assert [r.req_id for r in result] == ["V1.1.1"]
+
+    def test_parse_errors_are_not_cached(self, cache):
+        with pytest.raises(ValueError):
+            cache.get_or_parse("drift", "{bad", RequirementParser().parse, Requirement)
+        assert not cache.cache_dir.exists()
+
+
+class TestParseCacheConsumers:
+
+    def test_drift_detector_load_local(self, cache, catalog_text, tmp_path):
+        local = tmp_path / "asvs.json"
+        local.write_text(catalog_text, encoding="utf-8")
+        parser = Mock(wraps=RequirementParser())
+        detector = DriftDetector(DefaultFileReader(), Mock(), parser, cache)
+
+        first, first_hash = detector.load_local(local)
+        second, second_hash = detector.load_local(local)
+
+        assert parser.parse.call_count == 1
+        assert second == first
+        assert second_hash == first_hash
+
+    def test_requirements_loader(self, cache, catalog_text, tmp_path):
+        source = tmp_path / "asvs.json"
+        source.write_text(catalog_text, encoding="utf-8")
+        reader = DefaultFileReader()
+        loader = RequirementsLoader(reader, IntegrityVerifier(reader), cache)
+
+        first = loader.load(source)
+        assert cache.path_for("export", content_digest(catalog_text)).exists()
+        second = loader.load(source)
+
+        assert second == first
+        assert second[0].req_description == "Decode input once."
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the requirement reference index.
+"""
+
+import json
+
+import pytest
+
+from tools.drift_detector import DriftResult, Requirement, main
+from tools.reference_index import ReferenceIndex, affected_files, classify, scan_mentions, scan_text
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "evidence.yml").write_text(
+        "requirements:\n"
+        "  V11.1.2:\n"
+        "    evidence:\n"
+        "      - type: file_exists\n"
+        "  V6.2.1:\n"
+        "    evidence: []\n",
+        encoding="utf-8",
+    )
+    decisions = tmp_path / "docs" / "Decision-Templates"
+    decisions.mkdir(parents=True)
+    (decisions / "V11-Cryptography-Strategy.md").write_text(
+        "# Cryptography\n\n- **V11.1.2:** Maintain an inventory.\n\n## Use Cases (V11.1.2, V11.3.2)\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "guide.md").write_text("See V6.2.1 and version 1.2.3.4.\n", encoding="utf-8")
+    ignored = tmp_path / "node_modules" / "pkg"
+    ignored.mkdir(parents=True)
+    (ignored / "README.md").write_text("V11.1.2\n", encoding="utf-8")
+    return tmp_path
+
+
+def _req(req_id):
+    return Requirement(req_id, f"Description of {req_id}", "1")
+
+
+class TestScanning:
+
+    def test_scan_text_lines(self):
+        found = scan_text("V1.1.1 and V1.1.1\nnothing\nV2.3.4, not V1.2.3.4 or XV1.1.2\n")
+        assert found == {"V1.1.1": [1], "V2.3.4": [3]}
+
+    def test_scan_mentions_headings(self):
+        text = (
+            "Intro V1.1.1\n"
+            "# Title\n"
+            "## Usage (V2.1.1) ##\n"
+            "```python\n"
+            "# not a heading V2.1.1\n"
+            "```\n"
+            "Text V1.1.1\n"
+        )
+        assert scan_mentions(text, markdown=True) == {
+            "V1.1.1": [(1, ""), (7, "Usage (V2.1.1)")],
+            "V2.1.1": [(3, "Usage (V2.1.1)"), (5, "Usage (V2.1.1)")],
+        }
+        assert scan_mentions("# V1.1.1\n") == {"V1.1.1": [(1, "")]}
+
+    def test_classify(self):
+        assert classify("evidence.yml") == "evidence"
+        assert classify("docs/Decision-Templates/V7-Session-Management.md") == "decision"
+        assert classify("02-Implementation-Guidance/Languages/Python.md") == "guidance"
+
+
+class TestReferenceIndex:
+
+    def test_build(self, project):
+        index = ReferenceIndex.build(project, workers=2)
+
+        assert index.files_scanned == 3
+        assert [(r.path, r.kind, r.lines) for r in index.find("V11.1.2")] == [
+            ("docs/Decision-Templates/V11-Cryptography-Strategy.md", "decision", [3, 5]),
+            ("evidence.yml", "evidence", [2]),
+        ]
+        assert [r.path for r in index.find("V6.2.1")] == ["evidence.yml", "guide.md"]
+        assert index.find("V1.2.3") == []
+
+    def test_headings(self, project):
+        index = ReferenceIndex.build(project)
+        decision = index.find("V11.1.2")[0]
+        assert decision.headings == ["Cryptography", "Use Cases (V11.1.2, V11.3.2)"]
+        assert index.find("V11.1.2")[1].headings == [""]
+
+    def test_paths(self, project):
+        index = ReferenceIndex.build(project, paths=["docs", "missing"])
+        assert index.files_scanned == 1
+        assert [r.path for r in index.find("V11.1.2")] == ["docs/Decision-Templates/V11-Cryptography-Strategy.md"]
+
+    def test_cache_rescans_only_changed_files(self, project, tmp_path_factory, monkeypatch):
+        cache = tmp_path_factory.mktemp("cache") / "refs.json"
+        first = ReferenceIndex.load(project, cache_path=cache)
+        assert cache.exists()
+
+        scanned = []
+        original = scan_mentions
+
+        def counting(text, markdown=False):
+            scanned.append(text)
+            return original(text, markdown)
+
+        monkeypatch.setattr("tools.reference_index.scan_mentions", counting)
+        again = ReferenceIndex.load(project, cache_path=cache)
+        assert scanned == []
+        assert [r.path for r in again.find("V6.2.1")] == [r.path for r in first.find("V6.2.1")]
+
+        (project / "guide.md").write_text("# Passwords\nSee V6.2.2.\n", encoding="utf-8")
+        updated = ReferenceIndex.load(project, cache_path=cache)
+        assert len(scanned) == 1
+        assert [r.path for r in updated.find("V6.2.1")] == ["evidence.yml"]
+        assert updated.find("V6.2.2")[0].headings == ["Passwords"]
+
+    def test_impact_join(self, project):
+        index = ReferenceIndex.build(project)
+        result = DriftResult(
+            removed=[_req("V6.2.1")],
+            modified=[(_req("V11.1.2"), _req("V11.1.2"))],
+            moved=[(_req("V11.3.2"), _req("V11.3.9"), 0.9)],
+            added=[_req("V17.1.1")],
+        )
+
+        impact = index.impact(result)
+
+        assert [(e.req_id, e.change) for e in impact] == [
+            ("V6.2.1", "removed"), ("V11.1.2", "modified"), ("V11.3.2", "moved"), ("V17.1.1", "added"),
+        ]
+        assert impact[2].new_id == "V11.3.9"
+        assert impact[3].references == []
+        assert affected_files(impact) == [
+            "docs/Decision-Templates/V11-Cryptography-Strategy.md", "evidence.yml", "guide.md",
+        ]
+
+    def test_main_impact(self, project, tmp_path_factory, capsys):
+        catalog = {
+            "requirements": [
+                {"chapter_id": "V11", "section_id": "V11.1", "req_id": "V11.1.2",
+                 "req_description": "Maintain a cryptographic inventory.", "L": "2"},
+                {"chapter_id": "V6", "section_id": "V6.2", "req_id": "V6.2.1",
+                 "req_description": "Passwords are at least 8 characters.", "L": "1"},
+            ]
+        }
+        work = tmp_path_factory.mktemp("catalogs")
+        local = work / "local.json"
+        local.write_text(json.dumps(catalog), encoding="utf-8")
+        catalog["requirements"][0]["req_description"] = "Maintain and review a cryptographic inventory."
+        upstream = work / "upstream.json"
+        upstream.write_text(json.dumps(catalog), encoding="utf-8")
+
+        args = ["--local", str(local), "--upstream-file", str(upstream), "--impact", str(project)]
+        assert main(args + ["--format", "json"]) == 1
+        output = json.loads(capsys.readouterr().out)
+        assert output["impact"]["files"] == ["docs/Decision-Templates/V11-Cryptography-Strategy.md", "evidence.yml"]
+        assert output["impact"]["requirements"][0]["id"] == "V11.1.2"
+
+        assert main(args) == 1
+        text = capsys.readouterr().out
+        assert "IMPACT (1 changed requirements referenced in 2 files)" in text
+        assert "[evidence] evidence.yml:2" in text
+
+    def test_main_missing_root(self, tmp_path, capsys):
+        assert main(["--offline", "--impact", str(tmp_path / "missing")]) == 1
+        assert "Impact root not found" in capsys.readouterr().err
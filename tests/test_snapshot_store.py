@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the catalog snapshot store.
+"""
+
+import json
+from dataclasses import replace
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from tools.drift_detector import (
+    DEFAULT_LOCAL_PATH,
+    DriftDetector,
+    Requirement,
+    RequirementParser,
+    main,
+)
+from tools.snapshot_store import SnapshotError, SnapshotStore
+
+
+CATALOG_PATH = Path(__file__).parent.parent / DEFAULT_LOCAL_PATH
+
+
+def _requirements():
+    return [
+        Requirement("V1.1.1", "Encode output for the interpreter.", "1", "V1", "Encoding", "V1.1", "Architecture"),
+        Requirement("V1.1.2", "Decode input once.", "2", "V1", "Encoding", "V1.1", "Architecture"),
+        Requirement("V2.1.1", "Validate input against an allow list.", "1", "V2", "Validation", "V2.1", "Input"),
+    ]
+
+
+class FixedClock:
+    def __init__(self, *stamps):
+        self.stamps = list(stamps)
+
+    def __call__(self):
+        return self.stamps.pop(0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(
+        tmp_path / "snapshots",
+        clock=FixedClock("2025-01-15T10:00:00Z", "2025-06-30T10:00:00Z", "2025-07-01T10:00:00Z"),
+    )
+
+
+class TestSnapshotStore:
+
+    def test_round_trip(self, store):
+        info = store.save(_requirements(), source="test", content_hash="abc")
+        assert info.count == 3
+        assert store.load(info.snapshot_id, Requirement) == _requirements()
+        loaded = store.load(info.snapshot_id, Requirement, ["V1.1.2"])
+        assert [(r.req_id, r.level, r.section_name) for r in loaded] == [("V1.1.2", "2", "Architecture")]
+
+    def test_records_are_deduplicated(self, store):
+        first = store.save(_requirements())
+        changed = _requirements()
+        changed[0] = replace(changed[0], description="Encode output contextually.")
+        second = store.save(changed)
+
+        objects = list((store.root / "objects").rglob("*.json"))
+        assert first.snapshot_id != second.snapshot_id
+        assert len(objects) == 4
+
+    def test_identical_content_reuses_snapshot(self, store):
+        first = store.save(_requirements(), content_hash="abc")
+        second = store.save(list(reversed(_requirements())), content_hash="def")
+        assert second == first
+        assert len(store.snapshots()) == 1
+        assert store.find_content("abc") == first
+
+    def test_resolve(self, store):
+        jan = store.save(_requirements()[:1])
+        jun = store.save(_requirements()[:2])
+        jul = store.save(_requirements())
+
+        assert store.resolve("latest") == jul
+        assert store.resolve("previous") == jun
+        assert store.resolve("2025-06-30") == jun
+        assert store.resolve("2025-03-01") == jan
+        assert store.resolve(jan.snapshot_id[:8]) == jan
+        with pytest.raises(SnapshotError):
+            store.resolve("2024-12-31")
+        with pytest.raises(SnapshotError):
+            store.resolve("ffff" if not jul.snapshot_id.startswith("ffff") else "0000")
+        with pytest.raises(SnapshotError):
+            store.resolve("ab")
+
+    def test_empty_store(self, tmp_path):
+        store = SnapshotStore(tmp_path)
+        assert store.snapshots() == []
+        with pytest.raises(SnapshotError):
+            store.resolve("latest")
+
+
+class TestSnapshotDrift:
+
+    def test_compare_snapshots_reads_only_changed_records(self, store):
+        parser = Mock()
+        detector = DriftDetector(Mock(), Mock(), parser, snapshot_store=store)
+        old = _requirements()
+        new = [replace(old[0], description="Encode output contextually."), old[1],
+               Requirement("V3.1.1", "Log security events.", "2", "V3", "Logging", "V3.1", "Events")]
+        store.save(old, content_hash="1" * 64)
+        store.save(new, content_hash="2" * 64)
+
+        original = store.get_object
+        store.get_object = Mock(side_effect=original)
+        result = detector.compare_snapshots("previous", "latest")
+
+        assert [r.req_id for r in result.added] == ["V3.1.1"]
+        assert [r.req_id for r in result.removed] == ["V2.1.1"]
+        assert [old.req_id for old, _ in result.modified] == ["V1.1.1"]
+        assert (result.local_count, result.upstream_count) == (3, 3)
+        assert result.local_hash == "1" * 16
+        assert store.get_object.call_count == 4
+        parser.parse.assert_not_called()
+
+    def test_fetch_records_snapshot_once(self, store):
+        content = CATALOG_PATH.read_text(encoding="utf-8")
+        fetcher = Mock()
+        fetcher.fetch.return_value = content
+        detector = DriftDetector(Mock(read=Mock(return_value=content)), fetcher, RequirementParser(),
+                                 snapshot_store=store)
+
+        detector.detect(CATALOG_PATH, upstream_url="https://example.test/asvs.json")
+        detector.detect(CATALOG_PATH, upstream_url="https://example.test/asvs.json")
+
+        snapshots = store.snapshots()
+        assert len(snapshots) == 1
+        assert snapshots[0].source == "https://example.test/asvs.json"
+        assert snapshots[0].count == len(RequirementParser().parse(content))
+
+    def test_upstream_file_is_not_recorded(self, store):
+        content = CATALOG_PATH.read_text(encoding="utf-8")
+        detector = DriftDetector(Mock(read=Mock(return_value=content)), Mock(), RequirementParser(),
+                                 snapshot_store=store)
+        detector.detect(CATALOG_PATH, upstream_content=content)
+        assert store.snapshots() == []
+
+    def test_main_from_to(self, isolated_cache_dir, capsys):
+        store = SnapshotStore(isolated_cache_dir / "snapshots",
+                              clock=FixedClock("2025-01-15T10:00:00Z", "2025-06-30T10:00:00Z"))
+        old = _requirements()
+        store.save(old)
+        store.save(old[:2])
+
+        assert main(["--from", "2025-01-31", "--to", "latest", "--format", "json"]) == 1
+        output = json.loads(capsys.readouterr().out)
+        assert [r["id"] for r in output["removed"]] == ["V2.1.1"]
+
+        assert main(["--snapshots"]) == 0
+        listing = capsys.readouterr().out
+        assert "2025-01-15T10:00:00Z" in listing and "2025-06-30T10:00:00Z" in listing
+
+        assert main(["--from", "1999-01-01"]) == 1
+        assert "No snapshot taken" in capsys.readouterr().err
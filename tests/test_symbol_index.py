@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ASVS symbol index.
+"""
+
+import pytest
+
+from tools.symbol_index import (
+    SymbolIndex,
+    extract_python,
+    extract_script,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A small mixed Python/TypeScript repository."""
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "middleware.py").write_text(
+        "import django.middleware.csrf\n"
+        "from argon2 import PasswordHasher\n"
+        "\n"
+        "SESSION_COOKIE_SECURE = True\n"
+        "\n"
+        "class SecurityHeadersMiddleware:\n"
+        "    def __call__(self, request):\n"
+        "        return request\n"
+        "\n"
+        "# class CommentedOutMiddleware: would fool a regex\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "server.ts").write_text(
+        "import helmet from 'helmet';\n"
+        "import { z } from \"@scope/validation/strict\";\n"
+        "const cors = require('cors');\n"
+        "/* class NotReal {} */\n"
+        "const msg = 'class AlsoNotReal';\n"
+        "export class RateLimiter {}\n"
+        "export function applyHeaders(app) { app.use(helmet()); }\n"
+        "interface SessionOptions { secure: boolean }\n"
+        "type Token = string;\n",
+        encoding="utf-8",
+    )
+    return tmp_path
+
+
+class TestExtractors:
+
+    def test_extract_python(self):
+        symbols, imports = extract_python(
+            "import os.path\nfrom a.b import c\nclass K:\n    def m(self): pass\ndef f(): pass\n"
+        )
+        names = {(name, kind) for name, kind, _ in symbols}
+        assert ("K", "class") in names
+        assert ("K.m", "method") in names
+        assert ("f", "function") in names
+        assert set(imports) == {"os.path", "a.b", "a.b.c"}
+
+    def test_extract_python_syntax_error(self):
+        assert extract_python("def broken(:\n") == ([], [])
+
+    def test_extract_script_ignores_comments_and_strings(self):
+        symbols, imports = extract_script(
+            "// class Hidden {}\nconst s = \"function fake() {}\";\nclass Real {}\n"
+        )
+        names = {name for name, _, _ in symbols}
+        assert names == {"s", "Real"}
+        assert imports == []
+
+    def test_extract_script_line_numbers(self):
+        symbols, _ = extract_script("/*\nmulti\nline\n*/\nclass Late {}\n")
+        assert symbols == [("Late", "class", 5)]
+
+
+class TestSymbolIndex:
+
+    def test_find_symbol(self, repo):
+        index = SymbolIndex.load(repo)
+        matches = index.find_symbol("SecurityHeadersMiddleware", kind="class")
+        assert [(m.path, m.line) for m in matches] == [("app/middleware.py", 6)]
+        assert index.find_symbol("CommentedOutMiddleware") == []
+        assert index.find_symbol("NotReal") == []
+        assert index.find_symbol("AlsoNotReal") == []
+
+    def test_find_symbol_wildcard_and_scope(self, repo):
+        index = SymbolIndex.load(repo)
+        assert {m.path for m in index.find_symbol("*Middleware")} == {"app/middleware.py"}
+        assert index.find_symbol("RateLimiter", path_prefix="app") == []
+        assert index.find_symbol("RateLimiter", path_prefix="web")[0].kind == "class"
+
+    def test_find_import(self, repo):
+        index = SymbolIndex.load(repo)
+        assert index.find_import("django.middleware") == ["app/middleware.py"]
+        assert index.find_import("argon2") == ["app/middleware.py"]
+        assert index.find_import("helmet") == ["web/server.ts"]
+        assert index.find_import("cors") == ["web/server.ts"]
+        assert index.find_import("@scope/validation") == ["web/server.ts"]
+        assert index.find_import("bcrypt") == []
+
+    def test_index_is_persisted(self, repo, tmp_path_factory):
+        cache_path = tmp_path_factory.mktemp("idx") / "index.json"
+        SymbolIndex.load(repo, cache_path)
+        assert cache_path.exists()
+
+        reloaded = SymbolIndex(repo, cache_path)
+        reloaded._read_cache()
+        assert set(reloaded.files) == {"app/middleware.py", "web/server.ts"}
+
+    def test_incremental_refresh(self, repo, tmp_path_factory, monkeypatch):
+        cache_path = tmp_path_factory.mktemp("idx") / "index.json"
+        SymbolIndex.load(repo, cache_path)
+
+        (repo / "web" / "server.ts").write_text("export class Replaced {}\n", encoding="utf-8")
+        (repo / "app" / "middleware.py").unlink()
+
+        parsed = []
+        from tools import symbol_index
+        original = symbol_index.extract_script
+        monkeypatch.setattr(
+            symbol_index, "extract_script",
+            lambda source: parsed.append(source) or original(source),
+        )
+
+        index = SymbolIndex.load(repo, cache_path)
+        assert len(parsed) == 1
+        assert index.find_symbol("Replaced")
+        assert index.find_symbol("RateLimiter") == []
+        assert index.find_symbol("SecurityHeadersMiddleware") == []
+
+    def test_unchanged_content_is_not_reparsed(self, repo, tmp_path_factory, monkeypatch):
+        cache_path = tmp_path_factory.mktemp("idx") / "index.json"
+        SymbolIndex.load(repo, cache_path)
+
+        target = repo / "app" / "middleware.py"
+        target.write_bytes(target.read_bytes())  # new mtime, same hash
+
+        from tools import symbol_index
+        monkeypatch.setattr(
+            symbol_index, "extract_python",
+            lambda source: pytest.fail("unchanged file was re-parsed"),
+        )
+        index = SymbolIndex.load(repo, cache_path)
+        assert index.find_symbol("SecurityHeadersMiddleware")
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Unit tests for word-level description diffs.
+"""
+
+from tools.text_diff import render_word_diff, word_diff
+
+
+class TestWordDiff:
+
+    def test_identical(self):
+        assert word_diff("Verify  the\ninput.", "Verify the input.") == [("equal", "Verify the input.")]
+
+    def test_replace_insert_delete(self):
+        ops = word_diff("Use TLS 1.2 for traffic.", "Use TLS 1.3 for all external traffic.")
+        assert ops == [
+            ("equal", "Use TLS"),
+            ("delete", "1.2"),
+            ("insert", "1.3"),
+            ("equal", "for"),
+            ("insert", "all external"),
+            ("equal", "traffic."),
+        ]
+        assert render_word_diff(ops) == "Use TLS [-1.2-]{+1.3+} for {+all external+} traffic."
+
+    def test_empty_sides(self):
+        assert render_word_diff(word_diff("", "New text")) == "{+New text+}"
+        assert render_word_diff(word_diff("Old text", "")) == "[-Old text-]"
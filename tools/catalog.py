@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+ASVS Catalog - The requirement model and parser shared by all tools.
+
+Drift detection, export, catalog verification and reporting all read ASVS
+catalogs through ``RequirementParser`` into ``Requirement`` records.
+
+``Requirement`` uses ``__slots__`` and interns its level, chapter and
+section strings. A catalog repeats each chapter and section name on every
+row, and ``json.loads`` creates a new string for each occurrence.
+Interning keeps one copy per distinct value, and slots drop the per-record
+``__dict__``.
+
+``RequirementIndex`` is built once per loaded catalog and answers lookups
+by ID, chapter, section and level without re-scanning the list.
+"""
+
+import json
+from dataclasses import dataclass, fields
+from typing import IO, Any, Iterable, Iterator, Optional, Union
+
+from tools.json_stream import DEFAULT_CHUNK_SIZE, JsonStreamReader
+
+
+# Keys of the flat catalog format, in file order
+FLAT_FIELDS = ("chapter_id", "chapter_name", "section_id", "section_name", "req_id", "req_description", "L")
+
+# Levels each requirement level belongs to; level views are cumulative
+_CUMULATIVE_LEVELS = {"1": ("1", "2", "3"), "2": ("2", "3"), "3": ("3",)}
+
+_INTERNED = ("level", "chapter_id", "chapter_name", "section_id", "section_name")
+
+# Shared copies of interned values. A private pool rather than sys.intern,
+# which can resize the interpreter-wide table in the middle of a parse.
+_POOL: dict[str, str] = {}
+
+
+def _slotted(cls: type) -> type:
+    """
+    Rebuild a dataclass with ``__slots__``.
+
+    Equivalent to ``@dataclass(slots=True)``, which needs Python 3.10.
+    Field defaults live in the generated ``__init__``, so the class
+    attributes holding them can be dropped.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items() if k not in names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
+@dataclass
+class Requirement:
+    """
+    A single ASVS requirement.
+
+    Equality and hashing use ``req_id`` only, so requirements from two
+    catalog versions can be matched up in sets and dicts.
+    """
+    req_id: str
+    description: str
+    level: str
+    chapter_id: str = ""
+    chapter_name: str = ""
+    section_id: str = ""
+    section_name: str = ""
+
+    def __post_init__(self) -> None:
+        for name in _INTERNED:
+            value = getattr(self, name)
+            setattr(self, name, _POOL.setdefault(value, value))
+
+    def __hash__(self) -> int:
+        return hash(self.req_id)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Requirement):
+            return False
+        return self.req_id == other.req_id
+
+    @property
+    def req_description(self) -> str:
+        """Description under its flat-format key."""
+        return self.description
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Requirement":
+        """Create a Requirement from a flat-format record with validation."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected an object, got {type(data).__name__}")
+        for key in FLAT_FIELDS:
+            if key not in data:
+                raise ValueError(f"Missing required field: {key}")
+        return cls(
+            req_id=str(data["req_id"]),
+            description=str(data["req_description"]),
+            level=str(data["L"]),
+            chapter_id=str(data["chapter_id"]),
+            chapter_name=str(data["chapter_name"]),
+            section_id=str(data["section_id"]),
+            section_name=str(data["section_name"]),
+        )
+
+    def to_dict(self) -> dict[str, str]:
+        """The flat-format record of this requirement."""
+        return {
+            "chapter_id": self.chapter_id,
+            "chapter_name": self.chapter_name,
+            "section_id": self.section_id,
+            "section_name": self.section_name,
+            "req_id": self.req_id,
+            "req_description": self.description,
+            "L": self.level,
+        }
+
+
+class RequirementIndex:
+    """
+    Lookups over one catalog, built in a single pass.
+
+    ``get`` and ``in`` are O(1). ``chapter``, ``section`` and ``at_level``
+    return precomputed lists in catalog order; they are shared, so callers
+    must not modify them. ``at_level`` is cumulative (L1 within L2 within
+    L3), and requirements whose level is not 1-3 are in no level view.
+    When an ID repeats, the first occurrence is indexed and the later ones
+    are kept in ``duplicates``.
+    """
+
+    def __init__(self, requirements: Iterable[Requirement]):
+        self.requirements: list[Requirement] = []
+        self.duplicates: list[Requirement] = []
+        self._by_id: dict[str, Requirement] = {}
+        self._chapters: dict[str, list[Requirement]] = {}
+        self._sections: dict[str, list[Requirement]] = {}
+        self._levels: dict[str, list[Requirement]] = {level: [] for level in _CUMULATIVE_LEVELS}
+
+        for req in requirements:
+            if req.req_id in self._by_id:
+                self.duplicates.append(req)
+                continue
+            self._by_id[req.req_id] = req
+            self.requirements.append(req)
+            self._chapters.setdefault(req.chapter_id, []).append(req)
+            self._sections.setdefault(req.section_id, []).append(req)
+            for level in _CUMULATIVE_LEVELS.get(req.level, ()):
+                self._levels[level].append(req)
+
+    @classmethod
+    def of(cls, requirements: Union["RequirementIndex", Iterable[Requirement]]) -> "RequirementIndex":
+        """Index requirements, or return them unchanged if already indexed."""
+        return requirements if isinstance(requirements, cls) else cls(requirements)
+
+    def __len__(self) -> int:
+        return len(self.requirements)
+
+    def __iter__(self) -> Iterator[Requirement]:
+        return iter(self.requirements)
+
+    def __contains__(self, req_id: object) -> bool:
+        return req_id in self._by_id
+
+    def get(self, req_id: str) -> Optional[Requirement]:
+        """The requirement with this ID, if any."""
+        return self._by_id.get(req_id)
+
+    def ids(self) -> set[str]:
+        """All requirement IDs."""
+        return set(self._by_id)
+
+    @property
+    def chapters(self) -> list[str]:
+        """Chapter IDs in catalog order."""
+        return list(self._chapters)
+
+    def chapter(self, chapter_id: str) -> list[Requirement]:
+        """Requirements of a chapter."""
+        return self._chapters.get(chapter_id, [])
+
+    def section(self, section_id: str) -> list[Requirement]:
+        """Requirements of a section."""
+        return self._sections.get(section_id, [])
+
+    def at_level(self, level: Union[str, int]) -> list[Requirement]:
+        """Requirements needed at a level: its own and every lower level's."""
+        try:
+            return self._levels[str(level)]
+        except KeyError:
+            raise ValueError(f"Invalid level: {level}. Must be one of: 1, 2, 3")
+
+
+class RequirementParser:
+    """Parses ASVS requirements from various JSON formats."""
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+
+    def parse(self, content: str) -> list[Requirement]:
+        """Parse requirements from JSON content."""
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        return self.parse_data(data)
+
+    def parse_data(self, data: Any) -> list[Requirement]:
+        """Parse requirements from decoded JSON."""
+        if isinstance(data, list):
+            return self._parse_flat_format(data)
+        elif isinstance(data, dict):
+            return self._parse_nested_format(data)
+        else:
+            raise ValueError(f"Unexpected JSON structure: {type(data).__name__}")
+
+    def _parse_flat_format(self, data: list[dict[str, Any]]) -> list[Requirement]:
+        """Parse flat array format (used by local JSON files)."""
+        requirements = []
+        for idx, item in enumerate(data):
+            req = self._flat_item(idx, item)
+            if req is not None:
+                requirements.append(req)
+        return requirements
+
+    def _flat_item(self, idx: int, item: Any) -> Optional[Requirement]:
+        """One flat-format record, validated in strict mode; None if skipped."""
+        if self.strict:
+            try:
+                return Requirement.from_dict(item)
+            except ValueError as e:
+                raise ValueError(f"Invalid requirement at index {idx}: {e}")
+        if not isinstance(item, dict):
+            return None
+        req = self._flat_requirement(item)
+        return req if req.req_id else None
+
+    def iter_parse(self, stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Requirement]:
+        """
+        Parse requirements incrementally from a text or binary stream.
+
+        Yields the same requirements as ``parse`` for the flat and nested
+        formats without materializing the document, and validates flat
+        records the same way in strict mode. Requirement objects are
+        decoded one at a time; when a chapter or section lists its items
+        before its ``Shortcode``/``Name`` keys, that chapter or section is
+        buffered until its metadata has been read.
+
+        As in ``parse``, the records of an object document are read as flat
+        requirements only if it holds no nested requirements. Flat records
+        (with a ``req_id``) are yielded as they arrive; other candidates,
+        such as chapters or sections without items, are held until the
+        first nested requirement or the end of the document decides.
+
+        Raises:
+            ValueError: If the document is not a catalog, a record is
+                invalid in strict mode, or a nested requirement follows
+                flat records already yielded
+        """
+        reader = JsonStreamReader(stream, chunk_size)
+        first = reader.peek()
+        if first == "[":
+            for idx in reader.iter_array():
+                req = self._flat_item(idx, reader.read_value())
+                if req is not None:
+                    yield req
+        elif first == "{":
+            yield from self._resolve_events(self._stream_chapter(reader, top_level=True))
+        else:
+            raise ValueError("Unexpected JSON structure: expected an object or array")
+
+    def _resolve_events(self, events: Iterator[tuple[str, Any]]) -> Iterator[Requirement]:
+        """Apply ``parse``'s flat fallback to ("nested", req) / ("flat", record) events."""
+        nested_seen = False
+        flat_started = False
+        held: list[tuple[int, Any]] = []
+        count = 0
+
+        for kind, value in events:
+            if kind == "nested":
+                if flat_started:
+                    raise ValueError("Catalog mixes flat records and nested chapters")
+                nested_seen = True
+                held.clear()
+                yield value
+                continue
+
+            idx, count = count, count + 1
+            if nested_seen:
+                continue
+            if flat_started or (isinstance(value, dict) and "req_id" in value):
+                flat_started = True
+                held.append((idx, value))
+                for held_idx, item in held:
+                    req = self._flat_item(held_idx, item)
+                    if req is not None:
+                        yield req
+                held.clear()
+            else:
+                held.append((idx, value))
+
+        if not nested_seen:
+            for held_idx, item in held:
+                req = self._flat_item(held_idx, item)
+                if req is not None:
+                    yield req
+
+    def _stream_chapter(
+        self, reader: JsonStreamReader, top_level: bool = False, candidate: bool = False
+    ) -> Iterator[tuple[str, Any]]:
+        """
+        Stream one chapter object (or the top-level document) as events.
+
+        Nested requirements are ("nested", Requirement). Records that
+        ``parse`` would read as flat if the document had no nested
+        requirements are ("flat", fields): the items of a top-level
+        ``requirements`` array (``candidate``) and, for a single-chapter
+        document, its sections.
+        """
+        meta: dict[str, Any] = {}
+        pending: list[tuple[dict[str, Any], dict[str, Any]]] = []
+
+        for key in reader.iter_object():
+            char = reader.peek()
+            if top_level and key in ("requirements", "chapters") and char == "[":
+                for _ in reader.iter_array():
+                    if reader.peek() == "{":
+                        yield from self._stream_chapter(reader, candidate=key == "requirements")
+                    elif key == "requirements":
+                        yield "flat", reader.read_value()
+                    else:
+                        reader.skip_value()
+            elif key in ("Items", "sections") and char == "[":
+                sections_are_records = top_level and key == "Items"
+                for _ in reader.iter_array():
+                    if reader.peek() != "{":
+                        if sections_are_records:
+                            yield "flat", reader.read_value()
+                        else:
+                            reader.skip_value()
+                        continue
+                    for section, req_data in self._stream_section(reader, sections_are_records):
+                        if section is None:
+                            yield "flat", req_data
+                        elif "Shortcode" in meta and "Name" in meta:
+                            yield from self._flush(pending, meta)
+                            req = self._nested_requirement(req_data, meta, section)
+                            if req.req_id:
+                                yield "nested", req
+                        else:
+                            pending.append((section, req_data))
+            elif char in ("{", "["):
+                reader.skip_value()
+            else:
+                meta[key] = reader.read_value()
+
+        # ``parse`` reads a top-level document as a chapter only if it has a Name
+        if not top_level or "Name" in meta:
+            yield from self._flush(pending, meta)
+        if candidate:
+            yield "flat", meta
+
+    def _stream_section(
+        self, reader: JsonStreamReader, candidate: bool
+    ) -> Iterator[tuple[Optional[dict[str, Any]], dict[str, Any]]]:
+        """
+        Stream one section object as (section metadata, requirement data) pairs.
+
+        With ``candidate`` the section's own fields follow as (None, fields),
+        for the flat fallback of a single-chapter document.
+        """
+        meta: dict[str, Any] = {}
+        pending: list[dict[str, Any]] = []
+
+        for key in reader.iter_object():
+            char = reader.peek()
+            if key in ("Items", "requirements") and char == "[":
+                for _ in reader.iter_array():
+                    if reader.peek() != "{":
+                        reader.skip_value()
+                        continue
+                    req_data = reader.read_value()
+                    if "Shortcode" in meta and "Name" in meta:
+                        for buffered in pending:
+                            yield meta, buffered
+                        pending.clear()
+                        yield meta, req_data
+                    else:
+                        pending.append(req_data)
+            elif char in ("{", "["):
+                reader.skip_value()
+            else:
+                meta[key] = reader.read_value()
+
+        for buffered in pending:
+            yield meta, buffered
+        if candidate:
+            yield None, meta
+
+    def _flush(
+        self,
+        pending: list[tuple[dict[str, Any], dict[str, Any]]],
+        chapter: dict[str, Any],
+    ) -> Iterator[tuple[str, Requirement]]:
+        for section, req_data in pending:
+            req = self._nested_requirement(req_data, chapter, section)
+            if req.req_id:
+                yield "nested", req
+        pending.clear()
+
+    @staticmethod
+    def _flat_requirement(item: dict[str, Any]) -> Requirement:
+        return Requirement(
+            req_id=str(item.get("req_id", item.get("Shortcode", ""))),
+            description=str(item.get("req_description", item.get("Description", ""))),
+            level=str(item.get("L", item.get("Level", ""))),
+            chapter_id=str(item.get("chapter_id", item.get("Chapter", ""))),
+            chapter_name=str(item.get("chapter_name", item.get("ChapterName", ""))),
+            section_id=str(item.get("section_id", item.get("Section", ""))),
+            section_name=str(item.get("section_name", item.get("SectionName", ""))),
+        )
+
+    @staticmethod
+    def _nested_requirement(
+        req_data: dict[str, Any],
+        chapter: dict[str, Any],
+        section: dict[str, Any],
+    ) -> Requirement:
+        return Requirement(
+            req_id=str(req_data.get("Shortcode", req_data.get("req_id", ""))),
+            description=str(req_data.get("Description", req_data.get("req_description", ""))),
+            level=str(req_data.get("L1", {}).get("Required", "") or
+                      req_data.get("L2", {}).get("Required", "") or
+                      req_data.get("L3", {}).get("Required", "") or
+                      req_data.get("L", "")),
+            chapter_id=str(chapter.get("Shortcode", chapter.get("chapter_id", ""))),
+            chapter_name=str(chapter.get("Name", chapter.get("chapter_name", ""))),
+            section_id=str(section.get("Shortcode", section.get("section_id", ""))),
+            section_name=str(section.get("Name", section.get("section_name", ""))),
+        )
+
+    def _parse_nested_format(self, data: dict[str, Any]) -> list[Requirement]:
+        """Parse nested format (used by upstream OWASP JSON)."""
+        requirements = []
+
+        chapters = data.get("requirements", data.get("chapters", []))
+        if not chapters and "Name" in data:
+            chapters = [data]
+
+        for chapter in chapters:
+            if not isinstance(chapter, dict):
+                continue
+
+            items = chapter.get("Items", chapter.get("sections", []))
+            for section in items:
+                if not isinstance(section, dict):
+                    continue
+
+                reqs = section.get("Items", section.get("requirements", []))
+                for req_data in reqs:
+                    if not isinstance(req_data, dict):
+                        continue
+
+                    req = self._nested_requirement(req_data, chapter, section)
+                    if req.req_id:
+                        requirements.append(req)
+
+        if not requirements:
+            return self._parse_flat_format(
+                data.get("requirements", data.get("Items", []))
+            )
+
+        return requirements
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+ASVS Catalog Bundle - The reference catalogs packaged with the tools.
+
+``tools/data/core-reference.tar.xz`` holds the ``01-ASVS-Core-Reference``
+files of the resource manifest, including ``Functional-Requirements/``,
+laid out as in the checkout, so an installed ``asvs`` can export and
+verify the catalogs without a checkout or a download. The archive is read through
+``importlib.resources`` and unpacked on first use into the resource cache,
+in a directory named after its SHA-256; later runs only check that the
+directory exists, and an upgraded bundle unpacks next to the old one.
+
+The archive is written deterministically (sorted members, zeroed
+timestamps and owners), so rebuilding unchanged files gives identical
+bytes and ``--check`` can tell whether the bundle is current.
+
+ASVS Requirements Addressed:
+- V15.1.2: Maintain requirement inventory catalog
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tarfile
+from pathlib import Path
+from typing import Optional
+
+from tools.catalog_verifier import DEFAULT_REFERENCE_DIR
+
+
+# --- Constants ---
+
+BUNDLE_PACKAGE = "tools.data"
+
+BUNDLE_NAME = "core-reference.tar.xz"
+
+# Subdirectory of the resource cache holding unpacked bundles
+BUNDLE_CACHE_SUBDIR = "bundle"
+
+DEFAULT_BUNDLE_PATH = Path(__file__).parent / "data" / BUNDLE_NAME
+
+# xz preset used for the shipped archive
+XZ_PRESET = 9
+
+
+# Resource manifest categories bundled, all under the core reference directory
+BUNDLE_CATEGORIES = ("core_reference", "functional_requirements")
+
+
+def bundle_files() -> list[str]:
+    """Paths, relative to the core reference directory, that go into the bundle."""
+    from tools.resource_manager import RESOURCE_MANIFEST
+    files = []
+    for category in BUNDLE_CATEGORIES:
+        entry = RESOURCE_MANIFEST[category]
+        prefix = Path(entry["base_path"]).relative_to(DEFAULT_REFERENCE_DIR).as_posix()
+        files.extend(name if prefix == "." else f"{prefix}/{name}" for name in entry["files"])
+    return files
+
+
+def build_bundle(reference_dir: Path, files: Optional[list[str]] = None) -> bytes:
+    """
+    Archive reference files as a deterministic tar.xz.
+
+    Raises:
+        OSError: If a file cannot be read
+    """
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:xz", preset=XZ_PRESET, format=tarfile.PAX_FORMAT) as tar:
+        for name in sorted(files if files is not None else bundle_files()):
+            data = (Path(reference_dir) / name).read_bytes()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o644
+            info.mtime = 0
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def read_bundle() -> Optional[bytes]:
+    """The packaged archive, or None if this installation has none."""
+    try:
+        from importlib import resources
+        return resources.files(BUNDLE_PACKAGE).joinpath(BUNDLE_NAME).read_bytes()
+    except (ImportError, OSError):
+        return None
+
+
+def _safe_member_path(name: str) -> Optional[Path]:
+    """A member's relative path, or None if it could point outside the bundle."""
+    parts = name.split("/")
+    if not name or any(part in ("", ".", "..") or "\\" in part for part in parts):
+        return None
+    return Path(*parts)
+
+
+def _extract(data: bytes, target: Path) -> None:
+    """Unpack the regular files of an archive into a new directory."""
+    tmp_dir = target.with_name(f"{target.name}.tmp{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:xz") as tar:
+            for member in tar.getmembers():
+                # Only plain files at relative paths; never follow paths out of the bundle
+                relative = _safe_member_path(member.name)
+                if not member.isfile() or relative is None:
+                    continue
+                source = tar.extractfile(member)
+                if source is not None:
+                    (tmp_dir / relative).parent.mkdir(parents=True, exist_ok=True)
+                    (tmp_dir / relative).write_bytes(source.read())
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # Unpacked concurrently by another process
+            if not target.is_dir():
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def bundle_dir(cache_dir: Optional[Path] = None, data: Optional[bytes] = None) -> Optional[Path]:
+    """
+    Directory holding the unpacked bundle, unpacking it on first use.
+
+    Args:
+        cache_dir: Resource cache directory (default: ``get_cache_dir()``)
+        data: Archive bytes (default: the packaged bundle)
+
+    Returns:
+        The directory, or None if there is no bundle or it cannot be unpacked.
+    """
+    if data is None:
+        data = read_bundle()
+    if data is None:
+        return None
+
+    if cache_dir is None:
+        from tools.resource_manager import get_cache_dir
+        cache_dir = get_cache_dir()
+
+    target = Path(cache_dir) / BUNDLE_CACHE_SUBDIR / hashlib.sha256(data).hexdigest()[:16]
+    if target.is_dir():
+        return target
+    try:
+        _extract(data, target)
+    except (OSError, tarfile.TarError, EOFError):
+        return None
+    return target
+
+
+def bundled_file(filename: str, cache_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Path of one packaged reference file, or None if it is not bundled.
+
+    ``filename`` is relative to the core reference directory, e.g.
+    ``Functional-Requirements/ASVS-Functional-Requirements-L2.json``.
+    """
+    directory = bundle_dir(cache_dir)
+    if directory is None:
+        return None
+    relative = _safe_member_path(filename)
+    if relative is None:
+        return None
+    path = directory / relative
+    return path if path.is_file() else None
+
+
+# --- CLI ---
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="catalog-bundle",
+        description="Rebuild the compressed reference catalog bundle shipped in tools/data",
+        epilog="Example: catalog-bundle --check",
+    )
+
+    parser.add_argument(
+        "--path",
+        type=Path,
+        help=f"Reference catalog directory (default: {DEFAULT_REFERENCE_DIR})",
+    )
+
+    parser.add_argument(
+        "--base-path",
+        type=Path,
+        default=Path.cwd(),
+        help="Base path for finding the reference directory (default: current directory)",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_BUNDLE_PATH,
+        help=f"Bundle file to write (default: tools/data/{BUNDLE_NAME})",
+    )
+
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report whether the bundle is out of date; exit 1 if it is",
+    )
+
+    return parser
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Main entry point for the CLI."""
+    parser = create_parser()
+    parsed = parser.parse_args(args)
+
+    reference_dir = parsed.path or parsed.base_path / DEFAULT_REFERENCE_DIR
+    try:
+        data = build_bundle(reference_dir)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        current = parsed.output.read_bytes()
+    except OSError:
+        current = None
+
+    if current == data:
+        print(f"{parsed.output} is up to date")
+        return 0
+    if parsed.check:
+        print(f"{parsed.output} is out of date; run 'asvs catalog bundle'")
+        return 1
+
+    parsed.output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = parsed.output.with_suffix(parsed.output.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, parsed.output)
+    print(f"Wrote {parsed.output} ({len(data)} bytes, {len(bundle_files())} files)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+ASVS Catalog Database - SQLite copy of the reference catalogs for search.
+
+``build`` loads the full catalog, the L1/L2 subsets and the
+Functional-Requirements files (plus any internal catalogs passed with
+``--add``) into one SQLite database:
+
+- ``requirements``: one row per (source file, requirement), indexed on
+  ``req_id``, ``chapter_id``, ``section_id`` and ``level``
+- ``requirements_fts``: an FTS5 index over the descriptions, stemmed with
+  the Porter tokenizer
+
+``search`` runs a full-text query and returns each matching requirement
+once, with the files it appears in. When the SQLite build lacks FTS5 the
+database is built without the index and searches fall back to ``LIKE``.
+
+The database is a cache: it is rebuilt from scratch by every ``build`` and
+written atomically.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from tools.catalog import Requirement, RequirementParser
+from tools.catalog_verifier import (
+    DEFAULT_REFERENCE_DIR,
+    DERIVED_CATALOGS,
+    REFERENCE_CATALOG,
+    parse_csv,
+)
+
+
+# --- Constants ---
+
+# Database file in the resource cache
+CATALOG_DB_NAME = "catalog.db"
+
+# Bump when the table layout changes
+CATALOG_DB_VERSION = 1
+
+DEFAULT_SEARCH_LIMIT = 20
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE sources (
+    name TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE requirements (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL REFERENCES sources(name),
+    req_id TEXT NOT NULL,
+    level INTEGER,
+    chapter_id TEXT NOT NULL,
+    chapter_name TEXT NOT NULL,
+    section_id TEXT NOT NULL,
+    section_name TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX requirements_req_id ON requirements(req_id);
+CREATE INDEX requirements_chapter ON requirements(chapter_id);
+CREATE INDEX requirements_section ON requirements(section_id);
+CREATE INDEX requirements_level ON requirements(level);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE requirements_fts USING fts5(
+    description,
+    content='requirements',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+INSERT INTO requirements_fts(requirements_fts) VALUES ('rebuild');
+"""
+
+
+class CatalogDatabaseError(ValueError):
+    """Raised when the catalog database is missing, stale or unreadable."""
+    pass
+
+
+# --- Data Classes ---
+
+@dataclass
+class SearchHit:
+    """A requirement matching a search, with the files containing it."""
+    req_id: str
+    level: Optional[int]
+    chapter_name: str
+    section_name: str
+    description: str
+    sources: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.req_id,
+            "level": self.level,
+            "chapter": self.chapter_name,
+            "section": self.section_name,
+            "description": self.description,
+            "sources": self.sources,
+        }
+
+
+@dataclass
+class BuildReport:
+    """What ``build`` loaded."""
+    path: Path
+    sources: dict[str, int] = field(default_factory=dict)
+    full_text: bool = True
+
+    @property
+    def count(self) -> int:
+        return sum(self.sources.values())
+
+
+def default_db_path() -> Path:
+    """Catalog database location in the resource cache."""
+    from tools.resource_manager import get_cache_dir
+    return get_cache_dir() / CATALOG_DB_NAME
+
+
+def fts5_available() -> bool:
+    """Whether this SQLite build includes FTS5."""
+    with closing(sqlite3.connect(":memory:")) as conn:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(x)")
+        except sqlite3.OperationalError:
+            return False
+    return True
+
+
+def _level(value: str) -> Optional[int]:
+    return int(value) if value.isdigit() else None
+
+
+def _match_expression(query: str) -> str:
+    """
+    FTS5 expression requiring every word of a free-text query.
+
+    Words are quoted so that punctuation (``V1.2``, ``single-sign-on``) is
+    not read as query syntax; a trailing ``*`` keeps prefix matching.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def _like_pattern(word: str) -> str:
+    word = word.rstrip("*")
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# --- Database ---
+
+class CatalogDatabase:
+    """Builds and queries the SQLite catalog database."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else default_db_path()
+
+    def build(self, sources: Iterable[tuple[str, str, list[Requirement]]]) -> BuildReport:
+        """
+        Replace the database with the given catalogs.
+
+        Args:
+            sources: (name, content hash, requirements) per catalog file.
+                Requirements without a level take the level of the same
+                ID in an earlier source.
+        """
+        full_text = fts5_available()
+        report = BuildReport(self.path, full_text=full_text)
+        levels: dict[str, str] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            conn.executescript(SCHEMA)
+            for name, content_hash, requirements in sources:
+                rows = []
+                for req in requirements:
+                    level = req.level or levels.get(req.req_id, "")
+                    levels.setdefault(req.req_id, level)
+                    rows.append((
+                        name, req.req_id, _level(level), req.chapter_id, req.chapter_name,
+                        req.section_id, req.section_name, req.description,
+                    ))
+                conn.execute("INSERT INTO sources VALUES (?, ?, ?)", (name, content_hash, len(rows)))
+                conn.executemany(
+                    "INSERT INTO requirements (source, req_id, level, chapter_id, chapter_name, "
+                    "section_id, section_name, description) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                report.sources[name] = len(rows)
+            if full_text:
+                conn.executescript(FTS_SCHEMA)
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [("version", str(CATALOG_DB_VERSION)), ("fts5", "1" if full_text else "0")],
+            )
+            conn.commit()
+        os.replace(tmp_path, self.path)
+        return report
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self.path.exists():
+            raise CatalogDatabaseError(
+                f"Catalog database not found: {self.path}. Run 'asvs catalog build' first."
+            )
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError as e:
+            conn.close()
+            raise CatalogDatabaseError(f"Unreadable catalog database {self.path}: {e}")
+        if meta.get("version") != str(CATALOG_DB_VERSION):
+            conn.close()
+            raise CatalogDatabaseError("Catalog database is out of date. Run 'asvs catalog build' again.")
+        conn.row_factory = sqlite3.Row
+        self._full_text = meta.get("fts5") == "1"
+        return conn
+
+    def search(
+        self,
+        query: str,
+        level: Optional[int] = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> list[SearchHit]:
+        """
+        Requirements whose description contains every word of ``query``.
+
+        Args:
+            query: Free text; ``word*`` matches a prefix
+            level: Only requirements at this level or below
+            limit: Maximum number of requirements returned
+
+        Returns:
+            Hits ordered by relevance (requirement ID without FTS5)
+        """
+        words = query.split()
+        if not words:
+            raise CatalogDatabaseError("Empty search query")
+
+        with closing(self._connect()) as conn:
+            params: list[Any] = []
+            if self._full_text:
+                sql = (
+                    "SELECT r.* FROM requirements_fts JOIN requirements r ON r.id = requirements_fts.rowid "
+                    "WHERE requirements_fts MATCH ?"
+                )
+                params.append(_match_expression(query))
+            else:
+                sql = "SELECT r.* FROM requirements r WHERE " + " AND ".join(
+                    "r.description LIKE ? ESCAPE '\\'" for _ in words
+                )
+                params.extend(_like_pattern(word) for word in words)
+            if level is not None:
+                sql += " AND r.level <= ?"
+                params.append(level)
+            sql += " ORDER BY rank, r.id" if self._full_text else " ORDER BY r.id"
+            rows = conn.execute(sql, params).fetchall()
+
+        # Rank orders the requirements; each is shown as worded in the
+        # earliest-built source that matched, normally the full catalog
+        hits: dict[str, SearchHit] = {}
+        source_rows: dict[str, dict[str, int]] = {}
+        for row in rows:
+            req_id = row["req_id"]
+            seen = source_rows.get(req_id)
+            if seen is None:
+                if len(hits) >= limit:
+                    continue
+                seen = source_rows[req_id] = {}
+            if not seen or row["id"] < min(seen.values()):
+                hits[req_id] = SearchHit(
+                    req_id=req_id,
+                    level=row["level"],
+                    chapter_name=row["chapter_name"],
+                    section_name=row["section_name"],
+                    description=row["description"],
+                )
+            seen.setdefault(row["source"], row["id"])
+        for req_id, hit in hits.items():
+            seen = source_rows[req_id]
+            hit.sources = sorted(seen, key=seen.__getitem__)
+        return list(hits.values())
+
+
+# --- Loading ---
+
+def load_sources(
+    reference_dir: Path,
+    extra: Iterable[Path] = (),
+) -> list[tuple[str, str, list[Requirement]]]:
+    """
+    Read the reference catalogs and any extra catalog files.
+
+    Shipped files are named by their path under ``reference_dir``, extra
+    files by the path given. Missing optional reference files are skipped.
+    """
+    parser = RequirementParser()
+    reference_dir = Path(reference_dir)
+    files = [(REFERENCE_CATALOG, reference_dir / REFERENCE_CATALOG, True)]
+    files += [(spec.path, reference_dir / spec.path, False) for spec in DERIVED_CATALOGS]
+    files += [(str(path), Path(path), True) for path in extra]
+
+    sources = []
+    for name, path, required in files:
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            if required:
+                raise
+            continue
+        content = raw.decode("utf-8")
+        requirements = parse_csv(content) if path.suffix == ".csv" else parser.parse(content)
+        sources.append((name, hashlib.sha256(raw).hexdigest(), requirements))
+    return sources
+
+
+# --- Output Formatters ---
+
+class TextFormatter:
+    """Format search hits as human-readable text."""
+
+    def format(self, query: str, hits: list[SearchHit]) -> str:
+        if not hits:
+            return f'No requirements match "{query}"'
+        noun = "requirement" if len(hits) == 1 else "requirements"
+        lines = [f'{len(hits)} {noun} match "{query}"', ""]
+        for hit in hits:
+            level = f"L{hit.level}" if hit.level is not None else "L?"
+            lines.append(f"  {hit.req_id}  {level}  {hit.chapter_name} > {hit.section_name}")
+            lines.append(f"      {hit.description}")
+            lines.append(f"      in: {', '.join(hit.sources)}")
+        return "\n".join(lines)
+
+
+class JsonFormatter:
+    """Format search hits as JSON."""
+
+    def format(self, query: str, hits: list[SearchHit]) -> str:
+        return json.dumps({"query": query, "count": len(hits), "results": [h.to_dict() for h in hits]}, indent=2)
+
+
+# --- CLI ---
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="catalog-db",
+        description="Build and search a SQLite copy of the ASVS reference catalogs",
+        epilog='Example: catalog-db build && catalog-db search "jwt signature" --level 2',
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help=f"Database file (default: {CATALOG_DB_NAME} in the resource cache)",
+    )
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    build_parser = subparsers.add_parser("build", help="(Re)build the database")
+    build_parser.add_argument(
+        "--path",
+        type=Path,
+        help=f"Reference catalog directory (default: {DEFAULT_REFERENCE_DIR})",
+    )
+    build_parser.add_argument(
+        "--base-path",
+        type=Path,
+        default=Path.cwd(),
+        help="Base path for finding the reference directory (default: current directory)",
+    )
+    build_parser.add_argument(
+        "--add",
+        type=Path,
+        action="append",
+        default=[],
+        metavar="CATALOG",
+        help="Also load an internal catalog JSON file (repeatable)",
+    )
+
+    search_parser = subparsers.add_parser("search", help="Full-text search of requirement descriptions")
+    search_parser.add_argument("query", help="Words that must all appear; 'word*' matches a prefix")
+    search_parser.add_argument(
+        "--level",
+        type=int,
+        choices=[1, 2, 3],
+        help="Only requirements at this level or below",
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_SEARCH_LIMIT,
+        help=f"Maximum number of results (default: {DEFAULT_SEARCH_LIMIT})",
+    )
+    search_parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    return parser
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Main entry point for the CLI."""
+    parser = create_parser()
+    parsed = parser.parse_args(args)
+    database = CatalogDatabase(parsed.db)
+
+    try:
+        if parsed.action == "build":
+            reference_dir = parsed.path or parsed.base_path / DEFAULT_REFERENCE_DIR
+            report = database.build(load_sources(reference_dir, parsed.add))
+            mode = "full-text index" if report.full_text else "no FTS5; searches use LIKE"
+            print(f"Built {report.path}: {report.count} rows from {len(report.sources)} files ({mode})")
+            return 0
+
+        if parsed.limit < 1:
+            print("Error: --limit must be at least 1", file=sys.stderr)
+            return 1
+        hits = database.search(parsed.query, parsed.level, parsed.limit)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    formatter = JsonFormatter() if parsed.format == "json" else TextFormatter()
+    print(formatter.format(parsed.query, hits))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+ASVS Catalog Deriver - Rebuild the level subsets from the full catalog.
+
+The L1/L2 JSON and CSV files in ``01-ASVS-Core-Reference`` are generated
+from ``ASVS-5.0-en.json``: the JSON files hold every requirement at or
+below their level in the flat format, and the CSV files the
+(req_id, description) pairs. ``derive`` streams the full catalog once and
+feeds every requirement to each output that includes its level.
+
+``derived-manifest.json`` records the SHA-256 of the full catalog and of
+each output. When the full catalog, the generator and an output are all
+unchanged, that output is skipped; when nothing is stale the catalog is
+not parsed at all. Output is deterministic (catalog order, fixed JSON and
+CSV formatting, no timestamps), so regenerating an unchanged catalog is a
+no-op and merging requirements into the full catalog gives minimal diffs.
+
+ASVS Requirements Addressed:
+- V15.1.2: Maintain requirement inventory catalog
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from tools.catalog import Requirement, RequirementParser
+from tools.catalog_verifier import DEFAULT_REFERENCE_DIR, REFERENCE_CATALOG
+
+
+# --- Constants ---
+
+MANIFEST_NAME = "derived-manifest.json"
+
+# Bump when the output format changes, to regenerate every output
+DERIVE_VERSION = 1
+
+# Bytes hashed per read
+HASH_CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class DerivedOutput:
+    """A file generated from the full catalog."""
+    path: str
+    level: int
+    format: str
+
+
+DERIVED_OUTPUTS = (
+    DerivedOutput("ASVS-L1-Baseline.json", 1, "json"),
+    DerivedOutput("ASVS-L2-Standard.json", 2, "json"),
+    DerivedOutput("ASVS-L1-Baseline.csv", 1, "csv"),
+    DerivedOutput("ASVS-L2-Standard.csv", 2, "csv"),
+)
+
+
+# --- Data Classes ---
+
+@dataclass
+class OutputStatus:
+    """What ``derive`` did, or would do, with one output."""
+    path: str
+    status: str
+    count: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"path": self.path, "status": self.status, "count": self.count}
+
+
+@dataclass
+class DeriveReport:
+    """Result of a derive run."""
+    source: str
+    source_hash: str
+    parsed: bool = False
+    outputs: list[OutputStatus] = field(default_factory=list)
+
+    @property
+    def stale(self) -> list[OutputStatus]:
+        return [o for o in self.outputs if o.status in ("stale", "written")]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "source": self.source,
+            "source_sha256": self.source_hash,
+            "parsed": self.parsed,
+            "outputs": [o.to_dict() for o in self.outputs],
+        }
+
+
+# --- Writers ---
+
+class JsonArrayWriter:
+    """Builds a flat-format array byte-identical to ``json.dumps(items, indent=2)`` plus a newline."""
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+
+    def add(self, req: Requirement) -> None:
+        item = json.dumps(req.to_dict(), indent=2).replace("\n", "\n  ")
+        self.parts.append(f"  {item}")
+
+    @property
+    def count(self) -> int:
+        return len(self.parts)
+
+    def getvalue(self) -> str:
+        if not self.parts:
+            return "[]\n"
+        return "[\n" + ",\n".join(self.parts) + "\n]\n"
+
+
+class CsvWriter:
+    """Builds a headerless, fully quoted (req_id, description) CSV."""
+
+    def __init__(self) -> None:
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        self.count = 0
+
+    def add(self, req: Requirement) -> None:
+        self.writer.writerow([req.req_id, req.description])
+        self.count += 1
+
+    def getvalue(self) -> str:
+        return self.buffer.getvalue()
+
+
+WRITERS = {"json": JsonArrayWriter, "csv": CsvWriter}
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """SHA-256 of a file read in chunks, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+# --- Deriver ---
+
+class CatalogDeriver:
+    """Regenerates the derived catalog files of a reference directory."""
+
+    def __init__(
+        self,
+        reference_dir: Path,
+        outputs: Optional[tuple[DerivedOutput, ...]] = None,
+        source: str = REFERENCE_CATALOG,
+    ):
+        self.reference_dir = Path(reference_dir)
+        self.outputs = outputs if outputs is not None else DERIVED_OUTPUTS
+        self.source = source
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.reference_dir / MANIFEST_NAME
+
+    def read_manifest(self) -> dict[str, Any]:
+        """The recorded hashes, or an empty manifest."""
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _is_current(self, output: DerivedOutput, manifest: dict[str, Any], source_hash: str) -> bool:
+        entry = manifest.get("outputs", {}).get(output.path)
+        return (
+            manifest.get("version") == DERIVE_VERSION
+            and manifest.get("source", {}).get("sha256") == source_hash
+            and isinstance(entry, dict)
+            and entry.get("level") == output.level
+            and entry.get("sha256") is not None
+            and entry.get("sha256") == file_sha256(self.reference_dir / output.path)
+        )
+
+    def derive(self, check: bool = False, force: bool = False) -> DeriveReport:
+        """
+        Regenerate stale outputs and the manifest.
+
+        Args:
+            check: Report stale outputs without writing anything
+            force: Treat every output as stale
+
+        Raises:
+            OSError: If the full catalog cannot be read
+            ValueError: If the full catalog cannot be parsed
+        """
+        source_path = self.reference_dir / self.source
+        source_hash = file_sha256(source_path)
+        if source_hash is None:
+            raise OSError(f"Cannot read {source_path}")
+
+        manifest = self.read_manifest()
+        report = DeriveReport(self.source, source_hash)
+        stale = [o for o in self.outputs if force or not self._is_current(o, manifest, source_hash)]
+
+        if not stale:
+            report.outputs = [OutputStatus(o.path, "up-to-date", manifest["outputs"][o.path].get("count", 0))
+                              for o in self.outputs]
+            return report
+
+        # One streaming pass feeds every stale output
+        writers = {o.path: WRITERS[o.format]() for o in stale}
+        targets: dict[str, list[Any]] = {
+            level: [writers[o.path] for o in stale if o.level >= int(level)] for level in ("1", "2", "3")
+        }
+        report.parsed = True
+        with source_path.open("rb") as handle:
+            for req in RequirementParser().iter_parse(handle):
+                for writer in targets.get(req.level, ()):
+                    writer.add(req)
+
+        entries = dict(manifest.get("outputs", {})) if manifest.get("version") == DERIVE_VERSION else {}
+        for output in self.outputs:
+            writer = writers.get(output.path)
+            if writer is None:
+                report.outputs.append(OutputStatus(output.path, "up-to-date", entries[output.path].get("count", 0)))
+                continue
+
+            data = writer.getvalue().encode("utf-8")
+            digest = hashlib.sha256(data).hexdigest()
+            path = self.reference_dir / output.path
+            if digest == file_sha256(path):
+                status = "unchanged"
+            else:
+                status = "stale" if check else "written"
+                if not check:
+                    _write_atomic(path, data)
+            report.outputs.append(OutputStatus(output.path, status, writer.count))
+            entries[output.path] = {"level": output.level, "count": writer.count, "sha256": digest}
+
+        new_manifest = {
+            "version": DERIVE_VERSION,
+            "source": {"path": self.source, "sha256": source_hash},
+            "outputs": {o.path: entries[o.path] for o in self.outputs},
+        }
+        if new_manifest != manifest:
+            if check:
+                # Outputs that match but are unrecorded still need a manifest update
+                report.outputs = [
+                    OutputStatus(o.path, "stale", o.count) if o.status == "unchanged" else o
+                    for o in report.outputs
+                ]
+            else:
+                data = (json.dumps(new_manifest, indent=2, sort_keys=True) + "\n").encode("utf-8")
+                _write_atomic(self.manifest_path, data)
+        return report
+
+
+# --- Output Formatters ---
+
+class TextFormatter:
+    """Format a derive report as human-readable text."""
+
+    def format(self, report: DeriveReport, check: bool = False) -> str:
+        lines = [f"Source: {report.source} (sha256 {report.source_hash[:12]})"]
+        for output in report.outputs:
+            lines.append(f"  {output.status:<11} {output.path} ({output.count} requirements)")
+        lines.append("")
+        stale = report.stale
+        if check and stale:
+            lines.append(f"{len(stale)} derived files are out of date; run 'asvs catalog derive'")
+        elif check:
+            lines.append("All derived files are up to date")
+        elif stale:
+            lines.append(f"Regenerated {len(stale)} derived files")
+        else:
+            lines.append("Nothing to regenerate")
+        return "\n".join(lines)
+
+
+class JsonFormatter:
+    """Format a derive report as JSON."""
+
+    def format(self, report: DeriveReport, check: bool = False) -> str:
+        return json.dumps(report.to_dict(), indent=2)
+
+
+# --- CLI ---
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="catalog-deriver",
+        description="Regenerate the L1/L2 JSON and CSV catalogs from ASVS-5.0-en.json",
+        epilog=f"Example: catalog-deriver --path {DEFAULT_REFERENCE_DIR} --check",
+    )
+
+    parser.add_argument(
+        "--path",
+        type=Path,
+        help=f"Reference catalog directory (default: {DEFAULT_REFERENCE_DIR})",
+    )
+
+    parser.add_argument(
+        "--base-path",
+        type=Path,
+        default=Path.cwd(),
+        help="Base path for finding the reference directory (default: current directory)",
+    )
+
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report out-of-date files; exit 1 if there are any",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every output even if the manifest says it is current",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+
+    return parser
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Main entry point for the CLI."""
+    parser = create_parser()
+    parsed = parser.parse_args(args)
+
+    reference_dir = parsed.path or parsed.base_path / DEFAULT_REFERENCE_DIR
+    try:
+        report = CatalogDeriver(reference_dir).derive(check=parsed.check, force=parsed.force)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    formatter = JsonFormatter() if parsed.format == "json" else TextFormatter()
+    print(formatter.format(report, check=parsed.check))
+    return 1 if parsed.check and report.stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+ASVS Catalog Merkle Trees - Hierarchical content hashes for catalogs.
+
+A catalog is hashed as a tree: root -> chapter -> section -> requirement.
+Each requirement leaf hashes the canonical JSON of its ID, description and
+level; each inner node hashes its own ID and name plus the sorted
+(child ID, child hash) pairs. Hashes therefore depend only on catalog
+content, not on JSON key order, whitespace or requirement order.
+
+Comparing two trees only descends into subtrees whose hashes differ, so
+the cost of a comparison grows with the amount of change rather than the
+size of the catalogs.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional
+
+
+@dataclass
+class MerkleNode:
+    """A node of a catalog Merkle tree."""
+    key: str
+    name: str = ""
+    digest: str = ""
+    children: dict[str, "MerkleNode"] = field(default_factory=dict)
+
+    def leaves(self) -> Iterator[str]:
+        """Requirement IDs under this node."""
+        if not self.children:
+            yield self.key
+            return
+        for child in self.children.values():
+            yield from child.leaves()
+
+
+@dataclass
+class MerkleDiff:
+    """Requirement IDs that differ between two trees, found top-down."""
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    chapters: list[str] = field(default_factory=list)
+    visited: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def _canonical_hash(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _seal(node: MerkleNode) -> None:
+    """Compute inner node hashes bottom-up."""
+    for child in node.children.values():
+        if child.children:
+            _seal(child)
+    node.digest = _canonical_hash({
+        "id": node.key,
+        "name": node.name,
+        "children": sorted((key, child.digest) for key, child in node.children.items()),
+    })
+
+
+def build_tree(requirements: Iterable[Any]) -> MerkleNode:
+    """
+    Build the Merkle tree of a catalog.
+
+    ``requirements`` are objects with ``chapter_id``, ``chapter_name``,
+    ``section_id``, ``section_name``, ``req_id``, ``description`` and
+    ``level`` attributes.
+    """
+    root = MerkleNode(key="")
+    for req in requirements:
+        chapter = root.children.get(req.chapter_id)
+        if chapter is None:
+            chapter = root.children[req.chapter_id] = MerkleNode(req.chapter_id, req.chapter_name)
+        section = chapter.children.get(req.section_id)
+        if section is None:
+            section = chapter.children[req.section_id] = MerkleNode(req.section_id, req.section_name)
+        section.children[req.req_id] = MerkleNode(
+            key=req.req_id,
+            digest=_canonical_hash({
+                "id": req.req_id,
+                "description": req.description.strip(),
+                "level": req.level,
+            }),
+        )
+    _seal(root)
+    return root
+
+
+def diff_trees(local: MerkleNode, upstream: MerkleNode, leaves: bool = True) -> MerkleDiff:
+    """
+    Compare two trees, descending only into subtrees whose hashes differ.
+
+    Requirements that moved to another chapter or section appear as both
+    removed and added at first, and are reported as changed instead.
+
+    Args:
+        local: Baseline tree
+        upstream: Compared tree
+        leaves: When False, stop at the chapter level (``chapters`` only)
+    """
+    diff = MerkleDiff()
+    diff.visited = 1
+    if local.digest == upstream.digest:
+        return diff
+
+    for key in sorted(local.children.keys() | upstream.children.keys()):
+        a, b = local.children.get(key), upstream.children.get(key)
+        diff.visited += 1
+        if a is not None and b is not None and a.digest == b.digest:
+            continue
+        diff.chapters.append(key)
+        if leaves:
+            _walk(a, b, diff)
+
+    moved = set(diff.added) & set(diff.removed)
+    if moved:
+        diff.added = [r for r in diff.added if r not in moved]
+        diff.removed = [r for r in diff.removed if r not in moved]
+        diff.changed.extend(sorted(moved))
+    return diff
+
+
+def _walk(a: Optional[MerkleNode], b: Optional[MerkleNode], diff: MerkleDiff) -> None:
+    if a is None:
+        diff.added.extend(b.leaves())
+        return
+    if b is None:
+        diff.removed.extend(a.leaves())
+        return
+    if not a.children and not b.children:
+        diff.changed.append(a.key)
+        return
+    for key in sorted(a.children.keys() | b.children.keys()):
+        child_a, child_b = a.children.get(key), b.children.get(key)
+        diff.visited += 1
+        if child_a is not None and child_b is not None and child_a.digest == child_b.digest:
+            continue
+        _walk(child_a, child_b, diff)
+
+
+def tree_to_rows(root: MerkleNode) -> list[tuple[int, str, str, str]]:
+    """Flatten a tree to (depth, key, name, digest) rows in pre-order."""
+    rows: list[tuple[int, str, str, str]] = []
+
+    def visit(node: MerkleNode, depth: int) -> None:
+        rows.append((depth, node.key, node.name, node.digest))
+        for child in node.children.values():
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return rows
+
+
+def tree_from_rows(rows: list[tuple[int, str, str, str]]) -> MerkleNode:
+    """Rebuild a tree flattened by tree_to_rows."""
+    if not rows:
+        raise ValueError("Empty Merkle tree")
+    depth, key, name, digest = rows[0]
+    root = MerkleNode(key, name, digest)
+    stack = [root]
+    for depth, key, name, digest in rows[1:]:
+        node = MerkleNode(key, name, digest)
+        del stack[depth:]
+        stack[-1].children[key] = node
+        stack.append(node)
+    return root
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+ASVS Catalog Verifier - Cross-file consistency of the shipped reference catalogs.
+
+``01-ASVS-Core-Reference`` ships the same requirements several times: the
+full ``ASVS-5.0-en.json``, the L1/L2 JSON and CSV exports, and the
+Functional-Requirements rewrites. Each file is read once and hash-joined
+on ``req_id`` against the full catalog, reporting:
+
+- missing: a requirement at or below the file's level that it lacks
+- unknown: an ID that is not in the full catalog
+- above-level: a requirement whose level is above the file's level
+- level: a level that differs from the full catalog (reported as
+  above-level instead when it also puts the requirement in the wrong file)
+- description: requirement text that differs (not checked for the
+  Functional-Requirements files, which reword every requirement)
+- structure: a chapter or section that differs
+- duplicate: an ID listed more than once in one file
+
+ASVS Requirements Addressed:
+- V15.1.2: Maintain requirement inventory catalog
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from tools.catalog import Requirement, RequirementIndex, RequirementParser
+
+
+# --- Constants ---
+
+DEFAULT_REFERENCE_DIR = "01-ASVS-Core-Reference"
+
+REFERENCE_CATALOG = "ASVS-5.0-en.json"
+
+
+# --- Data Classes ---
+
+@dataclass
+class CatalogSpec:
+    """A file derived from the full catalog and what it should agree on."""
+    path: str
+    level: int
+    has_levels: bool = True
+    has_structure: bool = True
+    compare_descriptions: bool = True
+
+
+DERIVED_CATALOGS = (
+    CatalogSpec("ASVS-L1-Baseline.json", 1),
+    CatalogSpec("ASVS-L2-Standard.json", 2),
+    CatalogSpec("ASVS-L1-Baseline.csv", 1, has_levels=False, has_structure=False),
+    CatalogSpec("ASVS-L2-Standard.csv", 2, has_levels=False, has_structure=False),
+    CatalogSpec("Functional-Requirements/ASVS-Functional-Requirements-L1.json", 1, compare_descriptions=False),
+    CatalogSpec("Functional-Requirements/ASVS-Functional-Requirements-L2.json", 2, compare_descriptions=False),
+    CatalogSpec("Functional-Requirements/ASVS-Functional-Requirements-L3.json", 3, compare_descriptions=False),
+)
+
+
+@dataclass
+class Finding:
+    """One inconsistency between a derived file and the full catalog."""
+    path: str
+    req_id: str
+    kind: str
+    detail: str = ""
+
+    def to_dict(self) -> dict[str, str]:
+        return {"id": self.req_id, "kind": self.kind, "detail": self.detail}
+
+
+@dataclass
+class FileReport:
+    """Verification result for one file."""
+    path: str
+    count: int = 0
+    findings: list[Finding] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.findings
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "count": self.count,
+            "passed": self.passed,
+            "findings": [f.to_dict() for f in self.findings],
+        }
+
+
+@dataclass
+class VerificationReport:
+    """Verification results for a reference directory."""
+    reference: FileReport
+    files: list[FileReport] = field(default_factory=list)
+
+    @property
+    def reports(self) -> list[FileReport]:
+        return [self.reference] + self.files
+
+    @property
+    def findings(self) -> list[Finding]:
+        return [f for report in self.reports for f in report.findings]
+
+    @property
+    def passed(self) -> bool:
+        return not self.findings
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "status": "pass" if self.passed else "fail",
+            "findings": len(self.findings),
+            "reference": self.reference.to_dict(),
+            "files": [report.to_dict() for report in self.files],
+        }
+
+
+# --- Loading ---
+
+def parse_csv(content: str) -> list[Requirement]:
+    """Parse a two-column (req_id, description) CSV export."""
+    requirements = []
+    for row in csv.reader(io.StringIO(content)):
+        if len(row) >= 2 and row[0].strip():
+            requirements.append(Requirement(req_id=row[0].strip(), description=row[1], level=""))
+    return requirements
+
+
+class CatalogVerifier:
+    """Hash-joins derived catalog files against the full catalog."""
+
+    def __init__(
+        self,
+        reference_dir: Path,
+        specs: Optional[tuple[CatalogSpec, ...]] = None,
+        reference_catalog: str = REFERENCE_CATALOG,
+    ):
+        self.reference_dir = Path(reference_dir)
+        self.specs = specs if specs is not None else DERIVED_CATALOGS
+        self.reference_catalog = reference_catalog
+        self.parser = RequirementParser()
+
+    def load(self, rel_path: str) -> list[Requirement]:
+        """Read and parse one file by suffix."""
+        content = (self.reference_dir / rel_path).read_text(encoding="utf-8")
+        if rel_path.endswith(".csv"):
+            return parse_csv(content)
+        return self.parser.parse(content)
+
+    @staticmethod
+    def _index(report: FileReport, requirements: list[Requirement]) -> RequirementIndex:
+        index = RequirementIndex(requirements)
+        report.findings.extend(Finding(report.path, req.req_id, "duplicate") for req in index.duplicates)
+        report.count = len(requirements)
+        return index
+
+    def verify(self) -> VerificationReport:
+        """Verify every derived file against the full catalog."""
+        reference = FileReport(self.reference_catalog)
+        master = self._index(reference, self.load(self.reference_catalog))
+        for req in master:
+            if not req.level.isdigit():
+                reference.findings.append(
+                    Finding(reference.path, req.req_id, "level", f"invalid level {req.level!r}")
+                )
+
+        result = VerificationReport(reference=reference)
+        for spec in self.specs:
+            report = FileReport(spec.path)
+            result.files.append(report)
+            try:
+                requirements = self.load(spec.path)
+            except (OSError, ValueError) as e:
+                report.findings.append(Finding(spec.path, "", "unreadable", str(e)))
+                continue
+            self._compare(spec, report, master, self._index(report, requirements))
+        return result
+
+    def _compare(
+        self,
+        spec: CatalogSpec,
+        report: FileReport,
+        master: RequirementIndex,
+        derived: RequirementIndex,
+    ) -> None:
+        findings = report.findings
+
+        for ref in master.at_level(spec.level):
+            if ref.req_id not in derived:
+                findings.append(Finding(spec.path, ref.req_id, "missing", f"L{ref.level}"))
+
+        for req in derived:
+            req_id = req.req_id
+            ref = master.get(req_id)
+            if ref is None:
+                findings.append(Finding(spec.path, req_id, "unknown"))
+                continue
+
+            level_differs = spec.has_levels and req.level != ref.level
+            level_detail = f"L{ref.level} in reference" + (f", L{req.level} here" if level_differs else "")
+            if ref.level.isdigit() and int(ref.level) > spec.level:
+                findings.append(Finding(spec.path, req_id, "above-level", level_detail))
+            elif level_differs:
+                findings.append(Finding(spec.path, req_id, "level", level_detail))
+            if spec.compare_descriptions and req.description.strip() != ref.description.strip():
+                findings.append(Finding(spec.path, req_id, "description", "text differs from reference"))
+            if spec.has_structure:
+                fields = [
+                    name for name in ("chapter_id", "chapter_name", "section_id", "section_name")
+                    if getattr(req, name) != getattr(ref, name)
+                ]
+                if fields:
+                    findings.append(Finding(spec.path, req_id, "structure", ", ".join(fields) + " differ"))
+
+        findings.sort(key=lambda f: (_id_key(f.req_id), f.kind))
+
+
+def _id_key(req_id: str) -> tuple[int, ...]:
+    return tuple(int(part) if part.isdigit() else 0 for part in req_id.lstrip("V").split("."))
+
+
+# --- Output Formatters ---
+
+class TextFormatter:
+    """Format a verification report as human-readable text."""
+
+    def format(self, result: VerificationReport) -> str:
+        lines = [
+            "ASVS Catalog Verification",
+            "=" * 25,
+            f"Reference: {result.reference.path} ({result.reference.count} requirements)",
+            "",
+        ]
+        for report in result.reports:
+            status = "OK  " if report.passed else "FAIL"
+            lines.append(f"  {status}  {report.path} ({report.count})")
+            for finding in report.findings:
+                detail = f": {finding.detail}" if finding.detail else ""
+                lines.append(f"          {finding.kind:<12} {finding.req_id}{detail}")
+        lines.append("")
+        if result.passed:
+            lines.append("Status: PASS - all catalogs agree")
+        else:
+            failed = sum(1 for report in result.reports if not report.passed)
+            lines.append(f"Status: FAIL - {len(result.findings)} findings in {failed} files")
+        return "\n".join(lines)
+
+
+class JsonFormatter:
+    """Format a verification report as JSON."""
+
+    def format(self, result: VerificationReport) -> str:
+        return json.dumps(result.to_dict(), indent=2)
+
+
+# --- CLI ---
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="catalog-verifier",
+        description="Check that the shipped ASVS reference catalogs agree with each other",
+        epilog=f"Example: catalog-verifier --path {DEFAULT_REFERENCE_DIR}",
+    )
+
+    parser.add_argument(
+        "--path",
+        type=Path,
+        help=f"Reference catalog directory (default: {DEFAULT_REFERENCE_DIR}, else the packaged bundle)",
+    )
+
+    parser.add_argument(
+        "--base-path",
+        type=Path,
+        default=Path.cwd(),
+        help="Base path for finding the reference directory (default: current directory)",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+
+    return parser
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Main entry point for the CLI."""
+    parser = create_parser()
+    parsed = parser.parse_args(args)
+
+    reference_dir = parsed.path or parsed.base_path / DEFAULT_REFERENCE_DIR
+    if parsed.path is None and not (reference_dir / REFERENCE_CATALOG).exists():
+        from tools.catalog_bundle import bundle_dir
+        reference_dir = bundle_dir() or reference_dir
+    if not (reference_dir / REFERENCE_CATALOG).exists():
+        print(f"Error: {REFERENCE_CATALOG} not found in {reference_dir}", file=sys.stderr)
+        return 1
+
+    try:
+        result = CatalogVerifier(reference_dir).verify()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    formatter = JsonFormatter() if parsed.format == "json" else TextFormatter()
+    print(formatter.format(result))
+    return 0 if result.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
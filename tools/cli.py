@@ -12,6 +12,9 @@ Commands:
     test      - Run DAST verification suite
     export    - Export ASVS requirements
     drift     - Check for ASVS standard drift
+    catalog   - Maintain the ASVS reference catalogs
+    search    - Full-text search of ASVS requirements
+    explain   - Show a requirement with its guidance and decision templates
     resources - Manage CLI resources (download, cache)
 """
 
@@ -30,6 +33,21 @@ def get_version() -> str:
         return "2.2.0"
 
 
+def _max_scan_bytes(value: str) -> int:
+    """argparse type for --max-scan-bytes, validated as the compliance gate does."""
+    # Imported on use: the gate needs the optional PyYAML and is slow to import
+    from tools.compliance_gate import positive_int
+
+    return positive_int(value)
+
+
+def _move_threshold(value: str) -> float:
+    """argparse type for --move-threshold, validated as drift-detector does."""
+    from tools.drift_detector import similarity_threshold
+
+    return similarity_threshold(value)
+
+
 def cmd_init(args: argparse.Namespace) -> int:
     """Handle 'asvs init' command."""
     from tools import init_project
@@ -56,12 +74,17 @@ def cmd_verify(args: argparse.Namespace) -> int:
     if args.config:
         cli_args.extend(["--config", str(args.config)])
 
-    if args.json:
+    if args.ndjson:
+        cli_args.extend(["--format", "ndjson"])
+    elif args.json:
         cli_args.extend(["--format", "json"])
 
     if args.strict:
         cli_args.append("--strict")
 
+    if args.max_scan_bytes is not None:
+        cli_args.extend(["--max-scan-bytes", str(args.max_scan_bytes)])
+
     return compliance_gate.main(cli_args)
 
 
@@ -110,6 +133,15 @@ def cmd_export(args: argparse.Namespace) -> int:
     if args.source:
         cli_args.extend(["--source", str(args.source)])
 
+    if args.with_functional:
+        cli_args.append("--with-functional")
+
+    if args.framework:
+        cli_args.extend(["--framework", args.framework])
+
+    if args.stream:
+        cli_args.append("--stream")
+
     return export_requirements.main(cli_args)
 
 
@@ -128,9 +160,161 @@ def cmd_drift(args: argparse.Namespace) -> int:
     if args.json:
         cli_args.extend(["--format", "json"])
 
+    if args.json_patch:
+        cli_args.extend(["--format", "json-patch"])
+
+    if args.limit is not None:
+        cli_args.extend(["--limit", str(args.limit)])
+
+    if args.offset:
+        cli_args.extend(["--offset", str(args.offset)])
+
+    if args.matrix:
+        cli_args.append("--matrix")
+        cli_args.extend(str(path) for path in args.matrix)
+
+    if args.impact:
+        cli_args.extend(["--impact", str(args.impact)])
+
+    if args.from_ref:
+        cli_args.extend(["--from", args.from_ref])
+
+    if args.to_ref:
+        cli_args.extend(["--to", args.to_ref])
+
+    if args.snapshots:
+        cli_args.append("--snapshots")
+
+    if args.summary_only:
+        cli_args.append("--summary-only")
+
+    if args.stream:
+        cli_args.append("--stream")
+
+    if args.move_threshold is not None:
+        cli_args.extend(["--move-threshold", str(args.move_threshold)])
+
+    if args.no_move_detection:
+        cli_args.append("--no-move-detection")
+
+    if args.max_age is not None:
+        cli_args.extend(["--max-age", str(args.max_age)])
+
+    if args.no_cache:
+        cli_args.append("--no-cache")
+
     return drift_detector.main(cli_args)
 
 
+def cmd_catalog_verify(args: argparse.Namespace) -> int:
+    """Handle 'asvs catalog verify' command."""
+    from tools import catalog_verifier
+
+    cli_args = []
+
+    if args.path:
+        cli_args.extend(["--path", str(args.path)])
+
+    if args.json:
+        cli_args.extend(["--format", "json"])
+
+    return catalog_verifier.main(cli_args)
+
+
+def cmd_catalog_build(args: argparse.Namespace) -> int:
+    """Handle 'asvs catalog build' command."""
+    from tools import catalog_db
+
+    cli_args = []
+
+    if args.db:
+        cli_args.extend(["--db", str(args.db)])
+
+    cli_args.append("build")
+
+    if args.path:
+        cli_args.extend(["--path", str(args.path)])
+
+    for path in args.add:
+        cli_args.extend(["--add", str(path)])
+
+    return catalog_db.main(cli_args)
+
+
+def cmd_catalog_derive(args: argparse.Namespace) -> int:
+    """Handle 'asvs catalog derive' command."""
+    from tools import catalog_deriver
+
+    cli_args = []
+
+    if args.path:
+        cli_args.extend(["--path", str(args.path)])
+
+    if args.check:
+        cli_args.append("--check")
+
+    if args.force:
+        cli_args.append("--force")
+
+    if args.json:
+        cli_args.extend(["--format", "json"])
+
+    return catalog_deriver.main(cli_args)
+
+
+def cmd_catalog_bundle(args: argparse.Namespace) -> int:
+    """Handle 'asvs catalog bundle' command."""
+    from tools import catalog_bundle
+
+    cli_args = []
+
+    if args.path:
+        cli_args.extend(["--path", str(args.path)])
+
+    if args.output:
+        cli_args.extend(["--output", str(args.output)])
+
+    if args.check:
+        cli_args.append("--check")
+
+    return catalog_bundle.main(cli_args)
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    """Handle 'asvs search' command."""
+    from tools import catalog_db
+
+    cli_args = []
+
+    if args.db:
+        cli_args.extend(["--db", str(args.db)])
+
+    cli_args.extend(["search", args.query, "--limit", str(args.limit)])
+
+    if args.level:
+        cli_args.extend(["--level", str(args.level)])
+
+    if args.json:
+        cli_args.extend(["--format", "json"])
+
+    return catalog_db.main(cli_args)
+
+
+def cmd_explain(args: argparse.Namespace) -> int:
+    """Handle 'asvs explain' command."""
+    from tools import explain_requirement
+
+    cli_args = [args.req_id]
+
+    if args.source:
+        cli_args.extend(["--source", str(args.source)])
+
+    if args.json:
+        cli_args.extend(["--format", "json"])
+
+    return explain_requirement.main(cli_args)
+
+
 def cmd_resources(args: argparse.Namespace) -> int:
     """Handle 'asvs resources' command."""
     from tools import resource_manager
@@ -233,11 +417,21 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Output in JSON format",
     )
+    verify_parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one JSON line per result, then a summary line",
+    )
     verify_parser.add_argument(
         "--strict",
         action="store_true",
         help="Fail on warnings",
     )
+    verify_parser.add_argument(
+        "--max-scan-bytes",
+        type=_max_scan_bytes,
+        help="Maximum bytes scanned per file by content checks",
+    )
     verify_parser.set_defaults(func=cmd_verify)
 
     # --- asvs scan ---
@@ -299,9 +493,9 @@ def create_parser() -> argparse.ArgumentParser:
     )
     export_parser.add_argument(
         "--format", "-f",
-        choices=["csv", "jira-json"],
+        choices=["csv", "jira-json", "json"],
         default="csv",
-        help="Output format (default: csv)",
+        help="Output format (default: csv); json is the --framework control coverage",
     )
     export_parser.add_argument(
         "--output", "-o",
@@ -313,6 +507,21 @@ def create_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Custom source JSON file",
     )
+    export_parser.add_argument(
+        "--with-functional",
+        action="store_true",
+        help="Add the functional (\"shall\") text of each requirement",
+    )
+    export_parser.add_argument(
+        "--framework",
+        choices=["soc2", "iso27001"],
+        help="Group the export by SOC2 or ISO 27001 control",
+    )
+    export_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the source incrementally with bounded memory",
+    )
     export_parser.set_defaults(func=cmd_export)
 
     # --- asvs drift ---
@@ -331,13 +540,255 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip upstream fetch (offline mode)",
     )
-    drift_parser.add_argument(
+    drift_format = drift_parser.add_mutually_exclusive_group()
+    drift_format.add_argument(
         "--json",
         action="store_true",
         help="Output in JSON format",
     )
+    drift_format.add_argument(
+        "--json-patch",
+        action="store_true",
+        help="Output an RFC 6902 JSON Patch that turns the local catalog into upstream",
+    )
+    drift_parser.add_argument(
+        "--limit",
+        type=int,
+        help="Show at most this many changes",
+    )
+    drift_parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="Skip this many changes before the first one shown",
+    )
+    drift_parser.add_argument(
+        "--matrix",
+        type=Path,
+        nargs="+",
+        metavar="CATALOG",
+        help="Pairwise drift matrix between two or more catalog files",
+    )
+    drift_parser.add_argument(
+        "--impact",
+        type=Path,
+        metavar="ROOT",
+        help="List evidence manifests and documents under ROOT that mention changed requirements",
+    )
+    drift_parser.add_argument(
+        "--from",
+        dest="from_ref",
+        metavar="SNAPSHOT",
+        help="Compare two recorded snapshots (ID prefix, YYYY-MM-DD, 'latest' or 'previous')",
+    )
+    drift_parser.add_argument(
+        "--to",
+        dest="to_ref",
+        metavar="SNAPSHOT",
+        help="Snapshot to compare --from against (default: latest)",
+    )
+    drift_parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help="List recorded upstream snapshots",
+    )
+    drift_parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="Only report which chapters differ",
+    )
+    drift_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse catalogs incrementally with bounded memory",
+    )
+    drift_parser.add_argument(
+        "--move-threshold",
+        type=_move_threshold,
+        help="Minimum description similarity (0-1) for reporting renumbered requirements",
+    )
+    drift_parser.add_argument(
+        "--no-move-detection",
+        action="store_true",
+        help="Report renumbered requirements as added and removed",
+    )
+    drift_parser.add_argument(
+        "--max-age",
+        type=int,
+        help="Skip the network if the cached upstream copy is younger than this many seconds",
+    )
+    drift_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the upstream HTTP cache",
+    )
     drift_parser.set_defaults(func=cmd_drift)
 
+    # --- asvs catalog ---
+    catalog_parser = subparsers.add_parser(
+        "catalog",
+        help="Maintain the ASVS reference catalogs",
+        description="Check and maintain the shipped ASVS reference catalogs.",
+    )
+    catalog_parser.set_defaults(func=lambda args: catalog_parser.print_help() or 0)
+    catalog_subparsers = catalog_parser.add_subparsers(
+        dest="catalog_command",
+        title="catalog commands",
+        metavar="<catalog command>",
+    )
+
+    catalog_verify_parser = catalog_subparsers.add_parser(
+        "verify",
+        help="Check that the reference catalog files agree",
+        description="Hash-join the reference catalog files on req_id and report missing IDs, "
+                    "level mismatches and description divergence.",
+    )
+    catalog_verify_parser.add_argument(
+        "--path",
+        type=Path,
+        help="Reference catalog directory (default: ./01-ASVS-Core-Reference)",
+    )
+    catalog_verify_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+    catalog_verify_parser.set_defaults(func=cmd_catalog_verify)
+
+    catalog_build_parser = catalog_subparsers.add_parser(
+        "build",
+        help="Build the SQLite catalog database used by 'asvs search'",
+        description="Load the reference catalogs into a SQLite database with a full-text index "
+                    "over requirement descriptions.",
+    )
+    catalog_build_parser.add_argument(
+        "--path",
+        type=Path,
+        help="Reference catalog directory (default: ./01-ASVS-Core-Reference)",
+    )
+    catalog_build_parser.add_argument(
+        "--add",
+        type=Path,
+        action="append",
+        default=[],
+        metavar="CATALOG",
+        help="Also load an internal catalog JSON file (repeatable)",
+    )
+    catalog_build_parser.add_argument(
+        "--db",
+        type=Path,
+        help="Database file (default: catalog.db in the resource cache)",
+    )
+    catalog_build_parser.set_defaults(func=cmd_catalog_build)
+
+    catalog_derive_parser = catalog_subparsers.add_parser(
+        "derive",
+        help="Regenerate the L1/L2 JSON and CSV catalogs from ASVS-5.0-en.json",
+        description="Rebuild the derived level subsets from the full catalog in one pass. "
+                    "Outputs whose inputs are unchanged (per derived-manifest.json) are skipped.",
+    )
+    catalog_derive_parser.add_argument(
+        "--path",
+        type=Path,
+        help="Reference catalog directory (default: ./01-ASVS-Core-Reference)",
+    )
+    catalog_derive_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report out-of-date files; exit 1 if there are any",
+    )
+    catalog_derive_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every output even if the manifest says it is current",
+    )
+    catalog_derive_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+    catalog_derive_parser.set_defaults(func=cmd_catalog_derive)
+
+    catalog_bundle_parser = catalog_subparsers.add_parser(
+        "bundle",
+        help="Rebuild the compressed catalog bundle packaged with the tools",
+        description="Write the core reference files to tools/data/core-reference.tar.xz, "
+                    "which installed tools read when there is no checkout or download.",
+    )
+    catalog_bundle_parser.add_argument(
+        "--path",
+        type=Path,
+        help="Reference catalog directory (default: ./01-ASVS-Core-Reference)",
+    )
+    catalog_bundle_parser.add_argument(
+        "--output",
+        type=Path,
+        help="Bundle file to write (default: tools/data/core-reference.tar.xz)",
+    )
+    catalog_bundle_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report whether the bundle is out of date; exit 1 if it is",
+    )
+    catalog_bundle_parser.set_defaults(func=cmd_catalog_bundle)
+
+    # --- asvs search ---
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Full-text search of ASVS requirements",
+        description="Search requirement descriptions in the database built by 'asvs catalog build'.",
+    )
+    search_parser.add_argument(
+        "query",
+        help="Words that must all appear; 'word*' matches a prefix",
+    )
+    search_parser.add_argument(
+        "--level", "-l",
+        type=int,
+        choices=[1, 2, 3],
+        help="Only requirements at this level or below",
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of results (default: 20)",
+    )
+    search_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+    search_parser.add_argument(
+        "--db",
+        type=Path,
+        help="Database file (default: catalog.db in the resource cache)",
+    )
+    search_parser.set_defaults(func=cmd_search)
+
+    # --- asvs explain ---
+    explain_parser = subparsers.add_parser(
+        "explain",
+        help="Show a requirement with its guidance and decision templates",
+        description="Print the requirement text, the guidance sections that mention it "
+                    "and the decision templates that cover it.",
+    )
+    explain_parser.add_argument(
+        "req_id",
+        help="Requirement ID, e.g. V3.5.1",
+    )
+    explain_parser.add_argument(
+        "--source", "-s",
+        type=Path,
+        help="Custom catalog JSON file",
+    )
+    explain_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+    explain_parser.set_defaults(func=cmd_explain)
+
     # --- asvs resources ---
     resources_parser = subparsers.add_parser(
         "resources",
@@ -10,13 +10,22 @@ ASVS Requirements addressed:
 """
 
 import argparse
+import codecs
 import json
+import mmap
+import os
 import re
 import sys
+import threading
 import yaml
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import IO, Optional, Dict, Any, Iterator, List
+
+from tools.lockfile_index import LockfileIndex, version_at_least
+from tools.symbol_index import SymbolIndex
+from tools.tree_walker import IgnoreRules, walk_files
 
 
 @dataclass
@@ -35,6 +44,18 @@ class ValidationResult:
         """Document is valid if it exists, has content, and no placeholders."""
         return self.exists and self.has_content and not self.has_placeholders
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "document": self.document,
+            "exists": self.exists,
+            "has_content": self.has_content,
+            "has_placeholders": self.has_placeholders,
+            "placeholder_matches": self.placeholder_matches,
+            "is_valid": self.is_valid,
+            "error": self.error,
+        }
+
 
 @dataclass
 class EvidenceResult:
@@ -45,6 +66,16 @@ class EvidenceResult:
     passed: bool
     details: str = ""
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "requirement": self.requirement_id,
+            "type": self.check_type,
+            "target": self.target,
+            "passed": self.passed,
+            "details": self.details,
+        }
+
 
 @dataclass
 class GateResult:
@@ -68,36 +99,26 @@ class GateResult:
             "documents": {
                 "checked": self.documents_checked,
                 "valid": self.documents_valid,
-                "results": [
-                    {
-                        "document": r.document,
-                        "exists": r.exists,
-                        "has_content": r.has_content,
-                        "has_placeholders": r.has_placeholders,
-                        "placeholder_matches": r.placeholder_matches,
-                        "is_valid": r.is_valid,
-                        "error": r.error,
-                    }
-                    for r in self.document_results
-                ]
+                "results": [r.to_dict() for r in self.document_results]
             },
             "evidence": {
                 "checked": self.evidence_checked,
                 "passed": self.evidence_passed,
-                "results": [
-                    {
-                        "requirement": r.requirement_id,
-                        "type": r.check_type,
-                        "target": r.target,
-                        "passed": r.passed,
-                        "details": r.details
-                    }
-                    for r in self.evidence_results
-                ]
+                "results": [r.to_dict() for r in self.evidence_results]
             },
             "errors": self.errors,
         }
 
+    def summary_dict(self) -> dict:
+        """Counts and errors only, as emitted on the final NDJSON line."""
+        return {
+            "passed": self.passed,
+            "level": self.level,
+            "documents": {"checked": self.documents_checked, "valid": self.documents_valid},
+            "evidence": {"checked": self.evidence_checked, "passed": self.evidence_passed},
+            "errors": self.errors,
+        }
+
 
 # Default placeholder patterns that indicate unmodified template content
 DEFAULT_PLACEHOLDER_PATTERNS = [
@@ -117,12 +138,154 @@ REQUIRED_DOCUMENTS_BY_LEVEL = {
 # Minimum content length (bytes) to be considered non-empty
 MIN_CONTENT_LENGTH = 100
 
+# Leading bytes sniffed to decide whether an evidence file is binary
+BINARY_SNIFF_BYTES = 8192
+
+# Default upper bound (bytes) on how much of a file content checks scan
+DEFAULT_MAX_SCAN_BYTES = 10 * 1024 * 1024
+
+# Files larger than this are memory-mapped and searched window by window
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+# Bytes decoded and searched at a time in a memory-mapped file
+SCAN_WINDOW_BYTES = 1024 * 1024
+
+# Characters of each window carried into the next, so matches spanning a
+# window boundary are found; longer boundary-spanning matches may be missed
+SCAN_OVERLAP_CHARS = 64 * 1024
+
+# Files handed to a worker at a time by tree-wide content checks
+TREE_SCAN_BATCH_SIZE = 32
+
+
+@dataclass
+class FileScan:
+    """Outcome of scanning a single file for a pattern."""
+
+    matched: bool = False
+    size: int = 0
+    scanned: int = 0
+    skipped: Optional[str] = None
+
+    @property
+    def truncated(self) -> bool:
+        """True when only a prefix of the file was scanned."""
+        return self.skipped is None and self.scanned < self.size
+
+    def describe(self) -> str:
+        """Suffix for evidence details when the scan did not cover the file."""
+        if self.truncated:
+            return f" (truncated: scanned first {self.scanned} of {self.size} bytes)"
+        return ""
+
+
+class ContentScanner:
+    """
+    Searches files for a regex without decoding binaries or huge files whole.
+
+    The first block of every file is sniffed for NUL bytes; binary files are
+    skipped. Text is decoded as UTF-8 with newlines normalized and searched
+    with the same ``str`` regex whatever the file size. Small files are
+    searched in one piece; larger ones are memory-mapped and decoded in
+    overlapping windows, so memory use does not grow with file size. At most
+    ``max_scan_bytes`` are scanned.
+    """
+
+    def __init__(self, pattern: str, max_scan_bytes: int = DEFAULT_MAX_SCAN_BYTES):
+        self.pattern = pattern
+        self.max_scan_bytes = max_scan_bytes
+        self.text_regex = re.compile(pattern, re.MULTILINE)
+
+    def search_chunks(self, chunks: Iterator[bytes], final: bool) -> bool:
+        """
+        Search UTF-8 byte chunks as one normalized text.
+
+        Each window is searched together with the tail of the previous one;
+        once that tail no longer reaches back to the start of the text, the
+        search begins one character in so that ``^`` and ``\\b`` still see
+        the character before. Until the last window, a match running into
+        the window's end is not trusted (``$`` would match there); the
+        carried tail finds it again with the following text.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        carry = ""
+        trimmed = False
+        pending = b""
+        chunk = next(chunks, b"")
+        while True:
+            following = next(chunks, None)
+            last = following is None
+            text = decoder.decode(pending + chunk, final=last and final)
+            pending = b""
+            # Keep a trailing CR until we know whether LF follows
+            if not last and text.endswith("\r"):
+                text, pending = text[:-1], b"\r"
+            window = carry + text.replace("\r\n", "\n").replace("\r", "\n")
+            for match in self.text_regex.finditer(window, 1 if trimmed else 0):
+                if last or match.end() < len(window):
+                    return True
+            if last:
+                return False
+            if len(window) > SCAN_OVERLAP_CHARS + 1:
+                window, trimmed = window[-(SCAN_OVERLAP_CHARS + 1):], True
+            carry, chunk = window, following
+
+    def scan(self, path: Path) -> FileScan:
+        """Scan a single file."""
+        with path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            result = FileScan(size=size)
+
+            head = handle.read(BINARY_SNIFF_BYTES)
+            if b"\0" in head:
+                result.skipped = "binary"
+                return result
+
+            limit = min(size, self.max_scan_bytes)
+            if size <= MMAP_THRESHOLD_BYTES:
+                data = head[:limit] + handle.read(max(0, limit - len(head)))
+                result.scanned = len(data)
+                result.matched = self.search_chunks(iter([data]), final=not result.truncated)
+            else:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    result.scanned = limit
+                    windows = (
+                        mapped[offset:min(offset + SCAN_WINDOW_BYTES, limit)]
+                        for offset in range(0, limit, SCAN_WINDOW_BYTES)
+                    )
+                    result.matched = self.search_chunks(windows, final=not result.truncated)
+
+        return result
+
 
 class EvidenceVerifier:
     """Verifies technical evidence against an evidence manifest."""
 
-    def __init__(self, base_path: Path):
+    def __init__(
+        self,
+        base_path: Path,
+        max_scan_bytes: int = DEFAULT_MAX_SCAN_BYTES,
+        workers: Optional[int] = None,
+    ):
         self.base_path = base_path
+        self.max_scan_bytes = max_scan_bytes
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._symbol_index: Optional[SymbolIndex] = None
+        self._lockfile_index: Optional[LockfileIndex] = None
+
+    @property
+    def symbol_index(self) -> SymbolIndex:
+        """Symbol index of the base path, loaded and refreshed on first use."""
+        if self._symbol_index is None:
+            self._symbol_index = SymbolIndex.load(self.base_path)
+        return self._symbol_index
+
+    @property
+    def lockfile_index(self) -> LockfileIndex:
+        """Dependency index of every lockfile under the base path, parsed once."""
+        if self._lockfile_index is None:
+            self._lockfile_index = LockfileIndex.build(self.base_path)
+        return self._lockfile_index
 
     def check_file_exists(self, path_str: str) -> tuple[bool, str]:
         """Check if a file exists relative to the base path."""
@@ -136,15 +299,162 @@ class EvidenceVerifier:
         target = self.base_path / path_str
         if not target.exists():
             return False, f"File not found: {path_str}"
-        
+
         try:
-            content = target.read_text(encoding="utf-8")
-            if re.search(pattern, content, re.MULTILINE):
-                return True, f"Pattern '{pattern}' found in {path_str}"
-            return False, f"Pattern '{pattern}' NOT found in {path_str}"
+            scan = ContentScanner(pattern, self.max_scan_bytes).scan(target)
         except Exception as e:
             return False, f"Error reading {path_str}: {str(e)}"
 
+        if scan.skipped:
+            return False, f"Skipped {scan.skipped} file: {path_str}"
+        if scan.matched:
+            return True, f"Pattern '{pattern}' found in {path_str}{scan.describe()}"
+        return False, f"Pattern '{pattern}' NOT found in {path_str}{scan.describe()}"
+
+    def check_tree_contains(
+        self,
+        path_str: str,
+        pattern: str,
+        exclude: Optional[List[str]] = None,
+    ) -> tuple[bool, str]:
+        """
+        Check if any file under a directory contains a regex pattern.
+
+        Files are handed to a thread pool in batches as the tree is walked,
+        with at most two batches per worker in flight. The first match stops
+        the walk and every worker, so "exists anywhere" checks return as soon
+        as one file matches. Ignored, vendored and binary files are skipped.
+        If a worker fails and nothing matched, the check fails with the error
+        rather than reporting the pattern as absent.
+        """
+        root = self.base_path / path_str
+        if not root.is_dir():
+            return False, f"Directory not found: {path_str}"
+
+        try:
+            scanner = ContentScanner(pattern, self.max_scan_bytes)
+        except re.error as e:
+            return False, f"Invalid pattern '{pattern}': {e}"
+
+        rules = IgnoreRules.from_root(self.base_path, exclude or [])
+        found = threading.Event()
+        lock = threading.Lock()
+        hits: list[Path] = []
+        counts = {"scanned": 0, "skipped": 0}
+
+        def scan_batch(batch: list[Path]) -> None:
+            for file_path in batch:
+                if found.is_set():
+                    return
+                try:
+                    scan = scanner.scan(file_path)
+                except (OSError, UnicodeDecodeError):
+                    scan = FileScan(skipped="unreadable")
+                with lock:
+                    if scan.skipped:
+                        counts["skipped"] += 1
+                        continue
+                    counts["scanned"] += 1
+                    if scan.matched and not found.is_set():
+                        hits.append(file_path)
+                        found.set()
+                if found.is_set():
+                    return
+
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+        futures: list[Future] = []
+
+        def submit(pool: ThreadPoolExecutor, batch: list[Path]) -> None:
+            in_flight.acquire()
+            future = pool.submit(scan_batch, batch)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            batch: list[Path] = []
+            for file_path in walk_files(root, self.base_path, rules):
+                if found.is_set():
+                    break
+                batch.append(file_path)
+                if len(batch) >= TREE_SCAN_BATCH_SIZE:
+                    submit(pool, batch)
+                    batch = []
+            if batch and not found.is_set():
+                submit(pool, batch)
+
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors and not hits:
+            return False, (
+                f"Error scanning {path_str}: {errors[0]} "
+                f"({len(errors)} batch(es) failed, {counts['scanned']} files scanned)"
+            )
+
+        if hits:
+            rel = hits[0].relative_to(self.base_path).as_posix()
+            return True, f"Pattern '{pattern}' found in {rel}"
+        return False, (
+            f"Pattern '{pattern}' NOT found under {path_str} "
+            f"({counts['scanned']} files scanned, {counts['skipped']} skipped)"
+        )
+
+    def check_symbol_exists(
+        self,
+        symbol: str,
+        kind: Optional[str] = None,
+        path_str: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """Check if a class, function or variable is defined (via the symbol index)."""
+        if not symbol:
+            return False, "No symbol given"
+        matches = self.symbol_index.find_symbol(symbol, kind, path_str)
+        label = f"{kind} '{symbol}'" if kind else f"Symbol '{symbol}'"
+        if matches:
+            first = matches[0]
+            return True, f"{label} defined in {first.path}:{first.line}"
+        scope = f" under {path_str}" if path_str else ""
+        return False, f"{label} NOT defined{scope}"
+
+    def check_import_exists(
+        self,
+        module: str,
+        path_str: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """Check if a module (or a submodule of it) is imported (via the symbol index)."""
+        if not module:
+            return False, "No module given"
+        files = self.symbol_index.find_import(module, path_str)
+        if files:
+            return True, f"Module '{module}' imported in {files[0]}"
+        scope = f" under {path_str}" if path_str else ""
+        return False, f"Module '{module}' NOT imported{scope}"
+
+    def check_dependency_present(
+        self,
+        package: str,
+        min_version: Optional[str] = None,
+        ecosystem: Optional[str] = None,
+    ) -> tuple[bool, str]:
+        """Check if a package (optionally of a minimum version) is in any lockfile."""
+        if not package:
+            return False, "No package given"
+        found = self.lockfile_index.find(package, ecosystem)
+        if not found:
+            searched = len(self.lockfile_index.lockfiles)
+            return False, f"Dependency '{package}' NOT found in {searched} lockfile(s)"
+
+        if not min_version:
+            dep = found[0]
+            version = f" {dep.version}" if dep.version else ""
+            return True, f"Dependency '{package}'{version} found in {dep.source}"
+
+        for dep in found:
+            if dep.version and version_at_least(dep.version, min_version):
+                return True, (
+                    f"Dependency '{package}' {dep.version} (>= {min_version}) found in {dep.source}"
+                )
+        versions = ", ".join(sorted({d.version or "unpinned" for d in found}))
+        return False, f"Dependency '{package}' below minimum {min_version} (found: {versions})"
+
     def verify_requirement(self, req_id: str, checks: List[Dict[str, Any]]) -> List[EvidenceResult]:
         """Run all checks for a specific ASVS requirement."""
         results = []
@@ -157,6 +467,27 @@ class EvidenceVerifier:
             elif check_type == "content_match":
                 pattern = check.get("pattern", "")
                 passed, details = self.check_file_contains(target, pattern)
+            elif check_type == "tree_content_match":
+                pattern = check.get("pattern", "")
+                passed, details = self.check_tree_contains(
+                    target, pattern, check.get("exclude")
+                )
+            elif check_type == "symbol_exists":
+                passed, details = self.check_symbol_exists(
+                    check.get("symbol", ""), check.get("kind"), target
+                )
+                target = check.get("symbol", "")
+            elif check_type == "import_exists":
+                passed, details = self.check_import_exists(check.get("module", ""), target)
+                target = check.get("module", "")
+            elif check_type == "dependency_present":
+                min_version = check.get("min_version")
+                passed, details = self.check_dependency_present(
+                    check.get("package", ""),
+                    str(min_version) if min_version is not None else None,
+                    check.get("ecosystem"),
+                )
+                target = check.get("package", "")
             else:
                 passed, details = False, f"Unknown check type: {check_type}"
 
@@ -169,6 +500,13 @@ class EvidenceVerifier:
             ))
         return results
 
+    def iter_manifest(self, manifest: Optional[dict]) -> Iterator[EvidenceResult]:
+        """Run every check in a parsed evidence manifest, yielding results as they complete."""
+        if not manifest or "requirements" not in manifest:
+            return
+        for req_id, data in manifest["requirements"].items():
+            yield from self.verify_requirement(req_id, data.get("checks", []))
+
 
 class ComplianceGate:
     """Validates security decision documents against ASVS requirements."""
@@ -247,6 +585,11 @@ class ComplianceGate:
 
         return result
 
+    def iter_results(self) -> Iterator[ValidationResult]:
+        """Validate each required document, yielding results as they complete."""
+        for doc_name in self.get_required_documents():
+            yield self.validate_document(doc_name)
+
     def run(self) -> GateResult:
         """Run the compliance gate validation."""
         required_docs = self.get_required_documents()
@@ -263,8 +606,7 @@ class ComplianceGate:
                 errors=[f"Documents path not found: {self.docs_path}"],
             )
 
-        for doc_name in required_docs:
-            result = self.validate_document(doc_name)
+        for result in self.iter_results():
             results.append(result)
             if not result.is_valid and result.error:
                 errors.append(result.error)
@@ -282,6 +624,74 @@ class ComplianceGate:
         )
 
 
+def _write_ndjson_line(out: IO[str], record: str, data: dict) -> None:
+    out.write(json.dumps({"record": record, **data}) + "\n")
+    out.flush()
+
+
+def stream_ndjson(
+    gate: ComplianceGate,
+    out: IO[str],
+    evidence_manifest: Optional[Path] = None,
+    verifier: Optional[EvidenceVerifier] = None,
+) -> GateResult:
+    """
+    Run the gate and write one JSON line per result as soon as it completes.
+
+    Document lines come first, then evidence lines, then a single summary
+    line. Only counts and error messages are kept, so memory stays flat
+    regardless of how many evidence results a manifest produces.
+
+    Returns:
+        GateResult with counts and errors but no per-result lists
+    """
+    summary = GateResult(passed=True, level=gate.level, documents_checked=0, documents_valid=0)
+
+    if not gate.docs_path.exists():
+        summary.passed = False
+        summary.errors.append(f"Documents path not found: {gate.docs_path}")
+    else:
+        for result in gate.iter_results():
+            _write_ndjson_line(out, "document", result.to_dict())
+            summary.documents_checked += 1
+            if result.is_valid:
+                summary.documents_valid += 1
+            else:
+                summary.passed = False
+                if result.error:
+                    summary.errors.append(result.error)
+
+    if evidence_manifest and evidence_manifest.exists():
+        try:
+            with open(evidence_manifest, 'r') as f:
+                manifest = yaml.safe_load(f)
+            verifier = verifier or EvidenceVerifier(Path.cwd())
+            for result in verifier.iter_manifest(manifest):
+                _write_ndjson_line(out, "evidence", result.to_dict())
+                summary.evidence_checked += 1
+                if result.passed:
+                    summary.evidence_passed += 1
+                else:
+                    summary.passed = False
+        except Exception as e:
+            summary.errors.append(f"Evidence verification failed: {str(e)}")
+            summary.passed = False
+
+    _write_ndjson_line(out, "summary", summary.summary_dict())
+    return summary
+
+
+def positive_int(value: str) -> int:
+    """argparse type for a strictly positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {number}")
+    return number
+
+
 def load_policy_config(config_path: Path) -> dict:
     """Load policy configuration from JSON file."""
     with config_path.open("r", encoding="utf-8") as f:
@@ -345,9 +755,9 @@ def main(args: Optional[list[str]] = None) -> int:
     )
     parser.add_argument(
         "--format",
-        choices=["text", "json"],
+        choices=["text", "json", "ndjson"],
         default="text",
-        help="Output format (default: text)",
+        help="Output format (default: text). ndjson writes one line per result as it completes",
     )
     parser.add_argument(
         "--strict",
@@ -359,6 +769,12 @@ def main(args: Optional[list[str]] = None) -> int:
         type=Path,
         help="Path to evidence.yml configuration file",
     )
+    parser.add_argument(
+        "--max-scan-bytes",
+        type=positive_int,
+        default=DEFAULT_MAX_SCAN_BYTES,
+        help=f"Maximum bytes scanned per file by content checks (default: {DEFAULT_MAX_SCAN_BYTES})",
+    )
 
     parsed = parser.parse_args(args)
 
@@ -383,6 +799,11 @@ def main(args: Optional[list[str]] = None) -> int:
         required_documents=required_documents,
     )
 
+    if parsed.format == "ndjson":
+        verifier = EvidenceVerifier(Path.cwd(), max_scan_bytes=parsed.max_scan_bytes)
+        gate_result = stream_ndjson(gate, sys.stdout, parsed.evidence_manifest, verifier)
+        return 0 if gate_result.passed else 1
+
     gate_result = gate.run()
 
     # Run Evidence Verification
@@ -391,13 +812,8 @@ def main(args: Optional[list[str]] = None) -> int:
             with open(parsed.evidence_manifest, 'r') as f:
                 manifest = yaml.safe_load(f)
             
-            verifier = EvidenceVerifier(Path.cwd())
-            evidence_results = []
-            
-            if manifest and "requirements" in manifest:
-                for req_id, data in manifest["requirements"].items():
-                    checks = data.get("checks", [])
-                    evidence_results.extend(verifier.verify_requirement(req_id, checks))
+            verifier = EvidenceVerifier(Path.cwd(), max_scan_bytes=parsed.max_scan_bytes)
+            evidence_results = list(verifier.iter_manifest(manifest))
             
             gate_result.evidence_results = evidence_results
             gate_result.evidence_checked = len(evidence_results)
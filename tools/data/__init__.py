@@ -0,0 +1 @@
+"""Data files packaged with the tools."""
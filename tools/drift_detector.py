@@ -11,13 +11,33 @@ ASVS Requirements Addressed:
 
 import argparse
 import hashlib
+import io
 import json
+import os
 import sys
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Protocol
-from urllib.request import urlopen
-from urllib.error import URLError
+from typing import IO, Any, Iterable, Iterator, Optional, Protocol, Union
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+
+from tools.catalog import Requirement, RequirementIndex, RequirementParser
+from tools.catalog_bundle import bundled_file
+from tools.catalog_merkle import (
+    MerkleDiff,
+    MerkleNode,
+    build_tree,
+    diff_trees,
+    tree_from_rows,
+    tree_to_rows,
+)
+from tools.json_patch import build_patch, format_patch
+from tools.move_detection import DEFAULT_MOVE_THRESHOLD, find_moves
+from tools.parse_cache import ParseCache, content_digest
+from tools.reference_index import ImpactEntry, ReferenceIndex, affected_files
+from tools.snapshot_store import SnapshotInfo, SnapshotStore
+from tools.text_diff import render_word_diff, word_diff
 
 
 # --- Constants ---
@@ -28,28 +48,11 @@ UPSTREAM_ASVS_URL = (
 
 DEFAULT_LOCAL_PATH = "01-ASVS-Core-Reference/ASVS-5.0-en.json"
 
+# Subdirectory of the resource cache holding conditional-request HTTP caches
+HTTP_CACHE_SUBDIR = "http-cache"
 
-# --- Data Classes ---
-
-@dataclass
-class Requirement:
-    """Represents a single ASVS requirement."""
-    req_id: str
-    description: str
-    level: str
-    chapter_id: str = ""
-    chapter_name: str = ""
-    section_id: str = ""
-    section_name: str = ""
-
-    def __hash__(self) -> int:
-        return hash(self.req_id)
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, Requirement):
-            return False
-        return self.req_id == other.req_id
 
+# --- Data Classes ---
 
 @dataclass
 class DriftResult:
@@ -57,6 +60,7 @@ class DriftResult:
     added: list[Requirement] = field(default_factory=list)
     removed: list[Requirement] = field(default_factory=list)
     modified: list[tuple[Requirement, Requirement]] = field(default_factory=list)
+    moved: list[tuple[Requirement, Requirement, float]] = field(default_factory=list)
     local_hash: str = ""
     upstream_hash: str = ""
     local_count: int = 0
@@ -64,7 +68,7 @@ class DriftResult:
 
     @property
     def has_drift(self) -> bool:
-        return bool(self.added or self.removed or self.modified)
+        return bool(self.added or self.removed or self.modified or self.moved)
 
     @property
     def summary(self) -> str:
@@ -75,9 +79,61 @@ class DriftResult:
             parts.append(f"{len(self.removed)} removed")
         if self.modified:
             parts.append(f"{len(self.modified)} modified")
+        if self.moved:
+            parts.append(f"{len(self.moved)} moved")
         return ", ".join(parts) if parts else "No drift detected"
 
 
+@dataclass
+class CatalogIndex:
+    """Per-requirement content index of one catalog: req_id -> (digest, level)."""
+    label: str
+    path: str
+    content_hash: str
+    count: int
+    entries: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+
+
+@dataclass
+class MatrixCell:
+    """Drift counts going from one catalog (baseline) to another."""
+    added: int = 0
+    removed: int = 0
+    modified: int = 0
+    unchanged: int = 0
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+@dataclass
+class DriftMatrix:
+    """Pairwise drift between N catalogs."""
+    catalogs: list[CatalogIndex] = field(default_factory=list)
+    cells: dict[tuple[int, int], MatrixCell] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "catalogs": [
+                {"label": c.label, "path": c.path, "count": c.count, "hash": c.content_hash}
+                for c in self.catalogs
+            ],
+            "pairs": [
+                {
+                    "from": self.catalogs[i].label,
+                    "to": self.catalogs[j].label,
+                    "added": cell.added,
+                    "removed": cell.removed,
+                    "modified": cell.modified,
+                    "unchanged": cell.unchanged,
+                }
+                for (i, j), cell in sorted(self.cells.items())
+            ],
+        }
+
+
 # --- Protocols for Dependency Injection ---
 
 class FileReader(Protocol):
@@ -115,93 +171,100 @@ class DefaultUrlFetcher:
             raise ConnectionError(f"Failed to fetch {url}: {e}")
 
 
-# --- Requirement Parsing ---
+class CachingUrlFetcher:
+    """
+    URL fetcher that keeps the last response body on disk.
 
-class RequirementParser:
-    """Parses ASVS requirements from various JSON formats."""
-
-    def parse(self, content: str) -> list[Requirement]:
-        """Parse requirements from JSON content."""
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON: {e}")
-
-        if isinstance(data, list):
-            return self._parse_flat_format(data)
-        elif isinstance(data, dict):
-            return self._parse_nested_format(data)
-        else:
-            raise ValueError(f"Unexpected JSON structure: {type(data).__name__}")
+    Bodies are stored with their ``ETag``/``Last-Modified`` validators and
+    revalidated with a conditional request, so an unchanged upstream costs a
+    ``304 Not Modified`` instead of a full download. Within ``max_age``
+    seconds of the last fetch or revalidation the network is skipped.
+    """
 
-    def _parse_flat_format(self, data: list[dict[str, Any]]) -> list[Requirement]:
-        """Parse flat array format (used by local JSON files)."""
-        requirements = []
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            req = Requirement(
-                req_id=str(item.get("req_id", item.get("Shortcode", ""))),
-                description=str(item.get("req_description", item.get("Description", ""))),
-                level=str(item.get("L", item.get("Level", ""))),
-                chapter_id=str(item.get("chapter_id", item.get("Chapter", ""))),
-                chapter_name=str(item.get("chapter_name", item.get("ChapterName", ""))),
-                section_id=str(item.get("section_id", item.get("Section", ""))),
-                section_name=str(item.get("section_name", item.get("SectionName", ""))),
-            )
-            if req.req_id:
-                requirements.append(req)
-        return requirements
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_age: int = 0,
+        timeout: int = 30,
+    ):
+        if cache_dir is None:
+            from tools.resource_manager import get_cache_dir
+            cache_dir = get_cache_dir() / HTTP_CACHE_SUBDIR
+        self.cache_dir = Path(cache_dir)
+        self.max_age = max_age
+        self.timeout = timeout
+        self.last_status: Optional[str] = None
 
-    def _parse_nested_format(self, data: dict[str, Any]) -> list[Requirement]:
-        """Parse nested format (used by upstream OWASP JSON)."""
-        requirements = []
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
 
-        chapters = data.get("requirements", data.get("chapters", []))
-        if not chapters and "Name" in data:
-            chapters = [data]
+    def _read_cache(self, url: str) -> tuple[dict[str, Any], Optional[str]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return {}, None
+        if meta.get("url") != url:
+            return {}, None
+        return meta, body
+
+    def _write_cache(self, url: str, meta: dict[str, Any], body: Optional[str] = None) -> None:
+        meta_path, body_path = self._paths(url)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                tmp_body = body_path.with_suffix(".tmp")
+                tmp_body.write_text(body, encoding="utf-8")
+                os.replace(tmp_body, body_path)
+            tmp_meta = meta_path.with_suffix(".tmp")
+            tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_meta, meta_path)
+        except OSError:
+            # A read-only cache only costs the next run a full download
+            pass
 
-        for chapter in chapters:
-            if not isinstance(chapter, dict):
-                continue
+    def fetch(self, url: str) -> str:
+        """Fetch URL contents, revalidating a cached copy when one exists."""
+        meta, cached_body = self._read_cache(url)
+        now = time.time()
+
+        if cached_body is not None and self.max_age > 0:
+            if now - meta.get("fetched_at", 0) < self.max_age:
+                self.last_status = "fresh"
+                return cached_body
+
+        headers = {}
+        if cached_body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
 
-            chapter_id = str(chapter.get("Shortcode", chapter.get("chapter_id", "")))
-            chapter_name = str(chapter.get("Name", chapter.get("chapter_name", "")))
-
-            items = chapter.get("Items", chapter.get("sections", []))
-            for section in items:
-                if not isinstance(section, dict):
-                    continue
-
-                section_id = str(section.get("Shortcode", section.get("section_id", "")))
-                section_name = str(section.get("Name", section.get("section_name", "")))
-
-                reqs = section.get("Items", section.get("requirements", []))
-                for req_data in reqs:
-                    if not isinstance(req_data, dict):
-                        continue
-
-                    req = Requirement(
-                        req_id=str(req_data.get("Shortcode", req_data.get("req_id", ""))),
-                        description=str(req_data.get("Description", req_data.get("req_description", ""))),
-                        level=str(req_data.get("L1", {}).get("Required", "") or
-                                  req_data.get("L2", {}).get("Required", "") or
-                                  req_data.get("L3", {}).get("Required", "") or
-                                  req_data.get("L", "")),
-                        chapter_id=chapter_id,
-                        chapter_name=chapter_name,
-                        section_id=section_id,
-                        section_name=section_name,
-                    )
-                    if req.req_id:
-                        requirements.append(req)
-
-        if not requirements:
-            return self._parse_flat_format(
-                data.get("requirements", data.get("Items", []))
-            )
+        try:
+            with urlopen(Request(url, headers=headers), timeout=self.timeout) as response:
+                body = response.read().decode("utf-8")
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except HTTPError as e:
+            if e.code == 304 and cached_body is not None:
+                meta["fetched_at"] = now
+                self._write_cache(url, meta)
+                self.last_status = "not-modified"
+                return cached_body
+            raise ConnectionError(f"Failed to fetch {url}: {e}")
+        except URLError as e:
+            raise ConnectionError(f"Failed to fetch {url}: {e}")
 
-        return requirements
+        self._write_cache(url, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+        }, body)
+        self.last_status = "downloaded"
+        return body
 
 
 # --- Drift Detection ---
@@ -214,40 +277,130 @@ class DriftDetector:
         file_reader: FileReader,
         url_fetcher: UrlFetcher,
         parser: RequirementParser,
+        parse_cache: Optional[ParseCache] = None,
+        move_threshold: Optional[float] = DEFAULT_MOVE_THRESHOLD,
+        snapshot_store: Optional[SnapshotStore] = None,
     ):
         self.file_reader = file_reader
         self.url_fetcher = url_fetcher
         self.parser = parser
+        self.parse_cache = parse_cache
+        self.move_threshold = move_threshold
+        self.snapshot_store = snapshot_store
 
     def compute_hash(self, content: str) -> str:
         """Compute SHA-256 hash of content."""
         return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
+    def parse(self, content: str) -> list[Requirement]:
+        """Parse content, reusing the parse cache when one is configured."""
+        if self.parse_cache is None:
+            return self.parser.parse(content)
+        return self.parse_cache.get_or_parse("drift", content, self.parser.parse, Requirement)
+
     def load_local(self, path: Path) -> tuple[list[Requirement], str]:
         """Load requirements from local file."""
         content = self.file_reader.read(path)
-        requirements = self.parser.parse(content)
+        requirements = self.parse(content)
         content_hash = self.compute_hash(content)
         return requirements, content_hash
 
+    def load_tree(self, content: str, requirements: Optional[list[Requirement]] = None) -> MerkleNode:
+        """
+        Merkle tree of a catalog, stored alongside its parse cache entry.
+
+        With a warm cache the tree is loaded without parsing the catalog.
+        """
+        digest = content_digest(content)
+        if self.parse_cache is not None:
+            rows = self.parse_cache.load("merkle", digest)
+            if rows:
+                try:
+                    return tree_from_rows(rows)
+                except (ValueError, TypeError, IndexError):
+                    pass
+        tree = build_tree(requirements if requirements is not None else self.parse(content))
+        if self.parse_cache is not None:
+            self.parse_cache.store("merkle", digest, tree_to_rows(tree))
+        return tree
+
     def fetch_upstream(self, url: str) -> tuple[list[Requirement], str]:
         """Fetch requirements from upstream URL."""
         content = self.url_fetcher.fetch(url)
-        requirements = self.parser.parse(content)
+        requirements = self.parse(content)
+        self.record_snapshot(content, url, requirements)
         content_hash = self.compute_hash(content)
         return requirements, content_hash
 
+    def fetch_content(self, url: str) -> str:
+        """Fetch upstream content and record it as a snapshot."""
+        content = self.url_fetcher.fetch(url)
+        self.record_snapshot(content, url)
+        return content
+
+    def record_snapshot(
+        self,
+        content: str,
+        source: str,
+        requirements: Optional[Iterable[Requirement]] = None,
+    ) -> Optional[SnapshotInfo]:
+        """
+        Add fetched content to the snapshot store, if one is configured.
+
+        Content already recorded is recognized by its hash and not parsed
+        again. Write failures are ignored; snapshots never block a drift check.
+        """
+        if self.snapshot_store is None:
+            return None
+        digest = content_digest(content)
+        existing = self.snapshot_store.find_content(digest)
+        if existing is not None:
+            return existing
+        try:
+            return self.snapshot_store.save(
+                requirements if requirements is not None else self.parse(content),
+                source=source,
+                content_hash=digest,
+            )
+        except OSError:
+            return None
+
+    def compare_snapshots(self, from_ref: str, to_ref: str = "latest") -> DriftResult:
+        """
+        Drift between two recorded snapshots.
+
+        Requirements with identical object hashes in both snapshots are
+        skipped without being read; nothing is downloaded or parsed.
+        """
+        if self.snapshot_store is None:
+            raise ValueError("No snapshot store configured")
+        store = self.snapshot_store
+        old, new = store.resolve(from_ref), store.resolve(to_ref)
+        old_manifest, new_manifest = store.manifest(old.snapshot_id), store.manifest(new.snapshot_id)
+
+        old_ids = {rid for rid, digest in old_manifest.items() if new_manifest.get(rid) != digest}
+        new_ids = {rid for rid, digest in new_manifest.items() if old_manifest.get(rid) != digest}
+        result = self.compare(
+            store.load(old.snapshot_id, Requirement, old_ids),
+            store.load(new.snapshot_id, Requirement, new_ids),
+        )
+        result.local_count = old.count
+        result.upstream_count = new.count
+        result.local_hash = (old.content_hash or old.snapshot_id)[:16]
+        result.upstream_hash = (new.content_hash or new.snapshot_id)[:16]
+        return result
+
     def compare(
         self,
-        local: list[Requirement],
-        upstream: list[Requirement],
+        local: Union[list[Requirement], RequirementIndex],
+        upstream: Union[list[Requirement], RequirementIndex],
     ) -> DriftResult:
         """Compare local and upstream requirements."""
-        local_by_id = {r.req_id: r for r in local}
-        upstream_by_id = {r.req_id: r for r in upstream}
+        local_by_id = RequirementIndex.of(local)
+        upstream_by_id = RequirementIndex.of(upstream)
 
-        local_ids = set(local_by_id.keys())
-        upstream_ids = set(upstream_by_id.keys())
+        local_ids = local_by_id.ids()
+        upstream_ids = upstream_by_id.ids()
 
         added_ids = upstream_ids - local_ids
         removed_ids = local_ids - upstream_ids
@@ -258,17 +411,197 @@ class DriftDetector:
             upstream_count=len(upstream),
         )
 
-        result.added = [upstream_by_id[rid] for rid in sorted(added_ids)]
-        result.removed = [local_by_id[rid] for rid in sorted(removed_ids)]
+        result.added = [upstream_by_id.get(rid) for rid in sorted(added_ids)]
+        result.removed = [local_by_id.get(rid) for rid in sorted(removed_ids)]
 
         for rid in sorted(common_ids):
-            local_req = local_by_id[rid]
-            upstream_req = upstream_by_id[rid]
+            local_req = local_by_id.get(rid)
+            upstream_req = upstream_by_id.get(rid)
             if self._has_changes(local_req, upstream_req):
                 result.modified.append((local_req, upstream_req))
 
+        self.detect_moves(result)
+        return result
+
+    def compare_trees(
+        self,
+        local: Union[list[Requirement], RequirementIndex],
+        upstream: Union[list[Requirement], RequirementIndex],
+        local_tree: MerkleNode,
+        upstream_tree: MerkleNode,
+    ) -> DriftResult:
+        """
+        Compare catalogs, examining only requirements under differing subtrees.
+
+        Produces the same result as ``compare``; unchanged chapters and
+        sections are skipped by hash, and changed requirements are looked
+        up by ID.
+        """
+        diff = diff_trees(local_tree, upstream_tree)
+        if not diff.has_changes:
+            return DriftResult(local_count=len(local), upstream_count=len(upstream))
+
+        local = RequirementIndex.of(local)
+        upstream = RequirementIndex.of(upstream)
+        local_ids = set(diff.removed) | set(diff.changed)
+        upstream_ids = set(diff.added) | set(diff.changed)
+        result = self.compare(
+            [local.get(rid) for rid in local_ids if rid in local],
+            [upstream.get(rid) for rid in upstream_ids if rid in upstream],
+        )
+        result.local_count = len(local)
+        result.upstream_count = len(upstream)
+        return result
+
+    def summarize(self, local_content: str, upstream_content: str) -> MerkleDiff:
+        """Chapters that differ between two catalogs, without visiting unchanged ones."""
+        return diff_trees(self.load_tree(local_content), self.load_tree(upstream_content), leaves=False)
+
+    def detect_moves(self, result: DriftResult) -> None:
+        """
+        Re-classify removed/added pairs with matching descriptions as moves.
+
+        Disabled when ``move_threshold`` is None.
+        """
+        if self.move_threshold is None or not result.removed or not result.added:
+            return
+        removed_by_id = {r.req_id: r for r in result.removed}
+        added_by_id = {r.req_id: r for r in result.added}
+        moves = find_moves(
+            [(r.req_id, r.description) for r in result.removed],
+            [(r.req_id, r.description) for r in result.added],
+            self.move_threshold,
+        )
+        moved_removed = {removed_id for removed_id, _, _ in moves}
+        moved_added = {added_id for _, added_id, _ in moves}
+        result.moved = sorted(
+            ((removed_by_id[r], added_by_id[a], score) for r, a, score in moves),
+            key=lambda m: m[0].req_id,
+        )
+        result.removed = [r for r in result.removed if r.req_id not in moved_removed]
+        result.added = [r for r in result.added if r.req_id not in moved_added]
+
+    def stream_file(self, path: Path, hasher: Optional[Any] = None) -> Iterator[Requirement]:
+        """Stream requirements from a file, feeding its UTF-8 text to ``hasher``."""
+        with path.open("r", encoding="utf-8") as handle:
+            stream = _HashingReader(handle, hasher) if hasher is not None else handle
+            yield from self.parser.iter_parse(stream)
+
+    def detect_streaming(
+        self,
+        local_path: Path,
+        upstream_path: Optional[Path] = None,
+        upstream_url: Optional[str] = None,
+    ) -> DriftResult:
+        """
+        Detect drift without holding either catalog in memory.
+
+        Pass 1 streams the local file into a req_id -> (description digest,
+        level) map. Pass 2 streams upstream, collecting added requirements and
+        the upstream side of modified ones. Pass 3 streams the local file again
+        for removed requirements and the local side of modified ones. Memory
+        grows with the number of requirement IDs and the size of the drift,
+        not with the size of either document. Results match ``detect``.
+        """
+        result = DriftResult()
+
+        local_hasher = hashlib.sha256()
+        local_index: dict[str, tuple[bytes, str]] = {}
+        for req in self.stream_file(local_path, local_hasher):
+            local_index[req.req_id] = (_description_digest(req), req.level)
+            result.local_count += 1
+
+        upstream_hasher = hashlib.sha256()
+        if upstream_path is not None:
+            upstream = self.stream_file(upstream_path, upstream_hasher)
+        else:
+            upstream_url = upstream_url or UPSTREAM_ASVS_URL
+            content = self.url_fetcher.fetch(upstream_url)
+            self.record_snapshot(content, upstream_url, self.parser.iter_parse(io.StringIO(content)))
+            upstream_hasher.update(content.encode("utf-8"))
+            upstream = self.parser.iter_parse(io.StringIO(content))
+
+        added: dict[str, Requirement] = {}
+        changed: dict[str, Requirement] = {}
+        common: set[str] = set()
+        for req in upstream:
+            result.upstream_count += 1
+            entry = local_index.get(req.req_id)
+            if entry is None:
+                added[req.req_id] = req
+                continue
+            common.add(req.req_id)
+            digest, level = entry
+            if digest != _description_digest(req) or (level != req.level and req.level):
+                changed[req.req_id] = req
+            else:
+                changed.pop(req.req_id, None)
+
+        removed: dict[str, Requirement] = {}
+        modified_local: dict[str, Requirement] = {}
+        for req in self.stream_file(local_path):
+            if req.req_id not in common:
+                removed[req.req_id] = req
+            elif req.req_id in changed:
+                modified_local[req.req_id] = req
+
+        result.added = [added[rid] for rid in sorted(added)]
+        result.removed = [removed[rid] for rid in sorted(removed)]
+        result.modified = [(modified_local[rid], changed[rid]) for rid in sorted(changed)]
+        result.local_hash = local_hasher.hexdigest()[:16]
+        result.upstream_hash = upstream_hasher.hexdigest()[:16]
+        self.detect_moves(result)
+        return result
+
+    def build_index(self, path: Path, label: Optional[str] = None) -> CatalogIndex:
+        """Parse a catalog once into a req_id -> (description digest, level) index."""
+        requirements, content_hash = self.load_local(path)
+        return CatalogIndex(
+            label=label or path.stem,
+            path=str(path),
+            content_hash=content_hash,
+            count=len(requirements),
+            entries={r.req_id: (_description_digest(r), r.level) for r in requirements},
+        )
+
+    def matrix(self, paths: list[Path]) -> DriftMatrix:
+        """
+        Compute drift between every ordered pair of catalogs.
+
+        Each catalog is parsed once; every pair is then diffed from the
+        indexes alone. Cell (i, j) treats catalog i as local and catalog j
+        as upstream, with the same change rules as ``compare``. Move
+        detection needs descriptions and is not applied.
+        """
+        stems = [p.stem for p in paths]
+        labels = [stem if stems.count(stem) == 1 else str(p) for stem, p in zip(stems, paths)]
+        result = DriftMatrix(catalogs=[
+            self.build_index(path, label) for path, label in zip(paths, labels)
+        ])
+
+        for i, base in enumerate(result.catalogs):
+            for j, other in enumerate(result.catalogs):
+                if i != j:
+                    result.cells[(i, j)] = self._diff_indexes(base.entries, other.entries)
         return result
 
+    @staticmethod
+    def _diff_indexes(
+        local: dict[str, tuple[bytes, str]],
+        upstream: dict[str, tuple[bytes, str]],
+    ) -> MatrixCell:
+        cell = MatrixCell()
+        for req_id, (digest, level) in upstream.items():
+            entry = local.get(req_id)
+            if entry is None:
+                cell.added += 1
+            elif entry[0] != digest or (entry[1] != level and level):
+                cell.modified += 1
+            else:
+                cell.unchanged += 1
+        cell.removed = len(local.keys() - upstream.keys())
+        return cell
+
     def _has_changes(self, local: Requirement, upstream: Requirement) -> bool:
         """Check if requirement has meaningful changes."""
         if local.description.strip() != upstream.description.strip():
@@ -294,29 +627,81 @@ class DriftDetector:
         Returns:
             DriftResult with detected changes
         """
-        local_reqs, local_hash = self.load_local(local_path)
+        local_content = self.file_reader.read(local_path)
+        fetched = upstream_content is None
+        if fetched:
+            upstream_url = upstream_url or UPSTREAM_ASVS_URL
+            upstream_content = self.url_fetcher.fetch(upstream_url)
+
+        local_reqs = self.parse(local_content)
+        upstream_reqs = self.parse(upstream_content)
+        if fetched:
+            self.record_snapshot(upstream_content, upstream_url, upstream_reqs)
+
+        result = self.compare_trees(
+            local_reqs,
+            upstream_reqs,
+            self.load_tree(local_content, local_reqs),
+            self.load_tree(upstream_content, upstream_reqs),
+        )
+        result.local_hash = self.compute_hash(local_content)
+        result.upstream_hash = self.compute_hash(upstream_content)
 
-        if upstream_content is not None:
-            upstream_reqs = self.parser.parse(upstream_content)
-            upstream_hash = self.compute_hash(upstream_content)
-        elif upstream_url:
-            upstream_reqs, upstream_hash = self.fetch_upstream(upstream_url)
-        else:
-            upstream_reqs, upstream_hash = self.fetch_upstream(UPSTREAM_ASVS_URL)
+        return result
 
-        result = self.compare(local_reqs, upstream_reqs)
-        result.local_hash = local_hash
-        result.upstream_hash = upstream_hash
 
-        return result
+def _description_digest(req: Requirement) -> bytes:
+    return hashlib.blake2b(req.description.strip().encode("utf-8"), digest_size=16).digest()
+
+
+class _HashingReader:
+    """Text stream wrapper that hashes everything read through it."""
+
+    def __init__(self, stream: IO[str], hasher: Any):
+        self._stream = stream
+        self._hasher = hasher
+
+    def read(self, size: int = -1) -> str:
+        chunk = self._stream.read(size)
+        self._hasher.update(chunk.encode("utf-8"))
+        return chunk
 
 
 # --- Output Formatters ---
 
+def page_result(result: DriftResult, offset: int = 0, limit: Optional[int] = None) -> DriftResult:
+    """
+    A window of a drift result's changes, in report order.
+
+    Changes are numbered across the added, removed, modified and moved
+    lists in that order. Counts and hashes are kept from ``result``.
+    """
+    end = None if limit is None else offset + limit
+    page = replace(result)
+    position = 0
+    for name in ("added", "removed", "modified", "moved"):
+        items = getattr(result, name)
+        start = max(offset - position, 0)
+        stop = len(items) if end is None else max(min(end - position, len(items)), 0)
+        setattr(page, name, items[start:stop])
+        position += len(items)
+    return page
+
+
+def _change_count(result: DriftResult) -> int:
+    return len(result.added) + len(result.removed) + len(result.modified) + len(result.moved)
+
+
 class TextFormatter:
     """Format drift results as human-readable text."""
 
-    def format(self, result: DriftResult) -> str:
+    def format(
+        self,
+        result: DriftResult,
+        impact: Optional[list[ImpactEntry]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> str:
         lines = [
             "=" * 60,
             "ASVS Drift Detection Report",
@@ -335,30 +720,73 @@ class TextFormatter:
         lines.append(f"Status: DRIFT DETECTED - {result.summary}")
         lines.append("")
 
-        if result.added:
+        # Diffs are only computed for the changes on the requested page
+        page = page_result(result, offset, limit)
+
+        if page.added:
             lines.append("-" * 40)
             lines.append(f"ADDED ({len(result.added)} requirements in upstream):")
             lines.append("-" * 40)
-            for req in result.added:
+            for req in page.added:
                 lines.append(f"  + {req.req_id}: {req.description[:80]}...")
             lines.append("")
 
-        if result.removed:
+        if page.removed:
             lines.append("-" * 40)
             lines.append(f"REMOVED ({len(result.removed)} requirements not in upstream):")
             lines.append("-" * 40)
-            for req in result.removed:
+            for req in page.removed:
                 lines.append(f"  - {req.req_id}: {req.description[:80]}...")
             lines.append("")
 
-        if result.modified:
+        if page.modified:
             lines.append("-" * 40)
             lines.append(f"MODIFIED ({len(result.modified)} requirements changed):")
             lines.append("-" * 40)
-            for local_req, upstream_req in result.modified:
+            for local_req, upstream_req in page.modified:
                 lines.append(f"  ~ {local_req.req_id}:")
-                lines.append(f"    Local:    {local_req.description[:60]}...")
-                lines.append(f"    Upstream: {upstream_req.description[:60]}...")
+                if local_req.description.strip() != upstream_req.description.strip():
+                    diff = render_word_diff(word_diff(local_req.description, upstream_req.description))
+                    lines.append(f"    {diff}")
+                if local_req.level != upstream_req.level and upstream_req.level:
+                    lines.append(f"    Level: L{local_req.level} -> L{upstream_req.level}")
+            lines.append("")
+
+        if page.moved:
+            lines.append("-" * 40)
+            lines.append(f"MOVED ({len(result.moved)} requirements renumbered):")
+            lines.append("-" * 40)
+            for local_req, upstream_req, score in page.moved:
+                lines.append(
+                    f"  > {local_req.req_id} -> {upstream_req.req_id} (similarity: {score:.2f})"
+                )
+            lines.append("")
+
+        total = _change_count(result)
+        shown = _change_count(page)
+        if shown < total:
+            if shown:
+                lines.append(f"Showing changes {offset + 1}-{offset + shown} of {total}.")
+            else:
+                lines.append(f"No changes at offset {offset} ({total} in total).")
+            if offset + shown < total:
+                lines.append(f"Use --offset {offset + shown} to see more.")
+            lines.append("")
+
+        if impact is not None:
+            referenced = [entry for entry in impact if entry.references]
+            files = affected_files(referenced)
+            lines.append("-" * 40)
+            lines.append(
+                f"IMPACT ({len(referenced)} changed requirements referenced in {len(files)} files):"
+            )
+            lines.append("-" * 40)
+            for entry in referenced:
+                target = f" -> {entry.new_id}" if entry.new_id else ""
+                lines.append(f"  {entry.req_id} ({entry.change}{target}):")
+                for ref in entry.references:
+                    line_list = ", ".join(str(n) for n in ref.lines)
+                    lines.append(f"    [{ref.kind}] {ref.path}:{line_list}")
             lines.append("")
 
         return "\n".join(lines)
@@ -367,7 +795,14 @@ class TextFormatter:
 class JsonFormatter:
     """Format drift results as JSON."""
 
-    def format(self, result: DriftResult) -> str:
+    def format(
+        self,
+        result: DriftResult,
+        impact: Optional[list[ImpactEntry]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> str:
+        page = page_result(result, offset, limit)
         data = {
             "status": "drift" if result.has_drift else "in_sync",
             "summary": result.summary,
@@ -381,26 +816,165 @@ class JsonFormatter:
             },
             "added": [
                 {"id": r.req_id, "description": r.description}
-                for r in result.added
+                for r in page.added
             ],
             "removed": [
                 {"id": r.req_id, "description": r.description}
-                for r in result.removed
+                for r in page.removed
             ],
             "modified": [
                 {
                     "id": local.req_id,
                     "local_description": local.description,
                     "upstream_description": upstream.description,
+                    "diff": render_word_diff(word_diff(local.description, upstream.description)),
+                    "local_level": local.level,
+                    "upstream_level": upstream.level,
+                }
+                for local, upstream in page.modified
+            ],
+            "moved": [
+                {
+                    "local_id": local.req_id,
+                    "upstream_id": upstream.req_id,
+                    "similarity": score,
+                    "local_description": local.description,
+                    "upstream_description": upstream.description,
                 }
-                for local, upstream in result.modified
+                for local, upstream, score in page.moved
             ],
         }
+        if offset or limit is not None:
+            data["page"] = {"offset": offset, "limit": limit, "total": _change_count(result)}
+        if impact is not None:
+            data["impact"] = {
+                "files": affected_files(impact),
+                "requirements": [entry.to_dict() for entry in impact],
+            }
         return json.dumps(data, indent=2)
 
 
+class SummaryFormatter:
+    """Format a chapter-level Merkle summary as text or JSON."""
+
+    def format(
+        self,
+        summary: MerkleDiff,
+        local_hash: str,
+        upstream_hash: str,
+        json_output: bool = False,
+    ) -> str:
+        if json_output:
+            return json.dumps({
+                "status": "drift" if summary.chapters else "in_sync",
+                "changed_chapters": summary.chapters,
+                "local": {"hash": local_hash},
+                "upstream": {"hash": upstream_hash},
+            }, indent=2)
+
+        lines = [
+            "ASVS Drift Summary",
+            "=" * 30,
+            f"Local hash:    {local_hash}",
+            f"Upstream hash: {upstream_hash}",
+            "",
+        ]
+        if summary.chapters:
+            lines.append(f"Status: DRIFT DETECTED - {len(summary.chapters)} chapter(s) changed")
+            lines.extend(f"  ~ {chapter}" for chapter in summary.chapters)
+        else:
+            lines.append("Status: IN SYNC - No drift detected")
+        lines.append("")
+        return "\n".join(lines)
+
+
+class SnapshotListFormatter:
+    """Formats the snapshot index."""
+
+    def format(self, snapshots: list[SnapshotInfo], json_output: bool = False) -> str:
+        if json_output:
+            return json.dumps({"snapshots": [s.to_dict() for s in snapshots]}, indent=2)
+
+        lines = [
+            "ASVS Catalog Snapshots",
+            "=" * 22,
+        ]
+        if not snapshots:
+            lines.append("No snapshots recorded yet.")
+            return "\n".join(lines)
+        for snapshot in snapshots:
+            lines.append(
+                f"  {snapshot.snapshot_id[:12]}  {snapshot.created}  "
+                f"{snapshot.count:>5} requirements  {snapshot.source}"
+            )
+        return "\n".join(lines)
+
+
+class MatrixTextFormatter:
+    """Format a drift matrix as a compact text table."""
+
+    def format(self, matrix: DriftMatrix) -> str:
+        lines = [
+            "=" * 60,
+            "ASVS Drift Matrix",
+            "=" * 60,
+            "",
+            "Catalogs:",
+        ]
+        for n, catalog in enumerate(matrix.catalogs, 1):
+            lines.append(
+                f"  [{n}] {catalog.label}: {catalog.count} requirements (hash: {catalog.content_hash})"
+            )
+        lines.append("")
+        lines.append("Rows are the baseline, columns the compared catalog.")
+        lines.append("Cells: +added -removed ~modified (= when identical)")
+        lines.append("")
+
+        size = len(matrix.catalogs)
+        cells = [
+            [
+                "." if i == j else self._cell(matrix.cells[(i, j)])
+                for j in range(size)
+            ]
+            for i in range(size)
+        ]
+        headers = [f"[{n}]" for n in range(1, size + 1)]
+        width = max(len(text) for row in cells + [headers] for text in row)
+        row_label = len(headers[-1])
+
+        lines.append(" " * row_label + "  " + "  ".join(h.rjust(width) for h in headers))
+        for header, row in zip(headers, cells):
+            lines.append(header.rjust(row_label) + "  " + "  ".join(c.rjust(width) for c in row))
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cell(cell: MatrixCell) -> str:
+        if not cell.has_drift:
+            return "="
+        return f"+{cell.added} -{cell.removed} ~{cell.modified}"
+
+
+class MatrixJsonFormatter:
+    """Format a drift matrix as JSON."""
+
+    def format(self, matrix: DriftMatrix) -> str:
+        return json.dumps(matrix.to_dict(), indent=2)
+
+
 # --- CLI Interface ---
 
+def similarity_threshold(value: str) -> float:
+    """argparse type for a similarity between 0 and 1."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    if not 0.0 <= number <= 1.0:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1, got {value}")
+    return number
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser."""
     parser = argparse.ArgumentParser(
@@ -430,9 +1004,23 @@ def create_parser() -> argparse.ArgumentParser:
 
     parser.add_argument(
         "--format",
-        choices=["text", "json"],
+        choices=["text", "json", "json-patch"],
         default="text",
-        help="Output format (default: text)",
+        help="Output format; json-patch prints an RFC 6902 patch that turns "
+             "the local catalog into the upstream one (default: text)",
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Show at most this many changes (text and json formats)",
+    )
+
+    parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="Skip this many changes before the first one shown (default: 0)",
     )
 
     parser.add_argument(
@@ -448,9 +1036,114 @@ def create_parser() -> argparse.ArgumentParser:
         help="Skip upstream fetch (only validate local file parsing)",
     )
 
+    parser.add_argument(
+        "--matrix",
+        type=Path,
+        nargs="+",
+        metavar="CATALOG",
+        help="Report pairwise drift between two or more catalog files instead of local vs upstream",
+    )
+
+    parser.add_argument(
+        "--impact",
+        type=Path,
+        metavar="ROOT",
+        help="List evidence manifests and documents under ROOT that mention changed requirements",
+    )
+
+    parser.add_argument(
+        "--from",
+        dest="from_ref",
+        metavar="SNAPSHOT",
+        help="Compare two recorded snapshots instead of local vs upstream: "
+             "a snapshot ID prefix, a date (YYYY-MM-DD), 'latest' or 'previous'",
+    )
+
+    parser.add_argument(
+        "--to",
+        dest="to_ref",
+        metavar="SNAPSHOT",
+        default="latest",
+        help="Snapshot to compare --from against (default: latest)",
+    )
+
+    parser.add_argument(
+        "--snapshots",
+        action="store_true",
+        help="List the recorded upstream snapshots",
+    )
+
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="Only report which chapters differ, using the catalogs' Merkle trees",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the local and upstream files incrementally with bounded memory "
+             "(for very large merged catalogs)",
+    )
+
+    parser.add_argument(
+        "--move-threshold",
+        type=similarity_threshold,
+        default=DEFAULT_MOVE_THRESHOLD,
+        help="Minimum description similarity (0-1) for reporting a removed/added "
+             f"pair as a renumbered requirement (default: {DEFAULT_MOVE_THRESHOLD})",
+    )
+
+    parser.add_argument(
+        "--no-move-detection",
+        action="store_true",
+        help="Report renumbered requirements as separate added and removed entries",
+    )
+
+    parser.add_argument(
+        "--max-age",
+        type=int,
+        default=0,
+        help="Reuse the cached upstream copy without contacting the server "
+             "if it is younger than this many seconds (default: 0, always revalidate)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download the upstream file and bypass the HTTP cache",
+    )
+
     return parser
 
 
+def _report(
+    result: DriftResult,
+    parsed: argparse.Namespace,
+    local_path: Optional[Path] = None,
+    upstream_content: Optional[str] = None,
+) -> int:
+    """Print a drift result, joined with the reference index if requested."""
+    if parsed.format == "json-patch":
+        document = json.loads(local_path.read_text(encoding="utf-8"))
+        ops = build_patch(document, json.loads(upstream_content), result)
+        print(format_patch(ops))
+        return 1 if ops else 0
+
+    impact = None
+    if parsed.impact is not None:
+        impact = ReferenceIndex.load(parsed.impact).impact(result)
+
+    if parsed.format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter()
+
+    print(formatter.format(result, impact, offset=parsed.offset, limit=parsed.limit))
+
+    return 1 if result.has_drift else 0
+
+
 def main(args: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
     parser = create_parser()
@@ -458,14 +1151,68 @@ def main(args: list[str] | None = None) -> int:
 
     try:
         file_reader = DefaultFileReader()
-        url_fetcher = DefaultUrlFetcher()
+        if parsed.no_cache:
+            url_fetcher = DefaultUrlFetcher()
+        else:
+            url_fetcher = CachingUrlFetcher(max_age=parsed.max_age)
         req_parser = RequirementParser()
-        detector = DriftDetector(file_reader, url_fetcher, req_parser)
+        detector = DriftDetector(
+            file_reader,
+            url_fetcher,
+            req_parser,
+            ParseCache(),
+            move_threshold=None if parsed.no_move_detection else parsed.move_threshold,
+            snapshot_store=SnapshotStore(),
+        )
+
+        if parsed.offset < 0 or (parsed.limit is not None and parsed.limit < 0):
+            print("Error: --offset and --limit must not be negative", file=sys.stderr)
+            return 1
+
+        if parsed.format == "json-patch" and (
+            parsed.matrix or parsed.summary_only or parsed.from_ref or parsed.snapshots or parsed.offline
+        ):
+            print("Error: --format json-patch compares the local catalog with upstream; "
+                  "it cannot be combined with --matrix, --summary-only, --from, --snapshots or --offline",
+                  file=sys.stderr)
+            return 1
+
+        if parsed.snapshots:
+            print(SnapshotListFormatter().format(
+                detector.snapshot_store.snapshots(),
+                json_output=parsed.format == "json",
+            ))
+            return 0
+
+        if parsed.impact is not None and not parsed.impact.is_dir():
+            print(f"Error: Impact root not found: {parsed.impact}", file=sys.stderr)
+            return 1
+
+        if parsed.from_ref:
+            result = detector.compare_snapshots(parsed.from_ref, parsed.to_ref)
+            return _report(result, parsed)
+
+        if parsed.matrix:
+            if len(parsed.matrix) < 2:
+                print("Error: --matrix needs at least two catalogs", file=sys.stderr)
+                return 1
+            for path in parsed.matrix:
+                if not path.exists():
+                    print(f"Error: Catalog not found: {path}", file=sys.stderr)
+                    return 1
+            matrix = detector.matrix(parsed.matrix)
+            if parsed.format == "json":
+                print(MatrixJsonFormatter().format(matrix))
+            else:
+                print(MatrixTextFormatter().format(matrix))
+            return 0
 
         if parsed.local:
             local_path = parsed.local
         else:
             local_path = parsed.base_path / DEFAULT_LOCAL_PATH
+            if not local_path.exists():
+                local_path = bundled_file(Path(DEFAULT_LOCAL_PATH).name) or local_path
 
         if not local_path.exists():
             print(f"Error: Local file not found: {local_path}", file=sys.stderr)
@@ -474,7 +1221,40 @@ def main(args: list[str] | None = None) -> int:
         upstream_content = None
         upstream_url = None
 
-        if parsed.offline:
+        if parsed.summary_only and not parsed.offline:
+            local_content = file_reader.read(local_path)
+            if parsed.upstream_file:
+                upstream_content = file_reader.read(parsed.upstream_file)
+            else:
+                upstream_content = detector.fetch_content(parsed.upstream_url)
+            summary = detector.summarize(local_content, upstream_content)
+            print(SummaryFormatter().format(
+                summary,
+                detector.compute_hash(local_content),
+                detector.compute_hash(upstream_content),
+                json_output=parsed.format == "json",
+            ))
+            return 1 if summary.chapters else 0
+
+        if parsed.format == "json-patch":
+            # The patch is built from the upstream document itself
+            if parsed.upstream_file:
+                upstream_content = file_reader.read(parsed.upstream_file)
+            else:
+                upstream_content = detector.fetch_content(parsed.upstream_url)
+            result = detector.detect(local_path, upstream_content=upstream_content)
+            return _report(result, parsed, local_path, upstream_content)
+
+        if parsed.offline and parsed.stream:
+            hasher = hashlib.sha256()
+            local_count = sum(1 for _ in detector.stream_file(local_path, hasher))
+            result = DriftResult(
+                local_count=local_count,
+                local_hash=hasher.hexdigest()[:16],
+                upstream_count=0,
+                upstream_hash="(offline mode)",
+            )
+        elif parsed.offline:
             local_reqs, local_hash = detector.load_local(local_path)
             result = DriftResult(
                 local_count=len(local_reqs),
@@ -482,6 +1262,12 @@ def main(args: list[str] | None = None) -> int:
                 upstream_count=0,
                 upstream_hash="(offline mode)",
             )
+        elif parsed.stream:
+            result = detector.detect_streaming(
+                local_path,
+                upstream_path=parsed.upstream_file,
+                upstream_url=parsed.upstream_url,
+            )
         elif parsed.upstream_file:
             upstream_content = file_reader.read(parsed.upstream_file)
             result = detector.detect(local_path, upstream_content=upstream_content)
@@ -489,14 +1275,7 @@ def main(args: list[str] | None = None) -> int:
             upstream_url = parsed.upstream_url
             result = detector.detect(local_path, upstream_url=upstream_url)
 
-        if parsed.format == "json":
-            formatter = JsonFormatter()
-        else:
-            formatter = TextFormatter()
-
-        print(formatter.format(result))
-
-        return 1 if result.has_drift else 0
+        return _report(result, parsed, local_path)
 
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+ASVS Explain - Requirement text, guidance and decision templates for one ID.
+
+Looks the requirement up in the full catalog and joins it with the
+reference index of the documentation directories: the guidance sections
+(file and heading) that mention it, the decision templates that mention it
+or cover its chapter, and any other documents that mention it. The index
+is cached by file hash, so repeated lookups only stat the files.
+
+ASVS Requirements Addressed:
+- V15.1.2: Maintain requirement inventory catalog
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from tools.catalog import Requirement, RequirementIndex, RequirementParser
+from tools.export_requirements import find_source_file
+from tools.parse_cache import ParseCache
+from tools.reference_index import REQUIREMENT_ID, Reference, ReferenceIndex
+
+
+# --- Constants ---
+
+# Documentation directories indexed for references
+DOC_DIRS = (
+    "00-Documentation-Standards",
+    "02-Implementation-Guidance",
+    "04-Documentation-Artifacts",
+)
+
+GUIDANCE_DIR = "02-Implementation-Guidance"
+
+DECISION_TEMPLATE_DIR = "00-Documentation-Standards/Decision-Templates"
+
+
+# --- Data Classes ---
+
+@dataclass
+class Section:
+    """Lines of one file under one heading that mention the requirement."""
+    path: str
+    heading: str
+    lines: list[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"path": self.path, "heading": self.heading, "lines": self.lines}
+
+
+@dataclass
+class Explanation:
+    """Everything known about one requirement."""
+    req_id: str
+    requirement: Optional[Requirement] = None
+    guidance: list[Section] = field(default_factory=list)
+    decisions: list[Section] = field(default_factory=list)
+    chapter_templates: list[str] = field(default_factory=list)
+    other: list[Section] = field(default_factory=list)
+
+    @property
+    def found(self) -> bool:
+        return self.requirement is not None
+
+    def to_dict(self) -> dict[str, Any]:
+        req = self.requirement
+        return {
+            "id": self.req_id,
+            "found": self.found,
+            "requirement": {
+                "description": req.description,
+                "level": req.level,
+                "chapter": req.chapter_name,
+                "section": req.section_name,
+            } if req is not None else None,
+            "guidance": [s.to_dict() for s in self.guidance],
+            "decision_templates": [s.to_dict() for s in self.decisions],
+            "chapter_templates": self.chapter_templates,
+            "other": [s.to_dict() for s in self.other],
+        }
+
+
+def normalize_id(value: str) -> str:
+    """Canonical requirement ID (``v3.5.1`` -> ``V3.5.1``), or raise ValueError."""
+    req_id = value.strip()
+    req_id = "V" + req_id[1:] if req_id[:1] in ("v", "V") else "V" + req_id
+    if not REQUIREMENT_ID.fullmatch(req_id):
+        raise ValueError(f"Not a requirement ID: {value!r} (expected e.g. V3.5.1)")
+    return req_id
+
+
+def sections(references: list[Reference]) -> list[Section]:
+    """Group references by file and heading, in file then line order."""
+    result: list[Section] = []
+    for ref in references:
+        by_heading: dict[str, Section] = {}
+        for line, heading in zip(ref.lines, ref.headings or [""] * len(ref.lines)):
+            section = by_heading.get(heading)
+            if section is None:
+                section = by_heading[heading] = Section(ref.path, heading)
+                result.append(section)
+            section.lines.append(line)
+    return result
+
+
+def find_docs_root(base_path: Path) -> Optional[Path]:
+    """The checkout, or else the resource cache, holding the documentation directories."""
+    candidates = [Path(base_path)]
+    try:
+        from tools.resource_manager import get_cache_dir
+        candidates.append(get_cache_dir())
+    except ImportError:
+        pass
+    for root in candidates:
+        if any((root / d).is_dir() for d in DOC_DIRS):
+            return root
+    return None
+
+
+class RequirementExplainer:
+    """Joins the catalog with the documentation reference index."""
+
+    def __init__(self, catalog: RequirementIndex, references: Optional[ReferenceIndex]):
+        self.catalog = catalog
+        self.references = references
+
+    def explain(self, req_id: str) -> Explanation:
+        """Collect the requirement and the documents referring to it."""
+        result = Explanation(req_id, self.catalog.get(req_id))
+        if self.references is None:
+            return result
+
+        refs = self.references.find(req_id)
+        guidance = [r for r in refs if r.path.startswith(GUIDANCE_DIR + "/")]
+        decisions = [r for r in refs if r.kind == "decision"]
+        other = [r for r in refs if r not in guidance and r not in decisions]
+        result.guidance = sections(guidance)
+        result.decisions = sections(decisions)
+        result.other = sections(other)
+
+        chapter = result.requirement.chapter_id if result.requirement else req_id.split(".")[0]
+        template_dir = self.references.root / DECISION_TEMPLATE_DIR
+        if template_dir.is_dir():
+            mentioned = {r.path for r in decisions}
+            result.chapter_templates = [
+                f"{DECISION_TEMPLATE_DIR}/{p.name}"
+                for p in sorted(template_dir.glob(f"{chapter}-*.md"))
+                if f"{DECISION_TEMPLATE_DIR}/{p.name}" not in mentioned
+            ]
+        return result
+
+
+# --- Output Formatters ---
+
+def _format_sections(title: str, items: list[Section], extra: tuple[str, ...] = ()) -> list[str]:
+    lines = [f"{title} ({len(items) + len(extra)})"]
+    if not items and not extra:
+        lines.append("  none")
+    for section in items:
+        where = ", ".join(str(n) for n in section.lines)
+        heading = f" > {section.heading}" if section.heading else ""
+        lines.append(f"  {section.path}{heading}  (line{'s' if len(section.lines) > 1 else ''} {where})")
+    lines.extend(f"  {line}" for line in extra)
+    return lines
+
+
+class TextFormatter:
+    """Format an explanation as human-readable text."""
+
+    def format(self, result: Explanation) -> str:
+        req = result.requirement
+        if req is None:
+            lines = [f"{result.req_id}: not in the ASVS catalog"]
+        else:
+            lines = [
+                f"{req.req_id} (L{req.level}) {req.chapter_name} > {req.section_name}",
+                f"  {req.description}",
+            ]
+        lines.append("")
+        lines.extend(_format_sections("Guidance", result.guidance))
+        lines.append("")
+        chapter_templates = tuple(
+            f"{path}  (covers chapter {path.rsplit('/', 1)[-1].split('-')[0]})"
+            for path in result.chapter_templates
+        )
+        lines.extend(_format_sections("Decision templates", result.decisions, chapter_templates))
+        if result.other:
+            lines.append("")
+            lines.extend(_format_sections("Other references", result.other))
+        return "\n".join(lines)
+
+
+class JsonFormatter:
+    """Format an explanation as JSON."""
+
+    def format(self, result: Explanation) -> str:
+        return json.dumps(result.to_dict(), indent=2)
+
+
+# --- CLI ---
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="explain-requirement",
+        description="Show an ASVS requirement with the guidance and decision templates that cover it",
+        epilog="Example: explain-requirement V3.5.1",
+    )
+
+    parser.add_argument("req_id", help="Requirement ID, e.g. V3.5.1")
+
+    parser.add_argument(
+        "--source",
+        type=Path,
+        help="Catalog JSON file (default: ASVS-5.0-en.json from the checkout or resource cache)",
+    )
+
+    parser.add_argument(
+        "--base-path",
+        type=Path,
+        default=Path.cwd(),
+        help="Base path for finding the catalog and documentation (default: current directory)",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+
+    return parser
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Main entry point for the CLI."""
+    parser = create_parser()
+    parsed = parser.parse_args(args)
+
+    try:
+        req_id = normalize_id(parsed.req_id)
+        source = parsed.source or find_source_file("3", parsed.base_path)
+        content = source.read_text(encoding="utf-8")
+        requirements = ParseCache().get_or_parse("drift", content, RequirementParser().parse, Requirement)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    docs_root = find_docs_root(parsed.base_path)
+    references = ReferenceIndex.load(docs_root, paths=DOC_DIRS) if docs_root else None
+    result = RequirementExplainer(RequirementIndex(requirements), references).explain(req_id)
+
+    formatter = JsonFormatter() if parsed.format == "json" else TextFormatter()
+    print(formatter.format(result))
+    if not result.found:
+        print(f"Error: {req_id} is not in {source.name}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,44 +15,30 @@ import csv
 import hashlib
 import io
 import json
+import mmap
+import os
+import shutil
 import sys
+import tempfile
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Protocol
-
-
-# --- Data Classes ---
-
-@dataclass
-class Requirement:
-    """Represents a single ASVS requirement."""
-    chapter_id: str
-    chapter_name: str
-    section_id: str
-    section_name: str
-    req_id: str
-    req_description: str
-    level: str
-
-    @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> "Requirement":
-        """Create a Requirement from a dictionary with validation."""
-        required_fields = ["chapter_id", "chapter_name", "section_id", 
-                          "section_name", "req_id", "req_description", "L"]
-        for field in required_fields:
-            if field not in data:
-                raise ValueError(f"Missing required field: {field}")
-        
-        return cls(
-            chapter_id=str(data["chapter_id"]),
-            chapter_name=str(data["chapter_name"]),
-            section_id=str(data["section_id"]),
-            section_name=str(data["section_name"]),
-            req_id=str(data["req_id"]),
-            req_description=str(data["req_description"]),
-            level=str(data["L"]),
-        )
+from typing import IO, Any, ContextManager, Generic, Iterable, Iterator, Optional, Protocol, TextIO, TypeVar
+
+from tools.catalog import Requirement, RequirementIndex, RequirementParser
+from tools.catalog_bundle import bundled_file
+from tools.framework_mapping import FRAMEWORKS, ControlCoverage, MappingIndex, find_mapping_file
+from tools.json_stream import DEFAULT_CHUNK_SIZE
+from tools.parse_cache import ParseCache
+
+
+# --- Constants ---
+
+# Source files larger than this are mapped instead of read into memory
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+# Export output held in memory before stdout spools to a temporary file
+STDOUT_SPOOL_BYTES = 1024 * 1024
 
 
 # --- Protocols for Dependency Injection ---
@@ -60,11 +46,13 @@ class Requirement:
 class FileReader(Protocol):
     """Protocol for reading file contents."""
     def read(self, path: Path) -> str: ...
+    def open_bytes(self, path: Path) -> ContextManager[bytes | mmap.mmap]: ...
 
 
 class OutputWriter(Protocol):
     """Protocol for writing output."""
     def write(self, content: str) -> None: ...
+    def open(self) -> ContextManager[TextIO]: ...
 
 
 # --- Concrete Implementations ---
@@ -76,6 +64,22 @@ class DefaultFileReader:
         """Read file contents with UTF-8 encoding."""
         return path.read_text(encoding="utf-8")
 
+    @contextmanager
+    def open_bytes(self, path: Path) -> Iterator[bytes | mmap.mmap]:
+        """
+        The raw bytes of a file, read once.
+
+        Files above ``MMAP_THRESHOLD_BYTES`` are memory-mapped, so hashing
+        and decoding share the page cache instead of a private copy.
+        """
+        with path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size <= MMAP_THRESHOLD_BYTES:
+                yield handle.read()
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
 
 class StdoutWriter:
     """Write to stdout."""
@@ -84,6 +88,23 @@ class StdoutWriter:
         """Write content to stdout."""
         print(content, end="")
 
+    @contextmanager
+    def open(self) -> Iterator[TextIO]:
+        """
+        A stdout sink for streaming exporters.
+
+        Output is spooled (in memory up to ``STDOUT_SPOOL_BYTES``, then in a
+        temporary file) and copied to stdout only when the export finishes,
+        so a failed export prints nothing for a pipe to consume.
+        """
+        with tempfile.SpooledTemporaryFile(
+            max_size=STDOUT_SPOOL_BYTES, mode="w+", encoding="utf-8", newline=""
+        ) as spool:
+            yield spool
+            spool.seek(0)
+            shutil.copyfileobj(spool, sys.stdout)
+        sys.stdout.flush()
+
 
 class FileWriter:
     """Write to a file."""
@@ -95,6 +116,23 @@ class FileWriter:
         """Write content to file."""
         self.path.write_text(content, encoding="utf-8")
 
+    @contextmanager
+    def open(self) -> Iterator[TextIO]:
+        """
+        A sink for streaming exporters.
+
+        Output goes to a temporary file that replaces ``path`` only when
+        the export finishes, so a failed export leaves no partial file.
+        """
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                yield handle
+            os.replace(tmp_path, self.path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
 
 # --- Hash Verification (Security Control) ---
 
@@ -104,10 +142,15 @@ class IntegrityVerifier:
     def __init__(self, file_reader: FileReader):
         self.file_reader = file_reader
     
+    @staticmethod
+    def digest(data: bytes | mmap.mmap) -> str:
+        """SHA-256 of raw file bytes."""
+        return hashlib.sha256(data).hexdigest()
+
     def compute_hash(self, path: Path) -> str:
-        """Compute SHA-256 hash of file contents."""
-        content = self.file_reader.read(path)
-        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+        """Compute SHA-256 hash of the file's bytes, as ``sha256sum`` does."""
+        with self.file_reader.open_bytes(path) as data:
+            return self.digest(data)
     
     def verify(self, path: Path, expected_hash: str | None = None) -> tuple[bool, str]:
         """
@@ -123,6 +166,39 @@ class IntegrityVerifier:
         return computed == expected_hash, computed
 
 
+class _HashingReader:
+    """Binary stream wrapper that hashes everything read through it."""
+
+    def __init__(self, stream: IO[bytes], hasher: Any):
+        self._stream = stream
+        self._hasher = hasher
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._hasher.update(chunk)
+        return chunk
+
+    def finish(self) -> str:
+        """Hash whatever the parser left unread and return the hex digest."""
+        while self.read(DEFAULT_CHUNK_SIZE):
+            pass
+        return self._hasher.hexdigest()
+
+
+def check_integrity(path: Path, expected_hash: str | None, computed_hash: str) -> None:
+    """
+    Raise if a file's digest does not match the expected one.
+
+    Raises:
+        ValueError: If expected_hash is set and differs from computed_hash
+    """
+    if expected_hash is not None and computed_hash != expected_hash:
+        raise ValueError(
+            f"Integrity check failed for {path}. "
+            f"Expected: {expected_hash}, Got: {computed_hash}"
+        )
+
+
 # --- Requirements Loading ---
 
 class RequirementsLoader:
@@ -130,13 +206,23 @@ class RequirementsLoader:
     
     LEVEL_HIERARCHY = {"1": 1, "2": 2, "3": 3}
     
-    def __init__(self, file_reader: FileReader, verifier: IntegrityVerifier):
+    def __init__(
+        self,
+        file_reader: FileReader,
+        verifier: IntegrityVerifier,
+        parse_cache: Optional[ParseCache] = None,
+    ):
         self.file_reader = file_reader
         self.verifier = verifier
+        self.parse_cache = parse_cache
     
     def load(self, path: Path, expected_hash: str | None = None) -> list[Requirement]:
         """
         Load requirements from JSON file with optional integrity verification.
+
+        The file is read once: the same buffer is hashed and decoded, and
+        the digest is checked before the JSON is parsed. The digest also
+        keys the parse cache.
         
         Args:
             path: Path to the JSON file
@@ -148,34 +234,80 @@ class RequirementsLoader:
         Raises:
             ValueError: If hash verification fails or JSON is malformed
         """
-        is_valid, computed_hash = self.verifier.verify(path, expected_hash)
-        if not is_valid:
-            raise ValueError(
-                f"Integrity check failed for {path}. "
-                f"Expected: {expected_hash}, Got: {computed_hash}"
-            )
-        
-        content = self.file_reader.read(path)
-        
+        with self.file_reader.open_bytes(path) as data:
+            computed_hash = self.verifier.digest(data)
+            check_integrity(path, expected_hash, computed_hash)
+            try:
+                content = str(data, "utf-8")
+            except UnicodeDecodeError as e:
+                raise ValueError(f"Invalid UTF-8 in {path}: {e}")
+
+        def parse(text: str) -> list[Requirement]:
+            return self._parse(text, path)
+
+        if self.parse_cache is None:
+            return parse(content)
+        return self.parse_cache.get_or_parse(
+            "export", content, parse, Requirement, digest=computed_hash
+        )
+
+    def load_index(self, path: Path, expected_hash: str | None = None) -> RequirementIndex:
+        """Load requirements like ``load`` and index them once."""
+        return RequirementIndex(self.load(path, expected_hash))
+
+    def iter_load(
+        self, path: Path, expected_hash: str | None = None, stream: bool = False
+    ) -> Iterator[Requirement]:
+        """
+        Yield requirements for an export pipeline.
+
+        By default this iterates ``load`` (and so the parse cache), and an
+        expected hash is checked before this returns. With ``stream`` the
+        file is parsed incrementally through one handle that is hashed as
+        it is read, so memory does not grow with the catalog and the bytes
+        verified are the bytes parsed. The hash is then checked when
+        iteration finishes, and a mismatch or malformed record raises from
+        the iterator; the writers discard a partial export on error, so
+        nothing is published from an unverified file.
+
+        Raises:
+            ValueError: If hash verification fails or the catalog is malformed
+        """
+        if not stream:
+            return iter(self.load(path, expected_hash))
+
+        def generate() -> Iterator[Requirement]:
+            with path.open("rb") as handle:
+                reader = _HashingReader(handle, hashlib.sha256())
+                try:
+                    yield from RequirementParser(strict=True).iter_parse(reader)
+                except ValueError as e:
+                    # A tampered file is reported as such, not as malformed
+                    check_integrity(path, expected_hash, reader.finish())
+                    raise ValueError(f"{e} in {path}")
+                check_integrity(path, expected_hash, reader.finish())
+
+        return generate()
+
+    def _parse(self, content: str, path: Path) -> list[Requirement]:
+        """
+        Decode and validate a catalog.
+
+        Flat-format records must carry every field; the nested upstream
+        format (``ASVS-5.0-en.json``) is read as-is.
+        """
         try:
             data = json.loads(content)
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in {path}: {e}")
-        
-        if not isinstance(data, list):
-            raise ValueError(f"Expected JSON array in {path}, got {type(data).__name__}")
-        
-        requirements = []
-        for idx, item in enumerate(data):
-            try:
-                requirements.append(Requirement.from_dict(item))
-            except ValueError as e:
-                raise ValueError(f"Invalid requirement at index {idx}: {e}")
-        
-        return requirements
+
+        try:
+            return RequirementParser(strict=True).parse_data(data)
+        except ValueError as e:
+            raise ValueError(f"{e} in {path}")
     
     def filter_by_level(
-        self, requirements: list[Requirement], level: str
+        self, requirements: list[Requirement] | RequirementIndex, level: str
     ) -> list[Requirement]:
         """
         Filter requirements by level.
@@ -184,29 +316,87 @@ class RequirementsLoader:
         - L1: Only L1 requirements
         - L2: L1 and L2 requirements  
         - L3: L1, L2, and L3 requirements
+
+        A list is filtered row by row, so repeated IDs are all kept, as
+        merged catalogs expect. Pass the ``RequirementIndex`` from
+        ``load_index`` to read its precomputed level view instead; that
+        view holds first occurrences only, the rest being in
+        ``index.duplicates``.
         """
         if level not in self.LEVEL_HIERARCHY:
             raise ValueError(f"Invalid level: {level}. Must be one of: 1, 2, 3")
-        
+
+        if isinstance(requirements, RequirementIndex):
+            return requirements.at_level(level)
+        return list(self.iter_by_level(requirements, level))
+
+    def iter_by_level(
+        self, requirements: Iterable[Requirement], level: str | None = None
+    ) -> Iterator[Requirement]:
+        """
+        Streaming ``filter_by_level``: the same requirements, in the same order.
+
+        Nothing is kept between rows, so repeated IDs all pass through and
+        memory does not grow with the catalog. With no level, requirements
+        pass through unchanged.
+        """
+        if level is not None and level not in self.LEVEL_HIERARCHY:
+            raise ValueError(f"Invalid level: {level}. Must be one of: 1, 2, 3")
+
+        if level is None:
+            return iter(requirements)
+
         max_level = self.LEVEL_HIERARCHY[level]
-        return [
+        return (
             req for req in requirements
             if self.LEVEL_HIERARCHY.get(req.level, 99) <= max_level
-        ]
+        )
+
+
+def load_functional_text(path: Path) -> dict[str, str]:
+    """
+    Map req_id to the functional ("shall") text of a Functional-Requirements file.
+
+    The file is streamed once into a hash table, so joining it onto an
+    export is one lookup per requirement. The first entry for an ID wins.
+
+    Raises:
+        ValueError: If the file is not a requirement catalog
+    """
+    functional: dict[str, str] = {}
+    with path.open("rb") as handle:
+        for req in RequirementParser().iter_parse(handle):
+            functional.setdefault(req.req_id, req.description)
+    return functional
 
 
 # --- Export Formatters ---
 
-class Exporter(ABC):
-    """Abstract base class for requirement exporters."""
+T = TypeVar("T")
+
+
+class Exporter(ABC, Generic[T]):
+    """
+    Abstract base class for exporters of requirements or control coverage.
+
+    Exporters write each record to the sink as it arrives, so a generator
+    of requirements is exported without holding the catalog or the output
+    in memory.
+    """
     
     @abstractmethod
-    def export(self, requirements: list[Requirement]) -> str:
-        """Export requirements to string format."""
+    def write(self, records: Iterable[T], sink: TextIO) -> None:
+        """Write records to a text sink."""
         pass
 
+    def export(self, records: Iterable[T]) -> str:
+        """Export records to string format."""
+        sink = io.StringIO()
+        self.write(records, sink)
+        return sink.getvalue()
+
 
-class CsvExporter(Exporter):
+class CsvExporter(Exporter[Requirement]):
     """Export requirements to CSV format compatible with Jira/GitHub import."""
     
     HEADERS = [
@@ -217,58 +407,147 @@ class CsvExporter(Exporter):
         "Chapter",
         "Section",
     ]
+
+    FUNCTIONAL_HEADER = "Functional Requirement"
+
+    def __init__(self, functional: Optional[dict[str, str]] = None):
+        self.functional = functional
     
-    def export(self, requirements: list[Requirement]) -> str:
-        """Export requirements to CSV string."""
-        output = io.StringIO()
-        writer = csv.writer(output, quoting=csv.QUOTE_ALL)
+    def write(self, requirements: Iterable[Requirement], sink: TextIO) -> None:
+        """Write requirements to a sink as CSV rows."""
+        writer = csv.writer(sink, quoting=csv.QUOTE_ALL)
         
-        writer.writerow(self.HEADERS)
+        if self.functional is None:
+            writer.writerow(self.HEADERS)
+        else:
+            writer.writerow(self.HEADERS + [self.FUNCTIONAL_HEADER])
         
         for req in requirements:
-            writer.writerow([
+            row = [
                 req.req_id,
                 f"[ASVS {req.req_id}] {req.section_name}",
                 req.req_description,
                 f"asvs,security,L{req.level},{req.chapter_id}",
                 req.chapter_name,
                 req.section_name,
-            ])
-        
-        return output.getvalue()
+            ]
+            if self.functional is not None:
+                row.append(self.functional.get(req.req_id, ""))
+            writer.writerow(row)
 
 
-class JiraJsonExporter(Exporter):
+class JiraJsonExporter(Exporter[Requirement]):
     """Export requirements to Jira-compatible JSON format."""
+
+    def __init__(self, functional: Optional[dict[str, str]] = None):
+        self.functional = functional
     
-    def export(self, requirements: list[Requirement]) -> str:
-        """Export requirements to Jira JSON string."""
-        issues = []
-        
+    def write(self, requirements: Iterable[Requirement], sink: TextIO) -> None:
+        """
+        Write requirements to a sink as a Jira JSON document.
+
+        Issues are written one at a time. The output is byte-identical to
+        ``json.dumps({"issues": [...]}, indent=2)``.
+        """
+        sink.write('{\n  "issues": [')
+        first = True
         for req in requirements:
-            issues.append({
-                "summary": f"[ASVS {req.req_id}] {req.section_name}",
-                "description": req.req_description,
-                "labels": [
-                    "asvs",
-                    "security",
-                    f"L{req.level}",
-                    req.chapter_id.lower(),
-                ],
-                "customFields": {
-                    "asvsId": req.req_id,
-                    "asvsChapter": req.chapter_name,
-                    "asvsSection": req.section_name,
-                    "asvsLevel": req.level,
-                },
-            })
-        
-        return json.dumps({"issues": issues}, indent=2)
+            sink.write("\n    " if first else ",\n    ")
+            sink.write(json.dumps(self._issue(req), indent=2).replace("\n", "\n    "))
+            first = False
+        sink.write("]\n}" if first else "\n  ]\n}")
+
+    def _issue(self, req: Requirement) -> dict[str, Any]:
+        issue = {
+            "summary": f"[ASVS {req.req_id}] {req.section_name}",
+            "description": req.req_description,
+            "labels": [
+                "asvs",
+                "security",
+                f"L{req.level}",
+                req.chapter_id.lower(),
+            ],
+            "customFields": {
+                "asvsId": req.req_id,
+                "asvsChapter": req.chapter_name,
+                "asvsSection": req.section_name,
+                "asvsLevel": req.level,
+            },
+        }
+        if self.functional is not None:
+            issue["customFields"]["asvsFunctionalRequirement"] = self.functional.get(req.req_id)
+        return issue
+
+
+class ControlCsvExporter(Exporter[ControlCoverage]):
+    """Export framework control coverage to CSV, one row per control and requirement."""
+
+    HEADERS = [
+        "Control",
+        "Control Name",
+        "Issue Key",
+        "Summary",
+        "Description",
+        "Level",
+    ]
+
+    def __init__(self, functional: Optional[dict[str, str]] = None):
+        self.functional = functional
+
+    def write(self, coverage: Iterable[ControlCoverage], sink: TextIO) -> None:
+        """Write control coverage to a sink as CSV rows.
+
+        Controls with no requirement in the export get one row with empty
+        requirement columns, so coverage gaps stay visible.
+        """
+        writer = csv.writer(sink, quoting=csv.QUOTE_ALL)
+
+        headers = list(self.HEADERS)
+        if self.functional is not None:
+            headers.append(CsvExporter.FUNCTIONAL_HEADER)
+        writer.writerow(headers)
+
+        for item in coverage:
+            control = item.control
+            if not item.requirements:
+                writer.writerow([control.control_id, control.name] + [""] * (len(headers) - 2))
+            for req in item.requirements:
+                row = [
+                    control.control_id,
+                    control.name,
+                    req.req_id,
+                    f"[ASVS {req.req_id}] {req.section_name}",
+                    req.req_description,
+                    req.level,
+                ]
+                if self.functional is not None:
+                    row.append(self.functional.get(req.req_id, ""))
+                writer.writerow(row)
+
+
+class ControlJsonExporter(Exporter[ControlCoverage]):
+    """Export framework control coverage to JSON grouped by control."""
+
+    def __init__(self, framework: str, functional: Optional[dict[str, str]] = None):
+        self.framework = framework
+        self.functional = functional
+
+    def write(self, coverage: Iterable[ControlCoverage], sink: TextIO) -> None:
+        """Write control coverage to a sink as JSON."""
+        controls = [item.to_dict() for item in coverage]
+        if self.functional is not None:
+            for control in controls:
+                for req in control["requirements"]:
+                    req["functional"] = self.functional.get(req["id"])
+        json.dump({
+            "framework": self.framework,
+            "controls": controls,
+        }, sink, indent=2)
 
 
 # --- CLI Interface ---
 
-def get_exporter(format_type: str) -> Exporter:
+def get_exporter(format_type: str, functional: Optional[dict[str, str]] = None) -> Exporter[Requirement]:
     """Factory function to get the appropriate exporter."""
     exporters = {
         "csv": CsvExporter,
@@ -276,11 +555,34 @@ def get_exporter(format_type: str) -> Exporter:
     }
     if format_type not in exporters:
         raise ValueError(f"Unknown format: {format_type}")
-    return exporters[format_type]()
+    return exporters[format_type](functional)
+
+
+def get_control_exporter(
+    format_type: str, framework: str, functional: Optional[dict[str, str]] = None
+) -> Exporter[ControlCoverage]:
+    """
+    Factory function for the ``--framework`` exporters.
+
+    Control coverage is not a Jira import, so its JSON form is ``json``;
+    ``jira-json`` is rejected rather than given a second schema.
+    """
+    if format_type == "csv":
+        return ControlCsvExporter(functional)
+    if format_type == "json":
+        return ControlJsonExporter(framework, functional)
+    if format_type == "jira-json":
+        raise ValueError("Format jira-json cannot be combined with --framework; use --format json")
+    raise ValueError(f"Unknown format: {format_type}")
 
 
 def find_source_file(level: str, base_path: Path) -> Path:
-    """Find the appropriate source file for the given level."""
+    """
+    Find the appropriate source file for the given level.
+
+    Looks in the checkout, then the resource cache, then the catalog
+    bundle packaged with the tools.
+    """
     level_file_names = {
         "1": "ASVS-L1-Baseline.json",
         "2": "ASVS-L2-Standard.json",
@@ -307,12 +609,52 @@ def find_source_file(level: str, base_path: Path) -> Path:
     except ImportError:
         pass
 
+    bundled_path = bundled_file(filename)
+    if bundled_path:
+        return bundled_path
+
     raise FileNotFoundError(
         f"Source file not found: {filename}. "
         "Run 'asvs resources --download' to fetch required files."
     )
 
 
+def find_functional_file(level: str, base_path: Path) -> Path:
+    """
+    Find the Functional-Requirements file for the given level.
+
+    Looks in the checkout, then the resource cache, then the catalog
+    bundle packaged with the tools.
+    """
+    if level not in ("1", "2", "3"):
+        raise ValueError(f"Invalid level: {level}")
+
+    filename = f"ASVS-Functional-Requirements-L{level}.json"
+
+    local_path = base_path / "01-ASVS-Core-Reference" / "Functional-Requirements" / filename
+    if local_path.exists():
+        return local_path
+
+    try:
+        from tools.resource_manager import get_resource_path
+        cached_path = get_resource_path("functional_requirements")
+        if cached_path:
+            path = cached_path / filename
+            if path.exists():
+                return path
+    except ImportError:
+        pass
+
+    bundled_path = bundled_file(f"Functional-Requirements/{filename}")
+    if bundled_path:
+        return bundled_path
+
+    raise FileNotFoundError(
+        f"Functional requirements file not found: {filename}. "
+        "Run 'asvs resources --download' to fetch required files."
+    )
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser."""
     parser = argparse.ArgumentParser(
@@ -330,9 +672,9 @@ def create_parser() -> argparse.ArgumentParser:
     
     parser.add_argument(
         "--format",
-        choices=["csv", "jira-json"],
+        choices=["csv", "jira-json", "json"],
         default="csv",
-        help="Output format. Default: csv",
+        help="Output format. Default: csv. With --framework: csv or json (control coverage, not a Jira import)",
     )
     
     parser.add_argument(
@@ -340,12 +682,30 @@ def create_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Path to source JSON file (overrides --level for file selection)",
     )
+
+    parser.add_argument(
+        "--with-functional",
+        action="store_true",
+        help="Add the functional (\"shall\") text of each requirement to the output",
+    )
+
+    parser.add_argument(
+        "--framework",
+        choices=list(FRAMEWORKS),
+        help="Group the export by SOC2 or ISO 27001 control",
+    )
     
     parser.add_argument(
         "--output",
         type=Path,
         help="Output file path (default: stdout)",
     )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the source incrementally with bounded memory (for very large merged catalogs)",
+    )
     
     parser.add_argument(
         "--verify-hash",
@@ -373,11 +733,16 @@ def main(args: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
     parser = create_parser()
     parsed = parser.parse_args(args)
+
+    if parsed.framework and parsed.format == "jira-json":
+        parser.error("--format jira-json cannot be combined with --framework; use --format json")
+    if not parsed.framework and parsed.format == "json":
+        parser.error("--format json is only available with --framework; use jira-json")
     
     try:
         file_reader = DefaultFileReader()
         verifier = IntegrityVerifier(file_reader)
-        loader = RequirementsLoader(file_reader, verifier)
+        loader = RequirementsLoader(file_reader, verifier, ParseCache())
         
         if parsed.source:
             source_path = parsed.source
@@ -389,20 +754,31 @@ def main(args: list[str] | None = None) -> int:
             print(f"{hash_value}  {source_path}")
             return 0
         
-        requirements = loader.load(source_path, parsed.verify_hash)
-        
-        if not parsed.source:
-            requirements = loader.filter_by_level(requirements, parsed.level)
-        
-        exporter = get_exporter(parsed.format)
-        output = exporter.export(requirements)
+        # Generator pipeline: loader -> level filter -> exporter -> sink
+        requirements = loader.iter_by_level(
+            loader.iter_load(source_path, parsed.verify_hash, stream=parsed.stream),
+            None if parsed.source else parsed.level,
+        )
         
+        functional = None
+        if parsed.with_functional:
+            # A custom --source may hold any level; the L3 file covers them all
+            functional_level = "3" if parsed.source else parsed.level
+            functional = load_functional_text(find_functional_file(functional_level, parsed.base_path))
+
         if parsed.output:
             writer = FileWriter(parsed.output)
         else:
             writer = StdoutWriter()
-        
-        writer.write(output)
+
+        if parsed.framework:
+            mapping = MappingIndex.load(find_mapping_file(parsed.base_path))
+            coverage = mapping.join(parsed.framework, requirements)
+            with writer.open() as sink:
+                get_control_exporter(parsed.format, parsed.framework, functional).write(coverage, sink)
+        else:
+            with writer.open() as sink:
+                get_exporter(parsed.format, functional).write(requirements, sink)
         
         return 0
         
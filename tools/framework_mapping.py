@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+ASVS Framework Mapping - SOC2 and ISO 27001 controls joined to ASVS.
+
+``ASVS-SOC2-ISO27001-Mapping.md`` maps each SOC2 criterion and ISO 27001
+Annex A control to ASVS chapters and key requirements in markdown tables,
+and has a quick-reference table from ASVS chapter to controls. This module
+parses those tables once into a many-to-many index (control to
+requirements and chapters, and back) and caches it in the resource cache,
+keyed by the document's SHA-256. ``join`` groups a catalog by control in one
+pass over its requirements, with dictionary lookups on req_id.
+
+ASVS Requirements Addressed:
+- V15.1.2: Maintain requirement inventory catalog
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from tools.catalog import Requirement
+from tools.reference_index import REQUIREMENT_ID
+
+
+# --- Constants ---
+
+MAPPING_DOC = "04-Documentation-Artifacts/Getting-Started/ASVS-SOC2-ISO27001-Mapping.md"
+
+# First header cell of each framework's mapping tables
+FRAMEWORK_HEADERS = {
+    "SOC2 Criterion": "soc2",
+    "ISO Control": "iso27001",
+}
+
+# Quick-reference table: ASVS chapter to primary controls per framework
+QUICK_REFERENCE_HEADERS = {
+    "Primary SOC2": "soc2",
+    "Primary ISO 27001": "iso27001",
+}
+
+FRAMEWORKS = ("soc2", "iso27001")
+
+CONTROL_ID = re.compile(r"\b(?:CC\d+\.\d+|A\.\d+\.\d+)\b")
+
+CONTROL_RANGE = re.compile(r"\b((?:CC|A\.)\d+\.)(\d+)\s*-\s*\1(\d+)\b")
+
+CHAPTER_ID = re.compile(r"\bV\d+\b(?!\.)")
+
+# Bump when the cache format or the parser changes
+MAPPING_VERSION = 1
+
+MAPPING_CACHE_NAME = "framework-mapping.json"
+
+
+# --- Data Classes ---
+
+@dataclass
+class Control:
+    """One SOC2 criterion or ISO 27001 control and the ASVS items mapped to it."""
+    framework: str
+    control_id: str
+    name: str = ""
+    chapters: list[str] = field(default_factory=list)
+    requirements: list[str] = field(default_factory=list)
+    notes: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "framework": self.framework,
+            "id": self.control_id,
+            "name": self.name,
+            "chapters": self.chapters,
+            "requirements": self.requirements,
+            "notes": self.notes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Control":
+        return cls(
+            framework=data["framework"],
+            control_id=data["id"],
+            name=data.get("name", ""),
+            chapters=list(data.get("chapters", [])),
+            requirements=list(data.get("requirements", [])),
+            notes=list(data.get("notes", [])),
+        )
+
+
+@dataclass
+class ControlCoverage:
+    """A control with the catalog requirements mapped to it."""
+    control: Control
+    requirements: list[Requirement] = field(default_factory=list)
+    unmatched: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.control.control_id,
+            "name": self.control.name,
+            "chapters": self.control.chapters,
+            "requirements": [
+                {
+                    "id": req.req_id,
+                    "description": req.description,
+                    "level": req.level,
+                    "chapter": req.chapter_name,
+                    "section": req.section_name,
+                }
+                for req in self.requirements
+            ],
+            "unmatched": self.unmatched,
+            "notes": self.control.notes,
+        }
+
+
+def _add_unique(items: list[str], values: Iterable[str]) -> None:
+    for value in values:
+        if value not in items:
+            items.append(value)
+
+
+def expand_controls(text: str) -> list[str]:
+    """Control IDs in a cell, with ranges (``CC6.1-CC6.3``) expanded."""
+    result: list[str] = []
+    for part in re.split(r",", text):
+        match = CONTROL_RANGE.search(part)
+        if match:
+            prefix, start, end = match.group(1), int(match.group(2)), int(match.group(3))
+            _add_unique(result, [f"{prefix}{n}" for n in range(start, end + 1)])
+        else:
+            _add_unique(result, CONTROL_ID.findall(part))
+    return result
+
+
+def _table_rows(lines: list[str]) -> Iterable[tuple[list[str], list[list[str]]]]:
+    """Yield (header, rows) for each markdown table."""
+    i = 0
+    while i < len(lines):
+        if lines[i].startswith("|") and i + 1 < len(lines) and re.match(r"^\|[\s:|-]+\|$", lines[i + 1]):
+            header = [c.strip() for c in lines[i].strip().strip("|").split("|")]
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].startswith("|"):
+                rows.append([c.strip() for c in lines[i].strip().strip("|").split("|")])
+                i += 1
+            yield header, rows
+        else:
+            i += 1
+
+
+class MappingIndex:
+    """Many-to-many index between framework controls and ASVS requirements and chapters."""
+
+    def __init__(self, controls: Optional[Iterable[Control]] = None):
+        self.controls: dict[str, dict[str, Control]] = {name: {} for name in FRAMEWORKS}
+        for control in controls or ():
+            self.controls.setdefault(control.framework, {})[control.control_id] = control
+        self._build_lookups()
+
+    def _build_lookups(self) -> None:
+        self.by_requirement: dict[str, list[Control]] = {}
+        self.by_chapter: dict[str, list[Control]] = {}
+        for controls in self.controls.values():
+            for control in controls.values():
+                for req_id in control.requirements:
+                    self.by_requirement.setdefault(req_id, []).append(control)
+                for chapter in control.chapters:
+                    self.by_chapter.setdefault(chapter, []).append(control)
+
+    @classmethod
+    def parse(cls, text: str) -> "MappingIndex":
+        """Parse the mapping tables of the markdown document."""
+        controls: dict[tuple[str, str], Control] = {}
+
+        def control_for(framework: str, control_id: str) -> Control:
+            key = (framework, control_id)
+            if key not in controls:
+                controls[key] = Control(framework, control_id)
+            return controls[key]
+
+        for header, rows in _table_rows(text.splitlines()):
+            framework = FRAMEWORK_HEADERS.get(header[0])
+            if framework and len(header) >= 3:
+                for row in rows:
+                    cell, chapter_cell, req_cell = (row + ["", "", ""])[:3]
+                    match = re.match(r"^(\S+)\s+-\s+(.*)$", cell)
+                    if not match or not CONTROL_ID.fullmatch(match.group(1)):
+                        continue
+                    control = control_for(framework, match.group(1))
+                    control.name = control.name or match.group(2)
+                    _add_unique(control.chapters, CHAPTER_ID.findall(chapter_cell))
+                    req_ids = REQUIREMENT_ID.findall(req_cell)
+                    _add_unique(control.requirements, req_ids)
+                    if not req_ids and req_cell:
+                        _add_unique(control.notes, [req_cell])
+                continue
+
+            columns = {i: QUICK_REFERENCE_HEADERS[h] for i, h in enumerate(header) if h in QUICK_REFERENCE_HEADERS}
+            if header[0] == "ASVS Chapter" and columns:
+                for row in rows:
+                    chapters = CHAPTER_ID.findall(row[0])
+                    for i, framework in columns.items():
+                        if i < len(row):
+                            for control_id in expand_controls(row[i]):
+                                _add_unique(control_for(framework, control_id).chapters, chapters)
+
+        def order(key: tuple[str, str]) -> tuple[int, ...]:
+            return tuple(int(n) for n in re.findall(r"\d+", key[1]))
+
+        return cls(controls[key] for key in sorted(controls, key=order))
+
+    @classmethod
+    def load(cls, path: Path, cache_path: Optional[Path] = None) -> "MappingIndex":
+        """
+        Load the index for a mapping document, parsing it only if it changed.
+
+        Args:
+            path: The mapping markdown document
+            cache_path: Cache file (default: under the resource cache)
+
+        Raises:
+            OSError: If the document cannot be read
+        """
+        if cache_path is None:
+            from tools.resource_manager import get_cache_dir
+            cache_path = get_cache_dir() / MAPPING_CACHE_NAME
+
+        stat = path.stat()
+        cached = _read_cache(cache_path)
+        if cached and cached.get("size") == stat.st_size and cached.get("mtime_ns") == stat.st_mtime_ns:
+            return cls.from_dict(cached)
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if cached and cached.get("sha256") == digest:
+            index = cls.from_dict(cached)
+        else:
+            index = cls.parse(content.decode("utf-8"))
+
+        payload = index.to_dict()
+        payload.update(
+            version=MAPPING_VERSION, sha256=digest, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+        )
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+        return index
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"controls": [c.to_dict() for controls in self.controls.values() for c in controls.values()]}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MappingIndex":
+        return cls(Control.from_dict(entry) for entry in data.get("controls", []))
+
+    def framework(self, name: str) -> list[Control]:
+        """Controls of one framework, in ID order."""
+        if name not in self.controls:
+            raise ValueError(f"Unknown framework: {name}. Must be one of: {', '.join(FRAMEWORKS)}")
+        return list(self.controls[name].values())
+
+    def for_requirement(self, req_id: str) -> list[Control]:
+        """Controls listing a requirement among their key requirements."""
+        return list(self.by_requirement.get(req_id, []))
+
+    def for_chapter(self, chapter_id: str) -> list[Control]:
+        """Controls mapped to an ASVS chapter."""
+        return list(self.by_chapter.get(chapter_id, []))
+
+    def join(self, name: str, requirements: Iterable[Requirement]) -> list[ControlCoverage]:
+        """
+        Group catalog requirements by control.
+
+        The mapped IDs are the (small) build side of a hash join and
+        ``requirements`` (a list, ``RequirementIndex`` or generator) is
+        probed in one pass, keeping only mapped requirements; every row of
+        a repeated ID is kept. Mapped IDs missing from ``requirements``
+        (e.g. above the exported level) are listed as unmatched.
+        """
+        controls = self.framework(name)
+        wanted = {req_id for control in controls for req_id in control.requirements}
+        found: dict[str, list[Requirement]] = {}
+        for req in requirements:
+            if req.req_id in wanted:
+                found.setdefault(req.req_id, []).append(req)
+
+        result = []
+        for control in controls:
+            coverage = ControlCoverage(control)
+            for req_id in control.requirements:
+                rows = found.get(req_id)
+                if rows is None:
+                    coverage.unmatched.append(req_id)
+                else:
+                    coverage.requirements.extend(rows)
+            result.append(coverage)
+        return result
+
+
+def _read_cache(cache_path: Path) -> Optional[dict[str, Any]]:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MAPPING_VERSION:
+        return None
+    return data
+
+
+def find_mapping_file(base_path: Path) -> Path:
+    """Find the mapping document in the checkout, then the resource cache."""
+    local_path = Path(base_path) / MAPPING_DOC
+    if local_path.exists():
+        return local_path
+
+    try:
+        from tools.resource_manager import get_resource_path
+        cached_path = get_resource_path("framework_mappings")
+        if cached_path:
+            path = cached_path / Path(MAPPING_DOC).name
+            if path.exists():
+                return path
+    except ImportError:
+        pass
+
+    raise FileNotFoundError(
+        f"Mapping document not found: {Path(MAPPING_DOC).name}. "
+        "Run 'asvs resources --download' to fetch required files."
+    )
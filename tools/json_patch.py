@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+RFC 6902 JSON Patch between ASVS catalogs.
+
+``build_patch`` compares the local catalog document (a flat requirement
+list, bare or under a ``"requirements"`` key) with the upstream one, record
+by record and field by field, and returns a patch that transforms the
+local document into the upstream catalog. An upstream document in the
+nested format is compared as the flat records it parses to. Each edit is
+guarded by a ``test`` operation so that applying the patch to a different
+version of the file fails instead of corrupting it:
+
+- records are paired by ID, and by the moves in the drift result; every
+  field that differs is replaced, added or removed in place
+- unpaired local records are removed, highest index first, so earlier
+  removals do not shift later indices
+- upstream records are then put in upstream order: new ones are added at
+  their upstream index and out-of-order ones are moved there
+
+``apply_patch`` implements the ``test``, ``replace``, ``remove``, ``add``
+and ``move`` operations used here.
+"""
+
+import copy
+import json
+from typing import Any
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch cannot be built or applied."""
+    pass
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def catalog_items(document: Any) -> tuple[str, list[Any]]:
+    """JSON Pointer prefix and list of requirement records of a flat catalog."""
+    if isinstance(document, list):
+        prefix, items = "", document
+    elif isinstance(document, dict) and isinstance(document.get("requirements"), list):
+        prefix, items = "/requirements", document["requirements"]
+    else:
+        items = None
+    if items is not None and all(isinstance(item, dict) and "req_id" in item for item in items):
+        return prefix, items
+    raise JsonPatchError("JSON Patch output needs a local catalog in the flat requirement-list format")
+
+
+def _record(req: Any) -> dict[str, str]:
+    return {
+        "chapter_id": req.chapter_id,
+        "chapter_name": req.chapter_name,
+        "section_id": req.section_id,
+        "section_name": req.section_name,
+        "req_id": req.req_id,
+        "req_description": req.description,
+        "L": req.level,
+    }
+
+
+def upstream_items(document: Any) -> list[dict[str, Any]]:
+    """Flat records of the upstream catalog, in upstream order."""
+    try:
+        return catalog_items(document)[1]
+    except JsonPatchError:
+        pass
+    from tools.catalog import RequirementParser
+    try:
+        return [_record(req) for req in RequirementParser().parse_data(document)]
+    except ValueError as e:
+        raise JsonPatchError(f"Cannot read the upstream catalog: {e}")
+
+
+def _edit_fields(path: str, current: dict[str, Any], target: dict[str, Any]) -> list[dict[str, Any]]:
+    """Operations turning one object into another, key by key."""
+    ops: list[dict[str, Any]] = []
+    for key, value in target.items():
+        key_path = f"{path}/{_escape(key)}"
+        if key not in current:
+            ops.append({"op": "add", "path": key_path, "value": value})
+        elif current[key] != value:
+            ops.append({"op": "test", "path": key_path, "value": current[key]})
+            ops.append({"op": "replace", "path": key_path, "value": value})
+    for key in current:
+        if key not in target:
+            key_path = f"{path}/{_escape(key)}"
+            ops.append({"op": "test", "path": key_path, "value": current[key]})
+            ops.append({"op": "remove", "path": key_path})
+    return ops
+
+
+def _pair(items: list[dict[str, Any]], targets: list[dict[str, Any]], result: Any) -> dict[int, int]:
+    """Local index to upstream index for records that are kept."""
+    free: dict[str, list[int]] = {}
+    for j, target in enumerate(targets):
+        free.setdefault(target.get("req_id"), []).append(j)
+
+    pairs: dict[int, int] = {}
+    unpaired: dict[str, int] = {}
+    for i, item in enumerate(items):
+        candidates = free.get(item["req_id"])
+        if candidates:
+            pairs[i] = candidates.pop(0)
+        else:
+            unpaired.setdefault(item["req_id"], i)
+
+    for local, upstream, _ in getattr(result, "moved", ()):
+        candidates = free.get(upstream.req_id)
+        if local.req_id in unpaired and candidates:
+            pairs[unpaired.pop(local.req_id)] = candidates.pop(0)
+    return pairs
+
+
+def build_patch(document: Any, upstream: Any, result: Any = None) -> list[dict[str, Any]]:
+    """
+    Patch operations turning the local ``document`` into the upstream catalog.
+
+    Applying the patch to ``document`` gives ``upstream`` (or, for a nested
+    upstream document, its flat records) exactly.
+
+    Args:
+        document: Parsed local catalog JSON
+        upstream: Parsed upstream catalog JSON
+        result: Optional ``DriftResult`` whose moves pair renumbered
+            requirements, so they are edited instead of removed and added
+    """
+    prefix, items = catalog_items(document)
+    targets = upstream_items(upstream)
+    pairs = _pair(items, targets, result)
+
+    ops: list[dict[str, Any]] = []
+    if prefix and isinstance(upstream, dict) and isinstance(upstream.get("requirements"), list):
+        # Top-level keys besides the requirement list
+        current = {k: v for k, v in document.items() if k != "requirements"}
+        target = {k: v for k, v in upstream.items() if k != "requirements"}
+        ops.extend(_edit_fields("", current, target))
+
+    for i in sorted(pairs):
+        edits = _edit_fields(f"{prefix}/{i}", items[i], targets[pairs[i]])
+        if edits:
+            ops.append({"op": "test", "path": f"{prefix}/{i}/req_id", "value": items[i]["req_id"]})
+            ops.extend(edits)
+
+    for i in sorted((i for i in range(len(items)) if i not in pairs), reverse=True):
+        ops.append({"op": "test", "path": f"{prefix}/{i}/req_id", "value": items[i]["req_id"]})
+        ops.append({"op": "remove", "path": f"{prefix}/{i}"})
+
+    # Upstream index of each remaining record, in current order
+    order = [pairs[i] for i in sorted(pairs)]
+    kept = set(order)
+    for j, target in enumerate(targets):
+        if j < len(order) and order[j] == j:
+            continue
+        if j not in kept:
+            ops.append({"op": "add", "path": f"{prefix}/{j}", "value": target})
+        else:
+            source = order.index(j)
+            ops.append({"op": "move", "from": f"{prefix}/{source}", "path": f"{prefix}/{j}"})
+            order.pop(source)
+        order.insert(j, j)
+
+    return ops
+
+
+def _resolve(document: Any, path: str) -> tuple[Any, str]:
+    """Parent container and final token of a JSON Pointer."""
+    if not path.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON Pointer: {path!r}")
+    tokens = [_unescape(t) for t in path[1:].split("/")]
+    parent = document
+    for token in tokens[:-1]:
+        try:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise JsonPatchError(f"Path not found: {path}")
+    return parent, tokens[-1]
+
+
+def _get(parent: Any, token: str, path: str) -> Any:
+    try:
+        return parent[int(token)] if isinstance(parent, list) else parent[token]
+    except (KeyError, IndexError, ValueError, TypeError):
+        raise JsonPatchError(f"Path not found: {path}")
+
+
+def apply_patch(document: Any, ops: list[dict[str, Any]]) -> Any:
+    """Apply patch operations to a copy of ``document`` and return it."""
+    document = copy.deepcopy(document)
+    for op in ops:
+        name, path = op.get("op"), op.get("path", "")
+        parent, token = _resolve(document, path)
+        if name == "test":
+            if _get(parent, token, path) != op.get("value"):
+                raise JsonPatchError(f"Test failed at {path}")
+        elif name == "replace":
+            _get(parent, token, path)
+            if isinstance(parent, list):
+                parent[int(token)] = op["value"]
+            else:
+                parent[token] = op["value"]
+        elif name == "remove":
+            _get(parent, token, path)
+            del parent[int(token) if isinstance(parent, list) else token]
+        elif name in ("add", "move"):
+            if name == "move":
+                source_parent, source_token = _resolve(document, op.get("from", ""))
+                value = _get(source_parent, source_token, op.get("from", ""))
+                del source_parent[int(source_token) if isinstance(source_parent, list) else source_token]
+            else:
+                value = op["value"]
+            if isinstance(parent, list):
+                if token == "-":
+                    parent.append(value)
+                else:
+                    parent.insert(int(token), value)
+            else:
+                parent[token] = value
+        else:
+            raise JsonPatchError(f"Unsupported operation: {name!r}")
+    return document
+
+
+def format_patch(ops: list[dict[str, Any]]) -> str:
+    """Serialize a patch, one operation per line for reviewable diffs."""
+    if not ops:
+        return "[]"
+    return "[\n" + ",\n".join("  " + json.dumps(op, ensure_ascii=False) for op in ops) + "\n]"
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON reading for documents too large to load at once.
+
+``JsonStreamReader`` walks a JSON document from a file object in fixed-size
+chunks. Callers navigate containers with ``iter_object``/``iter_array`` and
+materialize only the values they need with ``read_value``; everything else
+is skipped with a regex-driven scanner, so peak memory is bounded by the
+largest value actually read rather than by the document size.
+
+Only the standard library is used: values are decoded with the C-accelerated
+``json`` scanner, structure is tracked here.
+"""
+
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from typing import IO, Any, Iterator, Sequence, Union
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR_END = re.compile(r"[ \t\n\r,\]}]")
+_DECODER = json.JSONDecoder()
+
+
+class JsonStreamReader:
+    """Pull-style reader over a JSON document in a text or binary stream."""
+
+    def __init__(self, stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = None
+        self._started = False
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    # --- Buffer management ---
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer. Returns False at end of input."""
+        if self.eof:
+            return False
+        raw = self._stream.read(self._chunk_size)
+        if isinstance(raw, (bytes, bytearray, memoryview)):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            text = self._decoder.decode(bytes(raw), final=not raw)
+        else:
+            text = raw
+            if not self._started and text.startswith("\ufeff"):
+                text = text[1:]
+        self._started = True
+        if not raw:
+            self.eof = True
+            if not text:
+                return False
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        self._skip_whitespace()
+        return self.buf[self.pos] if self.pos < len(self.buf) else ""
+
+    def _expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected '{char}', found '{found or 'EOF'}'")
+        self.pos += 1
+
+    # --- Values ---
+
+    def read_value(self) -> Any:
+        """Decode and return the next complete value."""
+        first = self.peek()
+        if first not in ('"', "{", "["):
+            # Numbers and literals may continue in the next chunk ("-1." + "5")
+            while not _SCALAR_END.search(self.buf, self.pos) and self._fill():
+                pass
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid JSON: {e}")
+            self.pos = end
+            return value
+
+    def read_string(self) -> str:
+        """Decode the next value, which must be a string."""
+        if self.peek() != '"':
+            raise ValueError("Invalid JSON: expected string")
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos + 1)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid JSON: {e}")
+            self.pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Skip the next value without decoding nested content."""
+        first = self.peek()
+        if first not in ("{", "["):
+            self.read_value()
+            return
+
+        depth = 0
+        while True:
+            match = _STRUCTURAL.search(self.buf, self.pos)
+            if not match:
+                self.pos = len(self.buf)
+                if not self._fill():
+                    raise ValueError("Invalid JSON: unexpected end of input")
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if char == '"':
+                while True:
+                    tail = _STRING_TAIL.match(self.buf, self.pos)
+                    if tail:
+                        self.pos = tail.end()
+                        break
+                    if not self._fill():
+                        raise ValueError("Invalid JSON: unterminated string")
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    # --- Containers ---
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Iterate the keys of the next object.
+
+        After each key is yielded the caller may read or skip its value; a
+        value left untouched is skipped automatically.
+        """
+        self._expect("{")
+        first = True
+        while True:
+            char = self.peek()
+            if char == "}":
+                self.pos += 1
+                return
+            if not first:
+                if char != ",":
+                    raise ValueError(f"Invalid JSON: expected ',' or '}}', found '{char or 'EOF'}'")
+                self.pos += 1
+            first = False
+            key = self.read_string()
+            self._expect(":")
+            yield key
+            if self.peek() not in (",", "}"):
+                self.skip_value()
+
+    def iter_array(self) -> Iterator[int]:
+        """
+        Iterate the elements of the next array, yielding their indexes.
+
+        The caller reads or skips each element; untouched elements are skipped.
+        """
+        self._expect("[")
+        index = 0
+        while True:
+            char = self.peek()
+            if char == "]":
+                self.pos += 1
+                return
+            if index:
+                if char != ",":
+                    raise ValueError(f"Invalid JSON: expected ',' or ']', found '{char or 'EOF'}'")
+                self.pos += 1
+            yield index
+            index += 1
+            if self.peek() not in (",", "]"):
+                self.skip_value()
+
+
+def iter_items(
+    stream: IO,
+    path: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[list[Union[str, int]], Any]]:
+    """
+    Yield (keys, value) for every value at ``path``.
+
+    Path steps are object keys, ``"*"`` for any object key or ``"item"`` for
+    any array element, e.g. ``["packages", "*"]`` or ``["requirements", "item"]``.
+    """
+    reader = JsonStreamReader(stream, chunk_size)
+    yield from _walk(reader, list(path), [])
+
+
+def _walk(reader: JsonStreamReader, path: list[str], keys: list) -> Iterator[tuple[list, Any]]:
+    if not path:
+        yield keys, reader.read_value()
+        return
+
+    step, rest = path[0], path[1:]
+    char = reader.peek()
+    if char == "{" and step != "item":
+        for key in reader.iter_object():
+            if step == "*" or key == step:
+                yield from _walk(reader, rest, keys + [key])
+    elif char == "[" and step == "item":
+        for index in reader.iter_array():
+            yield from _walk(reader, rest, keys + [index])
+    else:
+        reader.skip_value()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+ASVS Lockfile Index - Dependency evidence from package manifests.
+
+Parses every ``package-lock.json``, ``requirements*.txt``, ``poetry.lock``
+and ``go.sum`` under a repository once into a name -> versions map, so
+"library X of at least version Y is a dependency" evidence checks are a
+dictionary lookup. All formats are read incrementally: text lockfiles line
+by line and ``package-lock.json`` through the streaming JSON reader, so a
+50 MB lockfile is never held in memory as a whole.
+"""
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from tools.json_stream import JsonStreamReader
+from tools.tree_walker import IgnoreRules, walk_files
+
+
+ECOSYSTEMS = ("npm", "pypi", "go")
+
+# Lockfile name patterns and the ecosystem they describe
+LOCKFILE_PATTERNS = (
+    ("package-lock.json", "npm"),
+    ("npm-shrinkwrap.json", "npm"),
+    ("requirements*.txt", "pypi"),
+    ("poetry.lock", "pypi"),
+    ("go.sum", "go"),
+)
+
+_REQUIREMENT_LINE = re.compile(
+    r"^(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*"
+    r"(?:(?P<op>===|==|~=|>=)\s*(?P<version>[^\s,;#]+))?"
+)
+_TOML_STRING = re.compile(r'^(name|version)\s*=\s*"([^"]*)"')
+
+
+# --- Data Classes ---
+
+@dataclass(frozen=True)
+class Dependency:
+    """A single name/version pair recorded in a lockfile."""
+    ecosystem: str
+    name: str
+    version: str
+    source: str
+
+
+# --- Version Handling ---
+
+def normalize_name(name: str, ecosystem: str) -> str:
+    """Normalize a package name for lookup (PEP 503 for Python packages)."""
+    if ecosystem == "pypi":
+        return re.sub(r"[-_.]+", "-", name).lower()
+    return name.lower()
+
+
+def version_key(version: str) -> tuple[tuple[int, ...], int]:
+    """
+    Sortable key for a version string.
+
+    Compares the numeric release components (``v1.2.10`` > ``1.2.9``) and
+    orders pre-releases (``1.0.0-beta``, ``1.0rc1``) before the release.
+    """
+    release = version.strip().lstrip("vV=").partition("+")[0]
+    release, dash, _ = release.partition("-")
+    prerelease = bool(dash)
+    parts: list[int] = []
+    for component in release.split("."):
+        match = re.match(r"(\d*)(.*)", component)
+        parts.append(int(match.group(1) or 0))
+        if match.group(2):
+            prerelease = True
+            break
+    while len(parts) > 1 and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts), 0 if prerelease else 1
+
+
+def version_at_least(version: str, minimum: str) -> bool:
+    """True if ``version`` is greater than or equal to ``minimum``."""
+    return version_key(version) >= version_key(minimum)
+
+
+# --- Lockfile Parsers ---
+
+def parse_package_lock(path: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yield (name, version) pairs from package-lock.json / npm-shrinkwrap.json.
+
+    Lockfile v2/v3 ``packages`` entries are preferred; the v1 nested
+    ``dependencies`` tree is only read when no ``packages`` section came first.
+    """
+    with path.open("rb") as handle:
+        reader = JsonStreamReader(handle)
+        seen_packages = False
+        for key in reader.iter_object():
+            if key == "packages" and reader.peek() == "{":
+                seen_packages = True
+                for package_path in reader.iter_object():
+                    if "node_modules/" not in package_path:
+                        continue
+                    entry = reader.read_value()
+                    if isinstance(entry, dict) and entry.get("version"):
+                        name = entry.get("name") or package_path.rsplit("node_modules/", 1)[1]
+                        yield name, str(entry["version"])
+            elif key == "dependencies" and not seen_packages and reader.peek() == "{":
+                for name in reader.iter_object():
+                    yield from _walk_v1_dependency(name, reader.read_value())
+
+
+def _walk_v1_dependency(name: str, entry: object) -> Iterator[tuple[str, str]]:
+    if not isinstance(entry, dict):
+        return
+    if entry.get("version"):
+        yield name, str(entry["version"])
+    for child_name, child in (entry.get("dependencies") or {}).items():
+        yield from _walk_v1_dependency(child_name, child)
+
+
+def parse_requirements_txt(path: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yield (name, version) pairs from a pip requirements file.
+
+    Pinned (``==``/``===``) and lower-bounded (``>=``/``~=``) requirements
+    record that version; unpinned requirements record an empty version.
+    """
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        for raw_line in handle:
+            line = raw_line.split(" #", 1)[0].strip()
+            if not line or line.startswith(("#", "-", "git+", "http:", "https:")):
+                continue
+            match = _REQUIREMENT_LINE.match(line)
+            if match:
+                yield match.group("name"), match.group("version") or ""
+
+
+def parse_poetry_lock(path: Path) -> Iterator[tuple[str, str]]:
+    """Yield (name, version) pairs from the [[package]] tables of poetry.lock."""
+    in_package = False
+    name: Optional[str] = None
+    version: Optional[str] = None
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        for raw_line in handle:
+            line = raw_line.strip()
+            if line.startswith("["):
+                if name and version:
+                    yield name, version
+                name = version = None
+                in_package = line == "[[package]]"
+                continue
+            match = _TOML_STRING.match(line) if in_package else None
+            if match and match.group(1) == "name" and name is None:
+                name = match.group(2)
+            elif match and match.group(1) == "version" and version is None:
+                version = match.group(2)
+    if name and version:
+        yield name, version
+
+
+def parse_go_sum(path: Path) -> Iterator[tuple[str, str]]:
+    """Yield (module, version) pairs from go.sum."""
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        for raw_line in handle:
+            fields = raw_line.split()
+            if len(fields) >= 2:
+                yield fields[0], fields[1].split("/", 1)[0]
+
+
+PARSERS = {
+    "package-lock.json": parse_package_lock,
+    "npm-shrinkwrap.json": parse_package_lock,
+    "poetry.lock": parse_poetry_lock,
+    "go.sum": parse_go_sum,
+}
+
+
+def lockfile_ecosystem(filename: str) -> Optional[str]:
+    """Return the ecosystem of a lockfile name, or None if it is not one."""
+    for pattern, ecosystem in LOCKFILE_PATTERNS:
+        if fnmatch.fnmatchcase(filename, pattern):
+            return ecosystem
+    return None
+
+
+# --- Index ---
+
+class LockfileIndex:
+    """Name -> versions map over every lockfile in a repository."""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str], list[Dependency]] = {}
+        self.lockfiles: list[str] = []
+        self.errors: list[str] = []
+
+    @classmethod
+    def build(cls, root: Path) -> "LockfileIndex":
+        """Find and parse every supported lockfile under root, once each."""
+        index = cls()
+        rules = IgnoreRules.from_root(root)
+        for file_path in walk_files(root, rules=rules):
+            ecosystem = lockfile_ecosystem(file_path.name)
+            if ecosystem:
+                index.add_lockfile(file_path, ecosystem, file_path.relative_to(root).as_posix())
+        return index
+
+    def add_lockfile(self, path: Path, ecosystem: str, source: Optional[str] = None) -> None:
+        """Parse a single lockfile into the index."""
+        source = source or path.name
+        parser = PARSERS.get(path.name, parse_requirements_txt)
+        try:
+            for name, version in parser(path):
+                self.add(Dependency(ecosystem, name, version, source))
+        except (OSError, ValueError) as e:
+            self.errors.append(f"Failed to parse {source}: {e}")
+            return
+        self.lockfiles.append(source)
+
+    def add(self, dependency: Dependency) -> None:
+        """Record a single dependency."""
+        key = (dependency.ecosystem, normalize_name(dependency.name, dependency.ecosystem))
+        self._entries.setdefault(key, []).append(dependency)
+
+    def find(self, name: str, ecosystem: Optional[str] = None) -> list[Dependency]:
+        """All recorded versions of a package, across ecosystems unless one is given."""
+        ecosystems = [ecosystem] if ecosystem else ECOSYSTEMS
+        found: list[Dependency] = []
+        for eco in ecosystems:
+            found.extend(self._entries.get((eco, normalize_name(name, eco)), []))
+        return found
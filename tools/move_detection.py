@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+ASVS Move Detection - Match renumbered requirements by description.
+
+Between ASVS releases many requirements keep (nearly) the same text under a
+new identifier. Given the requirements that disappeared and those that
+appeared, this module pairs them up without comparing every pair:
+
+1. Exact moves: a hash index over normalized descriptions, linear time.
+2. Near moves: MinHash signatures over word bigrams, bucketed with
+   locality-sensitive hashing (LSH). Only pairs sharing a bucket are
+   scored, using the exact Jaccard similarity of their bigram sets.
+
+Pairs are assigned one-to-one, best score first.
+"""
+
+import hashlib
+import random
+import re
+import zlib
+from typing import Iterable, Sequence
+
+
+DEFAULT_MOVE_THRESHOLD = 0.7
+
+# 16 bands of 4 rows: pairs with similarity 0.7 share a bucket ~99% of the time
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_description(text: str) -> str:
+    """Lowercase and reduce to alphanumeric words separated by single spaces."""
+    return " ".join(_TOKEN.findall(text.lower()))
+
+
+def shingles(text: str) -> frozenset[str]:
+    """Word bigrams of the normalized text (single words for one-word texts)."""
+    words = normalize_description(text).split()
+    if len(words) < 2:
+        return frozenset(words)
+    return frozenset(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two sets (1.0 for two empty sets)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """Fixed family of hash permutations producing MinHash signatures."""
+
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, seed: int = 1):
+        rng = random.Random(seed)
+        self.params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, items: Iterable[str]) -> tuple[int, ...]:
+        """MinHash signature of a set of strings."""
+        values = [zlib.crc32(item.encode("utf-8")) for item in items]
+        if not values:
+            return tuple(0 for _ in self.params)
+        return tuple(
+            min((a * v + b) % _MERSENNE_PRIME for v in values)
+            for a, b in self.params
+        )
+
+
+def find_moves(
+    removed: Sequence[tuple[str, str]],
+    added: Sequence[tuple[str, str]],
+    threshold: float = DEFAULT_MOVE_THRESHOLD,
+) -> list[tuple[str, str, float]]:
+    """
+    Pair removed and added requirements whose descriptions match.
+
+    Args:
+        removed: (id, description) pairs present only in the old catalog
+        added: (id, description) pairs present only in the new catalog
+        threshold: Minimum Jaccard similarity of word bigrams for a near move
+
+    Returns:
+        (removed id, added id, similarity) triples, exact moves scoring 1.0
+
+    Requirements whose description has no words are never paired: two
+    blank descriptions say nothing about the requirements being the same.
+    """
+    moves: list[tuple[str, str, float]] = []
+    removed = [(i, t) for i, t in removed if normalize_description(t)]
+    added = [(i, t) for i, t in added if normalize_description(t)]
+
+    # Exact moves through the normalized-description index
+    by_text: dict[str, list[str]] = {}
+    for added_id, text in added:
+        key = hashlib.sha256(normalize_description(text).encode("utf-8")).hexdigest()
+        by_text.setdefault(key, []).append(added_id)
+
+    remaining_removed = []
+    for removed_id, text in removed:
+        key = hashlib.sha256(normalize_description(text).encode("utf-8")).hexdigest()
+        candidates = by_text.get(key)
+        if candidates:
+            moves.append((removed_id, candidates.pop(0), 1.0))
+        else:
+            remaining_removed.append((removed_id, text))
+
+    matched = {added_id for _, added_id, _ in moves}
+    remaining_added = [(i, t) for i, t in added if i not in matched]
+    if not remaining_removed or not remaining_added or threshold > 1.0:
+        return moves
+
+    # Near moves through MinHash/LSH buckets
+    hasher = MinHasher()
+    rows = len(hasher.params) // LSH_BANDS
+    added_shingles = {}
+    buckets: dict[tuple[int, tuple[int, ...]], list[str]] = {}
+    for added_id, text in remaining_added:
+        items = shingles(text)
+        added_shingles[added_id] = items
+        signature = hasher.signature(items)
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * rows:(band + 1) * rows])
+            buckets.setdefault(key, []).append(added_id)
+
+    scored: list[tuple[float, str, str]] = []
+    for removed_id, text in remaining_removed:
+        items = shingles(text)
+        signature = hasher.signature(items)
+        candidates: set[str] = set()
+        for band in range(LSH_BANDS):
+            candidates.update(buckets.get((band, signature[band * rows:(band + 1) * rows]), ()))
+        for added_id in candidates:
+            score = jaccard(items, added_shingles[added_id])
+            if score >= threshold:
+                scored.append((score, removed_id, added_id))
+
+    used_removed: set[str] = set()
+    used_added: set[str] = set()
+    for score, removed_id, added_id in sorted(scored, key=lambda s: (-s[0], s[1], s[2])):
+        if removed_id in used_removed or added_id in used_added:
+            continue
+        used_removed.add(removed_id)
+        used_added.add(added_id)
+        moves.append((removed_id, added_id, round(score, 3)))
+
+    return moves
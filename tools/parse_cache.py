@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+ASVS Parse Cache - Parsed requirement catalogs keyed by content hash.
+
+Drift detection and export re-read the same ASVS JSON on every run. The
+parsed records are stored here as tuples of strings serialized with
+``marshal``, keyed by the SHA-256 of the source text, so a repeated run
+skips ``json.loads`` and per-record dictionary lookups entirely.
+
+``marshal`` is used instead of ``pickle``: cache entries only ever hold
+tuples and strings, and unlike pickle, loading a tampered ``marshal`` file
+cannot instantiate arbitrary objects.
+"""
+
+import hashlib
+import marshal
+import os
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+
+# Bump when the stored row layout changes
+PARSE_CACHE_VERSION = 2
+
+# Subdirectory of the resource cache holding parsed catalogs
+PARSE_CACHE_SUBDIR = "parse-cache"
+
+T = TypeVar("T")
+
+
+def content_digest(content: str) -> str:
+    """SHA-256 of the UTF-8 encoded source text."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of parsed records, one file per (namespace, digest)."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        if cache_dir is None:
+            from tools.resource_manager import get_cache_dir
+            cache_dir = get_cache_dir() / PARSE_CACHE_SUBDIR
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, namespace: str, digest: str) -> Path:
+        """Cache file for a namespace and source digest."""
+        return self.cache_dir / f"{namespace}-{digest}.v{PARSE_CACHE_VERSION}.marshal"
+
+    def load(self, namespace: str, digest: str) -> Optional[list[tuple]]:
+        """Return cached rows, or None if absent or unreadable."""
+        try:
+            data = self.path_for(namespace, digest).read_bytes()
+            rows = marshal.loads(data)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return rows if isinstance(rows, list) else None
+
+    def store(self, namespace: str, digest: str, rows: list[tuple]) -> None:
+        """Write rows atomically. Failures are ignored; the cache is optional."""
+        path = self.path_for(namespace, digest)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(marshal.dumps(rows))
+            os.replace(tmp_path, path)
+        except (OSError, ValueError):
+            pass
+
+    def get_or_parse(
+        self,
+        namespace: str,
+        content: str,
+        parse: Callable[[str], list[T]],
+        record_type: Callable[..., T],
+        digest: Optional[str] = None,
+    ) -> list[T]:
+        """
+        Return the parsed records for ``content``, parsing only on a cache miss.
+
+        Args:
+            namespace: Separates record layouts of different parsers
+            content: Source text
+            parse: Parser used on a miss
+            record_type: Dataclass rebuilt positionally from cached rows
+            digest: Precomputed SHA-256 of content, if the caller has one
+        """
+        digest = digest or content_digest(content)
+        rows = self.load(namespace, digest)
+        if rows is not None:
+            try:
+                return [record_type(*row) for row in rows]
+            except TypeError:
+                pass
+
+        records = parse(content)
+        self.store(namespace, digest, [_as_row(record) for record in records])
+        return records
+
+
+def _as_row(record: Any) -> tuple:
+    return tuple(getattr(record, f.name) for f in fields(record))
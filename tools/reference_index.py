@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+ASVS Reference Index - Which files mention which requirement IDs.
+
+Builds an inverted index from requirement ID (``V11.1.2``) to the evidence
+manifests, decision documents and guidance files that mention it, with the
+line and, in Markdown, the enclosing heading of every mention. Files are
+read and scanned in parallel batches. Joining the index with a drift
+result lists the artifacts to review for each changed requirement.
+
+``ReferenceIndex.load`` keeps the per-file results under the resource
+cache directory, like the symbol index: files whose size and mtime are
+unchanged are not read, and files whose SHA-256 is unchanged are not
+re-scanned.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+from tools.tree_walker import IgnoreRules, walk_files
+
+
+# Files that can reference requirements
+REFERENCE_SUFFIXES = (".md", ".markdown", ".yml", ".yaml")
+
+EVIDENCE_SUFFIXES = (".yml", ".yaml")
+
+# Files read per worker task
+SCAN_BATCH_SIZE = 32
+
+REQUIREMENT_ID = re.compile(r"\bV\d{1,2}\.\d{1,3}\.\d{1,3}\b(?!\.\d)")
+
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+_HEADING = re.compile(r"^ {0,3}#{1,6}[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+# Bump when the cache format or the scanner changes
+INDEX_VERSION = 1
+
+# Subdirectory of the resource cache holding reference indexes
+INDEX_CACHE_SUBDIR = "reference-index"
+
+
+@dataclass
+class Reference:
+    """
+    Mentions of one requirement in one file.
+
+    ``headings`` holds the Markdown heading enclosing each line in
+    ``lines`` ("" before the first heading and in non-Markdown files).
+    """
+    path: str
+    kind: str
+    lines: list[int] = field(default_factory=list)
+    headings: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"path": self.path, "kind": self.kind, "lines": self.lines, "headings": self.headings}
+
+
+@dataclass
+class FileReferences:
+    """Cached scan result of one file."""
+    sha256: str
+    size: int
+    mtime_ns: int
+    mentions: dict[str, list[tuple[int, str]]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "sha256": self.sha256,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "mentions": {req_id: [list(m) for m in found] for req_id, found in self.mentions.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FileReferences":
+        """Create from a dictionary written by to_dict."""
+        return cls(
+            sha256=data["sha256"],
+            size=data["size"],
+            mtime_ns=data["mtime_ns"],
+            mentions={
+                req_id: [(m[0], m[1]) for m in found]
+                for req_id, found in data.get("mentions", {}).items()
+            },
+        )
+
+
+@dataclass
+class ImpactEntry:
+    """Artifacts referring to one changed requirement."""
+    req_id: str
+    change: str
+    references: list[Reference] = field(default_factory=list)
+    new_id: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "id": self.req_id,
+            "change": self.change,
+            "references": [r.to_dict() for r in self.references],
+        }
+        if self.new_id:
+            data["new_id"] = self.new_id
+        return data
+
+
+def classify(rel_path: str) -> str:
+    """Artifact kind of a file: evidence, decision or guidance."""
+    if rel_path.endswith(EVIDENCE_SUFFIXES):
+        return "evidence"
+    if "decision" in rel_path.lower():
+        return "decision"
+    return "guidance"
+
+
+def scan_mentions(text: str, markdown: bool = False) -> dict[str, list[tuple[int, str]]]:
+    """
+    Requirement IDs in a text, each with (line number, heading) pairs.
+
+    With ``markdown``, the heading is the text of the nearest ATX heading
+    above the line; lines inside fenced code blocks are never headings.
+    """
+    found: dict[str, list[tuple[int, str]]] = {}
+    if "V" not in text:
+        return found
+    heading = ""
+    fence = ""
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if markdown and line.lstrip(" ")[:1] in ("#", "`", "~"):
+            opened = _FENCE.match(line)
+            if fence:
+                if opened and opened.group(1)[0] == fence[0] and len(opened.group(1)) >= len(fence):
+                    fence = ""
+            elif opened:
+                fence = opened.group(1)
+            else:
+                match = _HEADING.match(line)
+                if match:
+                    heading = match.group(1)
+        if "V" not in line:
+            continue
+        for req_id in REQUIREMENT_ID.findall(line):
+            mentions = found.setdefault(req_id, [])
+            if not mentions or mentions[-1][0] != lineno:
+                mentions.append((lineno, heading))
+    return found
+
+
+def scan_text(text: str) -> dict[str, list[int]]:
+    """Requirement IDs in a text, each with the line numbers mentioning it."""
+    return {req_id: [line for line, _ in found] for req_id, found in scan_mentions(text).items()}
+
+
+class ReferenceIndex:
+    """Inverted index from requirement ID to referencing files."""
+
+    def __init__(
+        self,
+        root: Path,
+        workers: Optional[int] = None,
+        cache_path: Optional[Path] = None,
+        paths: Optional[Sequence[str]] = None,
+    ):
+        self.root = Path(root)
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cache_path = cache_path
+        self.paths = tuple(paths) if paths else None
+        self.files: dict[str, FileReferences] = {}
+        self.refs: dict[str, list[Reference]] = {}
+        self.files_scanned = 0
+
+    @classmethod
+    def build(
+        cls,
+        root: Path,
+        workers: Optional[int] = None,
+        paths: Optional[Sequence[str]] = None,
+    ) -> "ReferenceIndex":
+        """Scan a tree and return its index."""
+        index = cls(root, workers, paths=paths)
+        index.refresh()
+        return index
+
+    @staticmethod
+    def default_cache_path(root: Path, paths: Optional[Sequence[str]] = None) -> Path:
+        """Cache file for a root (and subdirectories) under the resource cache directory."""
+        from tools.resource_manager import get_cache_dir
+        key_source = "\0".join([str(Path(root).resolve()), *(paths or ())])
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+        return get_cache_dir() / INDEX_CACHE_SUBDIR / f"{key}.json"
+
+    @classmethod
+    def load(
+        cls,
+        root: Path,
+        workers: Optional[int] = None,
+        cache_path: Optional[Path] = None,
+        paths: Optional[Sequence[str]] = None,
+    ) -> "ReferenceIndex":
+        """
+        Load the cached index for a root and bring it up to date.
+
+        Args:
+            root: Directory paths in the index are relative to
+            workers: Threads reading changed files
+            cache_path: Cache file (default: under the resource cache)
+            paths: Only index these subdirectories of ``root``
+        """
+        index = cls(root, workers, cache_path or cls.default_cache_path(root, paths), paths)
+        index._read_cache()
+        if index.refresh():
+            index.save()
+        return index
+
+    def _read_cache(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        try:
+            self.files = {
+                path: FileReferences.from_dict(entry)
+                for path, entry in data.get("files", {}).items()
+            }
+        except (KeyError, IndexError, TypeError):
+            self.files = {}
+
+    def save(self) -> None:
+        """Write the per-file scan results to the cache file."""
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self.root.resolve()),
+            "files": {path: entry.to_dict() for path, entry in sorted(self.files.items())},
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self.cache_path)
+
+    def _walk(self) -> Iterable[Path]:
+        rules = IgnoreRules.from_root(self.root)
+        if self.paths is None:
+            yield from walk_files(self.root, rules=rules, suffixes=REFERENCE_SUFFIXES)
+            return
+        for sub in self.paths:
+            if (self.root / sub).is_dir():
+                yield from walk_files(self.root / sub, base_path=self.root, rules=rules,
+                                      suffixes=REFERENCE_SUFFIXES)
+
+    def _scan_batch(self, batch: list[tuple[str, Path, os.stat_result]]) -> list[tuple[str, FileReferences]]:
+        results = []
+        for rel, file_path, stat in batch:
+            try:
+                data = file_path.read_bytes()
+            except OSError:
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            entry = self.files.get(rel)
+            if entry is None or entry.sha256 != digest:
+                text = data.decode("utf-8", errors="replace")
+                entry = FileReferences(digest, 0, 0, scan_mentions(text, rel.endswith(MARKDOWN_SUFFIXES)))
+            results.append((rel, FileReferences(digest, stat.st_size, stat.st_mtime_ns, entry.mentions)))
+        return results
+
+    def refresh(self) -> int:
+        """
+        Re-scan changed files, drop deleted ones and rebuild the index.
+
+        Returns:
+            Number of files added, re-read or removed
+        """
+        changed = 0
+        seen: set[str] = set()
+        batches: list[list[tuple[str, Path, os.stat_result]]] = []
+        batch: list[tuple[str, Path, os.stat_result]] = []
+        for file_path in self._walk():
+            rel = file_path.relative_to(self.root).as_posix()
+            seen.add(rel)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            entry = self.files.get(rel)
+            if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                continue
+            batch.append((rel, file_path, stat))
+            if len(batch) >= SCAN_BATCH_SIZE:
+                batches.append(batch)
+                batch = []
+        if batch:
+            batches.append(batch)
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                scanned = [entry for results in pool.map(self._scan_batch, batches) for entry in results]
+            for rel, entry in scanned:
+                self.files[rel] = entry
+                changed += 1
+
+        for rel in set(self.files) - seen:
+            del self.files[rel]
+            changed += 1
+
+        self._build_lookups()
+        return changed
+
+    def _build_lookups(self) -> None:
+        self.refs = {}
+        self.files_scanned = len(self.files)
+        for rel in sorted(self.files):
+            kind = classify(rel)
+            for req_id, mentions in self.files[rel].mentions.items():
+                self.refs.setdefault(req_id, []).append(Reference(
+                    rel, kind, [line for line, _ in mentions], [heading for _, heading in mentions],
+                ))
+
+    def find(self, req_id: str) -> list[Reference]:
+        """Files mentioning a requirement, in path order."""
+        return self.refs.get(req_id, [])
+
+    def impact(self, result: Any) -> list[ImpactEntry]:
+        """
+        Join a drift result with the index.
+
+        ``result`` is a ``DriftResult``. Every changed requirement is listed,
+        including those no file mentions.
+        """
+        entries = [ImpactEntry(r.req_id, "removed", self.find(r.req_id)) for r in result.removed]
+        entries += [ImpactEntry(local.req_id, "modified", self.find(local.req_id))
+                    for local, _ in result.modified]
+        entries += [ImpactEntry(local.req_id, "moved", self.find(local.req_id), new_id=upstream.req_id)
+                    for local, upstream, _ in result.moved]
+        entries += [ImpactEntry(r.req_id, "added", self.find(r.req_id)) for r in result.added]
+        return sorted(entries, key=lambda e: _id_key(e.req_id))
+
+
+def affected_files(entries: Iterable[ImpactEntry]) -> list[str]:
+    """Distinct files to review for a set of impact entries."""
+    return sorted({ref.path for entry in entries for ref in entry.references})
+
+
+def _id_key(req_id: str) -> tuple[int, ...]:
+    return tuple(int(part) if part.isdigit() else 0 for part in req_id.lstrip("V").split("."))
@@ -24,6 +24,9 @@ GITHUB_REPO_URL = f"https://github.com/{GITHUB_REPO}"
 # Default cache directory for downloaded resources
 DEFAULT_CACHE_DIR = Path.home() / ".asvs-compliance" / "resources"
 
+# Environment variable overriding the cache directory
+CACHE_DIR_ENV_VAR = "ASVS_CACHE_DIR"
+
 # Resource manifest - defines all downloadable resources
 RESOURCE_MANIFEST = {
     "templates": {
@@ -69,9 +72,22 @@ RESOURCE_MANIFEST = {
             "Security-Logging-and-Monitoring.md",
         ],
     },
+    "framework_mappings": {
+        "description": "SOC2 and ISO 27001 control mappings",
+        "base_path": "04-Documentation-Artifacts/Getting-Started",
+        "files": [
+            "ASVS-SOC2-ISO27001-Mapping.md",
+        ],
+    },
 }
 
 
+def get_cache_dir() -> Path:
+    """Get the resource cache directory, honouring ASVS_CACHE_DIR."""
+    override = os.environ.get(CACHE_DIR_ENV_VAR)
+    return Path(override) if override else DEFAULT_CACHE_DIR
+
+
 class ResourceDownloadError(Exception):
     """Raised when resource download fails."""
     pass
@@ -86,9 +102,9 @@ class ResourceManager:
 
         Args:
             cache_dir: Directory to cache downloaded resources.
-                      Defaults to ~/.asvs-compliance/resources
+                      Defaults to $ASVS_CACHE_DIR or ~/.asvs-compliance/resources
         """
-        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.cache_dir = cache_dir or get_cache_dir()
         self._manifest_cache: Optional[Dict] = None
 
     def get_cache_path(self, resource_type: str, filename: str) -> Path:
@@ -286,7 +302,7 @@ def prompt_download_permission(resource_types: Optional[List[str]] = None) -> bo
     print(f"  {GITHUB_REPO_URL}")
     print()
     print("And cached locally at:")
-    print(f"  {DEFAULT_CACHE_DIR}")
+    print(f"  {get_cache_dir()}")
     print()
     
     if resource_types:
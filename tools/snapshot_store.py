@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+ASVS Snapshot Store - Content-addressed history of fetched catalogs.
+
+Every upstream fetch made by the drift detector is recorded as a snapshot.
+Storage is content-addressed, like a git object store:
+
+- ``objects/ab/cdef...json``: one requirement record, named by the SHA-256
+  of its canonical JSON. A requirement that is unchanged between releases
+  is stored once, however many snapshots contain it.
+- ``manifests/<id>.json``: the (requirement ID, object hash) pairs of one
+  snapshot. The snapshot ID is the hash of those pairs, so the same
+  catalog content always yields the same ID.
+- ``index.json``: snapshots in the order they were taken, with their
+  timestamp, source and source-file hash.
+
+Comparing two snapshots compares object hashes per requirement ID; only
+requirements whose hashes differ are read back. Records are stored as JSON
+rather than ``marshal`` because snapshots are an audit history that must
+outlive Python upgrades.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+
+# Subdirectory of the resource cache holding catalog snapshots
+SNAPSHOT_SUBDIR = "snapshots"
+
+# Shortest hash prefix accepted as a snapshot reference
+MIN_PREFIX_LENGTH = 4
+
+T = TypeVar("T")
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot reference cannot be resolved or read."""
+    pass
+
+
+@dataclass
+class SnapshotInfo:
+    """Index entry of one snapshot."""
+    snapshot_id: str
+    created: str
+    source: str = ""
+    content_hash: str = ""
+    count: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.snapshot_id,
+            "created": self.created,
+            "source": self.source,
+            "content_hash": self.content_hash,
+            "count": self.count,
+        }
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SnapshotStore:
+    """Content-addressed store of catalog snapshots."""
+
+    def __init__(self, root: Optional[Path] = None, clock: Callable[[], str] = _utc_now):
+        if root is None:
+            from tools.resource_manager import get_cache_dir
+            root = get_cache_dir() / SNAPSHOT_SUBDIR
+        self.root = Path(root)
+        self.clock = clock
+
+    # --- Index ---
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def snapshots(self) -> list[SnapshotInfo]:
+        """Snapshots in the order they were taken."""
+        try:
+            entries = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        return [
+            SnapshotInfo(
+                snapshot_id=e["id"],
+                created=e["created"],
+                source=e.get("source", ""),
+                content_hash=e.get("content_hash", ""),
+                count=e.get("count", 0),
+            )
+            for e in entries
+        ]
+
+    def _write_index(self, entries: list[SnapshotInfo]) -> None:
+        data = json.dumps([e.to_dict() for e in entries], indent=2) + "\n"
+        _write_atomic(self.index_path, data.encode("utf-8"))
+
+    def find_content(self, content_hash: str) -> Optional[SnapshotInfo]:
+        """Snapshot already taken of a source file with this SHA-256."""
+        for entry in self.snapshots():
+            if entry.content_hash == content_hash:
+                return entry
+        return None
+
+    def resolve(self, ref: str) -> SnapshotInfo:
+        """
+        Resolve a snapshot reference.
+
+        Accepts ``latest``, ``previous``, a snapshot ID prefix, or a date or
+        timestamp (``2025-06-30``), which selects the last snapshot taken on
+        or before it.
+        """
+        entries = self.snapshots()
+        if not entries:
+            raise SnapshotError("No snapshots recorded yet; run 'asvs drift' against upstream first")
+
+        if ref == "latest":
+            return entries[-1]
+        if ref == "previous":
+            if len(entries) < 2:
+                raise SnapshotError("Only one snapshot recorded")
+            return entries[-2]
+
+        if _DATE.match(ref):
+            # A bare date includes the whole day
+            bound = ref + "T23:59:59Z" if len(ref) == 10 else ref
+            earlier = [e for e in entries if e.created <= bound]
+            if not earlier:
+                raise SnapshotError(f"No snapshot taken on or before {ref}")
+            return earlier[-1]
+
+        if len(ref) < MIN_PREFIX_LENGTH:
+            raise SnapshotError(f"Snapshot reference too short: {ref}")
+        matches = [e for e in entries if e.snapshot_id.startswith(ref.lower())]
+        if not matches:
+            raise SnapshotError(f"Unknown snapshot: {ref}")
+        if len(matches) > 1:
+            raise SnapshotError(f"Ambiguous snapshot prefix: {ref}")
+        return matches[0]
+
+    # --- Objects and manifests ---
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.json"
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.root / "manifests" / f"{snapshot_id}.json"
+
+    def put_object(self, record: dict[str, Any]) -> str:
+        """Store a record unless an identical one exists; return its hash."""
+        data = _canonical(record)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            _write_atomic(path, data)
+        return digest
+
+    def get_object(self, digest: str) -> dict[str, Any]:
+        """Read a record by hash."""
+        try:
+            return json.loads(self._object_path(digest).read_bytes())
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Snapshot object {digest[:12]} is missing or corrupt") from e
+
+    def manifest(self, snapshot_id: str) -> dict[str, str]:
+        """Requirement ID -> object hash for a snapshot."""
+        try:
+            data = json.loads(self._manifest_path(snapshot_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Snapshot manifest {snapshot_id[:12]} is missing or corrupt") from e
+        return dict(data["requirements"])
+
+    def save(
+        self,
+        records: Iterable[Any],
+        source: str = "",
+        content_hash: str = "",
+    ) -> SnapshotInfo:
+        """
+        Record a snapshot of dataclass records with a ``req_id`` field.
+
+        Saving content identical to an existing snapshot returns that
+        snapshot instead of adding a new index entry.
+        """
+        pairs = []
+        for record in records:
+            row = {f.name: getattr(record, f.name) for f in fields(record)}
+            pairs.append((row["req_id"], self.put_object(row)))
+        pairs.sort()
+        snapshot_id = hashlib.sha256(_canonical(pairs)).hexdigest()
+
+        entries = self.snapshots()
+        for entry in entries:
+            if entry.snapshot_id == snapshot_id:
+                return entry
+
+        info = SnapshotInfo(
+            snapshot_id=snapshot_id,
+            created=self.clock(),
+            source=source,
+            content_hash=content_hash,
+            count=len(pairs),
+        )
+        manifest = {**info.to_dict(), "requirements": pairs}
+        _write_atomic(self._manifest_path(snapshot_id), json.dumps(manifest).encode("utf-8"))
+        entries.append(info)
+        self._write_index(entries)
+        return info
+
+    def load(
+        self,
+        snapshot_id: str,
+        record_type: Callable[..., T],
+        ids: Optional[Iterable[str]] = None,
+    ) -> list[T]:
+        """Rebuild records of a snapshot, optionally only the given IDs."""
+        manifest = self.manifest(snapshot_id)
+        wanted = sorted(manifest) if ids is None else sorted(ids)
+        return [record_type(**self.get_object(manifest[req_id])) for req_id in wanted]
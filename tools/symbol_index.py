@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+ASVS Symbol Index - Persistent index of code symbols for evidence checks.
+
+Indexes class, function and variable definitions plus imports across a
+repository so evidence checks can ask "is there a class called
+SecurityHeadersMiddleware?" or "is helmet imported anywhere?" with a
+dictionary lookup instead of a regex scan over every file.
+
+Python files are parsed with the ``ast`` module. JavaScript and TypeScript
+files go through a lightweight tokenizer that skips comments and strings.
+The index is stored under the resource cache directory and refreshed
+incrementally: files whose size and mtime are unchanged are not read, and
+files whose SHA-256 is unchanged are not re-parsed.
+"""
+
+import ast
+import fnmatch
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from tools.tree_walker import IgnoreRules, walk_files
+
+
+# Bump when the on-disk format or the extractors change
+INDEX_VERSION = 1
+
+PYTHON_SUFFIXES = (".py", ".pyi")
+SCRIPT_SUFFIXES = (".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx")
+
+# Subdirectory of the resource cache holding symbol indexes
+INDEX_CACHE_SUBDIR = "symbol-index"
+
+
+# --- Data Classes ---
+
+@dataclass
+class FileSymbols:
+    """Symbols and imports extracted from a single source file."""
+    sha256: str
+    size: int
+    mtime_ns: int
+    symbols: list[tuple[str, str, int]] = field(default_factory=list)
+    imports: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "sha256": self.sha256,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "symbols": [list(s) for s in self.symbols],
+            "imports": self.imports,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "FileSymbols":
+        """Create from a dictionary written by to_dict."""
+        return cls(
+            sha256=data["sha256"],
+            size=data["size"],
+            mtime_ns=data["mtime_ns"],
+            symbols=[(s[0], s[1], s[2]) for s in data.get("symbols", [])],
+            imports=list(data.get("imports", [])),
+        )
+
+
+@dataclass
+class SymbolMatch:
+    """A symbol definition found in the index."""
+    path: str
+    kind: str
+    line: int
+
+
+# --- Extractors ---
+
+def extract_python(source: str) -> tuple[list[tuple[str, str, int]], list[str]]:
+    """
+    Extract definitions and imports from Python source.
+
+    Methods are recorded under both their bare and ``Class.method`` names.
+    Files that do not parse yield nothing.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return [], []
+
+    symbols: list[tuple[str, str, int]] = []
+    imports: list[str] = []
+
+    def visit(nodes: list[ast.stmt], owner: str = "") -> None:
+        for node in nodes:
+            if isinstance(node, ast.ClassDef):
+                symbols.append((node.name, "class", node.lineno))
+                visit(node.body, node.name)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if owner:
+                    symbols.append((node.name, "method", node.lineno))
+                    symbols.append((f"{owner}.{node.name}", "method", node.lineno))
+                else:
+                    symbols.append((node.name, "function", node.lineno))
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)) and not owner:
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append((target.id, "variable", node.lineno))
+            elif isinstance(node, (ast.If, ast.Try)):
+                visit(node.body, owner)
+                visit(node.orelse, owner)
+
+    visit(tree.body)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imports.append(node.module)
+            imports.extend(
+                f"{node.module}.{alias.name}" for alias in node.names if alias.name != "*"
+            )
+
+    return symbols, imports
+
+
+_SCRIPT_TOKEN = re.compile(
+    r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|`(?:[^`\\]|\\.)*`)
+    |(?P<ident>[A-Za-z_$][\w$]*)
+    |(?P<punct>[=(){};*])
+    |(?P<newline>\n)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+_SCRIPT_DECLARATIONS = {
+    "class": "class",
+    "function": "function",
+    "interface": "interface",
+    "enum": "enum",
+    "type": "type",
+}
+
+
+def _tokenize_script(source: str) -> list[tuple[str, str, int]]:
+    """Split JS/TS source into (kind, value, line) tokens, dropping comments."""
+    tokens = []
+    line = 1
+    for match in _SCRIPT_TOKEN.finditer(source):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "newline":
+            line += 1
+            continue
+        if kind == "string":
+            tokens.append((kind, value[1:-1], line))
+        elif kind != "comment":
+            tokens.append((kind, value, line))
+        line += value.count("\n")
+    return tokens
+
+
+def extract_script(source: str) -> tuple[list[tuple[str, str, int]], list[str]]:
+    """Extract declarations and imports from JavaScript/TypeScript source."""
+    tokens = _tokenize_script(source)
+    symbols: list[tuple[str, str, int]] = []
+    imports: list[str] = []
+
+    for i, (kind, value, line) in enumerate(tokens):
+        if kind != "ident":
+            continue
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else ("", "", 0)
+        after = tokens[i + 2] if i + 2 < len(tokens) else ("", "", 0)
+
+        if value in _SCRIPT_DECLARATIONS:
+            if value == "function" and nxt[1] == "*":
+                nxt, after = after, tokens[i + 3] if i + 3 < len(tokens) else ("", "", 0)
+            if nxt[0] != "ident":
+                continue
+            if value == "type" and after[1] != "=":
+                continue
+            symbols.append((nxt[1], _SCRIPT_DECLARATIONS[value], nxt[2]))
+        elif value in ("const", "let", "var") and nxt[0] == "ident" and after[1] == "=":
+            symbols.append((nxt[1], "variable", nxt[2]))
+        elif value == "from" and nxt[0] == "string":
+            imports.append(nxt[1])
+        elif value == "import" and nxt[0] == "string":
+            imports.append(nxt[1])
+        elif value in ("require", "import") and nxt[1] == "(" and after[0] == "string":
+            imports.append(after[1])
+
+    return symbols, imports
+
+
+def _module_prefixes(module: str, separator: str) -> list[str]:
+    """All parent modules of an import, e.g. a.b.c -> a, a.b, a.b.c."""
+    if module.startswith((".", "/")):
+        return [module]
+    parts = module.split(separator)
+    start = 2 if module.startswith("@") and len(parts) > 1 else 1
+    return [separator.join(parts[:i]) for i in range(start, len(parts) + 1)]
+
+
+# --- Index ---
+
+class SymbolIndex:
+    """Incrementally maintained index of symbols and imports in a repository."""
+
+    def __init__(self, root: Path, cache_path: Optional[Path] = None):
+        self.root = Path(root)
+        self.cache_path = cache_path
+        self.files: dict[str, FileSymbols] = {}
+        self._symbols: dict[str, list[SymbolMatch]] = {}
+        self._imports: dict[str, set[str]] = {}
+
+    @staticmethod
+    def default_cache_path(root: Path) -> Path:
+        """Cache file for a repository root under the resource cache directory."""
+        from tools.resource_manager import get_cache_dir
+        key = hashlib.sha256(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:16]
+        return get_cache_dir() / INDEX_CACHE_SUBDIR / f"{key}.json"
+
+    @classmethod
+    def load(cls, root: Path, cache_path: Optional[Path] = None) -> "SymbolIndex":
+        """Load the cached index for a root and bring it up to date."""
+        index = cls(root, cache_path or cls.default_cache_path(root))
+        index._read_cache()
+        if index.refresh():
+            index.save()
+        return index
+
+    def _read_cache(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        try:
+            self.files = {
+                path: FileSymbols.from_dict(entry)
+                for path, entry in data.get("files", {}).items()
+            }
+        except (KeyError, IndexError, TypeError):
+            self.files = {}
+
+    def save(self) -> None:
+        """Write the index to its cache file."""
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_VERSION,
+            "root": str(self.root.resolve()),
+            "files": {path: entry.to_dict() for path, entry in sorted(self.files.items())},
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self.cache_path)
+
+    def refresh(self) -> int:
+        """
+        Re-index changed files and drop deleted ones.
+
+        Returns:
+            Number of files added, re-parsed or removed
+        """
+        changed = 0
+        seen: set[str] = set()
+        rules = IgnoreRules.from_root(self.root)
+
+        for file_path in walk_files(
+            self.root, rules=rules, suffixes=PYTHON_SUFFIXES + SCRIPT_SUFFIXES
+        ):
+            rel = file_path.relative_to(self.root).as_posix()
+            seen.add(rel)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+
+            entry = self.files.get(rel)
+            if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                continue
+
+            try:
+                data = file_path.read_bytes()
+            except OSError:
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if entry and entry.sha256 == digest:
+                entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                changed += 1
+                continue
+
+            source = data.decode("utf-8", errors="replace")
+            if rel.endswith(PYTHON_SUFFIXES):
+                symbols, imports = extract_python(source)
+            else:
+                symbols, imports = extract_script(source)
+            self.files[rel] = FileSymbols(
+                sha256=digest,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                symbols=symbols,
+                imports=sorted(set(imports)),
+            )
+            changed += 1
+
+        for rel in set(self.files) - seen:
+            del self.files[rel]
+            changed += 1
+
+        self._build_lookups()
+        return changed
+
+    def _build_lookups(self) -> None:
+        self._symbols = {}
+        self._imports = {}
+        for rel, entry in self.files.items():
+            for name, kind, line in entry.symbols:
+                self._symbols.setdefault(name, []).append(SymbolMatch(rel, kind, line))
+            separator = "." if rel.endswith(PYTHON_SUFFIXES) else "/"
+            for module in entry.imports:
+                for prefix in _module_prefixes(module, separator):
+                    self._imports.setdefault(prefix, set()).add(rel)
+
+    @staticmethod
+    def _in_scope(rel: str, path_prefix: Optional[str]) -> bool:
+        if not path_prefix:
+            return True
+        prefix = path_prefix.strip("/")
+        return rel == prefix or rel.startswith(prefix + "/")
+
+    def find_symbol(
+        self,
+        name: str,
+        kind: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+    ) -> list[SymbolMatch]:
+        """
+        Find definitions of a symbol.
+
+        ``name`` may contain shell-style wildcards (``*Middleware``); exact
+        names are a single dictionary lookup.
+        """
+        if any(c in name for c in "*?["):
+            candidates = [
+                match
+                for key, matches in self._symbols.items()
+                if fnmatch.fnmatchcase(key, name)
+                for match in matches
+            ]
+        else:
+            candidates = self._symbols.get(name, [])
+        return [
+            m for m in candidates
+            if (kind is None or m.kind == kind) and self._in_scope(m.path, path_prefix)
+        ]
+
+    def find_import(self, module: str, path_prefix: Optional[str] = None) -> list[str]:
+        """Find files importing a module or one of its submodules."""
+        return sorted(
+            rel for rel in self._imports.get(module, ())
+            if self._in_scope(rel, path_prefix)
+        )
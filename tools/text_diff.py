@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Word-level diffs of requirement descriptions.
+
+Descriptions are compared word by word, ignoring whitespace differences,
+and rendered in ``git diff --word-diff=plain`` style: ``[-removed-]`` and
+``{+inserted+}``.
+"""
+
+from difflib import SequenceMatcher
+
+
+def word_diff(old: str, new: str) -> list[tuple[str, str]]:
+    """
+    Diff two texts by words.
+
+    Returns:
+        (op, text) pairs where op is ``equal``, ``delete`` or ``insert``;
+        a replacement is a ``delete`` followed by an ``insert``
+    """
+    a, b = old.split(), new.split()
+    ops: list[tuple[str, str]] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(("equal", " ".join(a[i1:i2])))
+            continue
+        if i2 > i1:
+            ops.append(("delete", " ".join(a[i1:i2])))
+        if j2 > j1:
+            ops.append(("insert", " ".join(b[j1:j2])))
+    return ops
+
+
+def render_word_diff(ops: list[tuple[str, str]]) -> str:
+    """Render diff ops inline as ``[-removed-]{+inserted+}``."""
+    parts: list[str] = []
+    previous = ""
+    for op, text in ops:
+        if op == "delete":
+            parts.append(f"[-{text}-]")
+        elif op == "insert" and previous == "delete":
+            parts[-1] += f"{{+{text}+}}"
+        elif op == "insert":
+            parts.append(f"{{+{text}+}}")
+        else:
+            parts.append(text)
+        previous = op
+    return " ".join(parts)
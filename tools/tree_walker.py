@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Repository tree walking shared by tree-wide evidence checks and indexes.
+
+Skips version-control metadata, dependency and build directories, and
+anything matched by the repository's top-level ``.gitignore``.
+"""
+
+import fnmatch
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+
+# Directories never descended into (vendored, generated or VCS metadata)
+IGNORED_DIRECTORIES = frozenset({
+    ".git",
+    ".hg",
+    ".svn",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "node_modules",
+    "bower_components",
+    "vendor",
+    "third_party",
+    "dist",
+    "build",
+    ".next",
+    "coverage",
+})
+
+
+class IgnoreRules:
+    """
+    A small subset of .gitignore semantics.
+
+    Supports comments, blank lines, directory-only patterns (``build/``),
+    anchored patterns (``/out`` or ``docs/_site``) and basename globs
+    (``*.min.js``). In anchored patterns, as in git, ``*`` stays within one
+    path segment and ``**`` spans any number of them, so ``build/*`` covers
+    ``build/app.js`` but not ``build/js/app.js``. Negation (``!pattern``)
+    is not supported and ignored. A single pattern may be passed as a str.
+    """
+
+    def __init__(self, patterns: Iterable[str] | str = ()):
+        self.patterns: list[tuple[tuple[str, ...], bool, bool]] = []
+        for raw in _pattern_list(patterns):
+            line = raw.strip()
+            if not line or line.startswith("#") or line.startswith("!"):
+                continue
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            self.patterns.append((tuple(line.lstrip("/").split("/")), dir_only, anchored))
+
+    @classmethod
+    def from_root(cls, root: Path, extra: Iterable[str] | str = ()) -> "IgnoreRules":
+        """Load rules from ``root/.gitignore`` plus any extra patterns."""
+        patterns = _pattern_list(extra)
+        gitignore = root / ".gitignore"
+        if gitignore.is_file():
+            try:
+                patterns = gitignore.read_text(encoding="utf-8").splitlines() + patterns
+            except (OSError, UnicodeDecodeError):
+                pass
+        return cls(patterns)
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Check a POSIX path relative to the rules' root."""
+        parts = rel_path.split("/")
+        for segments, dir_only, anchored in self.patterns:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                if _match_segments(parts, segments):
+                    return True
+            elif fnmatch.fnmatchcase(parts[-1], segments[0]):
+                return True
+        return False
+
+
+def _pattern_list(patterns: Iterable[str] | str) -> list[str]:
+    """Patterns as a list; a lone str is one pattern, not its characters."""
+    return [patterns] if isinstance(patterns, str) else list(patterns)
+
+
+def _match_segments(parts: list[str], segments: tuple[str, ...]) -> bool:
+    """Match path segments against pattern segments, ``**`` spanning any number."""
+    if not segments:
+        return not parts
+    head, rest = segments[0], segments[1:]
+    if head == "**":
+        return any(_match_segments(parts[i:], rest) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], head) and _match_segments(parts[1:], rest)
+
+
+def walk_files(
+    root: Path,
+    base_path: Optional[Path] = None,
+    rules: Optional[IgnoreRules] = None,
+    suffixes: Optional[Iterable[str]] = None,
+) -> Iterator[Path]:
+    """
+    Yield files under ``root`` lazily, skipping ignored directories and files.
+
+    Args:
+        root: Directory to walk
+        base_path: Directory the ignore rules are relative to (default: root)
+        rules: Ignore rules (default: none beyond IGNORED_DIRECTORIES)
+        suffixes: Optional file suffixes to keep (e.g. {".py", ".js"})
+    """
+    base_path = base_path or root
+    rules = rules or IgnoreRules()
+    wanted = tuple(suffixes) if suffixes else None
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, base_path).replace(os.sep, "/")
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if d not in IGNORED_DIRECTORIES and not rules.matches(prefix + d, True)
+        )
+        for filename in sorted(filenames):
+            if wanted and not filename.endswith(wanted):
+                continue
+            if rules.matches(prefix + filename, False):
+                continue
+            yield Path(dirpath) / filename